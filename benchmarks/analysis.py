@@ -16,8 +16,14 @@
 
 import re
 import difflib
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Set, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import pandas as pd
 
@@ -26,6 +32,12 @@ from benchmarks.data_models import (
     BenchmarkResultType,
     BenchmarkType,
 )
+from benchmarks.results_store import (
+    RESULTS_COLUMNS_FILE,
+    RESULTS_PAYLOADS_FILE,
+    has_columnar_results,
+    load_results_frame,
+)
 
 
 # ANSI escape codes for colors
@@ -61,7 +73,15 @@ def process_results(
         return pd.DataFrame()
 
     raw_results_df = pd.DataFrame([r.model_dump() for r in benchmark_run_results])
+    return process_results_frame(raw_results_df)
+
+
+def process_results_frame(raw_results_df: pd.DataFrame) -> pd.DataFrame:
+    """Adds derived columns to a raw results DataFrame.
 
+    Accepts either a DataFrame of `BenchmarkRunResult` dumps or the scalar table
+    loaded from `results.parquet` (see `benchmarks.results_store`).
+    """
     if not raw_results_df.empty:
         # Use parent directory name as suite identifier (e.g. 'api_understanding' instead of 'benchmark.yaml')
         raw_results_df["suite"] = raw_results_df["suite"].apply(
@@ -130,8 +150,13 @@ def print_metrics(raw_results_df: pd.DataFrame):
             return row["usage_metadata"].get(key, 0)
         return 0
 
-    df["tokens"] = df.apply(lambda r: get_meta(r, "total_tokens"), axis=1)
-    df["cost"] = df.apply(lambda r: get_meta(r, "cost"), axis=1)
+    if "usage_metadata" in df.columns:
+        df["tokens"] = df.apply(lambda r: get_meta(r, "total_tokens"), axis=1)
+        df["cost"] = df.apply(lambda r: get_meta(r, "cost"), axis=1)
+    else:
+        # Columnar results already carry flattened usage columns
+        df["tokens"] = df.get("total_tokens", pd.Series(0, index=df.index)).fillna(0)
+        df["cost"] = df.get("cost", pd.Series(0, index=df.index)).fillna(0)
 
     system_failure_types = [
         BenchmarkResultType.FAIL_SETUP.value,
@@ -411,127 +436,173 @@ def generate_detailed_reports(raw_results_df: pd.DataFrame, output_dir: Path):
             print(f"  - Report saved: {file_path}")
 
 
-def get_token_usage_stats(results: List[BenchmarkRunResult]) -> pd.DataFrame:
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    """Reads a field from a pydantic model or a plain dict (e.g. a JSON payload)."""
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+# Columns of the flat trace event table, one row per trace event.
+TRACE_EVENT_COLUMNS = [
+    "pos",
+    "benchmark",
+    "generator",
+    "type",
+    "tool_name",
+    "role",
+    "timestamp",
+    "author",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+]
+
+
+def trace_event_rows(
+    pos: int, benchmark_id: str, generator: str, trace_logs: Optional[List[Any]]
+) -> List[tuple]:
     """
-    Analyzes token usage from trace logs.
-    Returns a DataFrame with columns: [Benchmark, Generator, Agent, Action, Prompt Tokens, Completion Tokens, Total Tokens]
+    Flattens a result's trace logs into rows of `TRACE_EVENT_COLUMNS`.
+
+    This is the only per-event work; everything the reports derive from the rows is
+    computed over all results at once by `_trace_frames`.
     """
-    token_entries = []
+    rows = []
+    for event in trace_logs or []:
+        e_type = _field(event, "type")
+        if hasattr(e_type, "value"):
+            e_type = e_type.value
+
+        details = _field(event, "details", {}) or {}
+        # Fallback: "stats" in details (Gemini CLI stream-json format)
+        usage = details.get("usage_metadata") or details.get("stats") or {}
+        if not isinstance(usage, dict):
+            usage = {
+                "prompt_token_count": getattr(usage, "prompt_token_count", 0),
+                "candidates_token_count": getattr(usage, "candidates_token_count", 0),
+                "total_token_count": getattr(usage, "total_token_count", 0),
+            }
+
+        rows.append(
+            (
+                pos,
+                benchmark_id,
+                generator,
+                e_type,
+                _field(event, "tool_name"),
+                _field(event, "role"),
+                _field(event, "timestamp"),
+                _field(event, "author") or _field(event, "source", "unknown"),
+                usage.get("prompt_token_count") or usage.get("input_tokens") or 0,
+                usage.get("candidates_token_count") or usage.get("output_tokens") or 0,
+                usage.get("total_token_count") or usage.get("total_tokens") or 0,
+            )
+        )
+    return rows
 
-    for r in results:
-        if not r.trace_logs:
-            continue
 
-        # Group logs by timestamp + author + total_tokens to handle multi-part events (text + tool) from one API call
-        unique_generations = {}
+def _trace_frames(
+    events: pd.DataFrame, rows: List[int], successes: List[bool]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Builds the token usage and tool usage frames from the trace event table.
 
-        for event in r.trace_logs:
-            # Handle Pydantic model vs dict
-            details = (
-                event.details if hasattr(event, "details") else event.get("details", {})
-            )
-            if not details:
-                continue
-
-            usage = details.get("usage_metadata")
-            if not usage:
-                # Fallback: check for "stats" in details (Gemini CLI stream-json format)
-                usage = details.get("stats")
-
-            if not usage:
-                continue
-
-            # normalize usage to dict
-            if not isinstance(usage, dict):
-                usage = {
-                    "prompt_token_count": getattr(usage, "prompt_token_count", 0),
-                    "candidates_token_count": getattr(
-                        usage, "candidates_token_count", 0
-                    ),
-                    "total_token_count": getattr(usage, "total_token_count", 0),
-                }
-
-            total = usage.get("total_token_count") or usage.get("total_tokens") or 0
-            if total == 0:
-                continue
-
-            # Identify the event
-            timestamp = (
-                event.timestamp
-                if hasattr(event, "timestamp")
-                else event.get("timestamp")
-            )
-            author = event.author if hasattr(event, "author") else event.get("author")
-            if not author:
-                author = (
-                    event.source
-                    if hasattr(event, "source")
-                    else event.get("source", "unknown")
-                )
+    Args:
+        events: Rows of `TRACE_EVENT_COLUMNS`, grouped by result position.
+        rows: The results frame index label of each position.
+        successes: Whether the result at each position passed.
+    """
+    # Generator groups arrive from the pool in any order; restore the results order.
+    events = events.sort_values("pos", kind="stable", ignore_index=True)
+    named_tools = events[
+        (events["type"] == "tool_use")
+        & events["tool_name"].notna()
+        & (events["tool_name"] != "")
+    ]
 
-            # Create a unique key for this "generation turn"
-            key = (timestamp, author, total)
-
-            if key not in unique_generations:
-                unique_generations[key] = {
-                    "benchmark": r.id,
-                    "generator": r.answer_generator,
-                    "author": author,
-                    "prompt_tokens": usage.get("prompt_token_count")
-                    or usage.get("input_tokens")
-                    or 0,
-                    "completion_tokens": usage.get("candidates_token_count")
-                    or usage.get("output_tokens")
-                    or 0,
-                    "total_tokens": total,
-                    "tool_names": set(),
-                    "has_text": False,
-                }
-
-            # Update the group info based on this specific log event type
-            e_type = event.type if hasattr(event, "type") else event.get("type")
-            if hasattr(e_type, "value"):
-                e_type = e_type.value
-
-            if e_type == "tool_use":
-                t_name = (
-                    event.tool_name
-                    if hasattr(event, "tool_name")
-                    else event.get("tool_name")
-                )
-                if t_name:
-                    unique_generations[key]["tool_names"].add(t_name)
-            elif e_type == "message":
-                role = event.role if hasattr(event, "role") else event.get("role")
-                if role == "model":
-                    unique_generations[key]["has_text"] = True
-
-        # Convert unique generations to list
-        for gen in unique_generations.values():
-            tools = list(gen["tool_names"])
-            if tools:
-                label = f"Tool: {', '.join(sorted(tools))}"
-            elif gen["has_text"]:
-                label = "Text Generation"
-            else:
-                label = "Other"
-
-            token_entries.append(
-                {
-                    "Benchmark": gen["benchmark"],
-                    "Generator": gen["generator"],
-                    "Agent": gen["author"],
-                    "Action": label,
-                    "Prompt Tokens": gen["prompt_tokens"],
-                    "Completion Tokens": gen["completion_tokens"],
-                    "Total Tokens": gen["total_tokens"],
-                }
-            )
+    # Tool usage: the unique tools of each result, sorted within the result
+    used = named_tools[["pos", "tool_name"]].drop_duplicates()
+    used = used.sort_values(["pos", "tool_name"], kind="stable")
+    positions = used["pos"].to_numpy(dtype=int)
+    tool_df = pd.DataFrame(
+        {
+            "row": pd.Index(rows)[positions],
+            "tool": used["tool_name"].to_numpy(),
+            "success": pd.Series(successes, dtype=bool).to_numpy()[positions],
+        }
+    )
 
-    if not token_entries:
+    # Token usage: events of one API call share timestamp + author + total_tokens
+    # (multi-part events, e.g. text + tool); one row per such generation turn.
+    usage = events[events["total_tokens"] != 0]
+    if usage.empty:
+        return {"token_usage": pd.DataFrame(), "tool_usage": tool_df}
+    keys = ["pos", "timestamp", "author", "total_tokens"]
+    turn = usage.groupby(keys, sort=False, dropna=False).ngroup()
+    usage = usage.assign(
+        turn=turn,
+        has_text=(usage["type"] == "message") & (usage["role"] == "model"),
+    )
+    turns = usage.groupby("turn").agg(
+        benchmark=("benchmark", "first"),
+        generator=("generator", "first"),
+        author=("author", "first"),
+        prompt_tokens=("prompt_tokens", "first"),
+        completion_tokens=("completion_tokens", "first"),
+        total_tokens=("total_tokens", "first"),
+        has_text=("has_text", "any"),
+    )
+    tool_labels = (
+        usage[usage.index.isin(named_tools.index)]
+        .groupby("turn")["tool_name"]
+        .agg(lambda names: "Tool: " + ", ".join(sorted(set(names))))
+    )
+    action = turns["has_text"].map({True: "Text Generation", False: "Other"})
+    action.update(tool_labels)
+
+    token_df = pd.DataFrame(
+        {
+            "Benchmark": turns["benchmark"],
+            "Generator": turns["generator"],
+            "Agent": turns["author"],
+            "Action": action,
+            "Prompt Tokens": turns["prompt_tokens"],
+            "Completion Tokens": turns["completion_tokens"],
+            "Total Tokens": turns["total_tokens"],
+        }
+    ).reset_index(drop=True)
+    return {"token_usage": token_df, "tool_usage": tool_df}
+
+
+def _tool_success_stats_from_usage(
+    tool_usage_df: pd.DataFrame, overall_pass_rate: float
+) -> pd.DataFrame:
+    """Aggregates per-(case, tool) usage rows into success rate and lift."""
+    if tool_usage_df.empty:
         return pd.DataFrame()
 
-    return pd.DataFrame(token_entries)
+    # Aggregate
+    tool_agg = (
+        tool_usage_df.groupby("tool")
+        .agg(times_used=("success", "count"), successes=("success", "sum"))
+        .reset_index()
+    )
+
+    tool_agg["success_rate"] = tool_agg["successes"] / tool_agg["times_used"]
+
+    # Calculate Lift (Difference from overall pass rate)
+    tool_agg["lift"] = tool_agg["success_rate"] - overall_pass_rate
+
+    return tool_agg.sort_values("times_used", ascending=False)
+
+
+def get_token_usage_stats(results: List[BenchmarkRunResult]) -> pd.DataFrame:
+    """
+    Analyzes token usage from trace logs.
+    Returns a DataFrame with columns: [Benchmark, Generator, Agent, Action, Prompt Tokens, Completion Tokens, Total Tokens]
+    """
+    return AnalysisEngine(results).token_usage
 
 
 def get_tool_success_stats(results: List[BenchmarkRunResult]) -> pd.DataFrame:
@@ -539,51 +610,247 @@ def get_tool_success_stats(results: List[BenchmarkRunResult]) -> pd.DataFrame:
     Calculates Success Rate and Lift for each tool used.
     Returns a DataFrame with columns: [tool, times_used, successes, success_rate, lift]
     """
-    tool_stats_data = []
-
-    for r in results:
-        # Extract unique tools used in this run from trace_logs
-        tools_used = set()
-        logs = r.trace_logs or []
-        for log in logs:
-            # Handle Pydantic model vs dict
-            e_type = log.type if hasattr(log, "type") else log.get("type")
-            if hasattr(e_type, "value"):
-                e_type = e_type.value
-
-            if e_type == "tool_use":
-                t_name = (
-                    log.tool_name if hasattr(log, "tool_name") else log.get("tool_name")
+    return AnalysisEngine(results).tool_success_stats()
+
+
+# Below this many results, trace extraction runs in-process rather than in workers
+# that each re-read their generator's payloads.
+PARALLEL_EXTRACTION_MIN_RESULTS = 500
+
+# Derived frames memoized per (content hash, frame name), least recently used first.
+# Bounded so that a long-lived viewer process does not keep every run it showed.
+FRAME_CACHE_MAX_ENTRIES = 32
+_FRAME_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+# Per run directory: the (size, mtime_ns) of its artifacts and their content hash, so
+# an unchanged run is not read in full again just to find its cached frames.
+_CONTENT_HASHES: Dict[Path, Tuple[tuple, str]] = {}
+
+
+def _extract_payload_traces(run_dir: str, items: List[tuple]) -> List[tuple]:
+    """Worker: loads the payloads for one generator's rows and flattens their traces.
+
+    Args:
+        run_dir: The run directory holding the columnar results artifacts.
+        items: (position, payload_offset, payload_length, benchmark_id, generator)
+            tuples.
+    """
+    events = []
+    with open(Path(run_dir) / RESULTS_PAYLOADS_FILE, "rb") as f:
+        for pos, offset, length, benchmark_id, generator in items:
+            f.seek(offset)
+            payload = json.loads(zlib.decompress(f.read(length)))
+            events.extend(
+                trace_event_rows(
+                    pos, benchmark_id, generator, payload.get("trace_logs")
                 )
-                if t_name:
-                    tools_used.add(t_name)
+            )
+    return events
 
-        is_success = r.result == 1
 
-        for tool in tools_used:
-            tool_stats_data.append({"tool": tool, "success": is_success})
+class AnalysisEngine:
+    """
+    Computes the analysis frames for a benchmark run once and memoizes them.
 
-    if not tool_stats_data:
-        return pd.DataFrame()
+    Report sections share one engine so that trace logs are walked a single time
+    (tool usage and token usage are extracted together). When the run has columnar
+    results (`benchmarks.results_store`), trace parsing is split per generator across
+    a process pool that reads payloads straight from disk, and the derived frames are
+    cached under `<run_dir>/.analysis_cache/<content hash>/` for later invocations.
+    """
 
-    df_tools = pd.DataFrame(tool_stats_data)
+    CACHE_DIR_NAME = ".analysis_cache"
+
+    def __init__(
+        self,
+        results: Optional[List[BenchmarkRunResult]] = None,
+        run_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        use_disk_cache: bool = True,
+    ):
+        self.results = results
+        self.run_dir = Path(run_dir) if run_dir else None
+        self.max_workers = max_workers
+        self.use_disk_cache = use_disk_cache
+        self._columnar = bool(self.run_dir and has_columnar_results(self.run_dir))
+        if results is None and not self._columnar:
+            raise ValueError(
+                "AnalysisEngine needs results or a run_dir with columnar results."
+            )
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._content_hash: Optional[str] = None
+
+    @classmethod
+    def from_run_dir(cls, run_dir: Path, **kwargs) -> "AnalysisEngine":
+        """Creates an engine backed only by a run's columnar results artifacts."""
+        return cls(results=None, run_dir=run_dir, **kwargs)
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """Hash of the run's columnar artifacts, or None for in-memory results."""
+        if self._content_hash is None and self._columnar:
+            paths = [
+                self.run_dir / RESULTS_COLUMNS_FILE,
+                self.run_dir / RESULTS_PAYLOADS_FILE,
+            ]
+            signature = tuple(
+                (st.st_size, st.st_mtime_ns) for st in map(os.stat, paths)
+            )
+            run_dir = self.run_dir.resolve()
+            cached = _CONTENT_HASHES.get(run_dir)
+            if cached and cached[0] == signature:
+                self._content_hash = cached[1]
+            else:
+                h = hashlib.sha256()
+                for path in paths:
+                    with open(path, "rb") as f:
+                        for chunk in iter(lambda: f.read(1 << 20), b""):
+                            h.update(chunk)
+                self._content_hash = h.hexdigest()
+                _CONTENT_HASHES[run_dir] = (signature, self._content_hash)
+        return self._content_hash
+
+    # --- Memoization ---
+
+    def _cache_path(self, name: str) -> Optional[Path]:
+        if not (self.use_disk_cache and self.content_hash):
+            return None
+        return (
+            self.run_dir
+            / self.CACHE_DIR_NAME
+            / self.content_hash[:16]
+            / f"{name}.parquet"
+        )
 
-    # Aggregate
-    tool_agg = (
-        df_tools.groupby("tool")
-        .agg(times_used=("success", "count"), successes=("success", "sum"))
-        .reset_index()
-    )
+    def _get_frame(self, name: str, compute) -> pd.DataFrame:
+        if name in self._frames:
+            return self._frames[name]
+
+        key = (self.content_hash, name) if self.content_hash else None
+        if key and key in _FRAME_CACHE:
+            _FRAME_CACHE.move_to_end(key)
+            self._frames[name] = _FRAME_CACHE[key]
+            return self._frames[name]
+
+        path = self._cache_path(name)
+        if path and path.exists():
+            try:
+                self._frames[name] = pd.read_parquet(path)
+            except Exception as e:
+                print(f"Ignoring unreadable analysis cache {path}: {e}")
+
+        if name not in self._frames:
+            # A single extraction pass may produce several frames; keep them all
+            computed = compute()
+            self._frames.update(computed)
+            if path:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    for frame_name, frame in computed.items():
+                        frame.to_parquet(
+                            path.parent / f"{frame_name}.parquet", index=False
+                        )
+                except Exception as e:
+                    print(f"Failed to write analysis cache: {e}")
+
+        if key:
+            _FRAME_CACHE[key] = self._frames[name]
+            while len(_FRAME_CACHE) > FRAME_CACHE_MAX_ENTRIES:
+                _FRAME_CACHE.popitem(last=False)
+        return self._frames[name]
+
+    # --- Frames ---
+
+    @property
+    def results_frame(self) -> pd.DataFrame:
+        """The `process_results` DataFrame (scalar columns only when columnar)."""
+        if "results" not in self._frames:
+            if self.results is not None:
+                self._frames["results"] = process_results(self.results)
+            else:
+                self._frames["results"] = process_results_frame(
+                    load_results_frame(self.run_dir)
+                )
+        return self._frames["results"]
+
+    @property
+    def token_usage(self) -> pd.DataFrame:
+        """Per-generation token usage (see `get_token_usage_stats`)."""
+        return self._get_frame("token_usage", self._extract_traces)
+
+    @property
+    def tool_usage(self) -> pd.DataFrame:
+        """One row per (result row, tool used) with the case outcome."""
+        return self._get_frame("tool_usage", self._extract_traces)
+
+    def tool_success_stats(self, generator: Optional[str] = None) -> pd.DataFrame:
+        """
+        Calculates Success Rate and Lift for each tool used, optionally restricted to
+        one generator (lift is then relative to that generator's pass rate).
+        """
+        df = self.results_frame
+        if df.empty:
+            return pd.DataFrame()
+        usage = self.tool_usage
+        if generator is not None:
+            rows = df.index[df["answer_generator"] == generator]
+            usage = usage[usage["row"].isin(rows)]
+            df = df.loc[rows]
+        overall_pass_rate = (df["result"] == 1).mean() if len(df) else 0
+        return _tool_success_stats_from_usage(usage, overall_pass_rate)
+
+    def _extract_traces(self) -> Dict[str, pd.DataFrame]:
+        df = self.results_frame
+        rows = df.index.tolist()
+        successes = (df["result"] == 1).tolist() if not df.empty else []
+
+        if self.results is not None and not self._columnar:
+            events = [
+                row
+                for pos, r in enumerate(self.results)
+                for row in trace_event_rows(pos, r.id, r.answer_generator, r.trace_logs)
+            ]
+            return _trace_frames(
+                pd.DataFrame(events, columns=TRACE_EVENT_COLUMNS), rows, successes
+            )
 
-    tool_agg["success_rate"] = tool_agg["successes"] / tool_agg["times_used"]
+        offsets = load_results_frame(
+            self.run_dir, columns=["payload_offset", "payload_length"]
+        )
+        items = list(
+            zip(
+                range(len(df)),
+                offsets["payload_offset"].astype(int),
+                offsets["payload_length"].astype(int),
+                df["id"],
+                df["answer_generator"],
+            )
+        )
 
-    # Calculate Lift (Difference from overall pass rate)
-    overall_pass_rate = (
-        sum(1 for r in results if r.result == 1) / len(results) if results else 0
-    )
-    tool_agg["lift"] = tool_agg["success_rate"] - overall_pass_rate
+        # Group row positions by generator: each group is one unit of parallel work
+        groups: Dict[str, List[int]] = {}
+        for pos, generator in enumerate(df["answer_generator"]):
+            groups.setdefault(generator, []).append(pos)
+
+        run_dir = str(self.run_dir)
+        if len(items) >= PARALLEL_EXTRACTION_MIN_RESULTS and len(groups) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers or min(len(groups), os.cpu_count() or 1)
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        _extract_payload_traces,
+                        run_dir,
+                        [items[pos] for pos in positions],
+                    )
+                    for positions in groups.values()
+                ]
+                events = [row for future in futures for row in future.result()]
+        else:
+            events = _extract_payload_traces(run_dir, items)
 
-    return tool_agg.sort_values("times_used", ascending=False)
+        return _trace_frames(
+            pd.DataFrame(events, columns=TRACE_EVENT_COLUMNS), rows, successes
+        )
 
 
 def format_as_markdown(df: pd.DataFrame, index: bool = False) -> str:
@@ -1,14 +1,20 @@
 """Adk Answer Generator module."""
 
+import asyncio
+import enum
 import uuid
 import time
 import datetime
-from typing import Optional, Callable, Awaitable, List, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Callable, Awaitable, List, Dict, Any, Tuple
 import os
 
 from google.adk.agents import Agent
 from google.adk.apps import App
-from google.adk.runners import InMemoryRunner
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory import InMemoryMemoryService
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from benchmarks.answer_generators.llm_base import LlmAnswerGenerator
@@ -26,6 +32,7 @@ from benchmarks.data_models import (
     UsageMetadata,
     BenchmarkGenerationError,
 )
+from core.models import DeferredDetails
 from core.api_key_manager import ApiKeyManager, KeyType
 from benchmarks.answer_generators.adk_context import adk_execution_context
 
@@ -41,14 +48,48 @@ from google.adk.agents.base_agent import BaseAgent
 from google.adk.events.event import Event
 
 
+class TraceCaptureLevel(str, enum.Enum):
+    """How much of each ADK event the TraceCollectorPlugin keeps in `details`."""
+
+    MINIMAL = "minimal"  # Extracted fields only (text, tool name/input/output).
+    STANDARD = "standard"  # Plus event ids, usage metadata and finish/error info.
+    FULL = "full"  # The complete event dump, serialized when the trace is written.
+
+
+DEFAULT_TRACE_CAPTURE_LEVEL = TraceCaptureLevel(
+    os.environ.get("ADK_TRACE_CAPTURE_LEVEL", TraceCaptureLevel.STANDARD.value)
+)
+
+# Event fields kept at STANDARD level; a subset of the FULL dump with the same keys.
+STANDARD_EVENT_FIELDS = {
+    "id",
+    "invocation_id",
+    "usage_metadata",
+    "finish_reason",
+    "error_code",
+    "error_message",
+}
+
+
 class TraceCollectorPlugin(BasePlugin):
     """
     An ADK Plugin that collects trace events and usage metadata during an invocation.
+
+    Each ADK event is converted once, however many parts it has. Details are compact
+    at STANDARD level; at FULL level the original events are kept and only dumped
+    when the trace is serialized.
     """
 
-    def __init__(self, name: str = "trace_collector"):
+    def __init__(
+        self,
+        name: str = "trace_collector",
+        capture_level: TraceCaptureLevel = DEFAULT_TRACE_CAPTURE_LEVEL,
+    ):
         super().__init__(name=name)
+        self.capture_level = TraceCaptureLevel(capture_level)
         self.logs: List[TraceLogEvent] = []
+        # Original ADK events, kept only at FULL level for deferred serialization.
+        self.events: List[Event] = []
         self.total_prompt_tokens = 0
         self.total_completion_tokens = 0
         self.total_tokens = 0
@@ -104,9 +145,13 @@ class TraceCollectorPlugin(BasePlugin):
         timestamp = datetime.datetime.now().isoformat()
         agent_name = callback_context.agent_name
 
-        # 1. Capture System Instruction
+        # 1. Capture System Instruction (identical on every call; skipped at MINIMAL)
         prompt_parts = []
-        if llm_request.config and llm_request.config.system_instruction:
+        if (
+            self.capture_level != TraceCaptureLevel.MINIMAL
+            and llm_request.config
+            and llm_request.config.system_instruction
+        ):
             si = llm_request.config.system_instruction
             # TODO: Avoid hasattr and use proper interfaces if possible
             if hasattr(si, "parts"):
@@ -156,64 +201,81 @@ class TraceCollectorPlugin(BasePlugin):
             self._current_agent_completion_tokens += cpt
         return None
 
+    def _event_details(self, event: Event) -> Optional[Dict[str, Any]]:
+        if self.capture_level == TraceCaptureLevel.MINIMAL:
+            return None
+        return event.model_dump(
+            mode="json", include=STANDARD_EVENT_FIELDS, exclude_none=True
+        )
+
     async def on_event_callback(
         self, *, invocation_context: InvocationContext, event: Event
     ) -> Optional[Event]:
+        if not (event.content and event.content.parts):
+            return None
+
         timestamp = (
-            event.created_time.isoformat()
-            if hasattr(event, "created_time") and event.created_time
+            datetime.datetime.fromtimestamp(event.timestamp).isoformat()
+            if event.timestamp
             else datetime.datetime.now().isoformat()
         )
         author = event.author or "unknown"
-
-        if event.content and event.content.parts:
-            for part in event.content.parts:
-                if part.text:
-                    self.logs.append(
-                        TraceLogEvent(
-                            type=TraceEventType.MESSAGE,
-                            source="adk",
-                            timestamp=timestamp,
-                            role=event.content.role,
-                            author=author,
-                            content=part.text,
-                            details=event.model_dump(mode="json"),
-                        )
-                    )
-                if part.function_call:
-                    self.logs.append(
-                        TraceLogEvent(
-                            type=TraceEventType.TOOL_USE,
-                            source="adk",
-                            timestamp=timestamp,
-                            role="model",
-                            author=author,
-                            tool_name=part.function_call.name,
-                            tool_input=part.function_call.args,
-                            tool_call_id=part.function_call.id,
-                            details=event.model_dump(mode="json"),
-                        )
+        details = self._event_details(event)
+        first_log = len(self.logs)
+
+        for part in event.content.parts:
+            if part.text:
+                self.logs.append(
+                    TraceLogEvent(
+                        type=TraceEventType.MESSAGE,
+                        source="adk",
+                        timestamp=timestamp,
+                        role=event.content.role,
+                        author=author,
+                        content=part.text,
+                        details=details,
                     )
-                if part.function_response:
-                    resp = part.function_response.response
-                    tool_output_str = (
-                        str(resp.get("result", resp))
-                        if isinstance(resp, dict)
-                        else str(resp)
+                )
+            if part.function_call:
+                self.logs.append(
+                    TraceLogEvent(
+                        type=TraceEventType.TOOL_USE,
+                        source="adk",
+                        timestamp=timestamp,
+                        role="model",
+                        author=author,
+                        tool_name=part.function_call.name,
+                        tool_input=part.function_call.args,
+                        tool_call_id=part.function_call.id,
+                        details=details,
                     )
-                    self.logs.append(
-                        TraceLogEvent(
-                            type=TraceEventType.TOOL_RESULT,
-                            source="adk",
-                            timestamp=timestamp,
-                            role="tool",
-                            author=author,
-                            tool_name=part.function_response.name,
-                            tool_output=tool_output_str,
-                            tool_call_id=part.function_response.id,
-                            details=event.model_dump(mode="json"),
-                        )
+                )
+            if part.function_response:
+                resp = part.function_response.response
+                tool_output_str = (
+                    str(resp.get("result", resp))
+                    if isinstance(resp, dict)
+                    else str(resp)
+                )
+                self.logs.append(
+                    TraceLogEvent(
+                        type=TraceEventType.TOOL_RESULT,
+                        source="adk",
+                        timestamp=timestamp,
+                        role="tool",
+                        author=author,
+                        tool_name=part.function_response.name,
+                        tool_output=tool_output_str,
+                        tool_call_id=part.function_response.id,
+                        details=details,
                     )
+                )
+
+        if self.capture_level == TraceCaptureLevel.FULL:
+            self.events.append(event)
+            deferred = DeferredDetails(event)
+            for log in self.logs[first_log:]:
+                log.defer_details(deferred)
         return None
 
     def finalize(self):
@@ -229,6 +291,109 @@ class TraceCollectorPlugin(BasePlugin):
             )
 
 
+class SessionTraceRouter(BasePlugin):
+    """
+    Routes the callbacks of a shared runner to a TraceCollectorPlugin per session.
+
+    A pooled runner serves many concurrent cases; each case opens its own collector
+    for its session id, so traces never mix between cases.
+    """
+
+    def __init__(
+        self,
+        name: str = "trace_router",
+        capture_level: TraceCaptureLevel = DEFAULT_TRACE_CAPTURE_LEVEL,
+    ):
+        super().__init__(name=name)
+        self.capture_level = capture_level
+        self._collectors: Dict[str, TraceCollectorPlugin] = {}
+
+    def open_session(self, session_id: str) -> TraceCollectorPlugin:
+        collector = TraceCollectorPlugin(capture_level=self.capture_level)
+        self._collectors[session_id] = collector
+        return collector
+
+    def close_session(self, session_id: str) -> None:
+        self._collectors.pop(session_id, None)
+
+    @property
+    def active_sessions(self) -> int:
+        return len(self._collectors)
+
+    async def on_user_message_callback(
+        self, *, invocation_context: InvocationContext, user_message: types.Content
+    ) -> Optional[types.Content]:
+        collector = self._collectors.get(invocation_context.session.id)
+        if collector:
+            await collector.on_user_message_callback(
+                invocation_context=invocation_context, user_message=user_message
+            )
+        return None
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        collector = self._collectors.get(callback_context.session.id)
+        if collector:
+            await collector.before_agent_callback(
+                agent=agent, callback_context=callback_context
+            )
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        collector = self._collectors.get(callback_context.session.id)
+        if collector:
+            await collector.before_model_callback(
+                callback_context=callback_context, llm_request=llm_request
+            )
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        collector = self._collectors.get(callback_context.session.id)
+        if collector:
+            await collector.after_model_callback(
+                callback_context=callback_context, llm_response=llm_response
+            )
+        return None
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        collector = self._collectors.get(invocation_context.session.id)
+        if collector:
+            await collector.on_event_callback(
+                invocation_context=invocation_context, event=event
+            )
+        return None
+
+
+class CaseSessionService(InMemorySessionService):
+    """In-memory sessions that are dropped after every case.
+
+    The base service deep-copies the whole session (every event of the case) just to
+    check that it exists before deleting it; here deletion is a dict pop.
+    """
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+
+
+@dataclass
+class PooledRunner:
+    """A long-lived runner for one agent, shared by every case of a generator."""
+
+    app: App
+    runner: Runner
+    router: SessionTraceRouter
+    cases_run: int = 0
+
+
 class AdkAnswerGenerator(LlmAnswerGenerator):
     """
     An AnswerGenerator that uses an ADK Agent.
@@ -243,13 +408,19 @@ class AdkAnswerGenerator(LlmAnswerGenerator):
         teardown_hook: Optional[Callable[[], Awaitable[None]]] = None,
         api_key_manager: ApiKeyManager | None = None,
         model_name: str | None = None,
+        trace_capture_level: TraceCaptureLevel = DEFAULT_TRACE_CAPTURE_LEVEL,
     ):
         super().__init__(context=None)
         self.agent = agent
+        self.trace_capture_level = TraceCaptureLevel(trace_capture_level)
         self.api_key_manager = api_key_manager
         self.setup_hook = setup_hook
         self.teardown_hook = teardown_hook
 
+        # Runners keyed by (agent identity, event loop); built on first use and reused.
+        # The key holds the loop itself, so a new loop can never match a dead one's id.
+        self._runners: Dict[Tuple[int, asyncio.AbstractEventLoop], PooledRunner] = {}
+
         self._name = name or f"AdkBenchmarkGenerator_{uuid.uuid4().hex}"
         self.model_name = model_name or "Unknown"
         if self.model_name == "Unknown" and hasattr(agent, "model"):
@@ -308,10 +479,67 @@ class AdkAnswerGenerator(LlmAnswerGenerator):
             await self.setup_hook()
 
     async def teardown(self) -> None:
-        """Executes the optional teardown hook."""
+        """Closes pooled runners and executes the optional teardown hook."""
+        runners, self._runners = list(self._runners.values()), {}
+        for pooled in runners:
+            try:
+                await pooled.runner.close()
+            except Exception as e:
+                print(f"Warning: Failed to close runner {pooled.app.name}: {e}")
         if self.teardown_hook:
             await self.teardown_hook()
 
+    def _get_runner(self) -> PooledRunner:
+        """Returns the pooled runner for the current agent, creating it on first use."""
+        # Runners of closed loops hold toolsets bound to them; they can neither be
+        # reused nor closed from another loop, so they are only dropped.
+        for stale in [key for key in self._runners if key[1].is_closed()]:
+            del self._runners[stale]
+
+        key = (id(self.agent), asyncio.get_running_loop())
+        pooled = self._runners.get(key)
+        if pooled is not None and pooled.app.root_agent is self.agent:
+            return pooled
+
+        # TODO: Avoid hasattr and use proper interfaces if possible
+        if getattr(self.agent, "__module__", "").startswith("google.adk.agents"):
+            app_name = "agents"
+        else:
+            app_name = f"AdkBenchmarkApp_{getattr(self.agent, 'name', 'unnamed')}_{uuid.uuid4().hex}"
+
+        router = SessionTraceRouter(capture_level=self.trace_capture_level)
+        app = App(name=app_name, root_agent=self.agent, plugins=[router])
+        runner = Runner(
+            app=app,
+            session_service=CaseSessionService(),
+            artifact_service=InMemoryArtifactService(),
+            memory_service=InMemoryMemoryService(),
+        )
+        pooled = PooledRunner(app=app, runner=runner, router=router)
+        self._runners[key] = pooled
+        return pooled
+
+    @staticmethod
+    async def _release_session(pooled: PooledRunner, user_id: str, session_id: str):
+        """Drops everything the runner retained for a finished case."""
+        pooled.router.close_session(session_id)
+        runner = pooled.runner
+        try:
+            for filename in await runner.artifact_service.list_artifact_keys(
+                app_name=pooled.app.name, user_id=user_id, session_id=session_id
+            ):
+                await runner.artifact_service.delete_artifact(
+                    app_name=pooled.app.name,
+                    user_id=user_id,
+                    session_id=session_id,
+                    filename=filename,
+                )
+            await runner.session_service.delete_session(
+                app_name=pooled.app.name, user_id=user_id, session_id=session_id
+            )
+        except Exception as e:
+            print(f"Warning: Failed to release session {session_id}: {e}")
+
     async def generate_answer(
         self,
         benchmark_case: BaseBenchmarkCase,
@@ -418,26 +646,42 @@ class AdkAnswerGenerator(LlmAnswerGenerator):
         api_key_id: Optional[str] = None,
         benchmark_type: str = "unknown",
     ) -> tuple[str, list[TraceLogEvent], UsageMetadata, str]:
-        """Helper to run the agent using a fresh Runner and TraceCollectorPlugin."""
+        """Helper to run the agent on the pooled Runner with a per-session trace collector."""
 
-        # TODO: Avoid hasattr and use proper interfaces if possible
-        if getattr(self.agent, "__module__", "").startswith("google.adk.agents"):
-            app_name = "agents"
-        else:
-            app_name = f"AdkBenchmarkApp_{getattr(self.agent, 'name', 'unnamed')}_{uuid.uuid4().hex}"
-
-        collector = TraceCollectorPlugin()
-        app = App(name=app_name, root_agent=self.agent, plugins=[collector])
-        runner = InMemoryRunner(app=app)
+        pooled = self._get_runner()
+        runner = pooled.runner
+        pooled.cases_run += 1
 
         session_id = f"benchmark_session_{uuid.uuid4()}"
-        session = await runner.session_service.create_session(
-            app_name=app.name,
-            user_id="benchmark_user",
-            session_id=session_id,
-            state={"benchmark_type": benchmark_type},
-        )
+        collector = pooled.router.open_session(session_id)
+        try:
+            session = await runner.session_service.create_session(
+                app_name=pooled.app.name,
+                user_id="benchmark_user",
+                session_id=session_id,
+                state={"benchmark_type": benchmark_type},
+            )
+        except BaseException:
+            pooled.router.close_session(session_id)
+            raise
 
+        try:
+            return await self._run_session(
+                runner, session, collector, prompt, api_key_id, benchmark_type
+            )
+        finally:
+            await self._release_session(pooled, session.user_id, session_id)
+
+    async def _run_session(
+        self,
+        runner: Runner,
+        session: Any,
+        collector: TraceCollectorPlugin,
+        prompt: str,
+        api_key_id: Optional[str],
+        benchmark_type: str,
+    ) -> tuple[str, list[TraceLogEvent], UsageMetadata, str]:
+        session_id = session.id
         collector.logs.append(
             TraceLogEvent(
                 type=TraceEventType.MESSAGE,
@@ -565,4 +809,4 @@ class AdkAnswerGenerator(LlmAnswerGenerator):
                     token_str = f" [Tokens: {item.get('prompt_tokens', 0)}P + {item.get('completion_tokens', 0)}C]"
                 print(f"{item['agent']}: {item['duration']:.2f}s{token_str}")
 
-        print("-------------------------------------------\n")
\ No newline at end of file
+        print("-------------------------------------------\n")
@@ -25,10 +25,18 @@ import json
 import asyncio
 import functools
 import ast
+import re
 import sys
 from benchmarks.generator.benchmark_generator.models import TargetEntity
 from tools.knowledge.target_ranker.models import RankedTarget
+from tools.knowledge.cooccurrence_graph import load_cooccurrence_graph
 from core.config import RANKED_TARGETS_FILE
+from benchmarks.answer_generators.agent_runner_pool import (
+    AgentRunnerUnavailable,
+    get_agent_runner_pool,
+)
+from benchmarks.answer_generators.code_search import get_code_search_index
+from benchmarks.answer_generators.shell_session_pool import get_shell_session_pool
 
 # Try to import yaml
 try:
@@ -43,6 +51,11 @@ try:
 except ImportError:
     HAS_SEARCH_PROVIDER = False
 
+try:
+    from adk_knowledge_ext.navigation import Navigation, load_navigation
+except ImportError:
+    Navigation = load_navigation = None
+
 
 class AdkTools:
 
@@ -50,9 +63,11 @@ class AdkTools:
         self.workspace_root = workspace_root
         self.venv_path = venv_path
         self._stats_index = None
-        self._coocc_index = None
+        self._coocc_graph = None
         self._search_provider = None
         self._ranked_targets_path = None
+        self._navigation = None
+        self._code_index = get_code_search_index(workspace_root)
         self._load_stats_index()
         self._load_coocc_index()
         self._init_search_provider()
@@ -93,12 +108,8 @@ class AdkTools:
             return
             
         coocc_path = RANKED_TARGETS_FILE.parent / "adk_cooccurrence.yaml"
-        if coocc_path.exists() and yaml:
-            try:
-                with open(coocc_path, "r", encoding="utf-8") as f:
-                    self._coocc_index = yaml.safe_load(f)
-            except Exception:
-                pass
+        # Compiled once per file and shared by all AdkTools instances.
+        self._coocc_graph = load_cooccurrence_graph(coocc_path)
 
     def _resolve_path(self, path_str: str) -> Path:
         """Resolves a path relative to the workspace root and ensures it's safe."""
@@ -187,6 +198,7 @@ class AdkTools:
             new_content = content.replace(old_string, new_string)
             with open(full_path, "w", encoding="utf-8") as f:
                 f.write(new_content)
+            self._code_index.mark_dirty()
             return f"Successfully replaced {count} occurrence(s) in {file_path}."
         except Exception as e:
             return f"Error replacing text: {e}"
@@ -198,6 +210,7 @@ class AdkTools:
             full_path.parent.mkdir(parents=True, exist_ok=True)
             with open(full_path, "w", encoding="utf-8") as f:
                 f.write(content)
+            self._code_index.mark_dirty()
             return f"Successfully wrote to {file_path}"
         except Exception as e:
             return f"Error writing file: {e}"
@@ -265,7 +278,10 @@ class AdkTools:
     ) -> str:
         """
         Executes a shell command in the workspace asynchronously.
-        
+
+        Commands run in a persistent shell session from the shared shell session
+        pool when it is enabled, and in a new `sh -c` process otherwise.
+
         Args:
             command: The command to run.
             dir_path: Optional working directory.
@@ -274,13 +290,7 @@ class AdkTools:
         """
         try:
             # kwargs like 'description' are ignored by the actual execution but allow the model to provide context.
-            env = os.environ.copy()
-            if self.venv_path:
-                venv_bin = self.venv_path / "bin"
-                env["PATH"] = f"{venv_bin}:{env.get('PATH', '')}"
-                env.pop("PYTHONHOME", None)
-            if extra_env:
-                env.update(extra_env)
+            env = self._command_env(extra_env)
             cwd = self._resolve_path(dir_path) if dir_path else self.workspace_root
             if not cwd.exists():
                 return f"Error: Directory not found at {cwd}"
@@ -288,6 +298,21 @@ class AdkTools:
             # If command is a string, use shell=True. If list, use shell=False.
             is_shell = isinstance(command, str)
 
+            pool = get_shell_session_pool()
+            if pool is not None:
+                shell_command = command if is_shell else shlex.join(command)
+                result = await pool.run(self.workspace_root, shell_command, cwd, env)
+                # The command may have changed files.
+                self._code_index.mark_dirty()
+                if result.timed_out:
+                    raise subprocess.TimeoutExpired(command, 60)
+                stderr = result.stderr
+                if result.truncated:
+                    stderr += "\n[Output truncated]"
+                return self._format_command_result(
+                    command, dir_path, result.stdout, stderr, result.returncode
+                )
+
             loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
                 None,
@@ -302,58 +327,133 @@ class AdkTools:
                     env=env,
                 ),
             )
+            # The command may have changed files.
+            self._code_index.mark_dirty()
 
-            cmd_str = command if isinstance(command, str) else " ".join(command)
-            output_parts = [
-                f"Command: {cmd_str}",
-                f"Directory: {dir_path or '(root)'}",
-                f"Stdout: {result.stdout.strip() or '(empty)'}",
-                f"Stderr: {result.stderr.strip() or '(empty)'}",
-                f"Exit Code: {result.returncode}",
-            ]
-            return "\n".join(output_parts)
+            return self._format_command_result(
+                command, dir_path, result.stdout, result.stderr, result.returncode
+            )
         except Exception as e:
             return f"Error running command: {e}"
 
+    def _command_env(self, extra_env: Optional[Any] = None) -> Dict[str, str]:
+        """The environment for workspace commands: ours, with the venv first on PATH."""
+        env = os.environ.copy()
+        if self.venv_path:
+            venv_bin = self.venv_path / "bin"
+            env["PATH"] = f"{venv_bin}:{env.get('PATH', '')}"
+            env.pop("PYTHONHOME", None)
+        if extra_env:
+            env.update(extra_env)
+        return env
+
+    @staticmethod
+    def _format_command_result(
+        command: str | List[str],
+        dir_path: Optional[str],
+        stdout: str,
+        stderr: str,
+        returncode: int,
+    ) -> str:
+        cmd_str = command if isinstance(command, str) else " ".join(command)
+        output_parts = [
+            f"Command: {cmd_str}",
+            f"Directory: {dir_path or '(root)'}",
+            f"Stdout: {stdout.strip() or '(empty)'}",
+            f"Stderr: {stderr.strip() or '(empty)'}",
+            f"Exit Code: {returncode}",
+        ]
+        return "\n".join(output_parts)
+
     async def search_files(self, pattern: str, path: str) -> str:
-        """Searches for files matching a specific pattern using `grep -r`."""
+        """
+        Searches for files matching a specific pattern with `grep -r` semantics.
+
+        Queries are answered from the shared in-process code search index of the
+        workspace; patterns it cannot translate, and paths outside the workspace,
+        go to `grep` itself.
+        """
         safe_pattern = pattern.replace("'", "'\\''")
         # Exclude common noise directories
         exclude_args = "--exclude-dir=venv --exclude-dir=env --exclude-dir=.git --exclude-dir=__pycache__ --exclude-dir=node_modules"
         cmd = f"grep -r {exclude_args} '{safe_pattern}' '{path}' | head -n 20 | cut -c 1-500"
-        return await self.run_shell_command(cmd)
+        try:
+            stdout = await asyncio.to_thread(self._indexed_search, pattern, path)
+        except (ValueError, re.error):
+            return await self.run_shell_command(cmd)
+        if stdout is None:
+            stderr = f"grep: {path}: No such file or directory"
+            return self._format_command_result(cmd, None, "", stderr, 0)
+        return self._format_command_result(cmd, None, stdout, "", 0)
+
+    def _indexed_search(self, pattern: str, path: str) -> Optional[str]:
+        """Formats index matches under `path` as `grep -r` prints them; None if missing."""
+        full_path = self._resolve_path(path)
+        if not full_path.exists():
+            return None
+        root = self._code_index.root
+        if not full_path.is_relative_to(root):
+            raise ValueError(f"{full_path} is outside the indexed root {root}")
+        scope = full_path.relative_to(root).as_posix()
+        scope = "" if scope == "." else scope
+        result = self._code_index.search(pattern, scope)
+        lines = []
+        for rel_path, line in result.lines:
+            if full_path.is_file():
+                lines.append(line)
+                continue
+            inner = rel_path[len(scope) + 1 :] if scope else rel_path
+            prefix = path if path.endswith("/") else f"{path}/"
+            lines.append(f"{prefix}{inner}:{line}"[:500])
+        return "\n".join(lines)
+
+    def get_api_associations(
+        self, entity_name: str, threshold: float = 0.1, hops: int = 1
+    ) -> str:
+        """
+        Returns modules/classes statistically likely to be used with the given entity.
 
-    def get_api_associations(self, entity_name: str, threshold: float = 0.1) -> str:
-        """Returns modules/classes statistically likely to be used with the given entity."""
-        if not self._coocc_index:
+        Args:
+            entity_name: The fully qualified name of a module or class.
+            threshold: Minimum conditional probability of an association.
+            hops: With more than 1, also lists entities associated indirectly (through
+                up to `hops` associations), with the probability of the best chain.
+        """
+        if self._coocc_graph is None:
             return "Error: Co-occurrence index not loaded."
 
-        associations = self._coocc_index.get("associations", [])
         # Find associations where 'context' is the entity
-        related = [
-            a
-            for a in associations
-            if a["context"] == entity_name and a["probability"] >= threshold
-        ]
+        related = self._coocc_graph.neighbors(entity_name, threshold, limit=10)
 
         if not related:
             # Try fuzzy match (prefix)
-            related = [
-                a
-                for a in associations
-                if entity_name.startswith(a["context"])
-                and a["probability"] >= threshold
-            ]
+            related = self._coocc_graph.prefix_neighbors(
+                entity_name, threshold, limit=10
+            )
 
         if not related:
             return f"No associations found for '{entity_name}' above threshold {threshold}."
 
         output = [f"# Statistical Associations for: {entity_name}"]
-        for a in related[:10]:
+        for a in related:
             output.append(
-                f"- {a['target']} (Prob: {a['probability']:.2f}, Support: {a['support']})"
+                f"- {a.target} (Prob: {a.probability:.2f}, Support: {a.support})"
             )
 
+        if hops > 1:
+            direct = {a.target for a in related}
+            indirect = [
+                x
+                for x in self._coocc_graph.expand(entity_name, hops, threshold)
+                if x.hops > 1 and x.target not in direct
+            ]
+            if indirect:
+                output.append("\n## Indirect Associations")
+                for x in indirect[:10]:
+                    output.append(
+                        f"- {x.target} (Prob: {x.probability:.2f}, via {x.via})"
+                    )
+
         return "\n".join(output)
 
     async def get_module_help(self, module_name: str, depth: int = 0) -> str:
@@ -440,15 +540,42 @@ class AdkTools:
         except Exception:
             return []
 
+    def _ranked_targets_navigation(self):
+        """
+        Reverse indices of ranked_targets.yaml: the ranker's sidecar, shared by all
+        AdkTools instances, or else built once from the loaded targets. None if
+        adk_knowledge_ext is not installed.
+        """
+        if Navigation is None:
+            return None
+        if RANKED_TARGETS_FILE:
+            navigation = load_navigation(RANKED_TARGETS_FILE)
+            if navigation is not None:
+                return navigation
+        if self._navigation is None:
+            targets = self._load_ranked_targets()
+            self._navigation = Navigation.from_items(
+                [t.model_dump(exclude_none=True) for t in targets]
+            )
+        return self._navigation
+
     def inspect_ranked_target(self, fqn: str) -> str:
         """
         Inspects a target using the offline ranked_targets.yaml index.
         """
-        data = self._load_ranked_targets()
-        if not data:
-            return "Error: ranked_targets.yaml not found or empty."
+        navigation = self._ranked_targets_navigation()
+        if navigation is not None:
+            if not len(navigation):
+                return "Error: ranked_targets.yaml not found or empty."
+            index = navigation.find(fqn)
+            # Only this target's entry is parsed.
+            target = RankedTarget(**navigation.entry(index)) if index is not None else None
+        else:
+            data = self._load_ranked_targets()
+            if not data:
+                return "Error: ranked_targets.yaml not found or empty."
 
-        target = next((item for item in data if item.id == fqn), None)
+            target = next((item for item in data if item.id == fqn), None)
         if not target:
             return f"Target '{fqn}' not found in ranked index."
 
@@ -500,7 +627,8 @@ class AdkTools:
             if not yaml:
                 return "Error: PyYAML not installed."
 
-            data = self._load_ranked_targets()
+            navigation = self._ranked_targets_navigation()
+            data = navigation if navigation is not None else self._load_ranked_targets()
             if not data:
                 return "Error: ranked_targets.yaml not found or empty."
 
@@ -516,18 +644,25 @@ class AdkTools:
             if start_idx >= total_items:
                 return f"Page {page} is out of range. Total items: {total_items} (max page {max_page})."
 
-            page_items = data[start_idx:end_idx]
+            if navigation is not None:
+                # Precomputed rows; no target is parsed to list a page.
+                page_items = [
+                    (row.id, row.rank, row.summary)
+                    for row in navigation.page(page, page_size)
+                ]
+            else:
+                page_items = [
+                    (item.id, item.rank, item.docstring.split("\n")[0].strip() if item.docstring else None)
+                    for item in data[start_idx:end_idx]
+                ]
 
             lines = [f"--- Ranked Targets (Page {page} of {max_page}) ---"]
             lines.append(
                 f"Showing items {start_idx + 1} to {min(end_idx, total_items)} of {total_items}"
             )
 
-            for item in page_items:
-                fqn = item.id
-                rank = item.rank
-                doc = item.docstring or "No description."
-                doc_summary = doc.split("\n")[0].strip()
+            for fqn, rank, summary in page_items:
+                doc_summary = "No description." if summary is None else summary
                 if len(doc_summary) > 80:
                     doc_summary = doc_summary[:77] + "..."
                 lines.append(f"[{rank}] {fqn}: {doc_summary}")
@@ -677,6 +812,35 @@ class AdkTools:
     async def read_full_execution_logs(self) -> str:
         return self.read_file("_last_run.log", limit=-1)
 
+    async def _run_agent_runner(
+        self, cmd: List[str], extra_env: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Runs the agent runner command on a warm worker (ADK already imported), with
+        the same output as `run_shell_command(cmd)`. Falls back to a fresh
+        subprocess when no worker is available.
+        """
+        env = self._command_env(extra_env)
+        pool = get_agent_runner_pool(env.get("PATH", ""))
+        if pool is not None:
+            try:
+                result = await pool.run(cmd[2:], cwd=self.workspace_root, env=env)
+            except AgentRunnerUnavailable as e:
+                print(f"Agent runner pool unavailable, using a subprocess: {e}")
+            else:
+                self._code_index.mark_dirty()
+                if result.timed_out:
+                    return f"Error running command: Command '{cmd}' timed out after 60 seconds"
+                stderr = result.stderr
+                if result.truncated:
+                    stderr += "\n[Output truncated]"
+                return self._format_command_result(
+                    cmd, None, result.stdout, stderr, result.returncode
+                )
+
+        # run_shell_command ensures virtualenv pathing is correct and captures result parts.
+        return await self.run_shell_command(cmd, extra_env=extra_env)
+
     async def run_adk_agent(
         self,
         prompt: str,
@@ -692,7 +856,8 @@ class AdkTools:
         Methodology:
         1. Validates input (must provide either agent_code or an agent_file path).
         2. If agent_code is provided, writes it to a temporary file in the workspace.
-        3. Invokes the standalone `benchmarks/answer_generators/support_scripts/adk_agent_runner.py` script.
+        3. Invokes the standalone `benchmarks/answer_generators/support_scripts/adk_agent_runner.py` script,
+           on a warm worker process from the agent runner pool when available.
         4. The runner utility dynamically imports the agent, sets up an `InMemoryRunner`,
            and executes the provided prompt.
         5. It captures all stdout/stderr from the agent's execution for forensic debugging.
@@ -747,9 +912,7 @@ class AdkTools:
         if initial_state:
             cmd.extend(["--initial-state", initial_state])
 
-        # Run the command. The run_shell_command method ensures virtualenv
-        # pathing is correct and captures result parts.
-        output = await self.run_shell_command(
+        output = await self._run_agent_runner(
             cmd, extra_env={"GEMINI_API_KEY": api_key} if api_key else None
         )
 
@@ -0,0 +1,197 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Warm worker processes for running candidate ADK agents.
+
+Each worker is `support_scripts/adk_agent_runner.py --serve` started with the
+workspace's Python: it imports ADK once and then runs every request in a forked
+child (own session, module namespace, stdio files and TMPDIR), killing the child's
+process group on timeout and capping its output. Workers are owned one per thread
+of a dedicated executor, so a pool never runs more than `size` agents at once and
+never blocks the default executor.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RUNNER_SCRIPT = (
+    Path(__file__).resolve().parent / "support_scripts" / "adk_agent_runner.py"
+)
+
+AGENT_RUNNER_POOL_SIZE = int(os.environ.get("ADK_AGENT_RUNNER_POOL_SIZE", 4))
+AGENT_RUNNER_MAX_OUTPUT_BYTES = int(
+    os.environ.get("ADK_AGENT_RUNNER_MAX_OUTPUT_BYTES", 4 * 1024 * 1024)
+)
+
+_POOLS: Dict[Tuple[str, str], "AgentRunnerPool"] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class AgentRunnerUnavailable(RuntimeError):
+    """The warm worker could not be started or died; callers fall back to a subprocess."""
+
+
+@dataclass
+class AgentRunResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False
+
+
+class _Worker:
+    """One `--serve` process; used by a single executor thread at a time."""
+
+    def __init__(self, python: str, env: Dict[str, str]):
+        self.proc = subprocess.Popen(
+            [python, str(RUNNER_SCRIPT), "--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            text=True,
+        )
+        ready = self.proc.stdout.readline()
+        if not ready:
+            self.close()
+            raise AgentRunnerUnavailable(
+                "ADK agent runner worker exited during startup."
+            )
+
+    def call(self, request: dict) -> dict:
+        try:
+            self.proc.stdin.write(json.dumps(request) + "\n")
+            self.proc.stdin.flush()
+            line = self.proc.stdout.readline()
+        except (BrokenPipeError, OSError) as e:
+            raise AgentRunnerUnavailable(f"ADK agent runner worker failed: {e}")
+        if not line:
+            raise AgentRunnerUnavailable("ADK agent runner worker exited.")
+        response = json.loads(line)
+        if "error" in response:
+            raise AgentRunnerUnavailable(response["error"])
+        return response
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class AgentRunnerPool:
+    """A bounded pool of warm ADK agent runner workers for one Python environment."""
+
+    def __init__(self, python: str, size: int = AGENT_RUNNER_POOL_SIZE):
+        self.python = python
+        self.size = max(1, size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="adk-agent-runner"
+        )
+        self._local = threading.local()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.worker_starts = 0
+
+    def _run_blocking(
+        self, request: dict, worker_env: Dict[str, str]
+    ) -> AgentRunResult:
+        worker = getattr(self._local, "worker", None)
+        if worker is None or worker.proc.poll() is not None:
+            worker = _Worker(self.python, worker_env)
+            self._local.worker = worker
+            with self._lock:
+                self._workers.append(worker)
+                self.worker_starts += 1
+        try:
+            response = worker.call(request)
+        except AgentRunnerUnavailable:
+            self._discard(worker)
+            raise
+        with self._lock:
+            self.runs += 1
+        return AgentRunResult(**response)
+
+    def _discard(self, worker: _Worker):
+        self._local.worker = None
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.close()
+
+    async def run(
+        self,
+        args: List[str],
+        cwd: Path,
+        env: Dict[str, str],
+        timeout: float = 60,
+        max_output_bytes: int = AGENT_RUNNER_MAX_OUTPUT_BYTES,
+    ) -> AgentRunResult:
+        """Runs `adk_agent_runner.py <args>` in a forked child of a warm worker.
+
+        `env` is the complete environment of the run, as it would be passed to a
+        subprocess; a worker started for it is reused for later runs.
+        """
+        request = {
+            "args": args,
+            "cwd": str(cwd),
+            "env": env,
+            "timeout": timeout,
+            "max_output_bytes": max_output_bytes,
+        }
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self._run_blocking, request, env
+        )
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+        self._executor.shutdown(wait=False)
+
+
+def get_agent_runner_pool(path_env: str) -> Optional[AgentRunnerPool]:
+    """Returns the shared pool for the `python3` found on `path_env`, if pooling is usable."""
+    if AGENT_RUNNER_POOL_SIZE <= 0 or not hasattr(os, "fork"):
+        return None
+    python = shutil.which("python3", path=path_env)
+    if not python:
+        return None
+    key = (python, path_env)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = AgentRunnerPool(python)
+        return pool
+
+
+@atexit.register
+def _close_pools():
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,457 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process, trigram-indexed code search with `grep -r` semantics.
+
+A workspace is indexed once per process and shared by every AdkTools instance on it.
+Queries are GNU basic regular expressions (what `grep` takes by default): literal
+runs the pattern requires are split into trigrams, the trigram postings narrow the
+candidate files, and the translated regex confirms matches line by line.
+
+The index is refreshed incrementally (by size and mtime) before a query once it
+has been marked dirty by a tool that may have changed files, or has gone stale.
+"""
+
+import os
+import re
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+EXCLUDED_DIRS = {"venv", "env", ".git", "__pycache__", "node_modules"}
+
+# Files larger than this are not indexed; they are scanned on every query instead.
+MAX_INDEXED_FILE_BYTES = 4 * 1024 * 1024
+# Refresh even without a dirty mark after this many seconds.
+MAX_STALENESS_SECONDS = 10.0
+# Rebuild postings once this fraction of indexed file versions is obsolete.
+COMPACT_RATIO = 0.5
+
+_POSIX_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "!-~",
+    "lower": "a-z",
+    "print": " -~",
+    "punct": "!-/:-@\\[-`{-~",
+    "space": " \\t\\n\\r\\f\\v",
+    "upper": "A-Z",
+    "xdigit": "0-9A-Fa-f",
+}
+
+
+def _translate_bracket(pattern: str, i: int) -> Tuple[str, int]:
+    """Translates the bracket expression starting at pattern[i] == '['."""
+    j = i + 1
+    out = "["
+    if j < len(pattern) and pattern[j] == "^":
+        out += "^"
+        j += 1
+    first = True
+    while j < len(pattern):
+        c = pattern[j]
+        if c == "]" and not first:
+            return out + "]", j + 1
+        if pattern.startswith("[:", j):
+            end = pattern.find(":]", j + 2)
+            if end != -1 and pattern[j + 2 : end] in _POSIX_CLASSES:
+                out += _POSIX_CLASSES[pattern[j + 2 : end]]
+                j = end + 2
+                first = False
+                continue
+        out += "\\" + c if c in "\\[]" else c
+        j += 1
+        first = False
+    raise re.error("Unmatched [ in pattern")
+
+
+def translate_bre(pattern: str) -> Tuple[str, List[List[str]]]:
+    """
+    Translates a GNU basic regular expression into Python `re` syntax.
+
+    Returns:
+        (python_regex, for each top-level alternative the literal runs every match
+        of that alternative must contain).
+    """
+    out: List[str] = []
+    branches: List[List[str]] = [[]]
+    run = ""
+    depth = 0
+    # Whether the previous token can be repeated (a `*` after it is an operator).
+    can_repeat = False
+    last_literal: Optional[str] = None  # char most recently added to `run`
+
+    def end_run():
+        nonlocal run, last_literal
+        if run:
+            branches[-1].append(run)
+        run = ""
+        last_literal = None
+
+    def make_optional():
+        """The previous atom may be absent: it no longer counts as required."""
+        nonlocal run
+        if last_literal is not None:
+            run = run[:-1]
+        end_run()
+
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "\\" and i + 1 < n:
+            e = pattern[i + 1]
+            i += 2
+            if e == "(":
+                end_run()
+                depth += 1
+                out.append("(")
+                can_repeat = False
+            elif e == ")":
+                depth -= 1
+                out.append(")")
+                can_repeat = True
+            elif e == "|":
+                end_run()
+                if depth == 0:
+                    branches.append([])
+                out.append("|")
+                can_repeat = False
+            elif e in "?+":
+                if can_repeat:
+                    if e == "?":
+                        make_optional()
+                    else:
+                        end_run()
+                    out.append(e)
+                else:
+                    out.append(re.escape(e))
+                    can_repeat = True
+            elif e == "{":
+                end = pattern.find("\\}", i)
+                if not can_repeat or end == -1:
+                    raise re.error("Invalid interval in pattern")
+                bounds = pattern[i:end]
+                if bounds.split(",")[0] in ("", "0"):
+                    make_optional()
+                else:
+                    end_run()
+                out.append("{" + bounds + "}")
+                i = end + 2
+            elif e in "<>":
+                end_run()
+                out.append("\\b")
+                can_repeat = False
+            elif e in "wWsSbB":
+                end_run()
+                out.append("\\" + e)
+                can_repeat = e in "wWsS"
+            elif e.isdigit():
+                end_run()
+                out.append("\\" + e)
+                can_repeat = True
+            else:
+                # Any other escaped character stands for itself.
+                out.append(re.escape(e))
+                if depth == 0:
+                    run += e
+                    last_literal = e
+                can_repeat = True
+            continue
+
+        i += 1
+        if c == "*" and can_repeat:
+            make_optional()
+            out.append("*")
+        elif c == "^" and (not out or out[-1] in ("(", "|")):
+            out.append("^")
+            can_repeat = False
+        elif c == "$" and (
+            i == n or pattern.startswith("\\)", i) or pattern.startswith("\\|", i)
+        ):
+            end_run()
+            out.append("$")
+        elif c == ".":
+            end_run()
+            out.append(".")
+            can_repeat = True
+        elif c == "[":
+            end_run()
+            bracket, i = _translate_bracket(pattern, i - 1)
+            out.append(bracket)
+            can_repeat = True
+        else:
+            out.append(re.escape(c))
+            if depth == 0:
+                run += c
+                last_literal = c
+            can_repeat = True
+    end_run()
+    return "".join(out), branches
+
+
+def _trigrams(text: str) -> Set[Tuple[str, str, str]]:
+    """Trigrams within lines of `text`; matches never span lines, so neither do keys."""
+    text = "\n".join(set(text.splitlines()))
+    return set(zip(text, text[1:], text[2:]))
+
+
+@dataclass
+class _IndexedFile:
+    rel_path: str
+    size: int
+    mtime_ns: int
+    content: Optional[str]  # None for files too large to index
+    file_id: int = -1
+
+
+@dataclass
+class SearchResult:
+    lines: List[Tuple[str, str]] = field(default_factory=list)  # (rel_path, line)
+    candidates: int = 0
+    truncated: bool = False
+
+
+class CodeSearchIndex:
+    """Trigram index of one directory tree. Thread-safe; see `get_code_search_index`."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self._lock = threading.Lock()
+        self._files: Dict[str, _IndexedFile] = {}
+        # Postings map trigram -> file ids; ids of replaced file versions go stale.
+        self._postings: Dict[Tuple[str, str, str], array] = {}
+        self._live: Dict[int, _IndexedFile] = {}
+        self._next_id = 0
+        self._built = False
+        self._dirty = True
+        self._refreshed_at = 0.0
+        self.stats = {"builds": 0, "refreshes": 0, "files_reindexed": 0}
+
+    def mark_dirty(self):
+        """Notes that files may have changed; the next query rescans them."""
+        self._dirty = True
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        found: Dict[str, os.stat_result] = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        rel = os.path.relpath(entry.path, self.root)
+                        found[rel.replace(os.sep, "/")] = entry.stat()
+                except OSError:
+                    continue
+        return found
+
+    def _load(self, rel_path: str, st: os.stat_result) -> Optional[_IndexedFile]:
+        if st.st_size > MAX_INDEXED_FILE_BYTES:
+            return _IndexedFile(rel_path, st.st_size, st.st_mtime_ns, None)
+        try:
+            with open(self.root / rel_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if b"\0" in data[:8192]:
+            return None  # Binary; grep would only report "binary file matches".
+        return _IndexedFile(
+            rel_path,
+            st.st_size,
+            st.st_mtime_ns,
+            data.decode("utf-8", errors="replace"),
+        )
+
+    def _add(self, indexed: _IndexedFile):
+        self._files[indexed.rel_path] = indexed
+        if indexed.content is None:
+            return
+        indexed.file_id = self._next_id
+        self._next_id += 1
+        self._live[indexed.file_id] = indexed
+        for trigram in _trigrams(indexed.content):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                posting = self._postings[trigram] = array("I")
+            posting.append(indexed.file_id)
+
+    def _remove(self, rel_path: str):
+        old = self._files.pop(rel_path, None)
+        if old is not None and old.file_id >= 0:
+            self._live.pop(old.file_id, None)
+
+    def _compact(self):
+        files = list(self._files.values())
+        self._files, self._postings, self._live, self._next_id = {}, {}, {}, 0
+        for indexed in files:
+            self._add(indexed)
+
+    def refresh(self, force: bool = False):
+        """Re-indexes added, changed and removed files (by size and mtime)."""
+        with self._lock:
+            stale = time.monotonic() - self._refreshed_at > MAX_STALENESS_SECONDS
+            if self._built and not (force or self._dirty or stale):
+                return
+            self._dirty = False
+            on_disk = self._walk()
+            for rel_path in list(self._files):
+                if rel_path not in on_disk:
+                    self._remove(rel_path)
+            for rel_path, st in on_disk.items():
+                current = self._files.get(rel_path)
+                if (
+                    current is not None
+                    and current.size == st.st_size
+                    and current.mtime_ns == st.st_mtime_ns
+                ):
+                    continue
+                self._remove(rel_path)
+                indexed = self._load(rel_path, st)
+                if indexed is not None:
+                    self._add(indexed)
+                    self.stats["files_reindexed"] += 1
+            if self._next_id and len(self._live) < self._next_id * COMPACT_RATIO:
+                self._compact()
+            self.stats["refreshes" if self._built else "builds"] += 1
+            self._built = True
+            self._refreshed_at = time.monotonic()
+
+    def _candidates(self, branches: List[List[str]]) -> Optional[Set[int]]:
+        """File ids that may match some alternative; None when nothing narrows."""
+        result: Set[int] = set()
+        for runs in branches:
+            ids = self._branch_candidates(runs)
+            if ids is None:
+                return None
+            result |= ids
+        return result
+
+    def _branch_candidates(self, runs: List[str]) -> Optional[Set[int]]:
+        """File ids containing every trigram of `runs`; None when there are none."""
+        trigrams = set()
+        for run in runs:
+            trigrams |= _trigrams(run)
+        if not trigrams:
+            return None
+        postings = []
+        for trigram in trigrams:
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def search(
+        self,
+        pattern: str,
+        rel_scope: str = "",
+        max_lines: int = 20,
+        max_line_chars: int = 500,
+    ) -> SearchResult:
+        """
+        Searches files under `rel_scope` (a path relative to the root; "" for all).
+
+        Raises:
+            re.error: If the pattern is not a valid basic regular expression.
+        """
+        python_regex, branches = translate_bre(pattern)
+        regex = re.compile(python_regex, re.MULTILINE)
+        self.refresh()
+
+        scope = rel_scope.strip("/")
+        with self._lock:
+            ids = self._candidates(branches)
+            if ids is None:
+                files = list(self._files.values())
+            else:
+                files = [self._live[i] for i in ids if i in self._live]
+                files += [f for f in self._files.values() if f.content is None]
+
+        files = [
+            f
+            for f in files
+            if not scope or f.rel_path == scope or f.rel_path.startswith(scope + "/")
+        ]
+        files.sort(key=lambda f: f.rel_path)
+
+        anchor = max(branches[0], key=len, default="") if len(branches) == 1 else ""
+        result = SearchResult(candidates=len(files))
+        for indexed in files:
+            content = indexed.content
+            if content is None:
+                try:
+                    content = (self.root / indexed.rel_path).read_text(
+                        encoding="utf-8", errors="replace"
+                    )
+                except OSError:
+                    continue
+            # Jump from each hit (of the longest required literal when there is one,
+            # which `str.find` locates much faster than the regex) to its line, and
+            # confirm the match within the line.
+            pos = 0
+            while True:
+                if anchor:
+                    hit = content.find(anchor, pos)
+                else:
+                    match = regex.search(content, pos)
+                    hit = -1 if match is None else match.start()
+                if hit == -1:
+                    break
+                start = content.rfind("\n", 0, hit) + 1
+                end = content.find("\n", start)
+                end = len(content) if end == -1 else end
+                line = content[start:end]
+                if regex.search(line):
+                    if len(result.lines) == max_lines:
+                        result.truncated = True
+                        return result
+                    result.lines.append((indexed.rel_path, line[:max_line_chars]))
+                pos = end + 1
+                if pos > len(content):
+                    break
+        return result
+
+
+_INDEXES: Dict[Path, CodeSearchIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_code_search_index(root: Path) -> CodeSearchIndex:
+    """Returns the process-wide index for `root`, creating it on first use."""
+    root = Path(root).resolve()
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(root)
+        if index is None:
+            index = _INDEXES[root] = CodeSearchIndex(root)
+        return index
@@ -1,51 +1,200 @@
 """Cli Server module."""
 
 import asyncio
+import contextlib
 import os
 import json
+import signal
+import time
 from fastapi import FastAPI, Request, Response, HTTPException
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 app = FastAPI()
 
+# Max length of a single stdout/stderr line read from the CLI when streaming.
+# stream-json emits whole tool results on one line, so this is well above asyncio's 64 KiB default.
+STREAM_LINE_LIMIT = int(
+    os.environ.get("CLI_SERVER_STREAM_LINE_LIMIT", 64 * 1024 * 1024)
+)
 
-@app.post("/")
-async def run_command(request: Request):
-    try:
-        # FastAPI handles JSON automatically, but for raw flexibility we can read body
-        try:
-            data = await request.json()
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=400, detail="Invalid JSON")
+# Admission control: at most MAX_PARALLEL commands run at once and at most MAX_QUEUE
+# wait for a slot. Anything beyond that is rejected with 503 + Retry-After.
+MAX_PARALLEL = int(os.environ.get("CLI_SERVER_MAX_PARALLEL", os.cpu_count() or 4))
+MAX_QUEUE = int(os.environ.get("CLI_SERVER_MAX_QUEUE", 2 * MAX_PARALLEL))
+RETRY_AFTER_SECONDS = int(os.environ.get("CLI_SERVER_RETRY_AFTER", 5))
 
-        # Expecting 'args' list: ["gemini", "prompt", ...]
-        args = data.get("args", [])
+# Default deadline (queueing + execution) for a request that doesn't send its own "timeout".
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get("CLI_SERVER_DEFAULT_TIMEOUT", 600))
+# Seconds between SIGTERM and SIGKILL when tearing down a process group.
+KILL_GRACE_SECONDS = float(os.environ.get("CLI_SERVER_KILL_GRACE", 5))
 
-        # Optional: 'env' dictionary to merge with system env
-        request_env = data.get("env", {})
 
-        if not args or args[0] != "gemini":
-            raise HTTPException(
-                status_code=400, detail="Invalid command. Must start with 'gemini'."
+class ServerOverloaded(Exception):
+    """Raised when the work queue is full."""
+
+
+class AdmissionController:
+    """Bounded work queue in front of the CLI processes."""
+
+    def __init__(self, max_parallel: int, max_queue: int):
+        self.max_parallel = max_parallel
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_parallel)
+        self.queued = 0
+        self.processes = {}
+        self.counters = {
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "disconnected": 0,
+        }
+
+    @contextlib.asynccontextmanager
+    async def slot(self, deadline: float):
+        """Waits for a free slot until `deadline` (a time.monotonic() value)."""
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.counters["rejected"] += 1
+            raise ServerOverloaded()
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=max(0.0, deadline - time.monotonic())
             )
+        except asyncio.TimeoutError:
+            self.counters["timed_out"] += 1
+            raise
+        finally:
+            self.queued -= 1
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        return {
+            "max_parallel": self.max_parallel,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queued,
+            "active_processes": len(self.processes),
+            "active_pids": sorted(self.processes),
+            **self.counters,
+        }
 
-        print(f"Executing: {args}")
 
-        # Merge env
-        full_env = os.environ.copy()
-        full_env.update(request_env)
+admission = AdmissionController(MAX_PARALLEL, MAX_QUEUE)
 
-        # Run the command asynchronously
-        # This is the non-blocking magic
-        proc = await asyncio.create_subprocess_exec(
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env=full_env,
+
+def _overloaded_response() -> Response:
+    return JSONResponse(
+        content={"error": "Server overloaded, retry later."},
+        status_code=503,
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+async def _parse_command(request: Request):
+    """Validates the request body and returns (args, env, deadline)."""
+    try:
+        data = await request.json()
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+
+    # Expecting 'args' list: ["gemini", "prompt", ...]
+    args = data.get("args", [])
+
+    if not args or args[0] != "gemini":
+        raise HTTPException(
+            status_code=400, detail="Invalid command. Must start with 'gemini'."
         )
 
-        stdout, stderr = await proc.communicate()
+    # Optional: 'env' dictionary to merge with system env
+    full_env = os.environ.copy()
+    full_env.update(data.get("env", {}))
+
+    timeout = float(data.get("timeout") or DEFAULT_TIMEOUT_SECONDS)
+    return args, full_env, time.monotonic() + timeout
+
+
+async def _spawn(args, env, **kwargs):
+    """Starts the command as the leader of a new process group."""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        start_new_session=True,
+        **kwargs,
+    )
+    admission.processes[proc.pid] = proc
+    return proc
+
+
+async def _reap(proc):
+    """Terminates the process group (CLI plus MCP servers and other children)."""
+    admission.processes.pop(proc.pid, None)
+    if proc.returncode is None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+    # Sweep children that outlived the leader or ignored SIGTERM.
+    with contextlib.suppress(ProcessLookupError, PermissionError):
+        os.killpg(proc.pid, signal.SIGKILL)
+    if proc.returncode is None:
+        await proc.wait()
+
 
+async def _wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(0.5)
+
+
+@app.post("/")
+async def run_command(request: Request):
+    try:
+        args, full_env, deadline = await _parse_command(request)
+
+        try:
+            async with admission.slot(deadline):
+                print(f"Executing: {args}")
+                proc = await _spawn(args, full_env)
+                try:
+                    communicate = asyncio.create_task(proc.communicate())
+                    disconnect = asyncio.create_task(_wait_for_disconnect(request))
+                    done, _ = await asyncio.wait(
+                        {communicate, disconnect},
+                        timeout=max(0.0, deadline - time.monotonic()),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    disconnect.cancel()
+                    if communicate not in done:
+                        reason = "disconnected" if disconnect in done else "timed_out"
+                        admission.counters[reason] += 1
+                        print(f"Killing process group {proc.pid}: {reason}")
+                        await _reap(proc)
+                        stdout, stderr = await communicate
+                        return JSONResponse(
+                            content={
+                                "stdout": stdout.decode(),
+                                "stderr": stderr.decode(),
+                                "returncode": proc.returncode,
+                                "error": reason,
+                            },
+                            status_code=504,
+                        )
+                    stdout, stderr = communicate.result()
+                finally:
+                    await _reap(proc)
+        except ServerOverloaded:
+            return _overloaded_response()
+        except asyncio.TimeoutError:
+            return PlainTextResponse("Deadline exceeded while queued", status_code=504)
+
+        admission.counters["completed"] += 1
         response = {
             "stdout": stdout.decode(),
             "stderr": stderr.decode(),
@@ -61,6 +210,121 @@ async def run_command(request: Request):
         return PlainTextResponse(str(e), status_code=500)
 
 
+async def _skip_line(stream):
+    """Discards the rest of the current line without buffering more than the limit."""
+    while True:
+        try:
+            await stream.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await stream.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def _pump_lines(stream, key, queue):
+    """
+    Forwards each line of a subprocess pipe to the queue as an NDJSON record.
+
+    A line longer than STREAM_LINE_LIMIT is replaced by an {"error": "line_too_long"}
+    record; the pipe keeps being drained, so the process never blocks writing to it.
+    """
+    try:
+        while True:
+            try:
+                line = await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                line = e.partial  # Last line without a newline, or b"" at EOF.
+            except asyncio.LimitOverrunError:
+                await _skip_line(stream)
+                record = {"error": "line_too_long", "stream": key}
+                await queue.put(json.dumps(record) + "\n")
+                continue
+            if not line:
+                break
+            record = {key: line.decode(errors="replace").rstrip("\n")}
+            await queue.put(json.dumps(record) + "\n")
+    finally:
+        await queue.put(None)
+
+
+@app.post("/stream")
+async def stream_command(request: Request):
+    """
+    Runs a command and streams its output as NDJSON while it executes.
+
+    Each line of the response is one JSON object: {"stdout": line}, {"stderr": line},
+    and finally {"returncode": code}. A request that exceeds its deadline gets an
+    {"error": "timed_out"} record before the return code, and a line longer than
+    STREAM_LINE_LIMIT is reported as {"error": "line_too_long"}. If the client
+    disconnects, the process group is killed.
+    """
+    args, full_env, deadline = await _parse_command(request)
+
+    # Admission happens before the response starts so overload can still be a 503.
+    slot = admission.slot(deadline)
+    try:
+        await slot.__aenter__()
+    except ServerOverloaded:
+        return _overloaded_response()
+    except asyncio.TimeoutError:
+        return PlainTextResponse("Deadline exceeded while queued", status_code=504)
+
+    print(f"Streaming: {args}")
+    try:
+        proc = await _spawn(args, full_env, limit=STREAM_LINE_LIMIT)
+    except BaseException:
+        await slot.__aexit__(None, None, None)
+        raise
+
+    async def generate():
+        queue = asyncio.Queue()
+        pumps = [
+            asyncio.create_task(_pump_lines(proc.stdout, "stdout", queue)),
+            asyncio.create_task(_pump_lines(proc.stderr, "stderr", queue)),
+        ]
+        finished = timed_out = False
+        try:
+            open_pipes = len(pumps)
+            while open_pipes:
+                try:
+                    chunk = await asyncio.wait_for(
+                        queue.get(), timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    admission.counters["timed_out"] += 1
+                    print(f"Killing process group {proc.pid}: timed_out")
+                    yield json.dumps({"error": "timed_out"}) + "\n"
+                    await _reap(proc)
+                    break
+                if chunk is None:
+                    open_pipes -= 1
+                    continue
+                yield chunk
+            returncode = await proc.wait()
+            finished = True
+            yield json.dumps({"returncode": returncode}) + "\n"
+        finally:
+            # Reached early on client disconnect or cancellation.
+            for pump in pumps:
+                pump.cancel()
+            if not finished:
+                admission.counters["disconnected"] += 1
+                print(f"Killing abandoned process group {proc.pid}")
+            elif not timed_out:
+                admission.counters["completed"] += 1
+            await _reap(proc)
+            await slot.__aexit__(None, None, None)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.get("/metrics")
+async def metrics():
+    return JSONResponse(content=admission.metrics())
+
+
 @app.post("/read_file")
 async def read_file(request: Request):
     try:
@@ -15,6 +15,7 @@
 """An AnswerGenerator that uses the gemini CLI hosted in a local Podman container."""
 
 import asyncio
+import contextlib
 import json
 import os
 import shutil
@@ -31,10 +32,16 @@ init()
 from core.api_key_manager import API_KEY_MANAGER, ApiKeyManager, KeyType
 from benchmarks.answer_generators.gemini_cli_answer_generator import GeminiCliAnswerGenerator, GeminiCliExecutionError
 from benchmarks.data_models import TraceLogEvent
-from core.trace_utils import parse_cli_stream_json_output
+from core.config import PODMAN_CONFIG
+from core.trace_utils import StreamJsonParser, parse_cli_stream_json_output
 from benchmarks.answer_generators.gemini_cli_docker.image_definitions import ImageDefinition, IMAGE_DEFINITIONS, IMAGE_PREFIX
 from benchmarks.answer_generators.hash_utils import calculate_source_hash
-from benchmarks.answer_generators.gemini_cli_docker.podman_utils import PodmanContainer
+from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+    ConnectionStats,
+    PodmanContainerPool,
+    StreamingUnsupportedError,
+    create_pooled_session,
+)
 
 
 class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
@@ -70,9 +77,11 @@ class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
         self._base_url = None
         self._setup_lock = asyncio.Lock()
         self._setup_completed = False
-        self.container = PodmanContainer(
-            image_name=self.image_name, 
-            container_name=self.container_name,
+        self._proxy_session: Optional[aiohttp.ClientSession] = None
+        self._proxy_connection_stats = ConnectionStats()
+        self.container = PodmanContainerPool(
+            image_name=self.image_name,
+            container_name_prefix=self.container_name,
             image_definitions=self._image_definitions,
             build_args=self.build_args,
         )
@@ -152,7 +161,7 @@ class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
 
             print(f"[Podman Setup] Starting setup for {self.name}")
 
-            # Start via PodmanContainer (which now handles building)
+            # Start the warm container pool (which builds the image first)
             await self.container.start(force_build=force_deploy)
             self._base_url = self.container.base_url
 
@@ -161,9 +170,73 @@ class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
                 f"[Podman Setup] Setup for {self.name} completed. Listening on {self._base_url}"
             )
 
+    @property
+    def connection_stats(self) -> dict[str, Any]:
+        """HTTP connection reuse counters for requests sent by this generator."""
+        if self._is_proxy or not self.container:
+            return self._proxy_connection_stats.as_dict()
+        return self.container.connection_stats.as_dict()
+
     async def teardown(self) -> None:
+        if self._proxy_session is not None and not self._proxy_session.closed:
+            await self._proxy_session.close()
+        self._proxy_session = None
         if self.container:
-            self.container.stop()
+            await self.container.close()
+
+    async def _run_streaming_command(
+        self, args: list[str], env: dict[str, str]
+    ) -> tuple[dict[str, Any], StreamJsonParser]:
+        """
+        Runs a stream-json command through the container's streaming endpoint.
+
+        Events are parsed into TraceLogEvents as they arrive. Raw stdout/stderr is only
+        retained up to PODMAN_CONFIG.STREAM_MAX_OUTPUT_BYTES.
+        """
+        parser = StreamJsonParser()
+        retained = {"stdout": [], "stderr": []}
+        retained_bytes = 0
+        truncated = False
+        returncode = None
+
+        async with contextlib.aclosing(
+            self.container.stream_command(args, env)
+        ) as records:
+            async for record in records:
+                if "returncode" in record:
+                    returncode = record["returncode"]
+                    continue
+                if record.get("error") == "line_too_long":
+                    record = {
+                        "stderr": f"[cli_server] Dropped an overlong {record['stream']} line"
+                    }
+                elif "error" in record:
+                    record = {"stderr": f"[cli_server] Command aborted: {record['error']}"}
+                stream = "stdout" if "stdout" in record else "stderr"
+                line = record.get(stream, "")
+                if stream == "stdout":
+                    parser.feed_line(line)
+
+                if retained_bytes + len(line) <= PODMAN_CONFIG.STREAM_MAX_OUTPUT_BYTES:
+                    retained[stream].append(line)
+                    retained_bytes += len(line) + 1
+                else:
+                    truncated = True
+
+        if returncode is None:
+            raise RuntimeError("Stream ended before the command exited")
+
+        stderr_lines = retained["stderr"]
+        if truncated:
+            stderr_lines = stderr_lines + [
+                f"[Output truncated after {PODMAN_CONFIG.STREAM_MAX_OUTPUT_BYTES} bytes]"
+            ]
+        result = {
+            "stdout": "\n".join(retained["stdout"]),
+            "stderr": "\n".join(stderr_lines),
+            "returncode": returncode,
+        }
+        return result, parser
 
     async def run_cli_command(
         self,
@@ -184,15 +257,30 @@ class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
             full_args[-1] = self.context_instruction + full_args[-1]
 
         logs: list[TraceLogEvent] = []
+        is_stream_json = "--output-format" in full_args and "stream-json" in full_args
+        stream_parser: Optional[StreamJsonParser] = None
 
         try:
             if self._is_proxy:
                 payload = {"args": full_args, "env": combined_env}
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(self._base_url, json=payload) as resp:
-                        if resp.status != 200:
-                            raise RuntimeError(f"Proxy returned {resp.status}")
-                        result = await resp.json()
+                if self._proxy_session is None or self._proxy_session.closed:
+                    self._proxy_session = create_pooled_session(
+                        self._proxy_connection_stats
+                    )
+                async with self._proxy_session.post(
+                    self._base_url, json=payload
+                ) as resp:
+                    if resp.status != 200:
+                        raise RuntimeError(f"Proxy returned {resp.status}")
+                    result = await resp.json()
+            elif is_stream_json and self.container.supports_streaming is not False:
+                try:
+                    result, stream_parser = await self._run_streaming_command(
+                        full_args, combined_env
+                    )
+                except StreamingUnsupportedError:
+                    # Image built before the streaming endpoint existed.
+                    result = await self.container.send_command(full_args, combined_env)
             else:
                 result = await self.container.send_command(full_args, combined_env)
 
@@ -239,8 +327,14 @@ class GeminiCliPodmanAnswerGenerator(GeminiCliAnswerGenerator):
             "response": "",
         }
 
-        if "--output-format" in full_args and "stream-json" in full_args:
-            parsed_response_dict, parsed_logs = parse_cli_stream_json_output(stdout_str)
+        if is_stream_json:
+            if stream_parser is not None:
+                parsed_response_dict = stream_parser.response_dict
+                parsed_logs = stream_parser.logs
+            else:
+                parsed_response_dict, parsed_logs = parse_cli_stream_json_output(
+                    stdout_str
+                )
             response_dict.update(parsed_response_dict)
             logs.extend(parsed_logs)
             # NOTE: We do NOT log CLI_STDOUT_FULL (the raw line) here because 
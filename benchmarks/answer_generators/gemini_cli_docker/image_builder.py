@@ -0,0 +1,297 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plans and runs Podman builds for chains of image definitions.
+
+The planner resolves the dependency DAG of the requested images once, hashes each
+build context once, and builds independent images concurrently as soon as their
+dependencies are ready, so a cold setup takes as long as the DAG's critical path.
+Builds are single-flighted per image across every caller in the process.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from benchmarks.answer_generators.hash_utils import calculate_source_hash
+
+# List of secret IDs to mount from .env during podman builds
+PODMAN_BUILD_SECRET_IDS: List[str] = ["github_token"]
+
+# Directory that ImageDefinition.source_dir and dockerfile are relative to.
+IMAGES_BASE_PATH = Path(__file__).parent
+
+# In-flight build tasks per (event loop, image), shared by every builder in the process.
+_INFLIGHT: Dict[Tuple[int, str], asyncio.Task] = {}
+
+
+@dataclass
+class ImageBuildStep:
+    """One image in a build plan and what happened to it."""
+
+    image: str
+    dependencies: List[str]
+    context_path: Path
+    dockerfile_path: Path
+    build_args: Dict[str, str]
+    source_hash: Optional[str] = None
+    action: str = "pending"  # "built", "up-to-date" or "failed"
+    reason: str = ""
+    started: float = 0.0
+    duration: float = 0.0
+
+
+@dataclass
+class ImageBuildPlan:
+    """The dependency-ordered steps for a set of target images."""
+
+    targets: List[str]
+    steps: Dict[str, ImageBuildStep] = field(default_factory=dict)
+    hash_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def rebuilt(self, image: str) -> bool:
+        return self.steps[image].action == "built"
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Returns the slowest dependency chain as (seconds, images)."""
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for name, step in self.steps.items():  # steps are in topological order
+            dep_time, dep_path = max(
+                (best[d] for d in step.dependencies), default=(0.0, [])
+            )
+            best[name] = (dep_time + step.duration, dep_path + [name])
+        return max(best.values(), default=(0.0, []))
+
+    def report(self) -> str:
+        lines = [f"{'Image':<45} {'Action':<11} {'Seconds':>8}  Reason"]
+        for step in self.steps.values():
+            lines.append(
+                f"{step.image:<45} {step.action:<11} {step.duration:8.1f}  {step.reason}"
+            )
+        cp_seconds, cp_images = self.critical_path()
+        lines.append(
+            f"Hashing: {self.hash_seconds:.2f}s | Wall: {self.wall_seconds:.1f}s |"
+            f" Critical path: {cp_seconds:.1f}s ({' -> '.join(cp_images)})"
+        )
+        return "\n".join(lines)
+
+
+async def image_exists(image_name: str) -> bool:
+    proc = await asyncio.create_subprocess_exec(
+        "podman",
+        "image",
+        "exists",
+        image_name,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    await proc.communicate()
+    return proc.returncode == 0
+
+
+async def get_image_label(image_name: str, label_key: str) -> Optional[str]:
+    try:
+        inspect_cmd = [
+            "podman",
+            "inspect",
+            "--format",
+            f"{{{{.Config.Labels.{label_key}}}}}",
+            image_name,
+        ]
+        proc = await asyncio.create_subprocess_exec(
+            *inspect_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await proc.communicate()
+        if proc.returncode == 0:
+            val = stdout.decode().strip()
+            return val if val != "<no value>" else None
+    except Exception:
+        pass
+    return None
+
+
+async def podman_build(
+    image_name: str,
+    dockerfile_path: Path,
+    context_path: Path,
+    build_args: Optional[Dict[str, str]] = None,
+    labels: Optional[Dict[str, str]] = None,
+):
+    print(f"Building Podman image: {image_name}...")
+    build_cmd = ["podman", "build", "-t", image_name, "-f", str(dockerfile_path)]
+
+    # Inject secrets if .env exists
+    if Path(".env").exists():
+        for secret_id in PODMAN_BUILD_SECRET_IDS:
+            build_cmd.extend(["--secret", f"id={secret_id},src=.env"])
+
+    for k, v in (build_args or {}).items():
+        build_cmd.extend(["--build-arg", f"{k}={v}"])
+    for k, v in (labels or {}).items():
+        build_cmd.extend(["--label", f"{k}={v}"])
+    build_cmd.append(str(context_path))
+
+    proc = await asyncio.create_subprocess_exec(
+        *build_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Build failed for {image_name}: {stderr.decode()}")
+    print(f"Successfully built {image_name}")
+
+
+class ImageBuilder:
+    """Builds images from `image_definitions`, reusing up-to-date ones.
+
+    Args:
+        image_definitions: Map of image name to ImageDefinition.
+        build_args: Extra build args applied to every image (override definitions).
+        base_path: Directory the definitions' source_dir/dockerfile are relative to.
+    """
+
+    def __init__(
+        self,
+        image_definitions: Dict[str, Any],
+        build_args: Optional[Dict[str, str]] = None,
+        base_path: Path = IMAGES_BASE_PATH,
+    ):
+        self.image_definitions = image_definitions
+        self.build_args = build_args or {}
+        self.base_path = base_path
+
+    def plan(self, targets: Iterable[str]) -> ImageBuildPlan:
+        """Resolves the targets' dependency closure into topologically ordered steps."""
+        plan = ImageBuildPlan(targets=list(targets))
+        visiting = set()
+
+        def visit(name: str):
+            if name in plan.steps:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at image '{name}'")
+            if name not in self.image_definitions:
+                raise KeyError(f"Image '{name}' is not a known managed image.")
+            visiting.add(name)
+            definition = self.image_definitions[name]
+            for dep in definition.dependencies:
+                visit(dep)
+            visiting.discard(name)
+            plan.steps[name] = ImageBuildStep(
+                image=name,
+                dependencies=list(definition.dependencies),
+                context_path=self.base_path / definition.source_dir,
+                dockerfile_path=self.base_path / definition.dockerfile,
+                build_args={**definition.build_args, **self.build_args},
+            )
+
+        for target in plan.targets:
+            visit(target)
+        return plan
+
+    async def _hash_contexts(self, plan: ImageBuildPlan):
+        """Hashes each distinct build context once, concurrently."""
+        started = time.monotonic()
+        contexts = sorted({step.context_path for step in plan.steps.values()})
+        hashes = await asyncio.gather(
+            *(asyncio.to_thread(calculate_source_hash, path) for path in contexts)
+        )
+        by_context = dict(zip(contexts, hashes))
+        for step in plan.steps.values():
+            step.source_hash = by_context[step.context_path]
+        plan.hash_seconds = time.monotonic() - started
+
+    async def ensure(
+        self, targets: Iterable[str], force: bool = False
+    ) -> ImageBuildPlan:
+        """Builds whatever the targets need and returns the executed plan."""
+        started = time.monotonic()
+        plan = self.plan(targets)
+        await self._hash_contexts(plan)
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, step in plan.steps.items():
+            deps = [tasks[d] for d in step.dependencies]
+            tasks[name] = asyncio.create_task(self._run_step(step, deps, force))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            plan.wall_seconds = time.monotonic() - started
+        return plan
+
+    async def _run_step(
+        self, step: ImageBuildStep, deps: List[asyncio.Task], force: bool
+    ) -> bool:
+        """Waits for dependencies, then joins or starts the single build of this image."""
+        dep_results = await asyncio.gather(*deps)
+        dependency_rebuilt = any(dep_results)
+
+        key = (id(asyncio.get_running_loop()), step.image)
+        inflight = _INFLIGHT.get(key)
+        if inflight is not None and not inflight.done():
+            step.reason = "joined in-flight build"
+            step.started = time.monotonic()
+            try:
+                rebuilt = await asyncio.shield(inflight)
+            except BaseException:
+                step.action = "failed"
+                raise
+            finally:
+                step.duration = time.monotonic() - step.started
+            step.action = "built" if rebuilt else "up-to-date"
+            return rebuilt
+
+        task = asyncio.create_task(
+            self._build_if_needed(step, dependency_rebuilt, force)
+        )
+        _INFLIGHT[key] = task
+        task.add_done_callback(
+            lambda t: _INFLIGHT.pop(key) if _INFLIGHT.get(key) is t else None
+        )
+        # Shielded so a cancelled caller doesn't abort a build others may be waiting on.
+        return await asyncio.shield(task)
+
+    async def _build_if_needed(
+        self, step: ImageBuildStep, dependency_rebuilt: bool, force: bool
+    ) -> bool:
+        step.started = time.monotonic()
+        try:
+            if force:
+                step.reason = "forced"
+            elif dependency_rebuilt:
+                step.reason = "dependency rebuilt"
+            elif not await image_exists(step.image):
+                step.reason = "image missing"
+            elif await get_image_label(step.image, "source_hash") != step.source_hash:
+                step.reason = "source changed"
+            else:
+                step.action = "up-to-date"
+                return False
+
+            await podman_build(
+                image_name=step.image,
+                dockerfile_path=step.dockerfile_path,
+                context_path=step.context_path,
+                build_args=step.build_args,
+                labels={"source_hash": step.source_hash},
+            )
+            step.action = "built"
+            return True
+        except BaseException:
+            step.action = "failed"
+            raise
+        finally:
+            step.duration = time.monotonic() - step.started
@@ -2,18 +2,87 @@
 
 import asyncio
 import atexit
+import contextlib
+import contextvars
+import json
 import os
 import socket
 import subprocess
+import time
 import uuid
-from pathlib import Path
-from typing import Optional, Dict, Any, List
+from dataclasses import asdict, dataclass
+from typing import Optional, Dict, Any, List, AsyncIterator
 import aiohttp
 
-from benchmarks.answer_generators.hash_utils import calculate_source_hash
+from benchmarks.answer_generators.gemini_cli_docker.image_builder import (
+    PODMAN_BUILD_SECRET_IDS,
+    ImageBuilder,
+)
+from core.config import PODMAN_CONFIG
+
+
+@dataclass
+class ConnectionStats:
+    """Counters describing how well a pooled HTTP session reuses its connections."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    requests_queued: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of connection acquisitions served by a kept-alive connection."""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "reuse_ratio": self.reuse_ratio}
+
+
+class StreamingUnsupportedError(RuntimeError):
+    """Raised when a container's server predates the streaming endpoint."""
+
+
+def create_pooled_session(
+    stats: ConnectionStats, limit: Optional[int] = None
+) -> aiohttp.ClientSession:
+    """
+    Creates a long-lived ClientSession with a keep-alive connector.
+
+    The connector is sized to the Podman concurrency limit so every in-flight request
+    can hold its own connection, and `stats` is updated through aiohttp's tracing hooks.
+    Must be called from within a running event loop.
+    """
+    limit = limit or PODMAN_CONFIG.MAX_GLOBAL_CONCURRENCY
+
+    async def on_request_start(session, ctx, params):
+        stats.requests += 1
+
+    async def on_connection_create_end(session, ctx, params):
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(session, ctx, params):
+        stats.connections_reused += 1
+
+    async def on_connection_queued_start(session, ctx, params):
+        stats.requests_queued += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        keepalive_timeout=PODMAN_CONFIG.HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=PODMAN_CONFIG.HTTP_DNS_CACHE_TTL,
+        use_dns_cache=True,
+    )
+    return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
 
-# List of secret IDs to mount from .env during podman builds
-PODMAN_BUILD_SECRET_IDS: List[str] = ["github_token"]
 
 class PodmanContainer:
     """
@@ -30,6 +99,11 @@ class PodmanContainer:
         self._setup_lock = asyncio.Lock()
         self._is_running = False
         self._image_checked = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connection_stats = ConnectionStats()
+        # None until the first streaming request tells us whether the server supports it.
+        self.supports_streaming: Optional[bool] = None
 
     async def start(self, force_build: bool = False):
         """Starts the container if not already running."""
@@ -133,107 +207,104 @@ class PodmanContainer:
         self._image_checked = True
 
     async def _build_image_chain(self, image_key: str, force: bool = False) -> bool:
-        definition = self.image_definitions[image_key]
-        dependency_rebuilt = False
-        for dep_key in definition.dependencies:
-            if await self._build_image_chain(dep_key, force=force):
-                dependency_rebuilt = True
-
-        full_image_name = image_key
-        # We assume the utility is in the same directory structure relative to the generators
-        base_path = Path(__file__).parent
-        source_path = base_path / definition.source_dir
-        dockerfile_path = base_path / definition.dockerfile
-
-        current_hash = calculate_source_hash(source_path)
-        should_build = force or dependency_rebuilt
-
-        if not should_build:
-            exists_cmd = ["podman", "image", "exists", full_image_name]
-            proc = await asyncio.create_subprocess_exec(*exists_cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE)
-            await proc.communicate()
-            if proc.returncode != 0:
-                should_build = True
-            else:
-                existing_hash = await self._get_image_label(full_image_name, "source_hash")
-                if existing_hash != current_hash:
-                    should_build = True
-
-        if should_build:
-            await self._execute_podman_build(
-                image_name=full_image_name,
-                dockerfile_path=dockerfile_path,
-                context_path=source_path,
-                build_args=definition.build_args,
-                labels={"source_hash": current_hash},
-            )
-            return True
-        return False
-
-    async def _get_image_label(self, image_name: str, label_key: str) -> str | None:
-        try:
-            inspect_cmd = ["podman", "inspect", "--format", f"{{{{.Config.Labels.{label_key}}}}}", image_name]
-            proc = await asyncio.create_subprocess_exec(
-                *inspect_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
-            if proc.returncode == 0:
-                val = stdout.decode().strip()
-                return val if val != "<no value>" else None
-        except Exception:
-            pass
-        return None
-
-    async def _execute_podman_build(self, image_name: str, dockerfile_path: Path, context_path: Path, build_args: Optional[Dict[str, str]] = None, labels: Optional[Dict[str, str]] = None):
-        print(f"Building Podman image: {image_name}...")
-        build_cmd = ["podman", "build", "-t", image_name, "-f", str(dockerfile_path)]
-
-        # Inject secrets if .env exists
-        if Path(".env").exists():
-            for secret_id in PODMAN_BUILD_SECRET_IDS:
-                build_cmd.extend(["--secret", f"id={secret_id},src=.env"])
-
-        # Merge instance-level build_args
-        merged_build_args = (build_args or {}).copy()
-        if self.build_args:
-            merged_build_args.update(self.build_args)
-
-        if merged_build_args:
-            for k, v in merged_build_args.items():
-                build_cmd.extend(["--build-arg", f"{k}={v}"])
-        if labels:
-            for k, v in labels.items():
-                build_cmd.extend(["--label", f"{k}={v}"])
-        build_cmd.append(str(context_path))
-
-        proc = await asyncio.create_subprocess_exec(
-            *build_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-             raise RuntimeError(f"Build failed for {image_name}: {stderr.decode()}")
-        print(f"Successfully built {image_name}")
+        """Builds the image and its dependencies as needed; True if the image was rebuilt."""
+        builder = ImageBuilder(self.image_definitions, build_args=self.build_args)
+        plan = await builder.ensure([image_key], force=force)
+        if any(step.action == "built" for step in plan.steps.values()):
+            print(plan.report())
+        return plan.rebuilt(image_key)
 
     async def _wait_for_health(self):
         """Waits for the container server to be ready."""
         print(f"Waiting for {self.container_name} to be ready...")
         for _ in range(20):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    # Simple health check on root
-                    async with session.get(self.base_url, timeout=2.0) as resp:
-                        if resp.status == 200:
-                            return
-            except Exception:
-                pass
+            if await self.is_healthy():
+                return
             await asyncio.sleep(0.5)
 
-        # If timeout, try to get logs
-        self.stop()
+        # The container was started, so make sure close() actually kills it.
+        self._is_running = True
+        await self.close()
         raise RuntimeError(f"Container {self.container_name} failed to start.")
 
+    async def is_healthy(self, timeout: float = 2.0) -> bool:
+        """Probes the server's health endpoint once, reusing the pooled session."""
+        if not self.base_url:
+            return False
+        try:
+            # Simple health check on root
+            async with self._get_session().get(
+                self.base_url, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the container's pooled session, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            # A session only works on the loop it was created on.
+            self._discard_session()
+        if self._session is None or self._session.closed:
+            self._session = create_pooled_session(self.connection_stats)
+            self._session_loop = loop
+        return self._session
+
+    def _discard_session(self):
+        """
+        Releases the pooled session without awaiting its close, for when that cannot
+        be awaited: its loop is gone or another loop is running, or there is none
+        (e.g. atexit). The connections are closed without waiting for them to finish.
+        """
+        session, loop = self._session, self._session_loop
+        self._session = self._session_loop = None
+        if session is None or session.closed:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if loop is not current and loop.is_running():
+            # Still running in another thread; close the session there.
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            # The synchronous part of connector.close(); nothing is left to await it.
+            connector._close()
+
+    async def _post(
+        self, url: str, payload: Dict[str, Any], timeout: Any
+    ) -> aiohttp.ClientResponse:
+        """POSTs to the container, waiting out 503 Retry-After responses from its admission queue."""
+        session = self._get_session()
+        retries = PODMAN_CONFIG.HTTP_OVERLOAD_RETRIES
+        for attempt in range(retries + 1):
+            resp = await session.post(url, json=payload, timeout=timeout)
+            if resp.status != 503 or attempt == retries:
+                return resp
+            delay = float(resp.headers.get("Retry-After", 1))
+            await resp.release()
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        """Closes the pooled HTTP session and stops the container."""
+        if self._session_loop is asyncio.get_running_loop():
+            session, self._session = self._session, None
+            self._session_loop = None
+            if session is not None and not session.closed:
+                await session.close()
+        self.stop()
+
     def stop(self):
-        """Stops the container."""
+        """
+        Stops the container synchronously (e.g. atexit). From a running loop, use
+        `close()`, which also waits for the pooled session to close.
+        """
+        self._discard_session()
+
         if not self._is_running:
             return
 
@@ -261,15 +332,95 @@ class PodmanContainer:
         if not self._is_running:
             await self.start()
 
-        payload = {"args": args, "env": env or {}}
+        # The server enforces the same deadline, killing the process tree when it expires.
+        timeout = PODMAN_CONFIG.COMMAND_TIMEOUT
+        payload = {"args": args, "env": env or {}, "timeout": timeout}
+
+        async with await self._post(self.base_url, payload, timeout=timeout) as resp:
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"Podman server returned {resp.status}: {text}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.base_url, json=payload, timeout=300.0) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"Podman server returned {resp.status}: {text}")
+            return await resp.json()
+
+    async def stream_command(
+        self,
+        args: List[str],
+        env: Dict[str, str] = None,
+        event_timeout: Optional[float] = None,
+        max_line_bytes: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs a command in the container and yields its output records as they arrive.
+
+        Records are {"stdout": line}, {"stderr": line}, {"error": reason} (when the
+        server kills the command, or "line_too_long" with the "stream" whose line it
+        dropped) and a final {"returncode": code}.
+        Closing the iterator early (or cancelling the consuming task) drops the
+        connection, which makes the server kill the process.
+
+        Args:
+            args: The command to run.
+            env: Extra environment variables for the command.
+            event_timeout: Max seconds to wait for the next record.
+            max_line_bytes: Max size of a single record; larger records abort the stream.
+        """
+        if not self._is_running:
+            await self.start()
 
-                return await resp.json()
+        event_timeout = event_timeout or PODMAN_CONFIG.STREAM_EVENT_TIMEOUT
+        max_line_bytes = max_line_bytes or PODMAN_CONFIG.STREAM_MAX_OUTPUT_BYTES
+        payload = {
+            "args": args,
+            "env": env or {},
+            "timeout": PODMAN_CONFIG.COMMAND_TIMEOUT,
+        }
+
+        # The server enforces the overall deadline; liveness is enforced per record here.
+        timeout = aiohttp.ClientTimeout(total=None)
+        async with await self._post(
+            f"{self.base_url}/stream", payload, timeout=timeout
+        ) as resp:
+            if resp.status in (404, 405):
+                self.supports_streaming = False
+                raise StreamingUnsupportedError(
+                    f"Container {self.container_name} does not support streaming."
+                )
+            if resp.status != 200:
+                text = await resp.text()
+                raise RuntimeError(f"Podman server returned {resp.status}: {text}")
+            self.supports_streaming = True
+
+            buffer = bytearray()
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            resp.content.readany(), timeout=event_timeout
+                        )
+                    except asyncio.TimeoutError:
+                        raise TimeoutError(
+                            f"No output from {self.container_name} for {event_timeout}s"
+                        )
+                    if not chunk:
+                        break
+                    buffer.extend(chunk)
+                    while (newline := buffer.find(b"\n")) >= 0:
+                        line = bytes(buffer[:newline])
+                        del buffer[: newline + 1]
+                        if line.strip():
+                            yield json.loads(line)
+                    if len(buffer) > max_line_bytes:
+                        raise RuntimeError(
+                            f"Output record from {self.container_name} exceeds {max_line_bytes} bytes"
+                        )
+            finally:
+                if not resp.content.at_eof():
+                    # Abandoned mid-stream: drop the connection instead of returning it to the pool.
+                    resp.close()
+
+            if buffer.strip():
+                yield json.loads(bytes(buffer))
 
     async def read_file(self, path: str) -> Optional[str]:
         """Reads a file from the container."""
@@ -277,12 +428,316 @@ class PodmanContainer:
             return None
 
         read_payload = {"path": path}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/read_file", json=read_payload
-            ) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("content", "")
-                else:
-                    return None
\ No newline at end of file
+        session = self._get_session()
+        async with session.post(
+            f"{self.base_url}/read_file", json=read_payload
+        ) as resp:
+            if resp.status == 200:
+                data = await resp.json()
+                return data.get("content", "")
+            else:
+                return None
+
+
+# Replica that served the current task's last request, so follow-up reads (e.g. error
+# reports written by the CLI) go to the same container.
+_current_replica: contextvars.ContextVar[Optional[PodmanContainer]] = (
+    contextvars.ContextVar("podman_current_replica", default=None)
+)
+
+
+class PodmanContainerPool:
+    """
+    A warm pool of identical Podman containers for one image.
+
+    Exposes the same request API as PodmanContainer. Requests go to the replica with the
+    fewest outstanding requests. Replicas are added (up to `max_replicas`) when the
+    outstanding requests per replica or the request latency rise, retired when idle
+    (down to `min_replicas`), and restarted when they fail health checks.
+    """
+
+    def __init__(
+        self,
+        image_name: str,
+        container_name_prefix: Optional[str] = None,
+        image_definitions: Optional[Dict[str, Any]] = None,
+        build_args: Optional[Dict[str, str]] = None,
+        min_replicas: Optional[int] = None,
+        max_replicas: Optional[int] = None,
+        target_outstanding: Optional[int] = None,
+        container_factory=PodmanContainer,
+    ):
+        self.image_name = image_name
+        self.container_name_prefix = (
+            container_name_prefix or f"gemini-cli-podman-pool-{uuid.uuid4().hex[:8]}"
+        )
+        self.image_definitions = image_definitions
+        self.build_args = build_args or {}
+        self.min_replicas = max(1, min_replicas or PODMAN_CONFIG.POOL_MIN_REPLICAS)
+        self.max_replicas = max(
+            self.min_replicas, max_replicas or PODMAN_CONFIG.POOL_MAX_REPLICAS
+        )
+        self.target_outstanding = (
+            target_outstanding or PODMAN_CONFIG.POOL_TARGET_OUTSTANDING
+        )
+        self._container_factory = container_factory
+
+        self.replicas: List[PodmanContainer] = []
+        self._outstanding: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._health_failures: Dict[str, int] = {}
+        self._retired_stats = ConnectionStats()
+        self._latency_ewma: Optional[float] = None
+        self._latency_floor: Optional[float] = None
+        self._scaling: Optional[asyncio.Task] = None
+        self._monitor: Optional[asyncio.Task] = None
+        # Restarts in flight, by the container name of the replica being replaced.
+        self._restarts: Dict[str, asyncio.Task] = {}
+        self._setup_lock = asyncio.Lock()
+        self._is_running = False
+        self._replica_seq = 0
+
+    @property
+    def base_url(self) -> Optional[str]:
+        return self.replicas[0].base_url if self.replicas else None
+
+    @property
+    def supports_streaming(self) -> Optional[bool]:
+        for replica in self.replicas:
+            if replica.supports_streaming is not None:
+                return replica.supports_streaming
+        return None
+
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        """Connection counters summed over current and retired replicas."""
+        total = ConnectionStats(**asdict(self._retired_stats))
+        for replica in self.replicas:
+            for key, value in asdict(replica.connection_stats).items():
+                setattr(total, key, getattr(total, key) + value)
+        return total
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "replicas": len(self.replicas),
+            "outstanding": dict(self._outstanding),
+            "latency_ewma": self._latency_ewma,
+            "latency_floor": self._latency_floor,
+        }
+
+    async def start(self, force_build: bool = False):
+        """Builds the image once and starts `min_replicas` containers in parallel."""
+        async with self._setup_lock:
+            if self._is_running:
+                return
+
+            if self.image_definitions:
+                builder = self._container_factory(
+                    image_name=self.image_name,
+                    image_definitions=self.image_definitions,
+                    build_args=self.build_args,
+                )
+                await builder._ensure_image_ready(force=force_build)
+
+            results = await asyncio.gather(
+                *(self._add_replica() for _ in range(self.min_replicas)),
+                return_exceptions=True,
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if errors:
+                await self.close()
+                raise errors[0]
+
+            self._is_running = True
+            self._monitor = asyncio.create_task(self._monitor_loop())
+
+    async def _add_replica(self) -> PodmanContainer:
+        self._replica_seq += 1
+        replica = self._container_factory(
+            image_name=self.image_name,
+            container_name=f"{self.container_name_prefix}-{self._replica_seq}",
+            build_args=self.build_args,
+        )
+        await replica.start()
+        self.replicas.append(replica)
+        self._outstanding[replica.container_name] = 0
+        self._last_used[replica.container_name] = time.monotonic()
+        return replica
+
+    async def _retire(self, replica: PodmanContainer):
+        if replica not in self.replicas:
+            return
+        self.replicas.remove(replica)
+        for key, value in asdict(replica.connection_stats).items():
+            retired = getattr(self._retired_stats, key)
+            setattr(self._retired_stats, key, retired + value)
+        self._outstanding.pop(replica.container_name, None)
+        self._last_used.pop(replica.container_name, None)
+        self._health_failures.pop(replica.container_name, None)
+        await replica.close()
+
+    async def _restart(self, replica: PodmanContainer):
+        print(f"Restarting unhealthy replica {replica.container_name}...")
+        await self._retire(replica)
+        try:
+            await self._add_replica()
+        except Exception as e:
+            print(f"Failed to replace replica {replica.container_name}: {e}")
+
+    def _schedule_restart(self, replica: PodmanContainer) -> asyncio.Task:
+        """Starts restarting `replica` unless that is already in flight; returns the task."""
+        name = replica.container_name
+        if name not in self._restarts:
+            task = asyncio.create_task(self._restart(replica))
+            self._restarts[name] = task
+            task.add_done_callback(lambda _: self._restarts.pop(name, None))
+        return self._restarts[name]
+
+    async def _ensure_replica(self):
+        """Starts a replica if the pool has none left, e.g. after a failed restart."""
+        async with self._setup_lock:
+            if self.replicas:
+                return
+            try:
+                await self._add_replica()
+            except Exception as e:
+                raise RuntimeError(
+                    f"{self.image_name} pool has no running replicas: {e}"
+                ) from e
+
+    def _should_scale_up(self) -> bool:
+        count = len(self.replicas)
+        if count >= self.max_replicas or (self._scaling and not self._scaling.done()):
+            return False
+        outstanding = sum(self._outstanding.values())
+        if outstanding >= count * self.target_outstanding:
+            return True
+        # Latency has degraded well past the best observed while every replica is busy.
+        return (
+            self._latency_ewma is not None
+            and self._latency_ewma
+            > PODMAN_CONFIG.POOL_LATENCY_SCALE_FACTOR * self._latency_floor
+            and outstanding >= count
+        )
+
+    async def _scale_up(self):
+        try:
+            replica = await self._add_replica()
+            print(
+                f"Scaled {self.image_name} pool up to {len(self.replicas)}"
+                f" ({replica.container_name})"
+            )
+        except Exception as e:
+            print(f"Failed to scale {self.image_name} pool: {e}")
+
+    def _record_latency(self, seconds: float):
+        if self._latency_ewma is None:
+            self._latency_ewma = seconds
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * seconds
+        self._latency_floor = min(self._latency_floor or seconds, seconds)
+
+    async def _monitor_loop(self):
+        """Restarts replicas that fail health checks and retires idle ones."""
+        while True:
+            await asyncio.sleep(PODMAN_CONFIG.POOL_HEALTH_INTERVAL)
+            await self._check_replicas()
+
+    async def _check_replicas(self):
+        for replica in list(self.replicas):
+            name = replica.container_name
+            if name in self._restarts:
+                continue
+            if await replica.is_healthy():
+                self._health_failures[name] = 0
+                continue
+            self._health_failures[name] = self._health_failures.get(name, 0) + 1
+            if self._health_failures[name] >= 2:
+                await self._schedule_restart(replica)
+
+        now = time.monotonic()
+        for replica in list(self.replicas):
+            if len(self.replicas) <= self.min_replicas:
+                break
+            name = replica.container_name
+            idle = now - self._last_used.get(name, now)
+            is_idle = idle > PODMAN_CONFIG.POOL_IDLE_SECONDS
+            if self._outstanding.get(name) == 0 and is_idle:
+                print(f"Retiring idle replica {name}")
+                await self._retire(replica)
+
+    @contextlib.asynccontextmanager
+    async def _lease(self):
+        """Routes a request to the least-loaded replica for its duration."""
+        if not self._is_running:
+            await self.start()
+        if not self.replicas:
+            await self._ensure_replica()
+
+        replica = min(self.replicas, key=lambda r: self._outstanding[r.container_name])
+        name = replica.container_name
+        self._outstanding[name] += 1
+        _current_replica.set(replica)
+        if self._should_scale_up():
+            self._scaling = asyncio.create_task(self._scale_up())
+
+        started = time.monotonic()
+        try:
+            yield replica
+            self._record_latency(time.monotonic() - started)
+        except aiohttp.ClientConnectionError:
+            if (
+                replica in self.replicas
+                and name not in self._restarts
+                and not await replica.is_healthy()
+            ):
+                self._schedule_restart(replica)
+            raise
+        finally:
+            if name in self._outstanding:
+                self._outstanding[name] -= 1
+                self._last_used[name] = time.monotonic()
+
+    async def send_command(
+        self, args: List[str], env: Dict[str, str] = None
+    ) -> Dict[str, Any]:
+        async with self._lease() as replica:
+            return await replica.send_command(args, env)
+
+    async def stream_command(
+        self, args: List[str], env: Dict[str, str] = None, **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async with self._lease() as replica:
+            async with contextlib.aclosing(
+                replica.stream_command(args, env, **kwargs)
+            ) as records:
+                async for record in records:
+                    yield record
+
+    async def read_file(self, path: str) -> Optional[str]:
+        """Reads a file from the replica that served this task's last request."""
+        replica = _current_replica.get()
+        if replica not in self.replicas:
+            replica = self.replicas[0] if self.replicas else None
+        return await replica.read_file(path) if replica else None
+
+    async def close(self):
+        """Stops the monitor and any restarts, and closes every replica."""
+        restarts = list(self._restarts.values())
+        for task in (self._monitor, self._scaling, *restarts):
+            if task and not task.done():
+                task.cancel()
+        await asyncio.gather(*restarts, return_exceptions=True)
+        await asyncio.gather(*(self._retire(r) for r in list(self.replicas)))
+        self._is_running = False
+
+    def stop(self):
+        """Synchronously kills every replica (e.g. outside an event loop)."""
+        for task in (self._monitor, *self._restarts.values()):
+            if task and not task.done():
+                task.cancel()
+        for replica in self.replicas:
+            replica.stop()
+        self.replicas.clear()
+        self._is_running = False
+
@@ -12,39 +12,100 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Utility functions for source code hashing."""
+"""Utility functions for source code hashing.
+
+Source hashes are Merkle digests: each file is hashed by content, and each directory
+by the sorted names and digests of its children. File digests are kept in a
+persistent cache keyed by (path, size, mtime_ns, inode), so re-hashing a tree only
+reads the files that changed since the last call.
+"""
 
 import fnmatch
 import hashlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from core.config import OUTPUT_ROOT
+from core.json_store import JsonStore, store_or_default
 
-def calculate_source_hash(directory: Path) -> str:
-    """Calculates a deterministic hash of the source directory."""
-    sha = hashlib.sha256()
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get("ADK_SOURCE_HASH_CACHE", OUTPUT_ROOT / "source_hash_cache.db")
+)
+
+# Files modified this recently are hashed but not cached: a second write within the
+# same mtime tick would otherwise go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+HASH_WORKERS = min(8, os.cpu_count() or 4)
+
+DEFAULT_IGNORE_PATTERNS = [
+    ".git",
+    "__pycache__",
+    ".ipynb_checkpoints",
+    "node_modules",
+    "venv",
+    "version.txt",  # Added to default ignores
+    "package-lock.json",  # Added to default ignores
+    "npm-debug.log",  # Added to default ignores
+]
+
+
+class IgnoreRules:
+    """Exclude rules from the defaults plus the context's .gitignore and .dockerignore.
+
+    Patterns match a file or directory by name or by path relative to the context.
+    As in .dockerignore, a later matching pattern wins and `!pattern` re-includes.
+    """
+
+    def __init__(self, rules: List[Tuple[str, bool]]):
+        self.rules = rules
+        self._negations = [pattern for pattern, negate in rules if negate]
 
-    # Try to read .gitignore
-    ignore_patterns = [
-        ".git",
-        "__pycache__",
-        ".ipynb_checkpoints",
-        "node_modules",
-        "venv",
-        "version.txt",  # Added to default ignores
-        "package-lock.json",  # Added to default ignores
-        "npm-debug.log",  # Added to default ignores
-    ]
-    gitignore_path = directory / ".gitignore"
-    if gitignore_path.exists():
-        try:
-            with open(gitignore_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        ignore_patterns.append(line)
-        except Exception:
-            pass  # Ignore errors reading .gitignore
+    @classmethod
+    def for_directory(cls, directory: Path) -> "IgnoreRules":
+        rules = [(pattern, False) for pattern in DEFAULT_IGNORE_PATTERNS]
+        for ignore_file in (".gitignore", ".dockerignore"):
+            path = directory / ignore_file
+            if not path.exists():
+                continue
+            try:
+                with open(path, "r") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line or line.startswith("#"):
+                            continue
+                        negate = line.startswith("!")
+                        pattern = line.lstrip("!").strip("/")
+                        if pattern:
+                            rules.append((pattern, negate))
+            except Exception:
+                pass  # Ignore errors reading ignore files
+        return cls(rules)
+
+    def is_ignored(self, name: str, rel_path: str) -> bool:
+        ignored = False
+        for pattern, negate in self.rules:
+            candidates = [pattern]
+            if pattern.startswith("**/"):
+                candidates.append(pattern[3:])
+            if any(
+                name == p or fnmatch.fnmatch(name, p) or fnmatch.fnmatch(rel_path, p)
+                for p in candidates
+            ):
+                ignored = not negate
+        return ignored
+
+    def can_prune(self, rel_dir: str) -> bool:
+        """An ignored directory is skipped unless a `!` rule re-includes something inside it."""
+        return not any(p.startswith(rel_dir + "/") for p in self._negations)
+
+
+def _iter_source_files(directory: Path) -> Iterator[Tuple[str, Path]]:
+    """Yields (relative posix path, path) for non-ignored files in deterministic order."""
+    rules = IgnoreRules.for_directory(directory)
 
     for root, dirs, files in os.walk(directory):
         # Sort in-place to ensure deterministic walk order
@@ -52,50 +113,124 @@ def calculate_source_hash(directory: Path) -> str:
         files.sort()
 
         # Prune ignored dirs
-        i = 0
-        while i < len(dirs):
-            d = dirs[i]
+        kept = []
+        for d in dirs:
             rel_path = (Path(root) / d).relative_to(directory).as_posix()
-
-            should_ignore = False
-            # Check against simple name matches first (common case)
-            if d in ignore_patterns:
-                should_ignore = True
-            else:
-                # Check patterns
-                for pattern in ignore_patterns:
-                    if fnmatch.fnmatch(d, pattern) or fnmatch.fnmatch(
-                        rel_path, pattern
-                    ):
-                        should_ignore = True
-                        break
-
-            if should_ignore:
-                del dirs[i]
-            else:
-                i += 1
+            if not (rules.is_ignored(d, rel_path) and rules.can_prune(rel_path)):
+                kept.append(d)
+        dirs[:] = kept
 
         for file in files:
             rel_path = (Path(root) / file).relative_to(directory).as_posix()
-            should_ignore = False
-            for pattern in ignore_patterns:
-                if fnmatch.fnmatch(file, pattern) or fnmatch.fnmatch(rel_path, pattern):
-                    should_ignore = True
+            if rules.is_ignored(file, rel_path):
+                continue
+            yield rel_path, Path(root) / file
+
+
+class FileHashCache(JsonStore):
+    """Persistent map of file path to content digest, validated by (size, mtime_ns, inode)."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(db_path or DEFAULT_CACHE_PATH, "file_hashes")
+
+    def lookup_tree(self, directory: Path) -> Dict[str, Tuple[int, int, int, str]]:
+        """Returns cached (size, mtime_ns, inode, digest) rows for files under directory."""
+        rows = self.lookup_prefix(str(directory) + os.sep)
+        return {path: tuple(row) for path, row in rows.items()}
+
+    def store_files(self, rows: Iterable[Tuple[str, int, int, int, str]]):
+        """Caches (path, size, mtime_ns, inode, digest) rows."""
+        self.store((path, row) for path, *row in rows)
+
+
+def _hash_file(path: Path) -> str:
+    sha = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
                     break
+                sha.update(chunk)
+    except OSError:
+        pass  # Skip if unreadable
+    return sha.hexdigest()
 
-            if should_ignore:
-                continue
 
-            path = Path(root) / file
-            # Hash path (relative) and content
-            sha.update(rel_path.encode())
+def calculate_tree_digests(
+    directory: Path, cache: Optional[FileHashCache] = None
+) -> Dict[str, str]:
+    """
+    Calculates Merkle digests for a source directory and every included subdirectory.
+
+    Args:
+        directory: The build context to hash.
+        cache: File digest cache; the default persistent cache is used when omitted.
+
+    Returns:
+        A map of relative posix directory path ("" for the root) to digest. A subtree's
+        digest only depends on its own contents, so unchanged subtrees can be reused.
+    """
+    directory = Path(directory).resolve()
+    with store_or_default(cache, FileHashCache) as cache:
+        cached = cache.lookup_tree(directory) if cache else {}
+        files: List[Tuple[str, Path, Optional[os.stat_result]]] = []
+        digests: Dict[str, str] = {}
+        misses: List[Tuple[str, Path, Optional[os.stat_result]]] = []
+        for rel_path, path in _iter_source_files(directory):
             try:
-                with open(path, "rb") as f:
-                    while True:
-                        chunk = f.read(4096)
-                        if not chunk:
-                            break
-                        sha.update(chunk)
+                st = path.stat()
             except OSError:
-                pass  # Skip if unreadable
-    return sha.hexdigest()
+                st = None
+            files.append((rel_path, path, st))
+            hit = cached.get(str(path))
+            if st and hit and hit[:3] == (st.st_size, st.st_mtime_ns, st.st_ino):
+                digests[rel_path] = hit[3]
+            else:
+                misses.append((rel_path, path, st))
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+                fresh = pool.map(_hash_file, [path for _, path, _ in misses])
+                now = time.time_ns()
+                new_rows = []
+                for (rel_path, path, st), digest in zip(misses, fresh):
+                    digests[rel_path] = digest
+                    if st and now - st.st_mtime_ns > RACY_WINDOW_NS:
+                        new_rows.append(
+                            (str(path), st.st_size, st.st_mtime_ns, st.st_ino, digest)
+                        )
+            if cache and new_rows:
+                cache.store_files(new_rows)
+
+    # Fold file digests into their directories, deepest first.
+    files_by_dir: Dict[str, List[Tuple[str, str]]] = {"": []}
+    subdirs: Dict[str, set] = {}
+    for rel_path, _, _ in files:
+        parent, _, name = rel_path.rpartition("/")
+        files_by_dir.setdefault(parent, []).append((name, digests[rel_path]))
+        while parent:
+            grandparent, _, dirname = parent.rpartition("/")
+            subdirs.setdefault(grandparent, set()).add(dirname)
+            parent = grandparent
+
+    def depth(rel_dir: str) -> int:
+        return rel_dir.count("/") + 1 if rel_dir else 0
+
+    tree: Dict[str, str] = {}
+    for rel_dir in sorted(set(files_by_dir) | set(subdirs), key=depth, reverse=True):
+        entries = [
+            (name, "f", digest) for name, digest in files_by_dir.get(rel_dir, [])
+        ]
+        for name in subdirs.get(rel_dir, ()):
+            entries.append((name, "d", tree[f"{rel_dir}/{name}" if rel_dir else name]))
+        sha = hashlib.sha256()
+        for name, kind, digest in sorted(entries):
+            sha.update(f"{kind} {name} {digest}\n".encode())
+        tree[rel_dir] = sha.hexdigest()
+    return tree
+
+
+def calculate_source_hash(directory: Path) -> str:
+    """Calculates a deterministic hash of the source directory."""
+    return calculate_tree_digests(directory)[""]
@@ -0,0 +1,389 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent shell sessions for running workspace commands.
+
+Each session is a long-lived `bash` with job control on. A command is evaluated
+as a background job in a subshell (POSIX mode, so it behaves like `sh -c`): the job
+gets its own process group, stdin from /dev/null, stdout/stderr in fresh files in
+the session's scratch directory, and the command's working directory and
+environment (as a diff against the session's). The session then reports the
+job's pid and exit status on lines tagged with a per-command nonce.
+
+A timeout kills the job's process group and keeps the session. Sessions are kept
+idle per workspace and used by the threads of a dedicated executor, so at most
+`size` commands run at once and shell work never occupies the default executor.
+"""
+
+import asyncio
+import atexit
+import os
+import re
+import select
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SHELL_POOL_SIZE = int(os.environ.get("ADK_SHELL_POOL_SIZE", 8))
+SHELL_MAX_OUTPUT_BYTES = int(
+    os.environ.get("ADK_SHELL_MAX_OUTPUT_BYTES", 4 * 1024 * 1024)
+)
+
+# Grace period for a killed job to be reaped before the session is abandoned.
+KILL_GRACE_SECONDS = 5.0
+
+_ENV_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Variables bash maintains itself and will not let a command assign.
+_BASH_READONLY = {"BASHOPTS", "BASH_VERSINFO", "EUID", "PPID", "SHELLOPTS", "UID"}
+
+_POOL: Optional["ShellSessionPool"] = None
+_POOL_LOCK = threading.Lock()
+
+
+class ShellSessionUnavailable(RuntimeError):
+    """No session could start the command; it runs in a new process instead."""
+
+
+class ShellSessionLost(RuntimeError):
+    """The session failed after starting the command; the command is not retried."""
+
+
+@dataclass
+class ShellResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    truncated: bool = False
+
+
+def _read_capped(path: Path, max_bytes: int) -> tuple:
+    try:
+        with open(path, "rb") as f:
+            data = f.read(max_bytes + 1)
+    except OSError:
+        return "", False
+    truncated = len(data) > max_bytes
+    return data[:max_bytes].decode("utf-8", errors="replace"), truncated
+
+
+class _ShellSession:
+    """One persistent shell for one workspace; used by a single thread at a time."""
+
+    def __init__(self, bash: str, env: Dict[str, str]):
+        self.env = dict(env)
+        self.scratch = Path(tempfile.mkdtemp(prefix="adk_shell_"))
+        self.proc = subprocess.Popen(
+            [bash, "--noprofile", "--norc"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            start_new_session=True,
+        )
+        self._buffer = b""
+        self._counter = 0
+        self._send("set -m\n")
+
+    def _send(self, script: str):
+        try:
+            self.proc.stdin.write(script.encode())
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise ShellSessionUnavailable(f"Shell session failed: {e}")
+
+    def _read_line(self, deadline: Optional[float]) -> Optional[str]:
+        """Reads one protocol line; None if the deadline passes first."""
+        fd = self.proc.stdout.fileno()
+        while b"\n" not in self._buffer:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([fd], [], [], wait)
+            if not ready:
+                return None
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                raise ShellSessionUnavailable("Shell session exited.")
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line.decode()
+
+    def _expect(self, nonce: str, tag: str, deadline: Optional[float]) -> Optional[str]:
+        line = self._read_line(deadline)
+        if line is None:
+            return None
+        parts = line.split(" ")
+        if len(parts) != 3 or parts[0] != nonce or parts[1] != tag:
+            raise ShellSessionUnavailable(f"Shell session out of sync: {line!r}")
+        return parts[2]
+
+    def _env_script(self, env: Dict[str, str]) -> List[str]:
+        lines = []
+        for key, value in env.items():
+            if self.env.get(key) != value and key not in _BASH_READONLY:
+                lines.append(f"export {key}={shlex.quote(value)}")
+        for key in self.env.keys() - env.keys():
+            lines.append(f"unset {key}")
+        return lines
+
+    def run(
+        self,
+        command: str,
+        cwd: Path,
+        env: Dict[str, str],
+        timeout: float,
+        max_output_bytes: int,
+    ) -> ShellResult:
+        self._counter += 1
+        nonce = uuid.uuid4().hex
+        out_file = self.scratch / f"{self._counter}.out"
+        err_file = self.scratch / f"{self._counter}.err"
+
+        job = [
+            "set -o posix",
+            "shopt -s xpg_echo",  # `echo` interprets escapes, as in `sh`
+            f"cd -- {shlex.quote(str(cwd))} || exit 1",
+            *self._env_script(env),
+            # Quoted whole, so a malformed command cannot desync the session.
+            f"eval {shlex.quote(command)}",
+        ]
+        script = (
+            "( " + "\n".join(job) + "\n)"
+            f" </dev/null >{shlex.quote(str(out_file))}"
+            f" 2>{shlex.quote(str(err_file))} &\n"
+            "__adk_job=$!\n"
+            f'echo "{nonce} PID $__adk_job"\n'
+            "wait $__adk_job\n"
+            f'echo "{nonce} DONE $?"\n'
+        )
+        start = time.monotonic()
+        self._send(script)
+        pid = int(self._expect(nonce, "PID", start + KILL_GRACE_SECONDS) or 0)
+        if not pid:
+            raise ShellSessionUnavailable("Shell session did not start the command.")
+
+        try:
+            timed_out = False
+            status = self._expect(nonce, "DONE", start + timeout)
+            if status is None:
+                timed_out = True
+                try:
+                    os.killpg(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                status = self._expect(
+                    nonce, "DONE", time.monotonic() + KILL_GRACE_SECONDS
+                )
+                if status is None:
+                    raise ShellSessionLost("Timed out command could not be killed.")
+        except ShellSessionUnavailable as e:
+            raise ShellSessionLost(str(e))
+
+        stdout, out_truncated = _read_capped(out_file, max_output_bytes)
+        stderr, err_truncated = _read_capped(err_file, max_output_bytes)
+        for path in (out_file, err_file):
+            path.unlink(missing_ok=True)
+        return ShellResult(
+            returncode=int(status),
+            stdout=stdout,
+            stderr=stderr,
+            timed_out=timed_out,
+            truncated=out_truncated or err_truncated,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self):
+        if self.proc.poll() is None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.proc.wait()
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+
+class ShellSessionPool:
+    """A bounded pool of persistent shell sessions, kept idle per workspace."""
+
+    def __init__(self, size: int = SHELL_POOL_SIZE, bash: Optional[str] = None):
+        self.size = max(1, size)
+        self.bash = bash or shutil.which("bash") or "/bin/bash"
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="adk-shell"
+        )
+        self._idle: Dict[str, List[_ShellSession]] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "commands": 0,
+            "timeouts": 0,
+            "truncated": 0,
+            "session_starts": 0,
+            "fallbacks": 0,
+            "busy_seconds": 0.0,
+        }
+
+    def _acquire(self, workspace: str, env: Dict[str, str]) -> _ShellSession:
+        with self._lock:
+            idle = self._idle.get(workspace, [])
+            while idle:
+                session = idle.pop()
+                if session.alive:
+                    return session
+                session.close()
+            self.stats["session_starts"] += 1
+        try:
+            return _ShellSession(self.bash, env)
+        except OSError as e:
+            raise ShellSessionUnavailable(f"Could not start {self.bash}: {e}")
+
+    def _release(self, workspace: str, session: _ShellSession):
+        with self._lock:
+            idle = self._idle.setdefault(workspace, [])
+            if session.alive and len(idle) < self.size:
+                idle.append(session)
+                return
+        session.close()
+
+    def _run_blocking(
+        self,
+        workspace: str,
+        command: str,
+        cwd: Path,
+        env: Dict[str, str],
+        timeout: float,
+        max_output_bytes: int,
+    ) -> ShellResult:
+        start = time.monotonic()
+        try:
+            if not all(_ENV_NAME.match(key) for key in env):
+                raise ShellSessionUnavailable("Environment not expressible in a shell.")
+            session = self._acquire(workspace, env)
+            try:
+                result = session.run(command, cwd, env, timeout, max_output_bytes)
+            except BaseException:
+                session.close()
+                raise
+            self._release(workspace, session)
+        except ShellSessionUnavailable:
+            result = self._run_subprocess(command, cwd, env, timeout, max_output_bytes)
+        with self._lock:
+            self.stats["commands"] += 1
+            self.stats["timeouts"] += result.timed_out
+            self.stats["truncated"] += result.truncated
+            self.stats["busy_seconds"] += time.monotonic() - start
+        return result
+
+    def _run_subprocess(
+        self,
+        command: str,
+        cwd: Path,
+        env: Dict[str, str],
+        timeout: float,
+        max_output_bytes: int,
+    ) -> ShellResult:
+        """Runs the command the pre-session way, still on this pool's thread."""
+        with self._lock:
+            self.stats["fallbacks"] += 1
+        try:
+            result = subprocess.run(
+                command,
+                shell=True,
+                capture_output=True,
+                cwd=cwd,
+                timeout=timeout,
+                env=env,
+                stdin=subprocess.DEVNULL,
+            )
+        except subprocess.TimeoutExpired:
+            return ShellResult(-signal.SIGKILL, "", "", timed_out=True)
+        truncated = max(len(result.stdout), len(result.stderr)) > max_output_bytes
+        return ShellResult(
+            returncode=result.returncode,
+            stdout=result.stdout[:max_output_bytes].decode("utf-8", errors="replace"),
+            stderr=result.stderr[:max_output_bytes].decode("utf-8", errors="replace"),
+            truncated=truncated,
+        )
+
+    async def run(
+        self,
+        workspace: Path,
+        command: str,
+        cwd: Path,
+        env: Dict[str, str],
+        timeout: float = 60,
+        max_output_bytes: int = SHELL_MAX_OUTPUT_BYTES,
+    ) -> ShellResult:
+        """Runs a shell command in `cwd` with exactly the environment `env`."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self._run_blocking,
+            str(workspace),
+            command,
+            cwd,
+            env,
+            timeout,
+            max_output_bytes,
+        )
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters plus mean latency and the number of idle sessions."""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics["idle_sessions"] = sum(len(s) for s in self._idle.values())
+        metrics["mean_seconds"] = (
+            metrics["busy_seconds"] / metrics["commands"]
+            if metrics["commands"]
+            else 0.0
+        )
+        return metrics
+
+    def close(self):
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for session in sessions:
+            session.close()
+        self._executor.shutdown(wait=False)
+
+
+def get_shell_session_pool() -> Optional[ShellSessionPool]:
+    """Returns the process-wide shell session pool, or None if it is disabled."""
+    global _POOL
+    if SHELL_POOL_SIZE <= 0 or os.name != "posix":
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ShellSessionPool()
+        return _POOL
+
+
+@atexit.register
+def _close_pool():
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
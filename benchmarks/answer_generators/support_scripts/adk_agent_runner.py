@@ -12,13 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""A utility script to execute an ADK Agent and capture its response and logs."""
+"""A utility script to execute an ADK Agent and capture its response and logs.
+
+Run with `--serve` to start a warm worker instead: ADK is imported once, then each
+JSON request read from stdin is executed in a forked child and answered with one
+JSON line on stdout (see benchmarks/answer_generators/agent_runner_pool.py).
+"""
 
 import sys
 import argparse
 import importlib.util
 import asyncio
 import io
+import select
+import shutil
+import signal
+import tempfile
 import traceback
 import os
 import json
@@ -119,5 +128,106 @@ async def main():
         print(traceback.format_exc())
 
 
+def _read_capped(path: str, limit: int) -> tuple[str, bool]:
+    with open(path, "rb") as f:
+        data = f.read(limit + 1)
+    return data[:limit].decode("utf-8", errors="replace"), len(data) > limit
+
+
+def _run_in_child(request: dict, run_dir: str, protocol_fd: int) -> int:
+    """Runs one request in the forked child; returns its exit code."""
+    os.setsid()
+    os.close(protocol_fd)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    sys.stdin = open(os.devnull, "r")  # Drop the worker's buffered requests.
+    for fd, name in ((1, "stdout"), (2, "stderr")):
+        out = os.open(
+            os.path.join(run_dir, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        )
+        os.dup2(out, fd)
+
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.environ["TMPDIR"] = run_dir
+    tempfile.tempdir = None
+    os.chdir(request["cwd"])
+    sys.argv = [__file__] + request["args"]
+    try:
+        asyncio.run(main())
+        return 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _run_forked(request: dict, protocol_fd: int) -> dict:
+    run_dir = tempfile.mkdtemp(prefix="adk_agent_run_")
+    done_r, done_w = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(done_r)
+        os._exit(_run_in_child(request, run_dir, protocol_fd))
+
+    os.close(done_w)
+    try:
+        # The pipe reaches EOF when the child exits (its write end closes with it).
+        ready, _, _ = select.select([done_r], [], [], request["timeout"])
+        timed_out = not ready
+        try:
+            # Also reaps anything the agent left running in its session.
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        _, status = os.waitpid(pid, 0)
+        limit = request["max_output_bytes"]
+        stdout, stdout_truncated = _read_capped(os.path.join(run_dir, "stdout"), limit)
+        stderr, stderr_truncated = _read_capped(os.path.join(run_dir, "stderr"), limit)
+        return {
+            "returncode": os.waitstatus_to_exitcode(status),
+            "stdout": stdout,
+            "stderr": stderr,
+            "timed_out": timed_out,
+            "truncated": stdout_truncated or stderr_truncated,
+        }
+    finally:
+        os.close(done_r)
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def serve():
+    """Warm worker loop: answers one JSON request per stdin line."""
+    from google.adk.apps import App  # noqa: F401 - imported once, inherited by forks
+    from google.adk.runners import InMemoryRunner  # noqa: F401
+    from google.genai import types  # noqa: F401
+
+    # Keep the protocol on a private fd so stray prints cannot corrupt it.
+    protocol_fd = os.dup(1)
+    os.dup2(2, 1)
+    protocol = os.fdopen(protocol_fd, "w")
+    protocol.write(json.dumps({"ready": True}) + "\n")
+    protocol.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _run_forked(json.loads(line), protocol_fd)
+        except Exception:
+            response = {"error": traceback.format_exc()}
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if sys.argv[1:] == ["--serve"]:
+        serve()
+    else:
+        asyncio.run(main())
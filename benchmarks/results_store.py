@@ -0,0 +1,242 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar storage for benchmark run results.
+
+`results.json.gz` stores every `BenchmarkRunResult` (including full traces) as one
+JSON array, so computing a pass rate requires decompressing and validating the whole
+run. This module writes an additional pair of artifacts next to it:
+
+- `results.parquet`: one row per result with the scalar columns used by dashboards
+  (generator, case, status, latency, tokens, error type, ...).
+- `results_payloads.bin`: the heavy nested fields (traces, attempts, answers) of each
+  row, individually zlib-compressed and concatenated. The Parquet table stores the
+  byte offset and length of each payload so a single result can be loaded on demand.
+"""
+
+import argparse
+import gzip
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from benchmarks.data_models import BenchmarkRunResult
+
+RESULTS_COLUMNS_FILE = "results.parquet"
+RESULTS_PAYLOADS_FILE = "results_payloads.bin"
+
+# Fields of BenchmarkRunResult that are stored inline as Parquet columns.
+SCALAR_FIELDS = [
+    "id",
+    "suite",
+    "benchmark_name",
+    "benchmark_type",
+    "answer_generator",
+    "status",
+    "result",
+    "error_type",
+    "latency",
+]
+
+# Derived scalar columns (flattened from usage_metadata / generation_attempts).
+DERIVED_COLUMNS = [
+    "total_tokens",
+    "prompt_tokens",
+    "completion_tokens",
+    "cost",
+    "num_attempts",
+    "attempts_summary",
+]
+
+
+def _flatten_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extracts the scalar column values from a JSON-mode result dump."""
+    row = {field: data.get(field) for field in SCALAR_FIELDS}
+
+    usage = data.get("usage_metadata") or {}
+    row["total_tokens"] = usage.get("total_tokens")
+    row["prompt_tokens"] = usage.get("prompt_tokens")
+    row["completion_tokens"] = usage.get("completion_tokens")
+    row["cost"] = usage.get("cost")
+
+    # Attempts are kept as a compact JSON summary (key id / status / error) so the
+    # API key breakdown does not need to touch the payload file.
+    attempts = data.get("generation_attempts") or []
+    row["num_attempts"] = len(attempts)
+    row["attempts_summary"] = json.dumps(
+        [
+            {
+                "api_key_id": a.get("api_key_id"),
+                "status": a.get("status"),
+                "error_message": a.get("error_message"),
+            }
+            for a in attempts
+        ]
+    )
+    return row
+
+
+def write_columnar_results(
+    results: Iterable[BenchmarkRunResult | Dict[str, Any]], run_dir: Path
+) -> Path:
+    """Writes the columnar results artifacts for a run.
+
+    Args:
+        results: Result models, or their `model_dump(mode="json")` dictionaries.
+        run_dir: The run output directory.
+
+    Returns:
+        The path to the written Parquet file.
+    """
+    run_dir = Path(run_dir)
+    columns_path = run_dir / RESULTS_COLUMNS_FILE
+    payloads_path = run_dir / RESULTS_PAYLOADS_FILE
+
+    rows: List[Dict[str, Any]] = []
+    offset = 0
+    tmp_payloads = payloads_path.with_suffix(".bin.tmp")
+    with open(tmp_payloads, "wb") as f:
+        for r in results:
+            data = r.model_dump(mode="json") if isinstance(r, BenchmarkRunResult) else r
+            row = _flatten_row(data)
+
+            # The payload holds every non-scalar field; loading it back and merging
+            # with the scalar columns reproduces the original model exactly.
+            payload = {k: v for k, v in data.items() if k not in SCALAR_FIELDS}
+            blob = zlib.compress(
+                json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            )
+            f.write(blob)
+
+            row["payload_offset"] = offset
+            row["payload_length"] = len(blob)
+            offset += len(blob)
+            rows.append(row)
+
+    df = pd.DataFrame(
+        rows,
+        columns=SCALAR_FIELDS + DERIVED_COLUMNS + ["payload_offset", "payload_length"],
+    )
+    tmp_columns = columns_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_columns, index=False)
+
+    # Replace the payloads first: a Parquet table must never point into a payload
+    # file written by a different run of this function.
+    tmp_payloads.replace(payloads_path)
+    tmp_columns.replace(columns_path)
+    return columns_path
+
+
+def has_columnar_results(run_dir: Path) -> bool:
+    """Returns True if the run directory contains the columnar artifacts."""
+    run_dir = Path(run_dir)
+    return (run_dir / RESULTS_COLUMNS_FILE).exists() and (
+        run_dir / RESULTS_PAYLOADS_FILE
+    ).exists()
+
+
+def load_results_frame(
+    run_dir: Path, columns: Optional[List[str]] = None
+) -> Optional[pd.DataFrame]:
+    """Loads the scalar results table for a run.
+
+    Args:
+        run_dir: The run output directory.
+        columns: Optional subset of columns to read.
+
+    Returns:
+        The DataFrame (row order matches `results.json.gz`), or None if the run has
+        no columnar artifact.
+    """
+    path = Path(run_dir) / RESULTS_COLUMNS_FILE
+    if not path.exists():
+        return None
+    return pd.read_parquet(path, columns=columns)
+
+
+class ResultPayloadReader:
+    """Lazily loads full `BenchmarkRunResult` objects from the payload file."""
+
+    def __init__(self, run_dir: Path, frame: Optional[pd.DataFrame] = None):
+        self.run_dir = Path(run_dir)
+        self.payloads_path = self.run_dir / RESULTS_PAYLOADS_FILE
+        self.frame = frame if frame is not None else load_results_frame(self.run_dir)
+        if self.frame is None:
+            raise FileNotFoundError(
+                f"No {RESULTS_COLUMNS_FILE} found in {self.run_dir}"
+            )
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def load_payload(self, index: int) -> Dict[str, Any]:
+        """Returns the decoded heavy fields for the row at `index`."""
+        row = self.frame.iloc[index]
+        with open(self.payloads_path, "rb") as f:
+            f.seek(int(row["payload_offset"]))
+            blob = f.read(int(row["payload_length"]))
+        return json.loads(zlib.decompress(blob))
+
+    def load(self, index: int) -> BenchmarkRunResult:
+        """Reconstructs the full result model for the row at `index`."""
+        row = self.frame.iloc[index]
+        data = {field: row[field] for field in SCALAR_FIELDS}
+        # pandas stores missing strings as None/NaN; pydantic expects None.
+        data = {k: (None if _is_missing(v) else v) for k, v in data.items()}
+        data["result"] = int(data["result"])
+        data["latency"] = float(data["latency"] or 0.0)
+        data.update(self.load_payload(index))
+        return BenchmarkRunResult.model_validate(data)
+
+    def __getitem__(self, index: int) -> BenchmarkRunResult:
+        return self.load(index)
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return value is None or bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def convert_run(run_dir: Path) -> Optional[Path]:
+    """Builds the columnar artifacts from an existing `results.json.gz` (backfill)."""
+    run_dir = Path(run_dir)
+    path_gz = run_dir / "results.json.gz"
+    if not path_gz.exists():
+        print(f"No results.json.gz in {run_dir}, skipping.")
+        return None
+    with gzip.open(path_gz, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    return write_columnar_results(data, run_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill columnar results (results.parquet) for existing runs."
+    )
+    parser.add_argument("run_dirs", nargs="+", help="Benchmark run directories.")
+    args = parser.parse_args()
+
+    for run_dir in args.run_dirs:
+        path = convert_run(Path(run_dir))
+        if path:
+            print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Test Adk Answer Generator Overhead module."""
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import os
+import time
+import tracemalloc
+from typing import Dict
+
+import pytest
+from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from benchmarks.answer_generators.adk_answer_generator import AdkAnswerGenerator
+
+"""
+Fake-model benchmark of the per-case overhead of AdkAnswerGenerator.
+
+The model answers instantly, so the time per case is what the generator and the ADK
+flow spend around it. Runs with a pooled runner (the default) are compared against
+building an App and Runner for every case, as the generator did before pooling. Like
+`timeit`, the two are timed in alternating rounds with the garbage collector off, and
+the best round of each is reported.
+
+    ADK_OVERHEAD_BENCHMARK=1 pytest benchmarks/tests/stress/test_adk_answer_generator_overhead.py
+    python -m benchmarks.tests.stress.test_adk_answer_generator_overhead --cases 100
+"""
+
+CASES = int(os.environ.get("ADK_OVERHEAD_CASES", 100))
+ROUNDS = int(os.environ.get("ADK_OVERHEAD_ROUNDS", 5))
+WARMUP_CASES = 20
+MODES = {"per_case_runner": False, "pooled_runner": True}
+
+
+class InstantLlm(BaseLlm):
+    """A fake model that answers at once with a fixed usage report."""
+
+    async def generate_content_async(self, request, **kwargs):
+        yield LlmResponse(
+            content=types.Content(parts=[types.Part(text="ok")], role="model"),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=3, candidates_token_count=2, total_token_count=5
+            ),
+        )
+
+
+def lookup(query: str) -> str:
+    """Looks up a query."""
+    return query
+
+
+def _pipeline() -> SequentialAgent:
+    """A four-step pipeline with tools, like the multi-agent generators."""
+    return SequentialAgent(
+        name="pipeline",
+        sub_agents=[
+            LlmAgent(
+                name=f"step_{i}",
+                model=InstantLlm(model="fake-model"),
+                instruction="Answer the question.",
+                tools=[lookup],
+            )
+            for i in range(4)
+        ],
+    )
+
+
+async def _run_cases(generator: AdkAnswerGenerator, cases: int, pooled: bool):
+    for _ in range(cases):
+        if not pooled:
+            # The next case builds its own App and Runner.
+            generator._runners.clear()
+        await generator._run_agent_async("What does lookup return?")
+
+
+async def _timed(generator: AdkAnswerGenerator, cases: int, pooled: bool) -> float:
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        await _run_cases(generator, cases, pooled)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+async def _traced_peak(generator: AdkAnswerGenerator, cases: int, pooled: bool):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await _run_cases(generator, cases, pooled)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def compare(cases: int, rounds: int = ROUNDS) -> Dict[str, Dict[str, float]]:
+    """Best milliseconds per case and traced peak allocation (KB) for each mode."""
+    generators = {
+        label: AdkAnswerGenerator(agent=_pipeline(), name=label) for label in MODES
+    }
+    timings = {label: [] for label in MODES}
+    # Silences the timing report printed for every case.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, pooled in MODES.items():
+            await _run_cases(generators[label], WARMUP_CASES, pooled)
+        for _ in range(rounds):
+            for label, pooled in MODES.items():
+                timings[label].append(await _timed(generators[label], cases, pooled))
+        # A separate pass: tracing allocations slows every case down.
+        peaks = {
+            label: await _traced_peak(generators[label], cases, pooled)
+            for label, pooled in MODES.items()
+        }
+
+    results = {}
+    for label, generator in generators.items():
+        await generator.teardown()
+        results[label] = {
+            "ms_per_case": min(timings[label]) / cases * 1e3,
+            "peak_kb": peaks[label] / 1e3,
+        }
+        print(
+            f"{label}: {results[label]['ms_per_case']:.2f} ms/case,"
+            f" traced peak {results[label]['peak_kb']:.0f} KB"
+            f" (best of {rounds} rounds of {cases} cases)"
+        )
+    return results
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ADK_OVERHEAD_BENCHMARK"),
+    reason="Set ADK_OVERHEAD_BENCHMARK=1 to run the fake-model overhead benchmark",
+)
+async def test_pooled_runner_overhead():
+    results = await compare(CASES)
+    # The saving is a fraction of a millisecond per case, close to the noise between
+    # rounds on a shared machine; this only guards against pooling making cases slower.
+    assert (
+        results["pooled_runner"]["ms_per_case"]
+        <= 1.1 * results["per_case_runner"]["ms_per_case"]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=CASES)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    args = parser.parse_args()
+    asyncio.run(compare(args.cases, args.rounds))
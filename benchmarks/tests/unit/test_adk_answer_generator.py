@@ -0,0 +1,108 @@
+"""Test Adk Answer Generator module."""
+
+import asyncio
+
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from benchmarks.answer_generators.adk_answer_generator import AdkAnswerGenerator
+from benchmarks.data_models import TraceEventType
+
+
+class EchoLlm(BaseLlm):
+    """A fake model that answers with the last line of the prompt after a short delay."""
+
+    async def generate_content_async(self, request, **kwargs):
+        await asyncio.sleep(0.01)
+        prompt = "".join(p.text for p in request.contents[-1].parts if p.text)
+        content = types.Content(
+            parts=[types.Part(text=f"echo: {prompt.splitlines()[-1]}")], role="model"
+        )
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=3, candidates_token_count=2, total_token_count=5
+        )
+        yield LlmResponse(content=content, usage_metadata=usage)
+
+
+def _generator():
+    agent = LlmAgent(name="echo_agent", model=EchoLlm(model="fake-model"))
+    return AdkAnswerGenerator(agent=agent, name="echo_gen")
+
+
+async def test_runner_is_reused_across_cases():
+    generator = _generator()
+
+    await generator._run_agent_async("first")
+    await generator._run_agent_async("second")
+
+    assert len(generator._runners) == 1
+    pooled = next(iter(generator._runners.values()))
+    assert pooled.cases_run == 2
+    await generator.teardown()
+    assert generator._runners == {}
+
+
+async def test_concurrent_cases_get_their_own_traces():
+    generator = _generator()
+
+    results = await asyncio.gather(
+        *(generator._run_agent_async(f"case {i}") for i in range(8))
+    )
+
+    for i, (response, logs, usage, _) in enumerate(results):
+        assert response == f"echo: case {i}"
+        model_messages = [
+            log.content
+            for log in logs
+            if log.type == TraceEventType.MESSAGE and log.role == "model"
+        ]
+        assert model_messages == [f"echo: case {i}"]
+        assert usage.total_tokens == 5
+
+
+async def test_sessions_are_released_after_each_case():
+    generator = _generator()
+
+    _, _, _, session_id = await generator._run_agent_async("hello")
+
+    pooled = next(iter(generator._runners.values()))
+    assert pooled.router.active_sessions == 0
+    session = await pooled.runner.session_service.get_session(
+        app_name=pooled.app.name, user_id="benchmark_user", session_id=session_id
+    )
+    assert session is None
+
+
+async def test_pooled_runner_closes_cleanly(monkeypatch):
+    generator = _generator()
+    await asyncio.gather(*(generator._run_agent_async(f"case {i}") for i in range(3)))
+
+    pooled = next(iter(generator._runners.values()))
+    closed = []
+
+    async def close():
+        closed.append(pooled.router.name)
+
+    monkeypatch.setattr(pooled.router, "close", close)
+    await generator.teardown()
+
+    # Runner.close() reaches the router, and the cases left nothing behind.
+    assert closed == ["trace_router"]
+    assert generator._runners == {}
+    assert pooled.router.active_sessions == 0
+    sessions = pooled.runner.session_service.sessions[pooled.app.name]
+    assert sessions == {"benchmark_user": {}}
+
+
+def test_runners_of_closed_loops_are_dropped():
+    generator = _generator()
+
+    asyncio.run(generator._run_agent_async("first"))
+    [first] = generator._runners.values()
+    asyncio.run(generator._run_agent_async("second"))
+    [second] = generator._runners.values()
+
+    assert second is not first
+    assert second.cases_run == 1
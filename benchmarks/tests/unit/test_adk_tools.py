@@ -329,11 +329,11 @@ class TestAdkTools(unittest.IsolatedAsyncioTestCase):
         initial_state = {"key": "value"}
         initial_state_str = json.dumps(initial_state)
 
-        # Mock run_shell_command to verify it gets called with correct python script
+        # Mock the runner invocation to verify it gets called with correct python script
         with patch.object(
-            self.tools, "run_shell_command", new_callable=MagicMock
+            self.tools, "_run_agent_runner", new_callable=MagicMock
         ) as mock_run_shell:
-            # Must set return value as a coroutine/future because run_shell_command is async
+            # Must set return value as a coroutine/future because _run_agent_runner is async
             f = asyncio.Future()
             f.set_result("Agent Output")
             mock_run_shell.return_value = f
@@ -372,7 +372,7 @@ class TestAdkTools(unittest.IsolatedAsyncioTestCase):
         long_output = "start" + ("." * 3000) + "end"
 
         with patch.object(
-            self.tools, "run_shell_command", new_callable=MagicMock
+            self.tools, "_run_agent_runner", new_callable=MagicMock
         ) as mock_run_shell:
             f = asyncio.Future()
             f.set_result(long_output)
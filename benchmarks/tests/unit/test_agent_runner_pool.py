@@ -0,0 +1,64 @@
+"""Test Agent Runner Pool module."""
+
+import os
+import sys
+
+import pytest
+
+from benchmarks.answer_generators.agent_runner_pool import AgentRunnerPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = AgentRunnerPool(sys.executable, size=1)
+    yield pool
+    pool.close()
+
+
+def _args(agent_file):
+    return ["--agent-file", agent_file, "--prompt", "hi", "--model-name", "m"]
+
+
+async def test_runs_reuse_one_warm_worker(pool, tmp_path):
+    (tmp_path / "agent.py").write_text(
+        "import os\nprint('KEY', os.environ.get('GEMINI_API_KEY'))\n"
+    )
+    env = {**os.environ, "GEMINI_API_KEY": "k1"}
+
+    first = await pool.run(_args("agent.py"), cwd=tmp_path, env=env)
+    env["GEMINI_API_KEY"] = "k2"
+    second = await pool.run(_args("agent.py"), cwd=tmp_path, env=env)
+
+    assert "KEY k1" in first.stdout
+    # Missing create_agent is reported the same way as by the standalone script.
+    assert "must define a 'create_agent" in first.stdout
+    assert "KEY k2" in second.stdout
+    assert pool.worker_starts == 1
+
+
+async def test_timeout_kills_the_run_and_keeps_the_worker(pool, tmp_path):
+    (tmp_path / "slow.py").write_text("import time\ntime.sleep(30)\n")
+    (tmp_path / "fast.py").write_text("print('done')\n")
+    starts = pool.worker_starts
+
+    result = await pool.run(
+        _args("slow.py"), cwd=tmp_path, env=dict(os.environ), timeout=1
+    )
+    after = await pool.run(_args("fast.py"), cwd=tmp_path, env=dict(os.environ))
+
+    assert result.timed_out
+    assert "done" in after.stdout
+    assert pool.worker_starts == starts
+
+
+async def test_output_is_capped(pool, tmp_path):
+    (tmp_path / "loud.py").write_text("print('x' * 100000)\n")
+
+    result = await pool.run(
+        _args("loud.py"), cwd=tmp_path, env=dict(os.environ), max_output_bytes=1000
+    )
+
+    assert result.truncated
+    assert len(result.stdout) == 1000
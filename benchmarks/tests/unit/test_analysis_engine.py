@@ -0,0 +1,157 @@
+"""Test Analysis Engine module."""
+
+import pandas as pd
+
+from benchmarks import analysis
+from benchmarks.analysis import (
+    AnalysisEngine,
+    get_token_usage_stats,
+    get_tool_success_stats,
+)
+from benchmarks.data_models import (
+    BenchmarkResultType,
+    BenchmarkRunResult,
+    TraceLogEvent,
+)
+from benchmarks.results_store import write_columnar_results
+
+
+def _result(case_id, generator, passed, tools):
+    usage = {
+        "usage_metadata": {
+            "prompt_token_count": 10,
+            "candidates_token_count": 5,
+            "total_token_count": 15,
+        }
+    }
+    logs = [
+        TraceLogEvent(
+            type="tool_use",
+            author="agent",
+            timestamp=f"{case_id}-t{i}",
+            tool_name=tool,
+            details=usage,
+        )
+        for i, tool in enumerate(tools)
+    ]
+    logs.append(
+        TraceLogEvent(
+            type="message",
+            role="model",
+            author="agent",
+            timestamp=f"{case_id}-final",
+            details=usage,
+        )
+    )
+    return BenchmarkRunResult(
+        id=case_id,
+        suite="benchmarks/benchmark_definitions/fix_errors/benchmark.yaml",
+        benchmark_name=case_id,
+        answer_generator=generator,
+        status=(
+            BenchmarkResultType.PASS if passed else BenchmarkResultType.FAIL_VALIDATION
+        ),
+        result=1 if passed else 0,
+        answer="",
+        trace_logs=logs,
+    )
+
+
+def _results():
+    return [
+        _result("c1", "gen_a", True, ["search"]),
+        _result("c2", "gen_a", False, ["search", "read"]),
+        _result("c3", "gen_b", True, ["read"]),
+        _result("c4", "gen_b", True, []),
+    ]
+
+
+def test_tool_success_stats():
+    stats = get_tool_success_stats(_results()).set_index("tool")
+
+    assert stats.loc["search", "times_used"] == 2
+    assert stats.loc["search", "successes"] == 1
+    assert stats.loc["read", "success_rate"] == 0.5
+    # Overall pass rate is 3/4
+    assert stats.loc["search", "lift"] == 0.5 - 0.75
+
+
+def test_tool_success_stats_per_generator_uses_generator_pass_rate():
+    engine = AnalysisEngine(_results())
+    stats = engine.tool_success_stats(generator="gen_b").set_index("tool")
+
+    assert list(stats.index) == ["read"]
+    assert stats.loc["read", "lift"] == 0.0
+
+
+def test_token_usage_groups_generations():
+    token_df = get_token_usage_stats(_results())
+
+    c2 = token_df[token_df["Benchmark"] == "c2"]
+    assert c2["Action"].tolist() == ["Tool: search", "Tool: read", "Text Generation"]
+    assert token_df["Total Tokens"].sum() == 15 * 8
+
+
+def test_columnar_parallel_extraction_matches_in_memory(tmp_path, monkeypatch):
+    results = _results()
+    write_columnar_results(results, tmp_path)
+    monkeypatch.setattr(analysis, "PARALLEL_EXTRACTION_MIN_RESULTS", 1)
+
+    in_memory = AnalysisEngine(results)
+    columnar = AnalysisEngine.from_run_dir(tmp_path, max_workers=2)
+
+    pd.testing.assert_frame_equal(in_memory.token_usage, columnar.token_usage)
+    pd.testing.assert_frame_equal(
+        in_memory.tool_success_stats().reset_index(drop=True),
+        columnar.tool_success_stats().reset_index(drop=True),
+    )
+
+
+def test_derived_frames_are_cached_by_content_hash(tmp_path, monkeypatch):
+    analysis._FRAME_CACHE.clear()
+    write_columnar_results(_results(), tmp_path)
+    first = AnalysisEngine.from_run_dir(tmp_path)
+    expected = first.token_usage
+    cache_dir = tmp_path / AnalysisEngine.CACHE_DIR_NAME / first.content_hash[:16]
+    assert (cache_dir / "token_usage.parquet").exists()
+    assert (cache_dir / "tool_usage.parquet").exists()
+
+    analysis._FRAME_CACHE.clear()
+
+    def fail_extract(self):
+        raise AssertionError("Traces should not be re-parsed")
+
+    monkeypatch.setattr(AnalysisEngine, "_extract_traces", fail_extract)
+    second = AnalysisEngine.from_run_dir(tmp_path)
+    pd.testing.assert_frame_equal(second.token_usage, expected)
+
+
+def test_frame_cache_keeps_only_recent_runs(tmp_path, monkeypatch):
+    analysis._FRAME_CACHE.clear()
+    monkeypatch.setattr(analysis, "FRAME_CACHE_MAX_ENTRIES", 2)
+    engines = []
+    for i in range(3):
+        run_dir = tmp_path / f"run{i}"
+        run_dir.mkdir()
+        write_columnar_results(_results()[: i + 1], run_dir)
+        engines.append(AnalysisEngine.from_run_dir(run_dir, use_disk_cache=False))
+        engines[-1].token_usage
+
+    assert list(analysis._FRAME_CACHE) == [
+        (engine.content_hash, "token_usage") for engine in engines[1:]
+    ]
+
+
+def test_content_hash_is_reused_until_the_artifacts_change(tmp_path, monkeypatch):
+    write_columnar_results(_results(), tmp_path)
+    first = AnalysisEngine.from_run_dir(tmp_path).content_hash
+
+    def fail_hash():
+        raise AssertionError("Unchanged artifacts should not be hashed again")
+
+    with monkeypatch.context() as m:
+        m.setattr(analysis.hashlib, "sha256", fail_hash)
+        assert AnalysisEngine.from_run_dir(tmp_path).content_hash == first
+
+    write_columnar_results(_results()[:1], tmp_path)
+    assert AnalysisEngine.from_run_dir(tmp_path).content_hash != first
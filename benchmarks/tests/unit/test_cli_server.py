@@ -0,0 +1,149 @@
+"""Test Cli Server module."""
+
+import asyncio
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+CLI_SERVER_PATH = (
+    Path(__file__).resolve().parents[2]
+    / "answer_generators"
+    / "gemini_cli_docker"
+    / "base"
+    / "cli_server.py"
+)
+
+
+@pytest.fixture
+def cli_server():
+    # cli_server.py is copied into the container image standalone, so load it by path.
+    spec = importlib.util.spec_from_file_location("cli_server", CLI_SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fake_gemini(tmp_path):
+    """Puts a fake `gemini` executable on a PATH that can be passed via `env`."""
+    script = tmp_path / "gemini"
+    script.write_text(
+        "#!/bin/sh\n"
+        'echo \'{"type": "message", "data": {"role": "model", "content": "Hi"}}\'\n'
+        "echo 'warning' >&2\n"
+        'echo \'{"type": "result", "data": {"stats": {}}}\'\n'
+        "exit 3\n"
+    )
+    script.chmod(0o755)
+    return {"PATH": f"{tmp_path}{os.pathsep}{os.environ['PATH']}"}
+
+
+def test_stream_forwards_lines_and_returncode(cli_server, fake_gemini):
+    client = TestClient(cli_server.app)
+
+    with client.stream(
+        "POST", "/stream", json={"args": ["gemini", "prompt"], "env": fake_gemini}
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in resp.iter_lines() if line]
+
+    stdout = [r["stdout"] for r in records if "stdout" in r]
+    assert [json.loads(line)["type"] for line in stdout] == ["message", "result"]
+    assert {"stderr": "warning"} in records
+    assert records[-1] == {"returncode": 3}
+
+
+def test_stream_rejects_non_gemini_commands(cli_server):
+    client = TestClient(cli_server.app)
+
+    resp = client.post("/stream", json={"args": ["ls"]})
+
+    assert resp.status_code == 400
+
+
+def _write_gemini(tmp_path, body):
+    script = tmp_path / "gemini"
+    script.write_text("#!/bin/sh\n" + body)
+    script.chmod(0o755)
+    return {"PATH": f"{tmp_path}{os.pathsep}{os.environ['PATH']}"}
+
+
+def _pid_alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Zombies are dead, just not yet reaped by their new parent.
+            return f.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_stream_reports_and_skips_overlong_lines(cli_server, tmp_path):
+    # The long line is larger than a pipe buffer, so the CLI blocks unless it is drained.
+    env = _write_gemini(
+        tmp_path,
+        "echo before\n"
+        "head -c 200000 /dev/zero | tr '\\0' x\n"
+        "echo\n"
+        "echo after\n",
+    )
+    cli_server.STREAM_LINE_LIMIT = 1024
+    client = TestClient(cli_server.app)
+
+    with client.stream(
+        "POST", "/stream", json={"args": ["gemini"], "env": env, "timeout": 10}
+    ) as resp:
+        records = [json.loads(line) for line in resp.iter_lines() if line]
+
+    assert records == [
+        {"stdout": "before"},
+        {"error": "line_too_long", "stream": "stdout"},
+        {"stdout": "after"},
+        {"returncode": 0},
+    ]
+
+
+async def test_deadline_kills_process_group(cli_server, tmp_path):
+    pid_file = tmp_path / "child.pid"
+    env = _write_gemini(tmp_path, f"sleep 30 &\necho $! > {pid_file}\nwait\n")
+    transport = httpx.ASGITransport(app=cli_server.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        resp = await client.post(
+            "/", json={"args": ["gemini"], "env": env, "timeout": 0.5}
+        )
+        metrics = (await client.get("/metrics")).json()
+
+    assert resp.status_code == 504
+    assert resp.json()["error"] == "timed_out"
+    child_pid = int(pid_file.read_text())
+    assert not _pid_alive(child_pid)
+    assert metrics["timed_out"] == 1
+    assert metrics["active_processes"] == 0
+
+
+async def test_overload_returns_503_with_retry_after(cli_server, tmp_path):
+    env = _write_gemini(tmp_path, "sleep 1\necho done\n")
+    cli_server.admission = cli_server.AdmissionController(max_parallel=1, max_queue=0)
+    transport = httpx.ASGITransport(app=cli_server.app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        first = asyncio.create_task(
+            client.post("/", json={"args": ["gemini"], "env": env})
+        )
+        await asyncio.sleep(0.3)
+        second = await client.post("/", json={"args": ["gemini"], "env": env})
+        first = await first
+        metrics = (await client.get("/metrics")).json()
+
+    assert second.status_code == 503
+    assert second.headers["Retry-After"] == str(cli_server.RETRY_AFTER_SECONDS)
+    assert first.status_code == 200
+    assert first.json()["stdout"] == "done\n"
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 1
@@ -0,0 +1,77 @@
+"""Test Code Search module."""
+
+import os
+import re
+
+import pytest
+
+from benchmarks.answer_generators.code_search import (
+    CodeSearchIndex,
+    get_code_search_index,
+    translate_bre,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, line, matches",
+    [
+        ("a+b", "xa+b", True),
+        ("a\\+b", "aaab", True),
+        ("x\\(ab\\)*y", "xababy", True),
+        ("(a)", "(a)", True),
+        ("*star", "a *star", True),
+        ("^def", " def", False),
+        ("cost$", "cost", True),
+        ("a$b", "a$b", True),
+        ("[[:digit:]]\\{2\\}", "v12", True),
+        ("\\<run\\>", "rerun", False),
+        ("foo\\|bar", "a bar", True),
+    ],
+)
+def test_translate_bre_matches_like_grep(pattern, line, matches):
+    regex, _ = translate_bre(pattern)
+    assert bool(re.search(regex, line)) == matches
+
+
+def test_translate_bre_required_literals():
+    assert translate_bre("class .*Generator")[1] == [["class ", "Generator"]]
+    # Optional atoms and group contents are not required.
+    assert translate_bre("colou*r")[1] == [["colo", "r"]]
+    assert translate_bre("a\\(bcd\\)*efg")[1] == [["a", "efg"]]
+    assert translate_bre("TODO\\|FIXME")[1] == [["TODO"], ["FIXME"]]
+
+
+def test_search_narrows_candidates_and_caps_results(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "hit.py").write_text("\n".join(["def target(): pass"] * 30))
+    (tmp_path / "pkg" / "miss.py").write_text("def other(): pass\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("def target\n")
+    index = CodeSearchIndex(tmp_path)
+
+    result = index.search("def target", "pkg", max_lines=20)
+
+    assert result.candidates == 1
+    assert result.truncated
+    assert result.lines == [("pkg/hit.py", "def target(): pass")] * 20
+
+
+def test_search_updates_incrementally(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("alpha = 1\n")
+    index = CodeSearchIndex(tmp_path)
+    assert index.search("alpha").lines == [("mod.py", "alpha = 1")]
+
+    path.write_text("beta = 2\n")
+    os.utime(path, ns=(1, 1))
+    (tmp_path / "new.py").write_text("alpha_two = 3\n")
+    index.mark_dirty()
+
+    assert index.search("alpha").lines == [("new.py", "alpha_two = 3")]
+    assert index.search("beta").lines == [("mod.py", "beta = 2")]
+    assert index.stats["builds"] == 1
+    assert index.stats["files_reindexed"] == 3
+
+
+def test_index_is_shared_per_workspace(tmp_path):
+    assert get_code_search_index(tmp_path) is get_code_search_index(tmp_path / ".")
@@ -41,7 +41,7 @@ def mock_akm():
 @pytest.fixture
 def mock_container():
     with patch(
-        "benchmarks.answer_generators.gemini_cli_docker.gemini_cli_podman_answer_generator.PodmanContainer"
+        "benchmarks.answer_generators.gemini_cli_docker.gemini_cli_podman_answer_generator.PodmanContainerPool"
     ) as mock:
         instance = mock.return_value
         instance.start = AsyncMock()
@@ -49,6 +49,7 @@ def mock_container():
         instance.send_command = AsyncMock()
         instance.read_file = AsyncMock()
         instance.base_url = "http://localhost:12345"
+        instance.supports_streaming = False
         yield instance
 
 
@@ -216,3 +217,234 @@ async def test_run_cli_command_error_report_capture(
     # Verify interactions
     mock_container.send_command.assert_called_once()
     mock_container.read_file.assert_called_once_with(error_file_path)
+
+
+@pytest.mark.asyncio
+async def test_podman_generator_teardown_closes_container(mock_akm, mock_container):
+    """Test that teardown closes the pooled session and stops the container."""
+    mock_container.close = AsyncMock()
+    generator = GeminiCliPodmanAnswerGenerator(
+        image_name="test-image",
+        model_name="gemini-2.5-flash",
+        image_definitions={},
+        api_key_manager=mock_akm,
+    )
+
+    await generator.teardown()
+
+    mock_container.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_podman_container_reuses_connections():
+    """Test that consecutive commands share one kept-alive connection."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+        PodmanContainer,
+    )
+
+    async def handler(request):
+        data = await request.json()
+        return web.json_response(
+            {"stdout": " ".join(data["args"]), "stderr": "", "returncode": 0}
+        )
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    async with TestServer(app) as server:
+        container = PodmanContainer(image_name="test-image")
+        container.base_url = str(server.make_url("/"))
+        container._is_running = True
+
+        for i in range(5):
+            result = await container.send_command(["gemini", str(i)])
+            assert result["stdout"] == f"gemini {i}"
+
+        stats = container.connection_stats
+        assert stats.requests == 5
+        assert stats.connections_created == 1
+        assert stats.connections_reused == 4
+
+        with patch("subprocess.run") as mock_run:
+            await container.close()
+        mock_run.assert_called_once()
+        assert container._session is None
+
+
+def test_podman_container_releases_sessions_of_finished_loops():
+    """Test that a session left on a finished loop is closed, not leaked."""
+    from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+        PodmanContainer,
+    )
+
+    container = PodmanContainer(image_name="test-image")
+
+    async def get_session():
+        return container._get_session()
+
+    first = asyncio.run(get_session())
+    connector = first.connector
+    second = asyncio.run(get_session())
+    assert second is not first
+    assert first.closed and connector.closed
+
+    # stop() runs without a loop (e.g. atexit) and releases the session it can't await.
+    container.stop()
+    assert second.closed and container._session is None
+
+
+@pytest.mark.asyncio
+async def test_podman_generator_streams_events(mock_akm, mock_container):
+    """Test that stream-json output is parsed from the streaming endpoint."""
+    records = [
+        {"stdout": '{"type": "tool_use", "data": {"tool_name": "search"}}'},
+        {"stderr": "debug line"},
+        {"stdout": '{"type": "message", "data": {"role": "model", "content": "Hi"}}'},
+        {"returncode": 0},
+    ]
+
+    async def stream_command(args, env=None):
+        for record in records:
+            yield record
+
+    mock_container.supports_streaming = None
+    mock_container.stream_command = stream_command
+    generator = GeminiCliPodmanAnswerGenerator(
+        image_name="test-image",
+        model_name="gemini-2.5-flash",
+        image_definitions={},
+        api_key_manager=mock_akm,
+    )
+    generator._setup_completed = True
+
+    response, logs = await generator.run_cli_command(
+        ["gemini", "--output-format", "stream-json", "Test Prompt"]
+    )
+
+    mock_container.send_command.assert_not_called()
+    assert response["response"] == "Hi"
+    assert response["stderr"] == "debug line"
+    assert [log.type for log in logs] == ["CLI_STDERR", "tool_use", "message"]
+    assert logs[1].tool_name == "search"
+
+
+@pytest.mark.asyncio
+async def test_podman_generator_falls_back_without_streaming(mock_akm, mock_container):
+    """Test that images without the streaming endpoint use the buffered endpoint."""
+    from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+        StreamingUnsupportedError,
+    )
+
+    async def stream_command(args, env=None):
+        raise StreamingUnsupportedError("no /stream")
+        yield
+
+    mock_container.supports_streaming = None
+    mock_container.stream_command = stream_command
+    mock_container.send_command.return_value = {
+        "stdout": '{"type": "message", "data": {"role": "model", "content": "Hello"}}',
+        "stderr": "",
+        "returncode": 0,
+    }
+    generator = GeminiCliPodmanAnswerGenerator(
+        image_name="test-image",
+        model_name="gemini-2.5-flash",
+        image_definitions={},
+        api_key_manager=mock_akm,
+    )
+    generator._setup_completed = True
+
+    response, _ = await generator.run_cli_command(
+        ["gemini", "--output-format", "stream-json", "Test Prompt"]
+    )
+
+    mock_container.send_command.assert_called_once()
+    assert response["response"] == "Hello"
+
+
+@pytest.mark.asyncio
+async def test_podman_container_stream_command_timeout_and_cancel():
+    """Test incremental records, per-record timeouts and early close."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+        PodmanContainer,
+    )
+
+    disconnected = asyncio.Event()
+    payloads = []
+
+    async def handler(request):
+        payloads.append(await request.json())
+        resp = web.StreamResponse()
+        await resp.prepare(request)
+        try:
+            # Split a record across chunks to exercise line reassembly.
+            await resp.write(b'{"stdout": "a"}\n{"std')
+            await resp.write(b'out": "b"}\n')
+            await asyncio.sleep(10)
+        except (asyncio.CancelledError, ConnectionResetError):
+            disconnected.set()
+            raise
+        return resp
+
+    app = web.Application()
+    app.router.add_post("/stream", handler)
+    async with TestServer(app) as server:
+        container = PodmanContainer(image_name="test-image")
+        container.base_url = str(server.make_url("")).rstrip("/")
+        container._is_running = True
+
+        seen = []
+        with pytest.raises(TimeoutError):
+            async for record in container.stream_command(["gemini"], event_timeout=0.2):
+                seen.append(record)
+        assert seen == [{"stdout": "a"}, {"stdout": "b"}]
+        assert container.supports_streaming is True
+        # Streamed runs get the same server-side deadline as buffered ones.
+        assert payloads[0]["timeout"] == 300.0
+
+        stream = container.stream_command(["gemini"], event_timeout=5)
+        assert await stream.__anext__() == {"stdout": "a"}
+        await stream.aclose()
+        await asyncio.wait_for(disconnected.wait(), timeout=5)
+
+        with patch("subprocess.run"):
+            await container.close()
+
+
+@pytest.mark.asyncio
+async def test_podman_container_waits_out_overload():
+    """Test that a 503 with Retry-After from the container is retried."""
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+    from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+        PodmanContainer,
+    )
+
+    calls = []
+
+    async def handler(request):
+        calls.append(await request.json())
+        if len(calls) == 1:
+            return web.json_response(
+                {"error": "overloaded"}, status=503, headers={"Retry-After": "0"}
+            )
+        return web.json_response({"stdout": "ok", "stderr": "", "returncode": 0})
+
+    app = web.Application()
+    app.router.add_post("/", handler)
+    async with TestServer(app) as server:
+        container = PodmanContainer(image_name="test-image")
+        container.base_url = str(server.make_url("/"))
+        container._is_running = True
+
+        result = await container.send_command(["gemini"])
+
+        with patch("subprocess.run"):
+            await container.close()
+
+    assert result["stdout"] == "ok"
+    assert len(calls) == 2
+    assert calls[0]["timeout"] == 300.0
@@ -0,0 +1,97 @@
+"""Test Hash Utils module."""
+
+import os
+
+import pytest
+
+from benchmarks.answer_generators import hash_utils
+from benchmarks.answer_generators.hash_utils import (
+    FileHashCache,
+    calculate_source_hash,
+    calculate_tree_digests,
+)
+
+OLD_NS = 1_000_000_000_000_000_000  # Well outside the racy window
+
+
+def _write(root, rel_path, content):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(path, ns=(OLD_NS, OLD_NS))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(hash_utils, "DEFAULT_CACHE_PATH", tmp_path / "cache.db")
+
+
+@pytest.fixture
+def context(tmp_path):
+    root = tmp_path / "ctx"
+    _write(root, "Dockerfile", "FROM base")
+    _write(root, "src/app.py", "print('hi')")
+    _write(root, "src/lib/util.py", "x = 1")
+    _write(root, "docs/readme.md", "docs")
+    return root
+
+
+def test_merkle_digests_isolate_subtrees(context):
+    before = calculate_tree_digests(context)
+    assert set(before) == {"", "src", "src/lib", "docs"}
+
+    _write(context, "docs/readme.md", "changed docs")
+    after = calculate_tree_digests(context)
+
+    assert after["src"] == before["src"]
+    assert after["docs"] != before["docs"]
+    assert after[""] != before[""]
+    assert calculate_source_hash(context) == after[""]
+
+
+def test_dockerignore_excludes_and_reincludes(context):
+    baseline = calculate_source_hash(context)
+    _write(context, ".dockerignore", "docs\n*.log\n!keep.log\n")
+    ignored_hash = calculate_source_hash(context)
+    _write(context, "debug.log", "noise")
+    _write(context, "docs/new.md", "noise")
+    assert calculate_source_hash(context) == ignored_hash
+    assert ignored_hash != baseline
+
+    _write(context, "keep.log", "signal")
+    assert calculate_source_hash(context) != ignored_hash
+
+
+def test_cache_rehashes_only_changed_files(context, tmp_path, monkeypatch):
+    cache = FileHashCache(tmp_path / "explicit.db")
+    first = calculate_tree_digests(context, cache=cache)
+
+    hashed = []
+    original = hash_utils._hash_file
+
+    def counting_hash(path):
+        hashed.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(hash_utils, "_hash_file", counting_hash)
+    assert calculate_tree_digests(context, cache=cache) == first
+    assert hashed == []
+
+    path = _write(context, "src/app.py", "print('bye')")
+    os.utime(path, ns=(OLD_NS + 1, OLD_NS + 1))
+    assert calculate_tree_digests(context, cache=cache)["src/lib"] == first["src/lib"]
+    assert hashed == ["app.py"]
+    cache.close()
+
+
+def test_recently_modified_files_are_not_cached(tmp_path):
+    root = tmp_path / "ctx"
+    root.mkdir()
+    (root / "fresh.txt").write_text("new")
+    cache = FileHashCache(tmp_path / "explicit.db")
+
+    calculate_tree_digests(root, cache=cache)
+
+    assert cache.lookup_tree(root.resolve()) == {}
+    cache.close()
@@ -0,0 +1,121 @@
+"""Test Image Builder module."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.answer_generators import hash_utils
+from benchmarks.answer_generators.gemini_cli_docker import image_builder
+from benchmarks.answer_generators.gemini_cli_docker.image_builder import ImageBuilder
+from benchmarks.answer_generators.gemini_cli_docker.image_definitions import (
+    ImageDefinition,
+)
+
+
+@pytest.fixture
+def definitions(tmp_path):
+    for name in ["base", "a", "b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "Dockerfile").write_text(f"FROM {name}\n")
+    return {
+        "base": ImageDefinition(source_dir="base", dockerfile="base/Dockerfile"),
+        "a": ImageDefinition(
+            source_dir="a", dockerfile="a/Dockerfile", dependencies=["base"]
+        ),
+        # Shares its build context with "a"
+        "a-variant": ImageDefinition(
+            source_dir="a",
+            dockerfile="a/Dockerfile",
+            dependencies=["base"],
+            build_args={"REF": "x"},
+        ),
+        "b": ImageDefinition(
+            source_dir="b", dockerfile="b/Dockerfile", dependencies=["base"]
+        ),
+    }
+
+
+@pytest.fixture
+def fake_podman(monkeypatch):
+    """Replaces podman calls with an in-memory image store."""
+    state = {"labels": {}, "builds": [], "running": 0, "max_running": 0}
+
+    async def image_exists(name):
+        return name in state["labels"]
+
+    async def get_image_label(name, key):
+        return state["labels"].get(name)
+
+    async def podman_build(
+        image_name, dockerfile_path, context_path, build_args, labels
+    ):
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(0.05)
+        state["running"] -= 1
+        state["builds"].append((image_name, build_args))
+        state["labels"][image_name] = labels["source_hash"]
+
+    monkeypatch.setattr(image_builder, "image_exists", image_exists)
+    monkeypatch.setattr(image_builder, "get_image_label", get_image_label)
+    monkeypatch.setattr(image_builder, "podman_build", podman_build)
+    return state
+
+
+def test_plan_orders_dependencies_and_detects_cycles(definitions, tmp_path):
+    builder = ImageBuilder(definitions, base_path=tmp_path)
+    plan = builder.plan(["b", "a"])
+    assert list(plan.steps) == ["base", "b", "a"]
+
+    definitions["base"] = ImageDefinition(
+        source_dir="base", dockerfile="base/Dockerfile", dependencies=["a"]
+    )
+    with pytest.raises(ValueError, match="cycle"):
+        builder.plan(["a"])
+
+
+async def test_siblings_build_in_parallel_after_dependency(
+    definitions, tmp_path, fake_podman, monkeypatch
+):
+    hashed = []
+    original = hash_utils.calculate_source_hash
+
+    def counting_hash(path):
+        hashed.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(image_builder, "calculate_source_hash", counting_hash)
+    builder = ImageBuilder(definitions, build_args={"EXTRA": "1"}, base_path=tmp_path)
+
+    plan = await builder.ensure(["a", "a-variant", "b"])
+
+    assert sorted(hashed) == ["a", "b", "base"]  # Shared context hashed once
+    assert fake_podman["builds"][0] == ("base", {"EXTRA": "1"})
+    assert fake_podman["max_running"] == 3
+    assert dict(fake_podman["builds"])["a-variant"] == {"REF": "x", "EXTRA": "1"}
+    assert all(step.action == "built" for step in plan.steps.values())
+    cp_seconds, cp_images = plan.critical_path()
+    assert cp_images[0] == "base" and len(cp_images) == 2
+    assert "Critical path" in plan.report()
+
+    # Everything is now up to date
+    plan = await builder.ensure(["a", "b"])
+    assert {step.action for step in plan.steps.values()} == {"up-to-date"}
+    assert len(fake_podman["builds"]) == 4
+
+    # A changed context rebuilds only that image
+    (tmp_path / "b" / "new.txt").write_text("x")
+    plan = await builder.ensure(["a", "b"])
+    assert plan.steps["b"].reason == "source changed"
+    assert plan.steps["a"].action == "up-to-date"
+
+
+async def test_concurrent_callers_share_one_build(definitions, tmp_path, fake_podman):
+    first = ImageBuilder(definitions, base_path=tmp_path)
+    second = ImageBuilder(definitions, base_path=tmp_path)
+
+    plans = await asyncio.gather(first.ensure(["a"]), second.ensure(["a"]))
+
+    assert [name for name, _ in fake_podman["builds"]] == ["base", "a"]
+    assert {plans[0].steps["a"].action, plans[1].steps["a"].action} == {"built"}
+    assert "joined in-flight build" in {p.steps["base"].reason for p in plans}
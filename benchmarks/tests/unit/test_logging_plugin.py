@@ -26,7 +26,10 @@ from google.adk.models.base_llm import BaseLlm
 from google.adk.models.llm_response import LlmResponse
 from google.genai.types import UsageMetadata
 
-from benchmarks.answer_generators.adk_answer_generator import TraceCollectorPlugin
+from benchmarks.answer_generators.adk_answer_generator import (
+    TraceCaptureLevel,
+    TraceCollectorPlugin,
+)
 from benchmarks.data_models import TraceEventType
 
 
@@ -176,3 +179,53 @@ async def test_trace_collector_plugin_captures_events():
     assert test_agent_timing["duration"] > 0
     assert test_agent_timing["prompt_tokens"] == 30
     assert test_agent_timing["completion_tokens"] == 13
+
+
+async def _collect(capture_level):
+    collector = TraceCollectorPlugin(capture_level=capture_level)
+    test_agent = LlmAgent(
+        name="test_agent",
+        model=MockLlm(model="mock-model"),
+        tools=[FunctionTool(simple_test_tool)],
+        instruction="Use the tool.",
+    )
+    app = App(name="test_app", root_agent=test_agent, plugins=[collector])
+    runner = InMemoryRunner(app=app)
+    await runner.session_service.create_session(
+        app_name=app.name, user_id="test_user", session_id="test_session"
+    )
+    new_message = types.UserContent(parts=[types.Part(text="Use your tool now.")])
+    async for _ in runner.run_async(
+        user_id="test_user", session_id="test_session", new_message=new_message
+    ):
+        pass
+    return collector
+
+
+@pytest.mark.asyncio
+async def test_trace_collector_capture_levels():
+    """Details are compact at STANDARD, absent at MINIMAL and deferred at FULL."""
+    minimal = await _collect(TraceCaptureLevel.MINIMAL)
+    standard = await _collect(TraceCaptureLevel.STANDARD)
+    full = await _collect(TraceCaptureLevel.FULL)
+
+    def tool_use(collector):
+        return next(
+            log for log in collector.logs if log.type == TraceEventType.TOOL_USE
+        )
+
+    assert tool_use(minimal).details is None
+    assert minimal.events == []
+
+    compact = tool_use(standard).details
+    assert set(compact) <= {"id", "invocation_id", "usage_metadata"}
+    assert compact["usage_metadata"]["total_token_count"] == 15
+    assert "content" not in compact
+    assert standard.events == []
+
+    deferred = tool_use(full)
+    assert set(deferred.details) == set(compact)
+    assert len(full.events) > 0
+    dumped = deferred.model_dump(mode="json")["details"]
+    assert dumped["content"]["parts"][0]["function_call"]["name"] == "simple_test_tool"
+    assert dumped["usage_metadata"]["total_token_count"] == 15
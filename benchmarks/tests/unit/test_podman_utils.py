@@ -0,0 +1,175 @@
+"""Test Podman Utils module."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from benchmarks.answer_generators.gemini_cli_docker import podman_utils
+from benchmarks.answer_generators.gemini_cli_docker.podman_utils import (
+    ConnectionStats,
+    PodmanContainerPool,
+)
+
+
+class FakeReplica:
+    """Stands in for PodmanContainer without running podman."""
+
+    built = []
+
+    def __init__(
+        self, image_name, container_name=None, image_definitions=None, build_args=None
+    ):
+        self.image_name = image_name
+        self.container_name = container_name
+        self.base_url = f"http://{container_name}"
+        self.connection_stats = ConnectionStats()
+        self.supports_streaming = None
+        self.healthy = True
+        self.closed = False
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def _ensure_image_ready(self, force=False):
+        FakeReplica.built.append(self.image_name)
+
+    async def start(self, force_build=False):
+        pass
+
+    async def is_healthy(self):
+        return self.healthy
+
+    async def send_command(self, args, env=None):
+        self.connection_stats.requests += 1
+        await self.gate.wait()
+        return {"stdout": self.container_name, "stderr": "", "returncode": 0}
+
+    async def read_file(self, path):
+        return f"{self.container_name}:{path}"
+
+    async def close(self):
+        self.closed = True
+
+    def stop(self):
+        self.closed = True
+
+
+def _pool(**kwargs):
+    FakeReplica.built = []
+    return PodmanContainerPool(
+        image_name="img",
+        container_name_prefix="pool",
+        image_definitions={"img": object()},
+        container_factory=FakeReplica,
+        **kwargs,
+    )
+
+
+async def test_pool_builds_once_and_prestarts_replicas():
+    pool = _pool(min_replicas=3, max_replicas=3)
+    await pool.start()
+
+    assert FakeReplica.built == ["img"]
+    assert [r.container_name for r in pool.replicas] == ["pool-1", "pool-2", "pool-3"]
+    await pool.close()
+    assert pool.replicas == []
+
+
+async def test_pool_routes_to_least_outstanding_and_scales_up():
+    pool = _pool(min_replicas=1, max_replicas=2, target_outstanding=1)
+    await pool.start()
+    first = pool.replicas[0]
+    first.gate.clear()
+
+    busy = asyncio.create_task(pool.send_command(["gemini"]))
+    await asyncio.sleep(0)
+    await pool._scaling
+    assert len(pool.replicas) == 2
+
+    result = await pool.send_command(["gemini"])
+    assert result["stdout"] == "pool-2"
+    # Follow-up reads go to the replica that served this task's request.
+    assert await pool.read_file("/tmp/report") == "pool-2:/tmp/report"
+
+    first.gate.set()
+    assert (await busy)["stdout"] == "pool-1"
+    assert pool.connection_stats.requests == 2
+    await pool.close()
+
+
+async def test_pool_restarts_unhealthy_and_retires_idle(monkeypatch):
+    pool = _pool(min_replicas=1, max_replicas=2)
+    await pool.start()
+    await pool._add_replica()
+    sick = pool.replicas[0]
+    sick.healthy = False
+
+    await pool._check_replicas()
+    assert sick in pool.replicas  # One failed probe is tolerated
+    await pool._check_replicas()
+    assert sick not in pool.replicas and sick.closed
+    assert len(pool.replicas) == 2
+
+    monkeypatch.setattr(
+        podman_utils,
+        "PODMAN_CONFIG",
+        podman_utils.PODMAN_CONFIG.__class__(POOL_IDLE_SECONDS=-1),
+    )
+    await pool._check_replicas()
+    assert len(pool.replicas) == 1
+    await pool.close()
+
+
+async def test_pool_recovers_after_losing_its_last_replica(monkeypatch):
+    pool = _pool(min_replicas=1, max_replicas=1)
+    await pool.start()
+    sick = pool.replicas[0]
+    sick.healthy = False
+
+    async def failing_start(self, force_build=False):
+        raise OSError("podman run failed")
+
+    monkeypatch.setattr(FakeReplica, "start", failing_start)
+    await pool._check_replicas()
+    await pool._check_replicas()
+    assert pool.replicas == []
+
+    # Requests fail clearly while no replica can start, and recover once one can.
+    with pytest.raises(RuntimeError, match="no running replicas"):
+        await pool.send_command(["gemini"])
+    monkeypatch.undo()
+    result = await pool.send_command(["gemini"])
+    assert result["stdout"] == "pool-4"
+    assert len(pool.replicas) == 1
+    await pool.close()
+
+
+async def test_pool_restarts_a_failing_replica_once(monkeypatch):
+    pool = _pool(min_replicas=1, max_replicas=1)
+    await pool.start()
+    sick = pool.replicas[0]
+    sick.healthy = False
+
+    async def refuse(args, env=None):
+        raise aiohttp.ClientConnectionError("connection refused")
+
+    sick.send_command = refuse
+    started = []
+
+    async def hanging_start(self, force_build=False):
+        started.append(self.container_name)
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(FakeReplica, "start", hanging_start)
+    results = await asyncio.gather(
+        pool.send_command(["a"]), pool.send_command(["b"]), return_exceptions=True
+    )
+    assert all(isinstance(r, aiohttp.ClientConnectionError) for r in results)
+    await asyncio.sleep(0)
+    # Both failures hit the same replica; only one replacement is started.
+    assert started == ["pool-2"]
+    assert list(pool._restarts) == ["pool-1"]
+
+    # close() cancels the restart still waiting for its replacement.
+    await pool.close()
+    assert pool._restarts == {} and pool.replicas == []
@@ -0,0 +1,95 @@
+"""Test Results Store module."""
+
+import json
+import gzip
+
+from benchmarks.analysis import process_results, process_results_frame
+from benchmarks.data_models import (
+    BenchmarkErrorType,
+    BenchmarkResultType,
+    BenchmarkRunResult,
+    BenchmarkType,
+    GenerationAttempt,
+    TraceLogEvent,
+    UsageMetadata,
+)
+from benchmarks import results_store
+
+
+def _make_results():
+    return [
+        BenchmarkRunResult(
+            id="fix_errors:01",
+            suite="benchmarks/benchmark_definitions/fix_errors/benchmark.yaml",
+            benchmark_name="01_single_llm_agent",
+            benchmark_type=BenchmarkType.FIX_ERROR,
+            answer_generator="gen_a",
+            status=BenchmarkResultType.PASS,
+            result=1,
+            answer="print('ok')",
+            latency=1.5,
+            usage_metadata=UsageMetadata(total_tokens=120, cost=0.01),
+            trace_logs=[
+                TraceLogEvent(type="tool_use", tool_name="search", tool_input={"q": "x"})
+            ],
+            generation_attempts=[
+                GenerationAttempt(attempt_number=1, status="success", api_key_id="k1")
+            ],
+        ),
+        BenchmarkRunResult(
+            id="fix_errors:02",
+            suite="benchmarks/benchmark_definitions/fix_errors/benchmark.yaml",
+            benchmark_name="02_agent_with_tool",
+            answer_generator="gen_b",
+            status=BenchmarkResultType.FAIL_VALIDATION,
+            result=0,
+            answer="",
+            validation_error="AssertionError: boom",
+            error_type=BenchmarkErrorType.ASSERTION_ERROR,
+        ),
+    ]
+
+
+def test_roundtrip_lazy_load(tmp_path):
+    results = _make_results()
+    results_store.write_columnar_results(results, tmp_path)
+
+    assert results_store.has_columnar_results(tmp_path)
+    reader = results_store.ResultPayloadReader(tmp_path)
+    assert len(reader) == 2
+    for i, original in enumerate(results):
+        assert reader[i] == original
+
+
+def test_frame_contains_only_scalars(tmp_path):
+    results_store.write_columnar_results(_make_results(), tmp_path)
+    df = results_store.load_results_frame(tmp_path)
+
+    assert "trace_logs" not in df.columns
+    assert df["answer_generator"].tolist() == ["gen_a", "gen_b"]
+    assert df["status"].tolist() == ["pass", "fail_validation"]
+    assert df["total_tokens"].iloc[0] == 120
+    assert json.loads(df["attempts_summary"].iloc[0])[0]["api_key_id"] == "k1"
+
+
+def test_process_results_frame_matches_process_results(tmp_path):
+    results = _make_results()
+    results_store.write_columnar_results(results, tmp_path)
+
+    columnar = process_results_frame(results_store.load_results_frame(tmp_path))
+    full = process_results(results)
+
+    for col in ["suite", "final_error_type", "status_str", "result", "latency"]:
+        assert columnar[col].tolist() == full[col].tolist()
+
+
+def test_convert_run_from_json_gz(tmp_path):
+    data = [r.model_dump(mode="json") for r in _make_results()]
+    with gzip.open(tmp_path / "results.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    assert results_store.convert_run(tmp_path) == tmp_path / "results.parquet"
+    assert results_store.load_results_frame(tmp_path, columns=["id"])["id"].tolist() == [
+        "fix_errors:01",
+        "fix_errors:02",
+    ]
@@ -0,0 +1,73 @@
+"""Test Shell Session Pool module."""
+
+import os
+import time
+
+import pytest
+
+from benchmarks.answer_generators.shell_session_pool import ShellSessionPool
+
+
+@pytest.fixture
+def pool():
+    pool = ShellSessionPool(size=2)
+    yield pool
+    pool.close()
+
+
+async def test_commands_reuse_one_session_without_leaking_state(pool, tmp_path):
+    (tmp_path / "sub").mkdir()
+    env = dict(os.environ, GREETING="hello world")
+
+    first = await pool.run(tmp_path, "cd /; X=1; echo $GREETING", tmp_path, env)
+    env.pop("GREETING")
+    second = await pool.run(
+        tmp_path, "pwd; echo ${X-unset} ${GREETING-unset}", tmp_path / "sub", env
+    )
+
+    assert first.stdout == "hello world\n"
+    assert second.stdout == f"{tmp_path / 'sub'}\nunset unset\n"
+    assert pool.metrics()["session_starts"] == 1
+
+
+async def test_exit_codes_stderr_and_sh_semantics(pool, tmp_path):
+    env = dict(os.environ)
+
+    failed = await pool.run(tmp_path, "echo oops >&2; exit 3", tmp_path, env)
+    escaped = await pool.run(tmp_path, "echo 'a\\nb'", tmp_path, env)
+    malformed = await pool.run(tmp_path, 'echo "unterminated', tmp_path, env)
+    after = await pool.run(tmp_path, "echo ok", tmp_path, env)
+
+    assert (failed.returncode, failed.stderr) == (3, "oops\n")
+    assert escaped.stdout == "a\nb\n"
+    assert malformed.returncode == 2
+    assert after.stdout == "ok\n"
+
+
+async def test_timeout_kills_the_job_group_and_keeps_the_session(pool, tmp_path):
+    env = dict(os.environ)
+    start = time.monotonic()
+
+    result = await pool.run(
+        tmp_path, "sleep 30 & sleep 30; echo never", tmp_path, env, timeout=1
+    )
+    after = await pool.run(tmp_path, "echo alive", tmp_path, env)
+
+    assert result.timed_out
+    assert time.monotonic() - start < 10
+    assert after.stdout == "alive\n"
+    assert pool.metrics()["session_starts"] == 1
+    assert pool.metrics()["timeouts"] == 1
+
+
+async def test_output_is_capped(pool, tmp_path):
+    result = await pool.run(
+        tmp_path,
+        "yes | head -c 100000",
+        tmp_path,
+        dict(os.environ),
+        max_output_bytes=1000,
+    )
+
+    assert result.truncated
+    assert len(result.stdout) == 1000
@@ -122,6 +122,34 @@ class PodmanConfig:
     # The podman machine was provisioned with the following resources: 7 CPUs, 16GB RAM
     MAX_GLOBAL_CONCURRENCY: int = int(os.environ.get("ADK_PODMAN_MAX_CONCURRENCY", 15))
 
+    # HTTP client pool for talking to a container's server.
+    # Connections are capped at the global concurrency (one in-flight request each)
+    # and kept alive between requests to avoid reconnecting and exhausting ephemeral ports.
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.environ.get("ADK_PODMAN_HTTP_KEEPALIVE", 60))
+    HTTP_DNS_CACHE_TTL: int = int(os.environ.get("ADK_PODMAN_HTTP_DNS_TTL", 300))
+    # How many times to wait out a 503 (Retry-After) from a container's full work queue.
+    HTTP_OVERLOAD_RETRIES: int = int(os.environ.get("ADK_PODMAN_HTTP_OVERLOAD_RETRIES", 10))
+
+    # Deadline (queueing + execution) of a CLI command, buffered or streamed. The container's
+    # server enforces it and kills the command's process tree when it expires.
+    COMMAND_TIMEOUT: float = float(os.environ.get("ADK_PODMAN_COMMAND_TIMEOUT", 300))
+
+    # Warm container pool per Podman generator. Replicas are added while outstanding requests
+    # per replica exceed POOL_TARGET_OUTSTANDING (or latency degrades by POOL_LATENCY_SCALE_FACTOR
+    # over the best observed), retired after POOL_IDLE_SECONDS without traffic, and restarted
+    # after failing two consecutive health checks.
+    POOL_MIN_REPLICAS: int = int(os.environ.get("ADK_PODMAN_POOL_MIN", 1))
+    POOL_MAX_REPLICAS: int = int(os.environ.get("ADK_PODMAN_POOL_MAX", max(1, (os.cpu_count() or 4) // 4)))
+    POOL_TARGET_OUTSTANDING: int = int(os.environ.get("ADK_PODMAN_POOL_TARGET_OUTSTANDING", 4))
+    POOL_LATENCY_SCALE_FACTOR: float = float(os.environ.get("ADK_PODMAN_POOL_LATENCY_FACTOR", 2.0))
+    POOL_IDLE_SECONDS: float = float(os.environ.get("ADK_PODMAN_POOL_IDLE_SECONDS", 300))
+    POOL_HEALTH_INTERVAL: float = float(os.environ.get("ADK_PODMAN_POOL_HEALTH_INTERVAL", 15))
+
+    # Streaming CLI output: max seconds to wait for the next output line before giving up,
+    # and max bytes of raw stdout/stderr retained per command (parsed events are always kept).
+    STREAM_EVENT_TIMEOUT: float = float(os.environ.get("ADK_PODMAN_STREAM_EVENT_TIMEOUT", 300))
+    STREAM_MAX_OUTPUT_BYTES: int = int(os.environ.get("ADK_PODMAN_STREAM_MAX_OUTPUT_BYTES", 16 * 1024 * 1024))
+
 
 # Instantiate for usage
 CLOUD_RUN_CONFIG = CloudRunConfig()
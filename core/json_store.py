@@ -0,0 +1,151 @@
+"""
+Core JSON Store.
+
+A persistent map of string keys to JSON values in one SQLite table, shared by the
+on-disk caches of the indexing, verification and build tools. Each cache wraps a
+`JsonStore` with its own key scheme and default location.
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Keys looked up per SELECT, below SQLite's host parameter limit.
+_LOOKUP_CHUNK = 500
+_COLUMNS = ["key", "version", "value"]
+
+
+def default_store_path(env_var: str, filename: str) -> Path:
+    """The path in $`env_var`, or `filename` under OUTPUT_ROOT."""
+    from core.config import OUTPUT_ROOT
+
+    return Path(os.environ.get(env_var, OUTPUT_ROOT / filename))
+
+
+class JsonStore:
+    """
+    Persistent map of string keys to JSON values.
+
+    Subclasses can store values in another encoding by overriding `_encode` and
+    `_decode`, and keep rows of an older table layout by overriding
+    `_upgrade_table`.
+
+    Args:
+        db_path: SQLite database file; its directory is created if needed.
+        table: Table holding the entries.
+        version: Tag written with every entry. When given, lookups only see entries
+            with this tag, and entries with any other tag are deleted on open.
+    """
+
+    def __init__(self, db_path: Path, table: str, version: Optional[str] = None):
+        self.db_path = Path(db_path)
+        self.table = table
+        self.version = version or ""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        # Readers in other processes do not block the writer.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+        try:
+            with self._conn:
+                if columns and columns != _COLUMNS:
+                    # Explicit, so the upgrade's DDL commits or rolls back as a whole.
+                    self._conn.execute("BEGIN")
+                    self._upgrade_table(columns)
+                self._create_table()
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+        if version is not None:
+            with self._conn:
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE version != ?", (self.version,)
+                )
+
+    def _create_table(self):
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            " key TEXT PRIMARY KEY, version TEXT, value TEXT)"
+        )
+
+    def _upgrade_table(self, columns: List[str]):
+        """
+        Called, inside a transaction, when the table was written with another column
+        layout. Caches drop it; stores whose entries cannot be recomputed override
+        this to move them into the new layout (see `_create_table`).
+        """
+        self._conn.execute(f"DROP TABLE {self.table}")
+
+    def _encode(self, value: Any) -> Any:
+        return json.dumps(value)
+
+    def _decode(self, value: Any) -> Any:
+        return json.loads(value)
+
+    def lookup(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """The stored values of `keys`; keys without an entry are left out."""
+        result = {}
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start : start + _LOOKUP_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE version = ? AND key IN"
+                f" ({','.join('?' * len(chunk))})",
+                [self.version, *chunk],
+            )
+            for key, value in rows:
+                result[key] = self._decode(value)
+        return result
+
+    def lookup_prefix(self, prefix: str) -> Dict[str, Any]:
+        """The stored entries whose key starts with `prefix` (non-empty)."""
+        # Every key starting with `prefix` sorts between it and its successor.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        rows = self._conn.execute(
+            f"SELECT key, value FROM {self.table}"
+            " WHERE version = ? AND key >= ? AND key < ?",
+            (self.version, prefix, upper),
+        )
+        return {key: self._decode(value) for key, value in rows}
+
+    def store(self, items: Iterable[Tuple[str, Any]]):
+        """Writes (key, value) pairs, replacing existing entries, in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)",
+                ((key, self.version, self._encode(value)) for key, value in items),
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def open_default(factory: Callable[[], JsonStore]) -> Optional[JsonStore]:
+    """Opens a default store, or returns None when its location is unwritable."""
+    try:
+        return factory()
+    except (OSError, sqlite3.Error):
+        return None
+
+
+@contextmanager
+def store_or_default(
+    store: Optional[JsonStore], factory: Callable[[], JsonStore]
+) -> Iterator[Optional[JsonStore]]:
+    """
+    Yields `store` if given. Otherwise yields the default store opened by `factory`
+    and closes it on exit, or yields None when it cannot be opened; callers then
+    compute everything without caching.
+    """
+    if store is not None:
+        yield store
+        return
+    store = open_default(factory)
+    try:
+        yield store
+    finally:
+        if store is not None:
+            store.close()
@@ -7,7 +7,7 @@ tools, and analysis scripts.
 
 import enum
 from typing import Any, Optional, Union, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_serializer
 
 class TraceEventType(str, enum.Enum):
     """
@@ -29,6 +29,26 @@ class TraceEventType(str, enum.Enum):
     RUN_END = "run_end"
 
 
+class DeferredDetails:
+    """
+    A `details` payload that is only built when a trace is written.
+
+    Wraps a source object (e.g. an ADK Event) and dumps it on first use. One instance
+    is shared by every TraceLogEvent produced from the same source, so the source is
+    serialized at most once.
+    """
+
+    def __init__(self, source: BaseModel):
+        self._source = source
+        self._value: Optional[dict[str, Any]] = None
+
+    def resolve(self) -> dict[str, Any]:
+        if self._value is None:
+            self._value = self._source.model_dump(mode="json")
+            self._source = None
+        return self._value
+
+
 class TraceLogEvent(BaseModel):
     """Represents a single event in the trace logs."""
 
@@ -66,6 +86,29 @@ class TraceLogEvent(BaseModel):
         None, description="Additional metadata or structured details."
     )
 
+    _deferred_details: Optional[DeferredDetails] = PrivateAttr(default=None)
+
+    def defer_details(self, deferred: Optional[DeferredDetails]) -> "TraceLogEvent":
+        """Replaces `details` with `deferred` once the event is serialized (None cancels)."""
+        self._deferred_details = deferred
+        return self
+
+    def resolve_details(self) -> Optional[dict[str, Any]]:
+        """Materializes deferred details in place and returns them."""
+        if self._deferred_details is not None:
+            self.details = self._deferred_details.resolve()
+            self._deferred_details = None
+        return self.details
+
+    @model_serializer(mode="wrap")
+    def _serialize_with_details(self, handler):
+        self.resolve_details()
+        return handler(self)
+
+    def __getstate__(self):
+        self.resolve_details()
+        return super().__getstate__()
+
 class ModelName(enum.StrEnum):
     """Enumeration of available LLM model names."""
     GEMINI_2_5_FLASH = "gemini-2.5-flash"
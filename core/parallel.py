@@ -0,0 +1,48 @@
+"""
+Core Parallel Utilities.
+
+Spreads CPU-bound batch functions over worker processes when the input is large
+enough to pay for them.
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+J = TypeVar("J")
+R = TypeVar("R")
+
+
+def map_in_batches(
+    fn: Callable[[List[J]], List[R]],
+    jobs: Sequence[J],
+    workers: int,
+    min_per_worker: int,
+    executor: Optional[Executor] = None,
+) -> List[R]:
+    """
+    Applies a batch function to `jobs` and concatenates its results, in order.
+
+    The jobs are split across up to `workers` processes, but only as many as get at
+    least `min_per_worker` jobs each; with fewer than two, `fn` runs in-process on
+    all jobs at once.
+
+    Args:
+        fn: Picklable function mapping a list of jobs to a list of results.
+        jobs: The jobs.
+        workers: Maximum number of worker processes.
+        min_per_worker: Jobs a worker needs to be worth starting.
+        executor: Pool to submit to instead of starting one for this call.
+    """
+    jobs = list(jobs)
+    workers = min(workers, len(jobs) // min_per_worker)
+    if workers <= 1:
+        return fn(jobs)
+    # Batches amortize pickling; several per worker keep the load balanced.
+    size = max(1, len(jobs) // (workers * 4))
+    batches = [jobs[i : i + size] for i in range(0, len(jobs), size)]
+    if executor is not None:
+        results = list(executor.map(fn, batches))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(fn, batches))
+    return [result for batch in results for result in batch]
@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from core.json_store import JsonStore, store_or_default
+
+
+def test_lookup_prefix_and_replace(tmp_path):
+    store = JsonStore(tmp_path / "store.db", "entries")
+    store.store([("a/x", [1, "d"]), ("a/y", {"k": None}), ("ab", 2), ("b", 3)])
+    store.store([("a/x", [4, "e"])])
+
+    assert store.lookup(["a/x", "b", "missing", "b"]) == {"a/x": [4, "e"], "b": 3}
+    assert store.lookup_prefix("a/") == {"a/x": [4, "e"], "a/y": {"k": None}}
+    store.close()
+
+
+def test_entries_of_other_versions_are_dropped(tmp_path):
+    path = tmp_path / "store.db"
+    old = JsonStore(path, "entries", version="v1")
+    old.store([("k", "old")])
+    old.close()
+
+    new = JsonStore(path, "entries", version="v2")
+    assert new.lookup(["k"]) == {}
+    new.store([("k", "new")])
+    new.close()
+    assert JsonStore(path, "entries", version="v1").lookup(["k"]) == {}
+
+
+def test_unwritable_default_store_is_skipped(tmp_path):
+    given = JsonStore(tmp_path / "given.db", "entries")
+    with store_or_default(given, None) as store:
+        assert store is given
+
+    def unwritable():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    with store_or_default(None, unwritable) as store:
+        assert store is None
+
+    opened = []
+
+    def default():
+        opened.append(JsonStore(tmp_path / "default.db", "entries"))
+        return opened[-1]
+
+    with store_or_default(None, default) as store:
+        store.store([("k", 1)])
+    # The default store is closed on exit; its entries persist.
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].lookup(["k"])
+    assert default().lookup(["k"]) == {"k": 1}
+
+
+def test_tables_with_another_layout_are_replaced(tmp_path):
+    path = tmp_path / "store.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (digest TEXT PRIMARY KEY, scan TEXT)")
+    conn.execute("INSERT INTO entries VALUES ('k', '1')")
+    conn.commit()
+    conn.close()
+
+    store = JsonStore(path, "entries")
+    assert store.lookup(["k"]) == {}
+    store.store([("k", 2)])
+    assert store.lookup(["k"]) == {"k": 2}
+    store.close()
@@ -1,5 +1,8 @@
+import json
+
 import pytest
-from core.models import TraceLogEvent, TraceEventType
+from core.models import DeferredDetails, TraceLogEvent, TraceEventType
+from core.trace_utils import deduplicate_trace_logs
 
 def test_trace_log_event_details_field():
     """
@@ -25,3 +28,31 @@ def test_trace_log_event_optional_details():
         content="message"
     )
     assert event.details is None
+
+def test_deferred_details_resolve_once_on_serialization():
+    """Deferred details replace 'details' only when the event is serialized."""
+    class Source(TraceLogEvent):
+        dumps: int = 0
+
+        def model_dump(self, **kwargs):
+            self.dumps += 1
+            return {"dump": self.dumps}
+
+    source = Source(type=TraceEventType.ADK_EVENT)
+    deferred = DeferredDetails(source)
+    first = TraceLogEvent(type=TraceEventType.MESSAGE, details={"id": "e1"})
+    second = TraceLogEvent(type=TraceEventType.TOOL_USE)
+    first.defer_details(deferred)
+    second.defer_details(deferred)
+
+    assert first.details == {"id": "e1"}
+    assert source.dumps == 0
+    assert first.model_dump()["details"] == {"dump": 1}
+    assert json.loads(second.model_dump_json())["details"] == {"dump": 1}
+    assert source.dumps == 1
+
+def test_cancelled_deferred_details_are_not_serialized():
+    event = TraceLogEvent(type=TraceEventType.TOOL_RESULT, details={"id": "e1"})
+    event.defer_details(DeferredDetails(event.model_copy()))
+    deduplicate_trace_logs([event])
+    assert event.model_dump()["details"] is None
@@ -0,0 +1,18 @@
+import os
+
+from core.parallel import map_in_batches
+
+
+def _pids(batch):
+    return [(job, os.getpid()) for job in batch]
+
+
+def test_small_inputs_run_in_process():
+    results = map_in_batches(_pids, range(10), workers=4, min_per_worker=8)
+    assert results == [(i, os.getpid()) for i in range(10)]
+
+
+def test_large_inputs_are_split_across_workers_in_order():
+    results = map_in_batches(_pids, range(100), workers=2, min_per_worker=10)
+    assert [job for job, _ in results] == list(range(100))
+    assert os.getpid() not in {pid for _, pid in results}
@@ -5,7 +5,7 @@ This module provides utilities for parsing and manipulating trace logs.
 """
 
 import json
-from typing import Any, List, Dict, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from core.models import TraceLogEvent, TraceEventType
 
 def deduplicate_trace_logs(logs: List[TraceLogEvent]) -> List[TraceLogEvent]:
@@ -31,6 +31,7 @@ def deduplicate_trace_logs(logs: List[TraceLogEvent]) -> List[TraceLogEvent]:
         # 'details' is a 100% redundant copy of the data.
         if log.type == TraceEventType.TOOL_RESULT:
             log.details = None
+            log.defer_details(None)
 
         # 2. Deduplicate GEMINI_CLIENT_ERROR:
         # These events often contain a 2MB+ 'context' field which is a dump of the
@@ -69,26 +70,30 @@ def deduplicate_trace_logs(logs: List[TraceLogEvent]) -> List[TraceLogEvent]:
     return logs
 
 
-def parse_cli_stream_json_output(
-    stdout_str: str,
-) -> Tuple[Dict[str, Any], List[TraceLogEvent]]:
-    """Parses the NDJSON output from the Gemini CLI in stream-json format.
+class StreamJsonParser:
+    """Incrementally parses Gemini CLI stream-json output, one line at a time.
 
-    Args:
-        stdout_str: The raw stdout string from the CLI.
-
-    Returns:
-        A tuple containing:
-        - A dictionary with the parsed response (e.g., {"response": "...", "stats": "..."}).
-        - A list of TraceLogEvent objects.
+    Lets callers turn events into TraceLogEvents as the CLI produces them instead of
+    buffering the whole stdout first. `response_dict` and `logs` accumulate the same
+    values `parse_cli_stream_json_output` returns for the full output.
     """
-    response_dict = {"response": ""}
-    logs: List[TraceLogEvent] = []
 
-    for line in stdout_str.splitlines():
+    def __init__(self):
+        self.response_dict: Dict[str, Any] = {"response": ""}
+        self.logs: List[TraceLogEvent] = []
+
+    def feed_line(self, line: str) -> Optional[TraceLogEvent]:
+        """Parses a single NDJSON line.
+
+        Args:
+            line: One line of CLI stdout.
+
+        Returns:
+            The TraceLogEvent produced for the line, or None for blank lines.
+        """
         line = line.strip()
         if not line:
-            continue
+            return None
         try:
             event = json.loads(line)
             event_type = event.get("type")
@@ -126,9 +131,9 @@ def parse_cli_stream_json_output(
                     if isinstance(content, list):
                         for part in content:
                             if isinstance(part, dict) and "text" in part:
-                                response_dict["response"] += part["text"]
+                                self.response_dict["response"] += part["text"]
                     elif isinstance(content, str):
-                        response_dict["response"] += content
+                        self.response_dict["response"] += content
 
             elif event_type == "tool_use":
                 log_event.tool_name = event_data.get("tool_name")
@@ -142,17 +147,34 @@ def parse_cli_stream_json_output(
             elif event_type == "result":
                 # This is already handled by enum_type = TraceEventType.SYSTEM_RESULT
                 if "stats" in event_data:
-                    response_dict["stats"] = event_data["stats"]
+                    self.response_dict["stats"] = event_data["stats"]
                     log_event.content = event_data["stats"]
 
-            logs.append(log_event)
-
         except json.JSONDecodeError:
-            logs.append(
-                TraceLogEvent(
-                    type=TraceEventType.CLI_STDOUT_RAW,
-                    source="cli_stream",
-                    content=line,
-                )
+            log_event = TraceLogEvent(
+                type=TraceEventType.CLI_STDOUT_RAW,
+                source="cli_stream",
+                content=line,
             )
-    return response_dict, logs
\ No newline at end of file
+
+        self.logs.append(log_event)
+        return log_event
+
+
+def parse_cli_stream_json_output(
+    stdout_str: str,
+) -> Tuple[Dict[str, Any], List[TraceLogEvent]]:
+    """Parses the NDJSON output from the Gemini CLI in stream-json format.
+
+    Args:
+        stdout_str: The raw stdout string from the CLI.
+
+    Returns:
+        A tuple containing:
+        - A dictionary with the parsed response (e.g., {"response": "...", "stats": "..."}).
+        - A list of TraceLogEvent objects.
+    """
+    parser = StreamJsonParser()
+    for line in stdout_str.splitlines():
+        parser.feed_line(line)
+    return parser.response_dict, parser.logs
@@ -11,6 +11,7 @@ from .search import (
     get_search_provider,
 )
 from .config import config
+from .navigation import Navigation
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,8 @@ class KnowledgeIndex:
         self._items: List[Dict[str, Any]] = []
         self._fqn_map: Dict[str, Dict[str, Any]] = {}
         self._provider: Optional[SearchProvider] = None
+        self._navigation: Optional[Navigation] = None
+        self._index_path: Optional[Path] = None
         self._loaded = False
 
     def load(self, index_path: Path):
@@ -94,6 +97,7 @@ class KnowledgeIndex:
                 )
                 self._provider.build_index(self._items)
 
+            self._index_path = index_path
             self._loaded = True
             logger.info(f"Loaded {len(self._items)} targets from index.")
         except Exception as e:
@@ -104,6 +108,34 @@ class KnowledgeIndex:
             # Ensure we don't proceed with partial/broken load
             raise
 
+    @property
+    def navigation(self) -> Navigation:
+        """
+        Reverse indices (members, short names, prefix trie) over the loaded items.
+        Read on first use from the ranker's ranked_targets.nav.json if it matches the
+        index, otherwise built from the items.
+        """
+        if self._navigation is None:
+            navigation = None
+            if self._index_path is not None:
+                navigation = Navigation.from_sidecar(self._index_path)
+            # Rows must line up with the items as sorted here.
+            if navigation is None or len(navigation) != len(self._items) or any(
+                (navigation.row(i).id or None) != self._fqn_of(item)
+                for i, item in enumerate(self._items)
+            ):
+                navigation = Navigation.from_items(
+                    [item if isinstance(item, dict) else item.model_dump() for item in self._items]
+                )
+            self._navigation = navigation
+        return self._navigation
+
+    @staticmethod
+    def _fqn_of(item) -> Optional[str]:
+        if isinstance(item, dict):
+            return item.get("id") or item.get("fqn") or item.get("name")
+        return getattr(item, "id", None) or getattr(item, "fqn", None) or getattr(item, "name", None)
+
     def resolve_target(self, fqn: str) -> Tuple[Optional[Dict[str, Any]], str]:
         """
         Resolves a FQN to the closest matching item in the index and a suffix path.
@@ -112,14 +144,19 @@ class KnowledgeIndex:
         if fqn in self._fqn_map:
             return self._fqn_map[fqn], ""
 
-        parts = fqn.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            prefix = ".".join(parts[:i])
-            if prefix in self._fqn_map:
-                suffix = ".".join(parts[i:])
-                return self._fqn_map[prefix], suffix
+        # Longest indexed prefix, in one walk down the prefix trie.
+        index, suffix = self.navigation.resolve(fqn)
+        if index is None:
+            return None, fqn
+        return self._fqn_map[fqn[: len(fqn) - len(suffix) - 1]], suffix
+
+    def members(self, fqn: str) -> List[Dict[str, Any]]:
+        """Items directly inside a module or class, in rank order."""
+        return [self._items[i] for i in self.navigation.members(fqn)]
 
-        return None, fqn
+    def find_by_short_name(self, name: str) -> List[Dict[str, Any]]:
+        """Items whose FQN ends with `name` (e.g. 'LlmAgent'), in rank order."""
+        return [self._items[i] for i in self.navigation.by_short_name(name)]
 
     async def search(self, query: str, limit: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
         if not self._provider:
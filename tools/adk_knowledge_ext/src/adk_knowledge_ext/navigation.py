@@ -0,0 +1,256 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Navigation module.
+
+Reverse indices over a ranked_targets.yaml, written by the ranker next to it as
+`ranked_targets.nav.json`:
+
+- `targets`: one (id, type, rank, summary) row per target, in file (rank) order;
+- `offsets`: byte offset of each target's YAML entry, plus the end of the file, so a
+  page of full entries is parsed from one slice of the YAML;
+- `members`: parent FQN (module or class) -> rows of its direct members;
+- `short_names`: last FQN component -> rows with that name;
+- `trie`: the FQNs split on dots, for longest-prefix resolution.
+
+The sidecar records the sha256 of the YAML it was built from. Indices without a
+(current) sidecar, e.g. downloaded ones, are navigated from the same structures built
+in memory (`Navigation.from_items`), so every lookup costs O(result size) either way.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+NAVIGATION_FORMAT = 1
+# Trie key of the row index of the FQN ending at a node; never a Python identifier.
+_TERMINAL = "$"
+
+_NAVIGATIONS: Dict[Path, Tuple[Tuple[int, int], "Navigation"]] = {}
+_NAVIGATIONS_LOCK = threading.Lock()
+
+
+class Row(NamedTuple):
+    id: str
+    type: Optional[str]
+    rank: Any
+    summary: Optional[str]  # First docstring line; None without a docstring.
+
+
+def navigation_path(index_path: Path) -> Path:
+    """Path of the navigation sidecar of a ranked_targets.yaml."""
+    return Path(index_path).with_suffix(".nav.json")
+
+
+def _item_fqn(item: Dict[str, Any]) -> Optional[str]:
+    return item.get("id") or item.get("fqn") or item.get("name")
+
+
+def build_navigation(
+    items: List[Dict[str, Any]],
+    offsets: Optional[List[int]] = None,
+    source_sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Builds the reverse indices of ranked target dicts, in the order given."""
+    targets, members, short_names, trie = [], {}, {}, {}
+    for i, item in enumerate(items):
+        fqn = _item_fqn(item) or ""
+        docstring = item.get("docstring")
+        summary = docstring.split("\n")[0].strip() if docstring else None
+        targets.append([fqn, item.get("type"), item.get("rank"), summary])
+        parent, _, name = fqn.rpartition(".")
+        if parent:
+            members.setdefault(parent, []).append(i)
+        short_names.setdefault(name, []).append(i)
+        if not fqn:
+            continue
+        node = trie
+        for part in fqn.split("."):
+            node = node.setdefault(part, {})
+        # The first of duplicate FQNs wins, as in a dict built in rank order.
+        node.setdefault(_TERMINAL, i)
+    return {
+        "format": NAVIGATION_FORMAT,
+        "source_sha256": source_sha256,
+        "targets": targets,
+        "offsets": offsets,
+        "members": members,
+        "short_names": short_names,
+        "trie": trie,
+    }
+
+
+def _atomic_write(path: Path, content: str):
+    """Writes `content` to `path` via a temporary file, so readers never see a part."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_ranked_targets(items: List[Dict[str, Any]], index_path: Path):
+    """
+    Writes ranked target dicts to a ranked_targets.yaml and its navigation sidecar.
+
+    The YAML is identical to `yaml.dump(items, sort_keys=False, width=1000)`; each
+    entry is dumped on its own to record where it starts.
+    """
+    index_path = Path(index_path)
+    chunks = [yaml.dump([item], sort_keys=False, width=1000) for item in items]
+    offsets = [0]
+    for chunk in chunks:
+        offsets.append(offsets[-1] + len(chunk.encode("utf-8")))
+    content = "".join(chunks) if chunks else yaml.dump([])
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    # A sidecar left over from an interrupted write is recognized as stale.
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    data = build_navigation(items, offsets, digest)
+    _atomic_write(navigation_path(index_path), json.dumps(data, separators=(",", ":")))
+
+
+class Navigation:
+    """Reverse indices over the ranked targets of one index."""
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        index_path: Optional[Path] = None,
+        items: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self._rows = data["targets"]
+        self._offsets = data.get("offsets")
+        self._members = data["members"]
+        self._short_names = data["short_names"]
+        self._trie = data["trie"]
+        self._index_path = index_path
+        self._items = items
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> "Navigation":
+        """Navigation built in memory; entries are served from `items`."""
+        return cls(build_navigation(items), items=items)
+
+    @classmethod
+    def from_sidecar(cls, index_path: Path) -> Optional["Navigation"]:
+        """The navigation written next to `index_path`, or None if missing or stale."""
+        index_path = Path(index_path)
+        try:
+            with open(navigation_path(index_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            source = index_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("format") != NAVIGATION_FORMAT
+            or data.get("source_sha256") != hashlib.sha256(source).hexdigest()
+        ):
+            return None
+        return cls(data, index_path=index_path)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, index: int) -> Row:
+        return Row(*self._rows[index])
+
+    def rows(self, indices: Iterable[int]) -> List[Row]:
+        return [Row(*self._rows[i]) for i in indices]
+
+    def page(self, page: int, page_size: int) -> List[Row]:
+        """Rows of a 1-based page, in rank order."""
+        start = (page - 1) * page_size
+        return [Row(*row) for row in self._rows[max(start, 0) : start + page_size]]
+
+    def resolve(self, fqn: str) -> Tuple[Optional[int], str]:
+        """
+        Row of the longest indexed prefix of `fqn`, and the rest of the FQN.
+        Example: 'a.b.C.m' -> (row of 'a.b.C', 'm')
+        """
+        parts = fqn.split(".")
+        node, best, depth = self._trie, None, 0
+        for i, part in enumerate(parts):
+            node = node.get(part)
+            if node is None:
+                break
+            if _TERMINAL in node:
+                best, depth = node[_TERMINAL], i + 1
+        if best is None:
+            return None, fqn
+        return best, ".".join(parts[depth:])
+
+    def find(self, fqn: str) -> Optional[int]:
+        """Row of exactly `fqn`, if indexed."""
+        index, suffix = self.resolve(fqn)
+        return index if not suffix else None
+
+    def members(self, fqn: str) -> List[int]:
+        """Rows of the direct members of a module or class, in rank order."""
+        return self._members.get(fqn, [])
+
+    def by_short_name(self, name: str) -> List[int]:
+        """Rows whose FQN ends with the component `name`, in rank order."""
+        return self._short_names.get(name, [])
+
+    def entries(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """The full ranked target dicts of rows [start, end)."""
+        start, end = max(start, 0), min(end, len(self._rows))
+        if start >= end:
+            return []
+        if self._items is not None:
+            return self._items[start:end]
+        with open(self._index_path, "rb") as f:
+            f.seek(self._offsets[start])
+            chunk = f.read(self._offsets[end] - self._offsets[start])
+        return yaml.load(chunk.decode("utf-8"), Loader=_Loader)
+
+    def entry(self, index: int) -> Dict[str, Any]:
+        return self.entries(index, index + 1)[0]
+
+
+def load_navigation(index_path: Path) -> Optional[Navigation]:
+    """
+    Returns the shared sidecar navigation of a ranked_targets.yaml, or None if it has
+    no current sidecar. Reloaded when the index's size or mtime changes.
+    """
+    index_path = Path(index_path).resolve()
+    try:
+        st = index_path.stat()
+    except OSError:
+        return None
+    version = (st.st_size, st.st_mtime_ns)
+    with _NAVIGATIONS_LOCK:
+        cached = _NAVIGATIONS.get(index_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        navigation = Navigation.from_sidecar(index_path)
+        if navigation is not None:
+            _NAVIGATIONS[index_path] = (version, navigation)
+        return navigation
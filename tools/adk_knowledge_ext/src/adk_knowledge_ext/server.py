@@ -421,7 +421,7 @@ def _ensure_instructions():
 
 
 @mcp.tool()
-def list_modules(kb_id: str = None, page: int = 1, page_size: int = 20) -> str:
+def list_modules(kb_id: str = None, page: int = 1, page_size: int = 20, module: str = None) -> str:
     """
     Lists ranked modules and classes in the specified codebase.
 
@@ -429,16 +429,24 @@ def list_modules(kb_id: str = None, page: int = 1, page_size: int = 20) -> str:
         kb_id: The ID of the knowledge base to query (optional).
         page: Page number (1-based).
         page_size: Number of items per page.
+        module: Only list the direct members of this module or class FQN (optional).
     """
     try:
         resolved_id = _ensure_index(kb_id)
         _ensure_instructions()
-        items = get_index(resolved_id).list_items(page, page_size)
+        idx = get_index(resolved_id)
+        if module:
+            start = (page - 1) * page_size
+            items = idx.members(module)[max(start, 0) : start + page_size]
+            if not items:
+                return f"Error: No members found for '{module}' on page {page} in '{resolved_id}'."
+            lines = [f"--- Members of '{module}' in '{resolved_id}' (Page {page}) ---"]
+        else:
+            items = idx.list_items(page, page_size)
+            if not items:
+                return f"Error: No items found for page {page} in '{resolved_id}'. Index might be empty or not properly set up."
+            lines = [f"--- Ranked Modules in '{resolved_id}' (Page {page}) ---"]
 
-        if not items:
-             return f"Error: No items found for page {page} in '{resolved_id}'. Index might be empty or not properly set up."
-
-        lines = [f"--- Ranked Modules in '{resolved_id}' (Page {page}) ---"]
         for item in items:
             rank = item.get("rank", "?")
             fqn = item.get("id") or item.get("fqn") or item.get("name") or "unknown"
@@ -495,6 +503,15 @@ async def search_knowledge(kb_id: str = None, queries: Union[str, List[str]] = [
     return "\n".join(lines)
 
 
+def _suggestions(idx, fqn: str, limit: int = 5) -> str:
+    """Indexed symbols with the same short name as an unknown FQN, as a hint."""
+    matches = idx.find_by_short_name(fqn.rsplit(".", 1)[-1])[:limit]
+    if not matches:
+        return ""
+    names = [item.get("id") or item.get("fqn") or item.get("name") for item in matches]
+    return " Did you mean: " + ", ".join(names) + "?"
+
+
 @mcp.tool()
 def read_source_code(kb_id: str = None, fqn: str = "") -> str:
     """
@@ -514,7 +531,7 @@ def read_source_code(kb_id: str = None, fqn: str = "") -> str:
     target, suffix = idx.resolve_target(fqn)
 
     if not target:
-        return f"Symbol '{fqn}' not found in index '{resolved_id}'."
+        return f"Symbol '{fqn}' not found in index '{resolved_id}'." + _suggestions(idx, fqn)
 
     rel_path = (target.get("file_path") if isinstance(target, dict) else getattr(target, "file_path", None))
     if not rel_path:
@@ -546,7 +563,7 @@ def inspect_symbol(kb_id: str = None, fqn: str = "") -> str:
     target, suffix = idx.resolve_target(fqn)
 
     if not target:
-        return f"Symbol '{fqn}' not found in index '{resolved_id}'."
+        return f"Symbol '{fqn}' not found in index '{resolved_id}'." + _suggestions(idx, fqn)
 
     output = yaml.safe_dump(target.model_dump(exclude_unset=True) if hasattr(target, "model_dump") else target, sort_keys=False)
 
@@ -0,0 +1,98 @@
+"""Test Navigation module."""
+
+import yaml
+
+from adk_knowledge_ext import index as index_module
+from adk_knowledge_ext.index import KnowledgeIndex
+from adk_knowledge_ext.navigation import (
+    Navigation,
+    load_navigation,
+    navigation_path,
+    write_ranked_targets,
+)
+from adk_knowledge_ext.search import KeywordSearchProvider
+
+ITEMS = [
+    {
+        "rank": 1,
+        "id": "pkg.runners.Runner",
+        "type": "CLASS",
+        "docstring": "Runs.\nMore.",
+    },
+    {"rank": 2, "id": "pkg.runners", "type": "MODULE"},
+    {"rank": 3, "id": "pkg.runners.Runner.run", "type": "METHOD", "docstring": "Go."},
+    {"rank": 4, "id": "pkg.agents.Agent", "type": "CLASS", "docstring": "An agent."},
+    {"rank": 5, "id": "pkg.runners.run", "type": "METHOD"},
+    {"rank": 6, "id": "pkg.agents.Agent", "type": "CLASS", "docstring": "Duplicate."},
+]
+
+
+def test_sidecar_matches_in_memory_navigation(tmp_path):
+    path = tmp_path / "ranked_targets.yaml"
+    write_ranked_targets(ITEMS, path)
+    assert path.read_text() == yaml.dump(ITEMS, sort_keys=False, width=1000)
+
+    for navigation in (load_navigation(path), Navigation.from_items(ITEMS)):
+        assert len(navigation) == 6
+        assert [row.id for row in navigation.page(2, 2)] == [
+            "pkg.runners.Runner.run",
+            "pkg.agents.Agent",
+        ]
+        assert navigation.row(0).summary == "Runs."
+        assert navigation.row(1).summary is None
+        assert navigation.entries(2, 4) == ITEMS[2:4]
+        assert navigation.entry(5) == ITEMS[5]
+        assert navigation.resolve("pkg.runners.Runner.run_async.x") == (
+            0,
+            "run_async.x",
+        )
+        assert navigation.resolve("pkg.runners.Other") == (1, "Other")
+        assert navigation.resolve("other.pkg") == (None, "other.pkg")
+        assert navigation.find("pkg.agents.Agent") == 3
+        assert navigation.find("pkg.agents") is None
+        assert navigation.members("pkg.runners") == [0, 4]
+        assert navigation.members("pkg.runners.Runner") == [2]
+        assert navigation.by_short_name("run") == [2, 4]
+
+    # Shared per file; an index rewritten without its sidecar is not navigated by it.
+    assert load_navigation(path) is load_navigation(path)
+    path.write_text(yaml.dump(ITEMS[:2], sort_keys=False, width=1000))
+    assert load_navigation(path) is None
+    navigation_path(path).unlink()
+    assert load_navigation(path) is None
+
+
+def test_empty_index_is_still_a_yaml_list(tmp_path):
+    path = tmp_path / "ranked_targets.yaml"
+    write_ranked_targets([], path)
+    assert yaml.safe_load(path.read_text()) == []
+    assert len(load_navigation(path)) == 0
+
+
+def test_knowledge_index_navigation(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        index_module, "_initialize_search_provider", lambda *a: KeywordSearchProvider()
+    )
+    path = tmp_path / "ranked_targets.yaml"
+    write_ranked_targets(ITEMS, path)
+    idx = KnowledgeIndex()
+    idx.load(path)
+
+    target, suffix = idx.resolve_target("pkg.runners.Runner.run_async")
+    assert (target["id"], suffix) == ("pkg.runners.Runner", "run_async")
+    # Duplicate FQNs resolve to the last one, with or without a suffix.
+    assert idx.resolve_target("pkg.agents.Agent")[0]["docstring"] == "Duplicate."
+    assert idx.resolve_target("pkg.agents.Agent.x")[0]["docstring"] == "Duplicate."
+    assert idx.resolve_target("nope.x") == (None, "nope.x")
+    assert [i["id"] for i in idx.members("pkg.runners")] == [
+        "pkg.runners.Runner",
+        "pkg.runners.run",
+    ]
+    assert [i["rank"] for i in idx.find_by_short_name("Agent")] == [4, 6]
+
+    # Without a sidecar, the same indices are built from the loaded items.
+    navigation_path(path).unlink()
+    idx = KnowledgeIndex()
+    idx.load(path)
+    assert idx.resolve_target("pkg.runners.Runner.run_async")[1] == "run_async"
+    assert [i["rank"] for i in idx.members("pkg.runners")] == [1, 5]
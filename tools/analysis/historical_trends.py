@@ -1,106 +1,57 @@
 """
 Analysis of pass rates over time across multiple runs.
 
-This script scans the `benchmark_runs/` directory to calculate weighted pass rates
-for benchmark cases. It applies a recency decay factor to prioritize recent results,
+This script calculates weighted pass rates for benchmark cases across the runs in
+the benchmark runs directory. It applies a recency decay factor to prioritize recent results,
 helping identify "flaky" tests versus consistently broken features.
 
+Results are read from the persistent aggregate store (see `trends_store.py`). Only
+runs that are new or changed since the last invocation are parsed, so the cost of a
+report grows with the number of new runs rather than the size of the history.
+
 Usage:
-    python tools/analysis/historical_trends.py
+    python tools/analysis/historical_trends.py [--generators] [--rebuild]
 """
 
-import json
-import yaml
+import argparse
 import pathlib
-import sys
-from collections import defaultdict
-from typing import Dict, List, Tuple
-import math
+
+from core.config import BENCHMARK_RUNS_DIR
+from tools.analysis.trends_store import DEFAULT_DB_PATH, TrendsStore
 
 # Configuration
-RUNS_DIR = pathlib.Path("benchmark_runs")
+RUNS_DIR = BENCHMARK_RUNS_DIR
 MIN_RUNS = 2  # Minimum number of runs a case must appear in to be reported
 DECAY_FACTOR = 0.8  # Weight multiplier for older runs (1.0 = equal weight, 0.5 = heavy bias to recent)
 
 
-def analyze_historical_pass_rates():
+def analyze_historical_pass_rates(
+    runs_dir: pathlib.Path = RUNS_DIR,
+    db_path: pathlib.Path = DEFAULT_DB_PATH,
+    show_generators: bool = False,
+):
     """
     Analyzes historical benchmark runs to identify persistent failure cases.
     Weights more recent runs higher.
     """
-    if not RUNS_DIR.exists():
-        print(f"Error: {RUNS_DIR} does not exist.")
+    if not runs_dir.exists():
+        print(f"Error: {runs_dir} does not exist.")
         return
 
-    # Data structure: benchmark_name -> list of results (1 for pass, 0 for fail) in reverse chronological order
-    case_results: Dict[str, List[int]] = defaultdict(list)
-
-    run_count = 0
-    print(f"Scanning {RUNS_DIR} for trace.yaml files (Weighted by Recency)...")
-
-    # Sort by date desc (Most recent first)
-    run_dirs = sorted([d for d in RUNS_DIR.iterdir() if d.is_dir()], reverse=True)
-
-    for run_dir in run_dirs:
-        log_file = run_dir / "trace.yaml"
-        if not log_file.exists():
-            continue
+    with TrendsStore(db_path, decay_factor=DECAY_FACTOR) as store:
+        print(f"Syncing {runs_dir} into {db_path} (Weighted by Recency)...")
+        ingested = store.sync(runs_dir)
+        print(f"Ingested {len(ingested)} new or changed runs.")
 
-        try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                run_processed = False
-                for event in yaml.safe_load_all(f):
-                    if event is None:
-                        continue
-                    if event.get("event_type") == "test_result":
-                        data = event.get("data", {})
-                        # Prioritize 'id' (unambiguous) over 'benchmark_name' (historical)
-                        name = data.get("id") or data.get("benchmark_name")
-                        result = data.get("result")
-
-                        if name and result:
-                            case_results[name].append(1 if result == "pass" else 0)
-                            run_processed = True
-
-                if run_processed:
-                    run_count += 1
-
-        except Exception as e:
-            print(f"Error processing {log_file}: {e}")
+        results = store.case_trends(min_runs=MIN_RUNS)
+        run_count = store.run_count()
+        generator_rows = store.generator_trends() if show_generators else []
 
     print(f"\nAnalyzed {run_count} runs.")
     print("-" * 85)
     print(f"{ 'Benchmark Case':<60} | {'Weighted Pass':<13} | {'Total Runs':<10}")
     print("-" * 85)
 
-    # Calculate weighted pass rates
-    results = []
-    for name, results_list in case_results.items():
-        if len(results_list) < MIN_RUNS:
-            continue
-
-        # results_list is [most_recent, ..., oldest]
-        weighted_sum = 0.0
-        total_weight = 0.0
-
-        for i, res in enumerate(results_list):
-            weight = math.pow(DECAY_FACTOR, i)
-            weighted_sum += res * weight
-            total_weight += weight
-
-        weighted_pass_rate = (weighted_sum / total_weight) * 100
-
-        results.append(
-            {
-                "name": name,
-                "weighted_pass_rate": weighted_pass_rate,
-                "total": len(results_list),
-            }
-        )
-
-    # Sort: Weighted Pass Rate (asc), then Total Runs (desc)
-    results.sort(key=lambda x: (x["weighted_pass_rate"], -x["total"]))
-
     for res in results:
         name_display = (
             (res["name"][:57] + "...") if len(res["name"]) > 57 else res["name"]
@@ -114,6 +65,39 @@ def analyze_historical_pass_rates():
         f"\nNote: Weighted Pass Rate uses a decay factor of {DECAY_FACTOR} per previous run."
     )
 
+    if generator_rows:
+        print("\nGenerator Pass Rate by Run:")
+        print("-" * 85)
+        for row in generator_rows:
+            print(
+                f"{row['run_id']:<20} | {row['generator'][:40]:<40} |"
+                f" {row['pass_rate']:6.1f}% | {row['total']:<6}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report recency-weighted pass rates across benchmark runs."
+    )
+    parser.add_argument("--runs-dir", type=pathlib.Path, default=RUNS_DIR)
+    parser.add_argument("--db", type=pathlib.Path, default=DEFAULT_DB_PATH)
+    parser.add_argument(
+        "--generators",
+        action="store_true",
+        help="Also print per-run pass rates for each generator.",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the aggregate store and re-ingest every run.",
+    )
+    args = parser.parse_args()
+
+    if args.rebuild and args.db.exists():
+        args.db.unlink()
+
+    analyze_historical_pass_rates(args.runs_dir, args.db, args.generators)
+
 
 if __name__ == "__main__":
-    analyze_historical_pass_rates()
+    main()
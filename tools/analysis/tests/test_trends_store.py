@@ -0,0 +1,123 @@
+import gzip
+import json
+import math
+import os
+
+import pytest
+
+from tools.analysis.trends_store import TrendsStore
+
+
+def _write_run(runs_dir, run_id, outcomes):
+    """Writes a minimal results.json.gz with (case_id, generator, status) tuples."""
+    run_dir = runs_dir / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    data = [
+        {
+            "id": case_id,
+            "answer_generator": gen,
+            "status": status,
+            "latency": 1.0,
+            "usage_metadata": {"total_tokens": 10},
+        }
+        for case_id, gen, status in outcomes
+    ]
+    with gzip.open(run_dir / "results.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(data, f)
+    return run_dir
+
+
+def _naive_weighted(results_newest_first, decay=0.8):
+    w_sum = sum(r * math.pow(decay, i) for i, r in enumerate(results_newest_first))
+    w_total = sum(math.pow(decay, i) for i in range(len(results_newest_first)))
+    return w_sum / w_total * 100
+
+
+@pytest.fixture
+def runs_dir(tmp_path):
+    d = tmp_path / "runs"
+    d.mkdir()
+    return d
+
+
+def test_incremental_matches_full_recompute(tmp_path, runs_dir):
+    _write_run(
+        runs_dir,
+        "2026-01-01_00-00-00",
+        [("a", "g1", "pass"), ("b", "g1", "fail_validation")],
+    )
+    _write_run(
+        runs_dir,
+        "2026-01-02_00-00-00",
+        [("a", "g1", "fail_validation"), ("b", "g1", "pass")],
+    )
+
+    with TrendsStore(tmp_path / "trends.db") as store:
+        assert len(store.sync(runs_dir)) == 2
+        # Newer run ingested incrementally
+        _write_run(
+            runs_dir, "2026-01-03_00-00-00", [("a", "g1", "pass"), ("a", "g2", "pass")]
+        )
+        assert store.sync(runs_dir) == ["2026-01-03_00-00-00"]
+        trends = {r["name"]: r for r in store.case_trends(min_runs=2)}
+
+    assert trends["a"]["total"] == 4
+    assert trends["a"]["weighted_pass_rate"] == pytest.approx(
+        _naive_weighted([1, 1, 0, 1])
+    )
+    assert trends["b"]["weighted_pass_rate"] == pytest.approx(_naive_weighted([1, 0]))
+
+
+def test_backfilled_older_run_is_recomputed(tmp_path, runs_dir):
+    _write_run(runs_dir, "2026-01-02_00-00-00", [("a", "g1", "pass")])
+    with TrendsStore(tmp_path / "trends.db") as store:
+        store.sync(runs_dir)
+        _write_run(runs_dir, "2026-01-01_00-00-00", [("a", "g1", "fail_setup")])
+        store.sync(runs_dir)
+        trends = store.case_trends(min_runs=1)
+
+    assert trends[0]["weighted_pass_rate"] == pytest.approx(_naive_weighted([1, 0]))
+
+
+def test_unchanged_runs_are_skipped(tmp_path, runs_dir):
+    run_dir = _write_run(runs_dir, "2026-01-01_00-00-00", [("a", "g1", "pass")])
+    with TrendsStore(tmp_path / "trends.db") as store:
+        assert store.sync(runs_dir) == ["2026-01-01_00-00-00"]
+        assert store.sync(runs_dir) == []
+
+        # Touching the file without changing content only refreshes the mtime
+        os.utime(run_dir / "results.json.gz", ns=(1, 1))
+        assert store.sync(runs_dir) == []
+
+        # Changing content re-ingests and replaces the run's rows
+        _write_run(runs_dir, "2026-01-01_00-00-00", [("a", "g1", "fail_validation")])
+        os.utime(run_dir / "results.json.gz", ns=(2, 2))
+        assert store.sync(runs_dir) == ["2026-01-01_00-00-00"]
+        trends = store.case_trends(min_runs=1)
+
+    assert trends[0]["total"] == 1
+    assert trends[0]["weighted_pass_rate"] == 0.0
+
+
+def test_generator_trends(tmp_path, runs_dir):
+    _write_run(
+        runs_dir,
+        "2026-01-01_00-00-00",
+        [("a", "g1", "pass"), ("b", "g1", "fail_generation")],
+    )
+    with TrendsStore(tmp_path / "trends.db") as store:
+        store.sync(runs_dir)
+        rows = store.generator_trends("g1")
+
+    assert rows == [
+        {
+            "run_id": "2026-01-01_00-00-00",
+            "generator": "g1",
+            "total": 2,
+            "passed": 1,
+            "system_failures": 1,
+            "pass_rate": 50.0,
+            "avg_latency": 1.0,
+            "avg_tokens": 10.0,
+        }
+    ]
@@ -0,0 +1,478 @@
+"""
+Persistent aggregate store for historical benchmark trends.
+
+Rescanning every run directory (and re-parsing every `results.json.gz` / `trace.yaml`)
+makes historical reports cost O(all runs). This module keeps a local SQLite database
+with:
+
+- `runs`: one summary row per ingested run, plus the artifact mtime and content hash
+  used to detect changes.
+- `run_generator_stats`: per-run, per-generator totals (pass/fail, crashes, latency,
+  tokens) for trend charts.
+- `run_case_results`: per-run pass/fail entries for each case.
+- `case_aggregates`: per-case totals and recency-weighted pass rates.
+
+Runs are ingested incrementally, either explicitly when a run completes
+(`ingest_run`) or by discovery (`sync`), which skips any run whose artifact mtime
+(or, failing that, content hash) is unchanged. Trend queries only read the aggregates.
+"""
+
+import gzip
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from benchmarks.results_store import RESULTS_COLUMNS_FILE, load_results_frame
+from core.config import OUTPUT_ROOT
+
+DEFAULT_DB_PATH = OUTPUT_ROOT / "historical_trends.db"
+DEFAULT_DECAY_FACTOR = 0.8
+
+# Artifacts checked in order of preference when ingesting a run
+RUN_ARTIFACTS = [RESULTS_COLUMNS_FILE, "results.json.gz", "results.json", "trace.yaml"]
+
+SYSTEM_FAILURE_STATUSES = ("fail_setup", "fail_generation")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    artifact TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_generator_stats (
+    run_id TEXT NOT NULL,
+    generator TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    system_failures INTEGER NOT NULL,
+    latency_sum REAL NOT NULL,
+    tokens_sum INTEGER NOT NULL,
+    PRIMARY KEY (run_id, generator)
+);
+CREATE TABLE IF NOT EXISTS run_case_results (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    case_id TEXT NOT NULL,
+    generator TEXT,
+    passed INTEGER NOT NULL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_run_case_results_case ON run_case_results (case_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS case_aggregates (
+    case_id TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    weighted_sum REAL NOT NULL,
+    weight_total REAL NOT NULL,
+    latest_run_id TEXT NOT NULL
+);
+"""
+
+
+class RunRecord:
+    """A single case result extracted from a run artifact."""
+
+    __slots__ = ("case_id", "generator", "status", "latency", "tokens")
+
+    def __init__(
+        self,
+        case_id: str,
+        generator: Optional[str],
+        status: str,
+        latency: float = 0.0,
+        tokens: int = 0,
+    ):
+        self.case_id = case_id
+        self.generator = generator
+        self.status = status
+        self.latency = latency
+        self.tokens = tokens
+
+    @property
+    def passed(self) -> int:
+        return 1 if self.status == "pass" else 0
+
+
+def find_run_artifact(run_dir: pathlib.Path) -> Optional[pathlib.Path]:
+    """Returns the preferred results artifact for a run directory, if any."""
+    for name in RUN_ARTIFACTS:
+        path = run_dir / name
+        if path.exists():
+            return path
+    return None
+
+
+def _file_hash(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _status_value(value) -> str:
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def read_run_records(artifact: pathlib.Path) -> List[RunRecord]:
+    """Extracts per-case records from a run artifact."""
+    name = artifact.name
+
+    if name == RESULTS_COLUMNS_FILE:
+        df = load_results_frame(
+            artifact.parent,
+            columns=["id", "answer_generator", "status", "latency", "total_tokens"],
+        )
+        df["latency"] = df["latency"].fillna(0.0)
+        df["total_tokens"] = df["total_tokens"].fillna(0)
+        return [
+            RunRecord(c, g, s, float(l), int(t))
+            for c, g, s, l, t in zip(
+                df["id"],
+                df["answer_generator"],
+                df["status"],
+                df["latency"],
+                df["total_tokens"],
+            )
+        ]
+
+    if name in ("results.json.gz", "results.json"):
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(artifact, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return [
+            RunRecord(
+                d.get("id") or d.get("benchmark_name"),
+                d.get("answer_generator"),
+                _status_value(d.get("status")),
+                float(d.get("latency") or 0.0),
+                int((d.get("usage_metadata") or {}).get("total_tokens") or 0),
+            )
+            for d in data
+        ]
+
+    # trace.yaml: only test_result events carry pass/fail information
+    records = []
+    with open(artifact, "r", encoding="utf-8", errors="ignore") as f:
+        for event in yaml.safe_load_all(f):
+            if event is None or event.get("event_type") != "test_result":
+                continue
+            data = event.get("data", {})
+            # Prioritize 'id' (unambiguous) over 'benchmark_name' (historical)
+            case_id = data.get("id") or data.get("benchmark_name")
+            result = data.get("result")
+            if case_id and result:
+                records.append(RunRecord(case_id, None, _status_value(result)))
+    return records
+
+
+def _weighted(entries: Iterable[int], decay: float) -> Tuple[float, float]:
+    """Computes the recency-weighted (sum, weight) for results ordered newest first."""
+    weighted_sum = 0.0
+    weight_total = 0.0
+    weight = 1.0
+    for passed in entries:
+        weighted_sum += passed * weight
+        weight_total += weight
+        weight *= decay
+    return weighted_sum, weight_total
+
+
+class TrendsStore:
+    """SQLite-backed aggregate store for historical benchmark results."""
+
+    def __init__(
+        self,
+        db_path: pathlib.Path = DEFAULT_DB_PATH,
+        decay_factor: float = DEFAULT_DECAY_FACTOR,
+    ):
+        self.db_path = pathlib.Path(db_path)
+        self.decay_factor = decay_factor
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(_SCHEMA)
+        self._check_decay_factor()
+
+    def _check_decay_factor(self):
+        """Recomputes the weighted aggregates if the decay factor has changed."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'decay_factor'"
+        ).fetchone()
+        if row and float(row[0]) == self.decay_factor:
+            return
+        with self.conn:
+            for (case_id,) in self.conn.execute(
+                "SELECT case_id FROM case_aggregates"
+            ).fetchall():
+                self._recompute_case(case_id)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('decay_factor', ?)",
+                (repr(self.decay_factor),),
+            )
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # --- Ingestion ---
+
+    def sync(self, runs_dir: pathlib.Path) -> List[str]:
+        """Ingests new or changed runs under `runs_dir`.
+
+        Unchanged runs (same artifact and mtime, or same content hash) are skipped
+        without being parsed.
+
+        Returns:
+            The run ids that were (re-)ingested.
+        """
+        if not runs_dir.exists():
+            return []
+        known = {
+            row[0]: row[1:]
+            for row in self.conn.execute(
+                "SELECT run_id, artifact, mtime_ns, content_hash FROM runs"
+            )
+        }
+
+        ingested = []
+        for run_dir in sorted(d for d in runs_dir.iterdir() if d.is_dir()):
+            artifact = find_run_artifact(run_dir)
+            if artifact is None:
+                continue
+            mtime_ns = artifact.stat().st_mtime_ns
+            previous = known.get(run_dir.name)
+            if previous and previous[0] == artifact.name and previous[1] == mtime_ns:
+                continue
+            if self.ingest_run(run_dir, artifact=artifact, mtime_ns=mtime_ns):
+                ingested.append(run_dir.name)
+        return ingested
+
+    def ingest_run(
+        self,
+        run_dir: pathlib.Path,
+        artifact: Optional[pathlib.Path] = None,
+        mtime_ns: Optional[int] = None,
+    ) -> bool:
+        """Ingests (or re-ingests) a single run directory.
+
+        Returns:
+            True if the run's rows were written, False if it had no artifact or its
+            content hash was unchanged.
+        """
+        run_dir = pathlib.Path(run_dir)
+        artifact = artifact or find_run_artifact(run_dir)
+        if artifact is None:
+            return False
+        mtime_ns = mtime_ns if mtime_ns is not None else artifact.stat().st_mtime_ns
+        content_hash = _file_hash(artifact)
+        run_id = run_dir.name
+
+        row = self.conn.execute(
+            "SELECT artifact, content_hash FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row and row == (artifact.name, content_hash):
+            # Touched but not modified: only refresh the mtime
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE runs SET mtime_ns = ? WHERE run_id = ?", (mtime_ns, run_id)
+                )
+            return False
+
+        try:
+            records = read_run_records(artifact)
+        except Exception as e:
+            print(f"Error processing {artifact}: {e}")
+            return False
+
+        with self.conn:
+            affected_cases = {
+                r[0]
+                for r in self.conn.execute(
+                    "SELECT DISTINCT case_id FROM run_case_results WHERE run_id = ?",
+                    (run_id,),
+                )
+            }
+            self.conn.execute(
+                "DELETE FROM run_case_results WHERE run_id = ?", (run_id,)
+            )
+            self.conn.execute(
+                "DELETE FROM run_generator_stats WHERE run_id = ?", (run_id,)
+            )
+
+            self.conn.executemany(
+                "INSERT INTO run_case_results VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, seq, r.case_id, r.generator, r.passed)
+                    for seq, r in enumerate(records)
+                    if r.case_id
+                ],
+            )
+
+            gen_stats: Dict[str, List[float]] = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+            for r in records:
+                if r.generator is None:
+                    continue
+                s = gen_stats[r.generator]
+                s[0] += 1
+                s[1] += r.passed
+                s[2] += 1 if r.status in SYSTEM_FAILURE_STATUSES else 0
+                s[3] += r.latency
+                s[4] += r.tokens
+            self.conn.executemany(
+                "INSERT INTO run_generator_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, g, *s) for g, s in gen_stats.items()],
+            )
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    artifact.name,
+                    mtime_ns,
+                    content_hash,
+                    len(records),
+                    sum(r.passed for r in records),
+                    time.time(),
+                ),
+            )
+
+            self._update_case_aggregates(
+                run_id, records, affected_cases | {r.case_id for r in records}
+            )
+        return True
+
+    def _update_case_aggregates(
+        self, run_id: str, records: List[RunRecord], case_ids: set
+    ):
+        """Updates `case_aggregates` for the cases touched by an ingested run.
+
+        When the run is the newest one for a case, the recency-weighted sums are
+        folded in directly (older entries are shifted by decay^k). Otherwise (a
+        backfilled or re-ingested run) the affected case is recomputed from
+        `run_case_results`, which never touches the run artifacts.
+        """
+        per_case: Dict[str, List[int]] = defaultdict(list)
+        for r in records:
+            if r.case_id:
+                per_case[r.case_id].append(r.passed)
+
+        for case_id in case_ids:
+            agg = self.conn.execute(
+                "SELECT total, passed, weighted_sum, weight_total, latest_run_id"
+                " FROM case_aggregates WHERE case_id = ?",
+                (case_id,),
+            ).fetchone()
+            new_entries = per_case.get(case_id, [])
+
+            if agg and new_entries and run_id > agg[4]:
+                total, passed, w_sum, w_total, _ = agg
+                k = len(new_entries)
+                add_sum, add_total = _weighted(new_entries, self.decay_factor)
+                shift = self.decay_factor**k
+                self.conn.execute(
+                    "UPDATE case_aggregates SET total = ?, passed = ?,"
+                    " weighted_sum = ?, weight_total = ?, latest_run_id = ?"
+                    " WHERE case_id = ?",
+                    (
+                        total + k,
+                        passed + sum(new_entries),
+                        add_sum + shift * w_sum,
+                        add_total + shift * w_total,
+                        run_id,
+                        case_id,
+                    ),
+                )
+            else:
+                self._recompute_case(case_id)
+
+    def _recompute_case(self, case_id: str):
+        rows = self.conn.execute(
+            "SELECT run_id, passed FROM run_case_results WHERE case_id = ?"
+            " ORDER BY run_id DESC, seq ASC",
+            (case_id,),
+        ).fetchall()
+        if not rows:
+            self.conn.execute(
+                "DELETE FROM case_aggregates WHERE case_id = ?", (case_id,)
+            )
+            return
+        entries = [r[1] for r in rows]
+        w_sum, w_total = _weighted(entries, self.decay_factor)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO case_aggregates VALUES (?, ?, ?, ?, ?, ?)",
+            (case_id, len(entries), sum(entries), w_sum, w_total, rows[0][0]),
+        )
+
+    # --- Queries ---
+
+    def run_count(self) -> int:
+        """Returns the number of ingested runs with at least one result."""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM runs WHERE total > 0"
+        ).fetchone()[0]
+
+    def case_trends(self, min_runs: int = 2) -> List[Dict]:
+        """Returns per-case weighted pass rates, worst first."""
+        rows = self.conn.execute(
+            "SELECT case_id, total, passed, weighted_sum, weight_total"
+            " FROM case_aggregates WHERE total >= ?",
+            (min_runs,),
+        ).fetchall()
+        results = [
+            {
+                "name": case_id,
+                "weighted_pass_rate": (w_sum / w_total) * 100 if w_total else 0.0,
+                "pass_rate": (passed / total) * 100 if total else 0.0,
+                "total": total,
+            }
+            for case_id, total, passed, w_sum, w_total in rows
+        ]
+        # Sort: Weighted Pass Rate (asc), then Total Runs (desc)
+        results.sort(key=lambda x: (x["weighted_pass_rate"], -x["total"]))
+        return results
+
+    def generator_trends(self, generator: Optional[str] = None) -> List[Dict]:
+        """Returns per-run pass rates and averages for each generator, oldest first."""
+        query = (
+            "SELECT run_id, generator, total, passed, system_failures, latency_sum,"
+            " tokens_sum FROM run_generator_stats"
+        )
+        params: Tuple = ()
+        if generator:
+            query += " WHERE generator = ?"
+            params = (generator,)
+        query += " ORDER BY run_id ASC, generator ASC"
+        return [
+            {
+                "run_id": run_id,
+                "generator": gen,
+                "total": total,
+                "passed": passed,
+                "system_failures": crashes,
+                "pass_rate": (passed / total) * 100 if total else 0.0,
+                "avg_latency": latency_sum / total if total else 0.0,
+                "avg_tokens": tokens_sum / total if total else 0.0,
+            }
+            for run_id, gen, total, passed, crashes, latency_sum, tokens_sum in (
+                self.conn.execute(query, params)
+            )
+        ]
@@ -1,21 +1,44 @@
-"""Extract Apis Llm module."""
+"""
+Extract Apis Llm module.
 
+Extracts API references from every benchmark case. Cases are extracted concurrently
+(at most `EXTRACT_CONCURRENCY` at a time), and each result is cached by a hash of the
+case text, the extractor and the set of valid APIs, so a rerun after editing one
+benchmark only extracts the cases that changed. The default `HeuristicExtractor` is
+deterministic and runs offline; any object with a `name` and an async
+`extract(text)` method can replace it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
 import os
-import yaml
 import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
 from core.config import EXTRACTED_APIS_FILE, RANKED_TARGETS_FILE
+from core.json_store import JsonStore, default_store_path, store_or_default
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # Configuration
 BENCHMARK_ROOT = "benchmarks/benchmark_definitions"
 RANKED_TARGETS_FILE = str(RANKED_TARGETS_FILE)
 OUTPUT_FILE = str(EXTRACTED_APIS_FILE)
+EXTRACT_CONCURRENCY = int(os.environ.get("ADK_EXTRACT_CONCURRENCY", 8))
 
 
 def load_ranked_targets(filepath):
     """Load ranked targets and return a set of valid API IDs."""
     try:
         with open(filepath, "r") as f:
-            targets = yaml.safe_load(f)
+            targets = yaml.load(f, Loader=_Loader)
             # Create a set of IDs (e.g., google.adk.runners.InMemoryRunner)
             return {t["id"] for t in targets if "id" in t}
     except Exception as e:
@@ -59,66 +82,171 @@ def extract_apis_from_text(text, valid_apis):
         m = m.rstrip(".")
         found.append(m)
 
-    return list(set(found))
+    # Sorted, so the output does not depend on set iteration order.
+    return sorted(set(found))
 
 
-def process_benchmark_file(filepath, valid_apis):
-    """Process a single benchmark file."""
+class HeuristicExtractor:
+    """Offline extractor: known API IDs and google.adk.* patterns found in the text."""
+
+    name = "heuristic-v1"
+
+    def __init__(self, valid_apis: Iterable[str]):
+        self.valid_apis = sorted(valid_apis)
+
+    async def extract(self, text: str) -> List[str]:
+        return extract_apis_from_text(text, self.valid_apis)
+
+
+def case_key(extractor_name: str, valid_apis: Iterable[str], text: str) -> str:
+    """Cache key of one case: what it says, who extracts it, and what counts as valid."""
+    apis_digest = hashlib.sha256("\n".join(sorted(valid_apis)).encode("utf-8"))
+    payload = json.dumps([extractor_name, apis_digest.hexdigest(), text])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache(JsonStore):
+    """Persistent map of case_key(...) to the API references extracted from the case."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path
+            or default_store_path("ADK_EXTRACTION_CACHE", "api_extraction_cache.db"),
+            "extractions",
+        )
+
+
+def case_text(entry: Dict[str, Any]) -> str:
+    """The text of a benchmark case that API references are extracted from."""
+    # Combine all text fields to search in
+    text_content = ""
+    text_fields = ["question", "rationale", "explanation", "description"]
+    if "options" in entry:
+        if isinstance(entry["options"], dict):
+            text_fields.extend(entry["options"].values())
+        elif isinstance(entry["options"], list):
+            text_fields.extend(entry["options"])
+
+    for field in text_fields:
+        val = entry.get(field) if field in entry else field
+        if isinstance(val, str):
+            text_content += val + " "
+
+    # Also check answers for explicit FQCNs
+    if "answers" in entry:
+        for ans in entry["answers"]:
+            fqcns = ans.get("fully_qualified_class_name", [])
+            if isinstance(fqcns, list):
+                for f in fqcns:
+                    text_content += f + " "
+            elif isinstance(fqcns, str):
+                text_content += fqcns + " "
+    return text_content
+
+
+def load_cases(filepath) -> List[Tuple[str, str]]:
+    """The (case_id, text) pairs of a benchmark file."""
     try:
         with open(filepath, "r") as f:
-            content = yaml.safe_load(f)
+            content = yaml.load(f, Loader=_Loader)
     except Exception as e:
         print(f"Error reading {filepath}: {e}")
         return []
 
     if not content or "benchmarks" not in content:
         return []
+    return [
+        (entry.get("id", "unknown"), case_text(entry))
+        for entry in content.get("benchmarks", [])
+    ]
+
+
+def _result_rows(filepath, case_id, extracted, valid_apis):
+    return [
+        {
+            "benchmark_file": filepath,
+            "case_id": case_id,
+            "api_reference": api,
+            "status": "matched" if api in valid_apis else "unmatched",
+        }
+        for api in extracted
+    ]
 
-    results = []
-    for entry in content.get("benchmarks", []):
-        case_id = entry.get("id", "unknown")
-
-        # Combine all text fields to search in
-        text_content = ""
-        text_fields = ["question", "rationale", "explanation", "description"]
-        if "options" in entry:
-            if isinstance(entry["options"], dict):
-                text_fields.extend(entry["options"].values())
-            elif isinstance(entry["options"], list):
-                text_fields.extend(entry["options"])
-
-        for field in text_fields:
-            val = entry.get(field) if field in entry else field
-            if isinstance(val, str):
-                text_content += val + " "
-
-        # Also check answers for explicit FQCNs
-        if "answers" in entry:
-            for ans in entry["answers"]:
-                fqcns = ans.get("fully_qualified_class_name", [])
-                if isinstance(fqcns, list):
-                    for f in fqcns:
-                        text_content += f + " "
-                elif isinstance(fqcns, str):
-                    text_content += fqcns + " "
-
-        extracted = extract_apis_from_text(text_content, valid_apis)
-
-        for api in extracted:
-            status = "matched" if api in valid_apis else "unmatched"
-            results.append(
-                {
-                    "benchmark_file": filepath,
-                    "case_id": case_id,
-                    "api_reference": api,
-                    "status": status,
-                }
-            )
 
+def process_benchmark_file(filepath, valid_apis):
+    """Process a single benchmark file."""
+    results = []
+    for case_id, text in load_cases(filepath):
+        extracted = extract_apis_from_text(text, valid_apis)
+        results.extend(_result_rows(filepath, case_id, extracted, valid_apis))
     return results
 
 
+async def extract_all(
+    files: Sequence[str],
+    valid_apis: Iterable[str],
+    extractor=None,
+    cache: Optional[ExtractionCache] = None,
+    concurrency: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Extracts the API references of every case in `files`, in file and case order.
+
+    Cached cases are not extracted again (`cache`, default: the persistent cache at
+    $ADK_EXTRACTION_CACHE or OUTPUT_ROOT/api_extraction_cache.db).
+
+    Returns:
+        The result rows, and counts of cases, cached cases and extracted cases.
+    """
+    valid_apis = set(valid_apis)
+    if extractor is None:
+        extractor = HeuristicExtractor(valid_apis)
+
+    cases = [
+        (filepath, case_id, text)
+        for filepath in files
+        for case_id, text in load_cases(filepath)
+    ]
+    keys = [case_key(extractor.name, valid_apis, text) for _, _, text in cases]
+
+    with store_or_default(cache, ExtractionCache) as cache:
+        known = cache.lookup(keys) if cache else {}
+        pending = {k: text for k, (_, _, text) in zip(keys, cases) if k not in known}
+        semaphore = asyncio.Semaphore(concurrency or EXTRACT_CONCURRENCY)
+
+        async def run(key, text):
+            async with semaphore:
+                apis = await extractor.extract(text)
+            # Checkpoint each case, so an interrupted run resumes where it stopped.
+            if cache:
+                cache.store([(key, apis)])
+            known[key] = apis
+
+        await asyncio.gather(*(run(key, text) for key, text in pending.items()))
+
+    results = []
+    for (filepath, case_id, _), key in zip(cases, keys):
+        results.extend(_result_rows(filepath, case_id, known[key], valid_apis))
+    stats = {
+        "cases": len(cases),
+        "cached": len(set(keys)) - len(pending),
+        "extracted": len(pending),
+    }
+    return results, stats
+
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Extract API references from benchmark definitions."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"Cases extracted at once (default: {EXTRACT_CONCURRENCY}).",
+    )
+    args = parser.parse_args()
+
     print(f"Loading ranked targets from {RANKED_TARGETS_FILE}...")
     valid_apis = load_ranked_targets(RANKED_TARGETS_FILE)
     print(f"Loaded {len(valid_apis)} valid API targets.")
@@ -126,12 +254,13 @@ def main():
     files = find_benchmark_files(BENCHMARK_ROOT)
     print(f"Found {len(files)} benchmark files.")
 
-    all_extractions = []
-    for f in files:
-        print(f"Processing {f}...")
-        extracted = process_benchmark_file(f, valid_apis)
-        all_extractions.extend(extracted)
-
+    all_extractions, stats = asyncio.run(
+        extract_all(files, valid_apis, concurrency=args.concurrency)
+    )
+    print(
+        f"Extracted {stats['extracted']} of {stats['cases']} cases"
+        f" ({stats['cached']} unchanged, cached)."
+    )
     print(f"Extracted {len(all_extractions)} references.")
 
     with open(OUTPUT_FILE, "w") as f:
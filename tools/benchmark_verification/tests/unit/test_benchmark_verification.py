@@ -0,0 +1,305 @@
+"""Test Benchmark Verification module."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import yaml
+from google import genai
+
+from tools import verify_benchmarks
+from tools.benchmark_verification.extract_apis_llm import (
+    ExtractionCache,
+    HeuristicExtractor,
+    extract_all,
+    process_benchmark_file,
+)
+from tools.benchmark_verification import verification_store
+from tools.benchmark_verification.verification_store import (
+    VerificationStore,
+    context_digest,
+    fingerprint_cases,
+)
+from tools.benchmark_verification.verify_apis import verify_apis
+from tools.knowledge.target_ranker.runtime_resolver import (
+    ResolutionCache,
+    RuntimeResolver,
+)
+
+VALID_APIS = {"google.adk.runners.Runner", "google.adk.agents.LlmAgent"}
+
+
+class FakeLlmExtractor(HeuristicExtractor):
+    """Records the texts it is asked about, like a metered LLM would be billed."""
+
+    name = "fake-llm"
+
+    def __init__(self, valid_apis):
+        super().__init__(valid_apis)
+        self.calls = []
+
+    async def extract(self, text):
+        self.calls.append(text)
+        return await super().extract(text)
+
+
+def _write_benchmark(path, questions):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cases = [{"id": f"case_{i}", "question": q} for i, q in enumerate(questions)]
+    path.write_text(yaml.safe_dump({"benchmarks": cases}))
+
+
+async def test_only_changed_cases_are_extracted_again(tmp_path):
+    first = tmp_path / "a" / "benchmark.yaml"
+    second = tmp_path / "b" / "benchmark.yaml"
+    _write_benchmark(first, ["Use google.adk.runners.Runner.", "Nothing here."])
+    _write_benchmark(second, ["Build a google.adk.agents.LlmAgent and google.adk.x."])
+    files = [str(first), str(second)]
+    cache = ExtractionCache(tmp_path / "extractions.db")
+
+    extractor = FakeLlmExtractor(VALID_APIS)
+    results, stats = await extract_all(files, VALID_APIS, extractor, cache, 2)
+    assert stats == {"cases": 3, "cached": 0, "extracted": 3}
+    assert len(extractor.calls) == 3
+    # Same rows as the serial, uncached extraction.
+    assert results == [
+        row for f in files for row in process_benchmark_file(f, VALID_APIS)
+    ]
+    assert [(r["api_reference"], r["status"]) for r in results] == [
+        ("google.adk.runners.Runner", "matched"),
+        ("google.adk.agents.LlmAgent", "matched"),
+        ("google.adk.x", "unmatched"),
+    ]
+
+    _write_benchmark(first, ["Use google.adk.runners.Runner.", "Now google.adk.y."])
+    extractor = FakeLlmExtractor(VALID_APIS)
+    results, stats = await extract_all(files, VALID_APIS, extractor, cache)
+    assert stats == {"cases": 3, "cached": 2, "extracted": 1}
+    assert len(extractor.calls) == 1
+    assert extractor.calls[0].startswith("Now google.adk.y. ")
+    assert ("case_1", "google.adk.y") in [
+        (r["case_id"], r["api_reference"]) for r in results
+    ]
+
+    # Another extractor (or another set of valid APIs) does not reuse the results.
+    _, stats = await extract_all(
+        files, VALID_APIS, HeuristicExtractor(VALID_APIS), cache
+    )
+    assert stats["extracted"] == 3
+
+
+def test_verification_resolves_each_api_once(tmp_path):
+    package = tmp_path / "src" / "fakepkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("class Runner:\n    def run(self): pass\n")
+    data = [
+        {"benchmark_file": "a.yaml", "api_reference": "fakepkg.Runner"},
+        {"benchmark_file": "b.yaml", "api_reference": "fakepkg.Runner.run"},
+        {"benchmark_file": "b.yaml", "api_reference": "fakepkg.Runner"},
+        {"benchmark_file": "c.yaml", "api_reference": "fakepkg.Missing"},
+        {"benchmark_file": "c.yaml", "api_reference": "fakepkg"},
+    ]
+
+    def verify():
+        with RuntimeResolver(
+            [str(tmp_path / "src")], cache=ResolutionCache(tmp_path / "resolver.db")
+        ) as resolver:
+            return verify_apis(data, resolver), resolver.stats
+
+    results, stats = verify()
+    assert [(r["api"], r["exists"], r["details"]) for r in results] == [
+        ("fakepkg.Runner", True, "Found"),
+        ("fakepkg.Runner.run", True, "Found"),
+        ("fakepkg.Missing", False, "ImportError or AttributeError"),
+        ("fakepkg", False, "Invalid format"),
+    ]
+    assert results[0]["found_in_benchmarks"] == ["a.yaml", "b.yaml"]
+    assert stats["resolved"] == 3 and stats["worker_starts"] == 1
+
+    # A rerun in the same environment imports nothing.
+    rerun, stats = verify()
+    assert rerun == results
+    assert stats["resolved"] == 0 and stats["worker_starts"] == 0
+
+
+class FakeVerifierGenerator:
+    """Stands in for the verifier pipeline and records the cases it is asked about."""
+
+    prompts = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def setup(self):
+        pass
+
+    async def teardown(self):
+        pass
+
+    async def _run_agent_async(self, prompt, benchmark_type):
+        self.prompts.append(prompt)
+        return "Verdict: Valid", [], None, None
+
+
+def _write_fix_errors_suite(root, count):
+    cases = []
+    for i in range(count):
+        case_dir = root / "cases" / f"case_{i}"
+        case_dir.mkdir(parents=True)
+        (case_dir / "fixed.py").write_text(f"ANSWER = {i}\n")
+        cases.append(
+            {
+                "id": f"fix_errors:case_{i}",
+                "benchmark_type": "fix_error",
+                "fixed_file": str(case_dir / "fixed.py"),
+                "description": f"Case {i}.",
+            }
+        )
+    suite = root / "benchmark.yaml"
+    suite.write_text(yaml.safe_dump({"benchmarks": cases}))
+    return suite, cases
+
+
+def test_fingerprints_follow_cases_and_their_files(tmp_path, monkeypatch):
+    _, cases = _write_fix_errors_suite(tmp_path, 40)
+    digest = context_digest({"target_repo_version": "v1.20.0"})
+    jobs = [(case, digest) for case in cases]
+
+    inline = fingerprint_cases(jobs, tmp_path, workers=1)
+    monkeypatch.setattr(verification_store, "PARALLEL_FINGERPRINT_MIN_CASES", 1)
+    assert fingerprint_cases(jobs, tmp_path, workers=2) == inline
+    assert len({fingerprint for fingerprint, _ in inline}) == 40
+    assert all(problems == [] for _, problems in inline)
+
+    # Another ADK version, or an edited referenced file, changes the fingerprint.
+    other = context_digest({"target_repo_version": "v1.21.0"})
+    assert fingerprint_cases([(cases[0], other)], tmp_path)[0] != inline[0]
+    (tmp_path / "cases" / "case_1" / "fixed.py").write_text("ANSWER = (\n")
+    (tmp_path / "cases" / "case_2" / "fixed.py").unlink()
+    changed = fingerprint_cases(jobs[:3], tmp_path)
+    assert changed[0] == inline[0]
+    assert changed[1][0] != inline[1][0]
+    assert changed[1][1][0].startswith("Referenced file does not parse")
+    assert changed[2][1] == [f"Referenced file not found: {cases[2]['fixed_file']}"]
+
+    store = VerificationStore(tmp_path / "verifications.db")
+    store.store(
+        [
+            (inline[0][0], {"id": cases[0]["id"], "verdict": "Valid"}),
+            (inline[1][0], {"id": cases[1]["id"], "verdict": "Error"}),
+        ]
+    )
+    assert store.lookup([fp for fp, _ in inline]) == {
+        inline[0][0]: {"id": cases[0]["id"], "verdict": "Valid"}
+    }
+
+
+def test_verdicts_in_the_legacy_layout_are_kept(tmp_path):
+    path = tmp_path / "verifications.db"
+    result = {"id": "fix_errors:case_0", "verdict": "Valid"}
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE verifications (fingerprint TEXT PRIMARY KEY, case_id TEXT,"
+        " verdict TEXT, result TEXT, verified_at REAL)"
+    )
+    conn.execute(
+        "INSERT INTO verifications VALUES ('fp', ?, 'Valid', ?, 0)",
+        (result["id"], json.dumps(result)),
+    )
+    conn.commit()
+    conn.close()
+
+    store = VerificationStore(path)
+    assert store.lookup(["fp"]) == {"fp": result}
+    store.close()
+    assert VerificationStore(path).lookup(["fp"]) == {"fp": result}
+
+    # A layout it does not know is left alone rather than dropped.
+    other = tmp_path / "other.db"
+    conn = sqlite3.connect(other)
+    conn.execute("CREATE TABLE verifications (fingerprint TEXT, verdict TEXT)")
+    conn.execute("INSERT INTO verifications VALUES ('fp', 'Valid')")
+    conn.commit()
+    with pytest.raises(sqlite3.DatabaseError):
+        VerificationStore(other)
+    assert conn.execute("SELECT * FROM verifications").fetchall() == [("fp", "Valid")]
+    conn.close()
+
+
+async def test_verify_benchmark_only_verifies_changed_cases(tmp_path, monkeypatch):
+    suite, cases = _write_fix_errors_suite(tmp_path / "fix_errors", 3)
+    monkeypatch.setattr(
+        verify_benchmarks, "create_verifier_adk_generator", FakeVerifierGenerator
+    )
+
+    def offline_client(**kwargs):
+        raise RuntimeError("offline")
+
+    # The verdict then comes from the response text.
+    monkeypatch.setattr(genai, "Client", offline_client)
+    FakeVerifierGenerator.prompts = []
+    store = VerificationStore(tmp_path / "verifications.db")
+
+    async def verify(run_dir):
+        run_dir.mkdir()
+        return await verify_benchmarks.verify_benchmark(
+            suite, run_dir, "model", None, store=store, min_wait=0, max_wait=0
+        )
+
+    results = await verify(tmp_path / "run1")
+    assert [r["verdict"] for r in results] == ["Valid"] * 3
+    assert len(FakeVerifierGenerator.prompts) == 3
+    streamed = (tmp_path / "run1" / "results.jsonl").read_text().splitlines()
+    assert len(streamed) == 3
+
+    Path(cases[1]["fixed_file"]).write_text("ANSWER = 'fixed'\n")
+    Path(cases[2]["fixed_file"]).unlink()
+    FakeVerifierGenerator.prompts = []
+    results = await verify(tmp_path / "run2")
+    assert [(r["verdict"], r.get("cached", False)) for r in results] == [
+        ("Valid", True),
+        ("Valid", False),
+        ("Error", False),
+    ]
+    assert len(FakeVerifierGenerator.prompts) == 1
+    assert "fix_errors:case_1" in FakeVerifierGenerator.prompts[0]
+
+
+async def test_duplicate_case_ids_across_files_keep_their_own_fingerprints(
+    tmp_path, monkeypatch
+):
+    first, _ = _write_fix_errors_suite(tmp_path / "a", 1)
+    second, cases = _write_fix_errors_suite(tmp_path / "b", 1)
+    Path(cases[0]["fixed_file"]).write_text("ANSWER = 'other'\n")
+    monkeypatch.setattr(
+        verify_benchmarks, "create_verifier_adk_generator", FakeVerifierGenerator
+    )
+
+    def offline_client(**kwargs):
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(genai, "Client", offline_client)
+    FakeVerifierGenerator.prompts = []
+    store = VerificationStore(tmp_path / "verifications.db")
+    fingerprints = verify_benchmarks.fingerprint_files([first, second], "model")
+    assert fingerprints[first][0][0] != fingerprints[second][0][0]
+
+    for i, suite in enumerate([first, second]):
+        run_dir = tmp_path / f"run{i}"
+        run_dir.mkdir()
+        [result] = await verify_benchmarks.verify_benchmark(
+            suite,
+            run_dir,
+            "model",
+            None,
+            store=store,
+            fingerprints=fingerprints[suite],
+            min_wait=0,
+            max_wait=0,
+        )
+        # Same ID, different case: the second file is verified, not served from cache.
+        assert result["fingerprint"] == fingerprints[suite][0][0]
+        assert not result.get("cached")
+    assert len(FakeVerifierGenerator.prompts) == 2
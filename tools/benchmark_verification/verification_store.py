@@ -0,0 +1,151 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Verification Store module.
+
+Fingerprints benchmark cases for `tools/verify_benchmarks.py` and remembers their
+verdicts. A fingerprint covers the case definition, the contents of the files it
+references (its `*_file` fields) and the verification context: the target ADK
+repository and version, extra dependencies, model and verifier. A case is therefore
+verified again only when one of those changes. Fingerprinting also runs the static
+checks (referenced files exist and parse), sharded across a process pool.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.json_store import JsonStore, default_store_path
+from core.parallel import map_in_batches
+
+VERIFY_JOBS = int(os.environ.get("ADK_VERIFY_JOBS", os.cpu_count() or 1))
+# Cases to fingerprint per worker process (see `core.parallel.map_in_batches`).
+PARALLEL_FINGERPRINT_MIN_CASES = 500
+# Verdicts that are remembered; errors and unparsed verdicts are retried next run.
+VERIFIED_VERDICTS = ("Valid", "Ambiguous", "Incorrect")
+# Columns of the verifications table before it moved to the shared `JsonStore` layout.
+_LEGACY_COLUMNS = ["fingerprint", "case_id", "verdict", "result", "verified_at"]
+
+
+def referenced_files(case: Dict[str, Any]) -> List[str]:
+    """The files a case points at through its `*_file` fields, e.g. `fixed_file`."""
+    return sorted(
+        value
+        for key, value in case.items()
+        if key.endswith("_file") and isinstance(value, str)
+    )
+
+
+def context_digest(context: Dict[str, Any]) -> str:
+    """Digest of everything outside the case that its verdict depends on."""
+    payload = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _case_fingerprint(
+    case: Dict[str, Any], context: str, root: str
+) -> Tuple[str, List[str]]:
+    digest = hashlib.sha256(context.encode("utf-8"))
+    digest.update(json.dumps(case, sort_keys=True, default=str).encode("utf-8"))
+    problems = []
+    for name in referenced_files(case):
+        path = Path(root, name)
+        try:
+            source = path.read_bytes()
+        except OSError:
+            digest.update(f"\0{name}\0missing".encode("utf-8"))
+            problems.append(f"Referenced file not found: {name}")
+            continue
+        digest.update(f"\0{name}\0".encode("utf-8"))
+        digest.update(hashlib.sha256(source).digest())
+        if path.suffix == ".py":
+            try:
+                ast.parse(source, filename=name)
+            except (SyntaxError, ValueError) as e:
+                problems.append(f"Referenced file does not parse: {name}: {e}")
+    return digest.hexdigest(), problems
+
+
+def _fingerprint_batch(
+    jobs: List[Tuple[Dict[str, Any], str, str]],
+) -> List[Tuple[str, List[str]]]:
+    return [_case_fingerprint(case, context, root) for case, context, root in jobs]
+
+
+def fingerprint_cases(
+    jobs: Sequence[Tuple[Dict[str, Any], str]],
+    root: Path,
+    workers: Optional[int] = None,
+) -> List[Tuple[str, List[str]]]:
+    """
+    Fingerprints cases and runs their static checks.
+
+    Args:
+        jobs: (case, context_digest(...)) pairs.
+        root: Directory that referenced file paths are relative to.
+        workers: Processes to shard the cases across (default: $ADK_VERIFY_JOBS).
+
+    Returns:
+        The fingerprint and static-check problems of each case, in order.
+    """
+    jobs = [(case, context, str(root)) for case, context in jobs]
+    return map_in_batches(
+        _fingerprint_batch,
+        jobs,
+        workers or VERIFY_JOBS,
+        PARALLEL_FINGERPRINT_MIN_CASES,
+    )
+
+
+class VerificationStore(JsonStore):
+    """Persistent map of case fingerprints to their verification results."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path
+            or default_store_path(
+                "ADK_VERIFICATION_STORE", "benchmark_verification.db"
+            ),
+            "verifications",
+        )
+
+    def _upgrade_table(self, columns: List[str]):
+        """
+        Moves verdicts from the legacy layout into the current one. Each verdict cost
+        an agent run, so unlike a cache the table is never dropped: an unknown layout
+        fails to open and the run goes ahead without a store.
+        """
+        if columns != _LEGACY_COLUMNS:
+            raise sqlite3.DatabaseError(
+                f"Unknown layout of table {self.table} in {self.db_path}: {columns}"
+            )
+        legacy = f"{self.table}_legacy"
+        self._conn.execute(f"ALTER TABLE {self.table} RENAME TO {legacy}")
+        self._create_table()
+        self._conn.execute(
+            f"INSERT INTO {self.table} SELECT fingerprint, ?, result FROM {legacy}",
+            (self.version,),
+        )
+        self._conn.execute(f"DROP TABLE {legacy}")
+
+    def store(self, rows: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Remembers results with a verified verdict; other results are skipped."""
+        super().store(
+            (fp, r) for fp, r in rows if r.get("verdict") in VERIFIED_VERDICTS
+        )
@@ -1,47 +1,91 @@
-"""Verify Apis module."""
+"""
+Verify Apis module.
+
+Checks that every extracted API reference can be imported. All references are resolved
+through one shared `RuntimeResolver`, which imports them in an isolated subprocess,
+memoizes each FQN, and persists the results per environment hash, so a rerun only
+imports references it has not seen in the same environment.
+"""
 
 import yaml
-import importlib
 import sys
 import os
+from typing import Any, Dict, List, Optional
+
 from core.config import EXTRACTED_APIS_FILE, API_VERIFICATION_REPORT
+from tools.knowledge.target_ranker.runtime_resolver import RuntimeResolver
 
 INPUT_FILE = str(EXTRACTED_APIS_FILE)
 OUTPUT_REPORT = str(API_VERIFICATION_REPORT)
 
 
-def verify_api_existence(api_string):
+def default_search_paths() -> List[str]:
+    """
+    Source directories appended to the resolver's sys.path, if they exist. Like the
+    original `sys.path.append`s, installed packages (e.g. google.adk) take precedence.
+    """
+    cwd = os.getcwd()
+    candidates = [
+        cwd,
+        os.path.join(cwd, "src"),  # Try standard src dir
+        os.path.join(cwd, "repos", "adk-python", "src"),
+    ]
+    return [p for p in candidates if os.path.isdir(p)]
+
+
+def verify_api_existence(api_string, resolver: RuntimeResolver):
     """
     Verifies if a fully qualified API string exists in the codebase.
-    Tries to import the module and check for the attribute.
+    The resolver imports the longest importable module prefix and walks the rest
+    as attributes.
     """
     parts = api_string.split(".")
     if len(parts) < 2:
         return False, "Invalid format"
+    if resolver.resolve(api_string) is None:
+        return False, "ImportError or AttributeError"
+    return True, "Found"
 
-    # Try matching successively shorter module paths
-    # e.g. google.adk.runners.InMemoryRunner
-    # Try import google.adk.runners -> getattr InMemoryRunner
-    # Try import google.adk.runners.InMemoryRunner (if it's a module)
 
-    for i in range(len(parts), 0, -1):
-        module_name = ".".join(parts[:i])
-        attr_chain = parts[i:]
+def verify_apis(
+    data: List[Dict[str, Any]], resolver: Optional[RuntimeResolver] = None
+) -> List[Dict[str, Any]]:
+    """
+    Verifies each unique API reference of the extraction output once.
 
-        try:
-            module = importlib.import_module(module_name)
-            # If we successfully imported the module, try to traverse attributes
-            obj = module
-            try:
-                for attr in attr_chain:
-                    obj = getattr(obj, attr)
-                return True, "Found"
-            except AttributeError:
-                continue  # Try next split
-        except ImportError:
-            continue
+    Args:
+        data: Rows of the extraction output.
+        resolver: Shared resolver; one falling back to `default_search_paths()` when
+            omitted.
 
-    return False, "ImportError or AttributeError"
+    Returns:
+        One result per unique API, in order of first appearance.
+    """
+    found_in: Dict[str, List[str]] = {}
+    for entry in data:
+        found_in.setdefault(entry["api_reference"], []).append(entry["benchmark_file"])
+
+    owns_resolver = resolver is None
+    if owns_resolver:
+        resolver = RuntimeResolver(fallback_paths=default_search_paths())
+    try:
+        # One batch for every reference; verify_api_existence then hits the memo.
+        resolver.resolve_many(api for api in found_in if len(api.split(".")) >= 2)
+        verified_results = []
+        for api, files in found_in.items():
+            exists, reason = verify_api_existence(api, resolver)
+            verified_results.append(
+                {
+                    "api": api,
+                    "exists": exists,
+                    "details": reason,
+                    "found_in_benchmarks": files,
+                }
+            )
+    finally:
+        if owns_resolver:
+            resolver.close()
+    return verified_results
 
 
 def main():
@@ -50,31 +94,19 @@ def main():
         return
 
     with open(INPUT_FILE, "r") as f:
-        data = yaml.safe_load(f)
+        data = yaml.safe_load(f) or []
 
     print(f"Verifying {len(data)} APIs...")
 
-    verified_results = []
-    seen = set()
-
-    for entry in data:
-        api = entry["api_reference"]
-        if api in seen:
-            continue
-        seen.add(api)
-
-        exists, reason = verify_api_existence(api)
-
-        verified_results.append(
-            {
-                "api": api,
-                "exists": exists,
-                "details": reason,
-                "found_in_benchmarks": [
-                    e["benchmark_file"] for e in data if e["api_reference"] == api
-                ],
-            }
-        )
+    resolver = RuntimeResolver(fallback_paths=default_search_paths())
+    try:
+        verified_results = verify_apis(data, resolver)
+    finally:
+        resolver.close()
+    print(
+        f"Resolved {resolver.stats['resolved']} references"
+        f" ({resolver.stats['cache_hits']} cached)."
+    )
 
     # Filter for non-existent ones to highlight issues
     failures = [r for r in verified_results if not r["exists"]]
@@ -92,11 +124,4 @@ def main():
 
 
 if __name__ == "__main__":
-    # Ensure src is in python path if needed, though env/bin/python usually handles it
-    # if installed in editable mode. If not, we might need to add PWD to path.
-    sys.path.append(os.getcwd())
-    sys.path.append(os.path.join(os.getcwd(), "src"))  # Try standard src dir
-    # Also try repos/adk-python/src
-    sys.path.append(os.path.join(os.getcwd(), "repos", "adk-python", "src"))
-
     main()
@@ -36,12 +36,11 @@ from benchmarks.data_models import (
     ForensicData,
 )
 from benchmarks.analysis import (
-    process_results,
-    get_token_usage_stats,
-    get_tool_success_stats,
+    AnalysisEngine,
     format_as_markdown,
     Bcolors,
 )
+from benchmarks.results_store import ResultPayloadReader, has_columnar_results
 from tools.analysis.run_metrics import analyze_benchmark_run
 from tools.analysis.generate_architecture_docs import DOC_MANAGER
 from tools.analysis.summarize_cases import CASE_DOC_MANAGER
@@ -301,7 +300,7 @@ class LogAnalyzer:
     def _calculate_quantitative_stats(
         self,
         results_df: pd.DataFrame,
-        results_list: List[BenchmarkRunResult],
+        engine: AnalysisEngine,
     ) -> str:
         """Calculates quantitative statistics from the results DataFrame."""
         if results_df.empty:
@@ -322,7 +321,7 @@ class LogAnalyzer:
         )
         stats_lines.append("\n")
 
-        token_df = get_token_usage_stats(results_list)
+        token_df = engine.token_usage
         all_suites = sorted(results_df["suite"].unique())
 
         leaderboard_data = []
@@ -374,7 +373,7 @@ class LogAnalyzer:
         )
 
         try:
-            tool_df = get_tool_success_stats(results_list)
+            tool_df = engine.tool_success_stats()
             if not tool_df.empty:
                 # Format percentages
                 tool_df["success_rate"] = (tool_df["success_rate"] * 100).map(
@@ -906,52 +905,79 @@ class LogAnalyzer:
 
         run_dir = log_path.parent
         generator_context = await self._load_static_context(run_dir)
-        
-        data = None
 
-        # Try Gzipped JSON first (Primary)
-        path_gz = run_dir / "results.json.gz"
-        if path_gz.exists():
+        if has_columnar_results(run_dir):
+            # The columnar artifact serves the results frame and the traces; full
+            # results are decoded one generator at a time, for its logs only.
             try:
-                with gzip.open(path_gz, "rt", encoding="utf-8") as f:
-                    data = json.load(f)
+                engine = AnalysisEngine.from_run_dir(run_dir)
+                reader = ResultPayloadReader(run_dir)
             except Exception as e:
-                return f"Error loading results.json.gz: {e}"
+                return f"Error loading columnar results: {e}"
 
-        if not data:
-            # Try JSON (Preferred for performance)
-            results_path = run_dir / "results.json"
-            if results_path.exists():
+            def results_for(gen_name: str) -> List[BenchmarkRunResult]:
+                return [
+                    reader.load(i)
+                    for i, name in enumerate(reader.frame["answer_generator"])
+                    if name == gen_name
+                ]
+
+        else:
+            data = None
+
+            # Try Gzipped JSON first (Primary)
+            path_gz = run_dir / "results.json.gz"
+            if path_gz.exists():
                 try:
-                    with open(results_path, "r", encoding="utf-8") as f:
+                    with gzip.open(path_gz, "rt", encoding="utf-8") as f:
                         data = json.load(f)
                 except Exception as e:
-                    return f"Error loading results.json: {e}"
+                    return f"Error loading results.json.gz: {e}"
 
-        if not data:
-            # Fallback to YAML (Legacy/Standard)
-            results_yaml_path = run_dir / "results.yaml"
-            if results_yaml_path.exists():
-                try:
+            if not data:
+                # Try JSON (Preferred for performance)
+                results_path = run_dir / "results.json"
+                if results_path.exists():
                     try:
-                        from yaml import CLoader as Loader
-                    except ImportError:
-                        from yaml import Loader
-                    with open(results_yaml_path, "r", encoding="utf-8") as f:
-                        data = yaml.load(f, Loader=Loader)
-                except Exception as e:
-                    return f"Error loading results.yaml: {e}"
-            else:
-                return "No results.json.gz, results.json, or results.yaml found."
+                        with open(results_path, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                    except Exception as e:
+                        return f"Error loading results.json: {e}"
+
+            if not data:
+                # Fallback to YAML (Legacy/Standard)
+                results_yaml_path = run_dir / "results.yaml"
+                if results_yaml_path.exists():
+                    try:
+                        try:
+                            from yaml import CLoader as Loader
+                        except ImportError:
+                            from yaml import Loader
+                        with open(results_yaml_path, "r", encoding="utf-8") as f:
+                            data = yaml.load(f, Loader=Loader)
+                    except Exception as e:
+                        return f"Error loading results.yaml: {e}"
+                else:
+                    return "No results.json.gz, results.json, or results.yaml found."
+
+            try:
+                TypeAdapter = pydantic.TypeAdapter(List[BenchmarkRunResult])
+                results_list = TypeAdapter.validate_python(data)
+            except Exception as e:
+                print(f"Error processing results data: {e}")
+                return f"Error processing results: {e}"
+            # One engine for the whole report: traces are parsed once and reused
+            engine = AnalysisEngine(results_list, run_dir=run_dir)
+
+            def results_for(gen_name: str) -> List[BenchmarkRunResult]:
+                return [r for r in results_list if r.answer_generator == gen_name]
 
         try:
-            TypeAdapter = pydantic.TypeAdapter(List[BenchmarkRunResult])
-            results_list = TypeAdapter.validate_python(data)
-            results_df = process_results(results_list)
+            results_df = engine.results_frame
 
             # Pre-calculate contexts
             quantitative_context = self._calculate_quantitative_stats(
-                results_df, results_list
+                results_df, engine
             )
             suite_context = self._get_suite_context(results_df)
 
@@ -963,25 +989,18 @@ class LogAnalyzer:
         generator_analyses: List[GeneratorAnalysisSection] = []
         generator_summaries_text = []  # For the high-level insights prompt
 
-        # Calculate tool stats globally first to filter by generator later
-        try:
-            tool_df_all = get_tool_success_stats(results_list)
-        except Exception:
-            tool_df_all = pd.DataFrame()
-
         grouped = results_df.groupby("answer_generator")
         print(f"Identified {len(grouped)} generators.")
 
         for gen_name, _ in grouped:
-            gen_results = [r for r in results_list if r.answer_generator == gen_name]
             log_text = await self._format_generator_logs(
-                generator_name=gen_name, results_list=gen_results
+                generator_name=gen_name, results_list=results_for(gen_name)
             )
 
             # Filter tool stats for this specific generator
             gen_tool_stats = ""
             try:
-                gen_tool_df = get_tool_success_stats(gen_results)
+                gen_tool_df = engine.tool_success_stats(generator=gen_name)
                 if not gen_tool_df.empty:
                     gen_tool_stats = format_as_markdown(gen_tool_df)
             except Exception as e:
@@ -4,24 +4,33 @@ Registry Automation Tool.
 Handles lifecycle management for the Codebase Knowledge Registry using Pydantic models for validation.
 - check-updates: Scans for new git tags.
 - add-version: Generates index for a new version and updates registry.yaml.
+
+Version builds are incremental. Tags and sample repositories are fetched into
+persistent bare mirrors and exported with `git archive`, file scans and co-occurrence
+entities are cached by content digest, and embeddings by text, so a new patch release
+only parses the files and embeds the targets that changed. Each version directory gets
+a `changes.yaml` report against the closest previously indexed version.
 """
 
 import sys
 import os
+import io
+import re
 import shutil
 import subprocess
+import tarfile
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 
 import click
 import yaml
 from rich.console import Console
 from rich.table import Table
-from rich.prompt import Confirm
 from pydantic import BaseModel, Field
 import questionary
-from packaging.version import parse as parse_version
+from packaging.version import InvalidVersion, parse as parse_version
 
 # --- Path Setup ---
 from core.config import PROJECT_ROOT
@@ -29,14 +38,28 @@ from core.config import PROJECT_ROOT
 from tools.knowledge.target_ranker.ranker import TargetRanker
 from tools.knowledge.build_vector_index import build_index
 from tools.knowledge.run_cooccurrence_indexing import generate_cooccurrence
+from tools.knowledge.run_api_indexing import RepoMirrors
 
 console = Console()
 
 REGISTRY_PATH = PROJECT_ROOT / "tools/adk_knowledge_ext/src/adk_knowledge_ext/registry.yaml"
 INDICES_DIR = PROJECT_ROOT / "tools/adk_knowledge_ext/src/adk_knowledge_ext/data/indices"
+BUILD_DIR = Path.home() / ".mcp_cache" / "tmp_build"
+MIRRORS_DIR = Path.home() / ".mcp_cache" / "mirrors"
 
 RANKED_TARGETS_YAML = "ranked_targets.yaml"
 RANKED_TARGETS_MD = "ranked_targets.md"
+CHANGE_REPORT_YAML = "changes.yaml"
+
+# Versions built at once by `update`. Parsing already uses a process pool per build;
+# running a few builds side by side overlaps their fetches and embedding requests.
+VERSION_JOBS = int(os.environ.get("ADK_REGISTRY_JOBS", 2))
+TAG_QUERY_WORKERS = 8
+
+# Fields of a ranked target that describe the symbol itself (not its ranking).
+_RANKING_FIELDS = {"rank", "usage_score", "group"}
+
+_mirrors = RepoMirrors(MIRRORS_DIR)
 
 # --- Data Models ---
 
@@ -133,12 +156,11 @@ def find_available_updates(repos: Dict[str, Repository]) -> Dict[str, List[str]]
         Dict[str, List[str]]: Map of repo_id to list of new version tags.
     """
     updates = {}
-    for repo_id, repo in repos.items():
-        current_versions = set(repo.versions.keys())
-        
-        with console.status(f"Checking {repo_id}...", spinner="dots"):
-            remote_tags = get_remote_tags(repo.repo_url)
-        
+    with console.status(f"Checking {len(repos)} repositories...", spinner="dots"):
+        with ThreadPoolExecutor(max_workers=TAG_QUERY_WORKERS) as executor:
+            all_tags = list(executor.map(get_remote_tags, [repo.repo_url for repo in repos.values()]))
+
+    for repo_id, remote_tags in zip(repos, all_tags):
         # Filter for stable releases (v* without beta/rc)
         stable_tags = [t for t in remote_tags if t.startswith("v") and "rc" not in t and "beta" not in t]
         
@@ -147,6 +169,143 @@ def find_available_updates(repos: Dict[str, Repository]) -> Dict[str, List[str]]
             
     return updates
 
+def checkout(repo_url: str, ref: str, dest: Path) -> Optional[str]:
+    """
+    Write the tree of a tag or branch to a directory.
+
+    The ref is fetched (depth 1) into a persistent local mirror of the repository and
+    exported with `git archive`, so repeated builds never clone from scratch.
+
+    Args:
+        repo_url: The URL of the repository.
+        ref: The tag or branch to export ("HEAD" for the default branch).
+        dest: The directory to write the files to.
+
+    Returns:
+        Optional[str]: The commit SHA, or None if the ref could not be fetched.
+    """
+    sha = _mirrors.fetch(repo_url, ref)
+    if sha is None:
+        return None
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", sha],
+        cwd=_mirrors.path(repo_url),
+        check=True,
+        capture_output=True
+    )
+    dest.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        # The "data" filter (Python 3.11.4+) rejects links and paths outside `dest`.
+        extract_args = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        tar.extractall(dest, **extract_args)
+    return sha
+
+def changed_files(repo_url: str, base_sha: str, sha: str) -> Dict[str, List[str]]:
+    """
+    List the files that differ between two commits of a mirrored repository.
+
+    Returns:
+        Dict[str, List[str]]: Paths by change kind ('added', 'modified', 'deleted').
+    """
+    output = subprocess.run(
+        ["git", "diff", "--name-status", "--no-renames", base_sha, sha],
+        cwd=_mirrors.path(repo_url),
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    kinds = {"A": "added", "M": "modified", "D": "deleted"}
+    changes = {kind: [] for kind in kinds.values()}
+    for line in output.splitlines():
+        status, path = line.split("\t", 1)
+        changes[kinds.get(status[0], "modified")].append(path)
+    return changes
+
+def find_base_version(repo: Repository, version: str, safe_repo_id: str) -> Optional[str]:
+    """
+    Find the indexed version to compare a new version against: the newest one below it
+    or, for an older version, the oldest one above it.
+
+    Returns:
+        Optional[str]: A version with an index on disk, or None.
+    """
+    def key(tag):
+        try:
+            return parse_version(tag)
+        except InvalidVersion:
+            return None
+
+    target = key(version)
+    if target is None:
+        return None
+    candidates = [
+        v for v in repo.versions
+        if v != version
+        and key(v) is not None
+        and (INDICES_DIR / safe_repo_id / v / RANKED_TARGETS_YAML).exists()
+    ]
+    below = [v for v in candidates if key(v) < target]
+    if below:
+        return max(below, key=key)
+    above = [v for v in candidates if key(v) > target]
+    return min(above, key=key) if above else None
+
+def _load_targets(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    with open(path, "r") as f:
+        targets = yaml.load(f, Loader=Loader) or []
+    return {
+        t["id"]: {k: v for k, v in t.items() if k not in _RANKING_FIELDS}
+        for t in targets
+    }
+
+def diff_targets(base_path: Path, path: Path) -> Dict[str, Any]:
+    """
+    Compare two ranked target indices symbol by symbol (ignoring rank changes).
+
+    Returns:
+        Dict[str, Any]: The target count and the added, removed and changed target IDs.
+    """
+    base = _load_targets(base_path)
+    current = _load_targets(path)
+    return {
+        "total": len(current),
+        "added": sorted(current.keys() - base.keys()),
+        "removed": sorted(base.keys() - current.keys()),
+        "changed": sorted(k for k in current.keys() & base.keys() if current[k] != base[k]),
+    }
+
+def _checkout_sample(sample_url: str, sample_dir: Path) -> Optional[Path]:
+    """Export a sample repository (or a /tree/<branch>/<path> of one); returns the path to scan."""
+    # Handle URLs like: https://github.com/google/adk-samples/tree/main/python/agents
+    match = re.match(r"(https://github\.com/[^/]+/[^/]+?)(?:\.git)?/tree/([^/]+)/(.*)", sample_url)
+    if match:
+        base_url = match.group(1)
+        if not base_url.endswith(".git"):
+            base_url += ".git"
+        branch, subpath = match.group(2), match.group(3)
+    else:
+        base_url, branch, subpath = sample_url, "HEAD", None
+
+    console.print(f"[bold]Fetching sample repo {sample_url}...[/bold]")
+    try:
+        sha = checkout(base_url, branch, sample_dir)
+    except (subprocess.CalledProcessError, tarfile.TarError) as e:
+        sha = None
+        console.print(f"[yellow]Warning: Failed to export sample repo {sample_url}: {e}[/yellow]")
+    if sha is None:
+        console.print(f"[yellow]Warning: Failed to fetch sample repo {sample_url}[/yellow]")
+        return None
+
+    target_path = sample_dir / subpath if subpath else sample_dir
+    if not target_path.exists():
+        console.print(f"[yellow]Warning: Subpath '{subpath}' not found in {sample_url}[/yellow]")
+        return None
+    return target_path
+
 # --- CLI ---
 
 @click.group()
@@ -240,18 +399,44 @@ def update() -> None:
         console.print("No updates selected.")
         return
         
-    for repo_id, version, is_installed in to_process:
-        action = "Reinstalling" if is_installed else "Installing"
-        console.print(f"\n[bold]{action} {repo_id} {version}...[/bold]")
-        try:
-            # Force IS required if it's already installed
-            asyncio.run(process_version_update(repo_id, version, force=is_installed, registry=registry))
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            console.print(f"[red]Failed to update {repo_id}@{version}: {e}[/red]")
-            if not Confirm.ask("Continue with remaining updates?", default=True):
-                break
+    results = asyncio.run(process_version_updates(to_process, registry))
+
+    failed = [(repo_id, version, error) for (repo_id, version, _), error in zip(to_process, results) if error]
+    for repo_id, version, error in failed:
+        console.print(f"[red]Failed to update {repo_id}@{version}: {error}[/red]")
+    console.print(f"\n[bold]Updated {len(to_process) - len(failed)} of {len(to_process)} versions.[/bold]")
+
+async def process_version_updates(
+    to_process: List[Tuple[str, str, bool]],
+    registry: Registry,
+    jobs: Optional[int] = None
+) -> List[Optional[BaseException]]:
+    """
+    Build several versions concurrently, at most `jobs` (default: VERSION_JOBS) at a time.
+
+    Args:
+        to_process: (repo_id, version, is_installed) tuples; installed versions are rebuilt.
+        registry: The registry object to update.
+        jobs: Maximum number of versions built at once.
+
+    Returns:
+        List[Optional[BaseException]]: The error of each version, or None if it succeeded.
+    """
+    semaphore = asyncio.Semaphore(jobs or VERSION_JOBS)
+
+    async def run(repo_id, version, is_installed):
+        async with semaphore:
+            action = "Reinstalling" if is_installed else "Installing"
+            console.print(f"\n[bold]{action} {repo_id} {version}...[/bold]")
+            try:
+                # Force IS required if it's already installed
+                await process_version_update(repo_id, version, force=is_installed, registry=registry)
+            except (Exception, SystemExit) as e:
+                # A failed version (including its sys.exit) must not stop the others.
+                return e
+            return None
+
+    return await asyncio.gather(*(run(*item) for item in to_process))
 
 async def process_version_update(
     repo_id: str, 
@@ -285,70 +470,52 @@ async def process_version_update(
         return
         
     repo_url = repo.repo_url
+    safe_repo_id = repo_id.replace("/", "-")
+    version_dir = INDICES_DIR / safe_repo_id / version
     
-    # 1. Clone
-    tmp_dir = Path.home() / ".mcp_cache" / "tmp_build" / repo_id.replace("/", "_") / version
+    # 1. Check out the tag from the local mirror
+    tmp_dir = BUILD_DIR / repo_id.replace("/", "_") / version
     if tmp_dir.exists():
         shutil.rmtree(tmp_dir)
     tmp_dir.mkdir(parents=True, exist_ok=True)
     
-    console.print(f"[bold]Cloning {repo_url} ({version})...[/bold]")
+    console.print(f"[bold]Fetching {repo_url} ({version})...[/bold]")
     try:
-        subprocess.run(
-            ["git", "clone", "--depth", "1", "--branch", version, repo_url, str(tmp_dir)],
-            check=True,
-            capture_output=True
-        )
-    except subprocess.CalledProcessError:
-        console.print(f"[red]Failed to clone {repo_url} at tag {version}.[/red]")
+        commit = await asyncio.to_thread(checkout, repo_url, version, tmp_dir)
+    except (subprocess.CalledProcessError, tarfile.TarError):
+        commit = None
+    if commit is None:
+        console.print(f"[red]Failed to fetch {repo_url} at tag {version}.[/red]")
         sys.exit(1)
-        
-    # 1.5 Clone Sample Repos
+
+    # 1.5 Fetch Sample Repos (concurrently)
     scan_targets = [tmp_dir]
     sample_repos = repo.sample_repos
     if sample_repos:
-        import re
         samples_dir = tmp_dir / "samples"
         samples_dir.mkdir(parents=True, exist_ok=True)
-        for i, sample_url in enumerate(sample_repos):
-            sample_dir = samples_dir / f"sample_{i}"
-            console.print(f"[bold]Cloning sample repo {sample_url}...[/bold]")
-            try:
-                # Handle URLs like: https://github.com/google/adk-samples/tree/main/python/agents
-                match = re.match(r"(https://github\.com/[^/]+/[^/]+?)(?:\.git)?/tree/([^/]+)/(.*)", sample_url)
-                
-                if match:
-                    base_url = match.group(1)
-                    if not base_url.endswith(".git"):
-                        base_url += ".git"
-                    branch = match.group(2)
-                    subpath = match.group(3)
-                    
-                    subprocess.run(
-                        ["git", "clone", "--depth", "1", "--branch", branch, base_url, str(sample_dir)],
-                        check=True,
-                        capture_output=True
-                    )
-                    
-                    target_path = sample_dir / subpath
-                    if target_path.exists():
-                        scan_targets.append(target_path)
-                    else:
-                        console.print(f"[yellow]Warning: Subpath '{subpath}' not found in {sample_url}[/yellow]")
-                else:
-                    subprocess.run(
-                        ["git", "clone", "--depth", "1", sample_url, str(sample_dir)],
-                        check=True,
-                        capture_output=True
-                    )
-                    scan_targets.append(sample_dir)
-            except subprocess.CalledProcessError as e:
-                console.print(f"[yellow]Warning: Failed to clone sample repo {sample_url}: {e}[/yellow]")
+        sample_targets = await asyncio.gather(*(
+            asyncio.to_thread(_checkout_sample, sample_url, samples_dir / f"sample_{i}")
+            for i, sample_url in enumerate(sample_repos)
+        ))
+        scan_targets.extend(t for t in sample_targets if t is not None)
+
+    # 1.6 Diff against the closest indexed version
+    base_version = find_base_version(repo, version, safe_repo_id)
+    base_commit = None
+    files = None
+    if base_version:
+        base_commit = await asyncio.to_thread(_mirrors.fetch, repo_url, base_version)
+        try:
+            if base_commit:
+                files = await asyncio.to_thread(changed_files, repo_url, base_commit, commit)
+                changed_count = sum(len(paths) for paths in files.values())
+                console.print(f"[dim]{changed_count} files changed since {base_version}; unchanged files reuse cached scans.[/dim]")
+        except subprocess.CalledProcessError as e:
+            console.print(f"[yellow]Warning: Failed to diff against {base_version}: {e}[/yellow]")
 
     # 2. Generate Co-occurrence Metrics
     console.print("[bold]Generating Co-occurrence Metrics...[/bold]")
-    safe_repo_id = repo_id.replace("/", "-")
-    version_dir = INDICES_DIR / safe_repo_id / version
     version_dir.mkdir(parents=True, exist_ok=True)
     
     cooccurrence_path = version_dir / "adk_cooccurrence.yaml"
@@ -357,7 +524,7 @@ async def process_version_update(
         console.print("[dim]Dynamic discovery enabled (ignoring stdlib)...[/dim]")
         
         console.print(f"[dim]Passing {len(scan_targets)} localized targets to metrics indexer...[/dim]")
-        generate_cooccurrence(scan_targets, str(cooccurrence_path))
+        await asyncio.to_thread(generate_cooccurrence, scan_targets, str(cooccurrence_path))
         console.print(f"[green]✓ Co-occurrence metrics generated at {cooccurrence_path.name}[/green]")
     except Exception as e:
         import traceback
@@ -381,7 +548,12 @@ async def process_version_update(
             stats_file=str(stats_file),
             cooccurrence_file=str(cooccurrence_path) if cooccurrence_path.exists() else None
         )
-        await ranker.generate(output_yaml_path=str(output_path), output_md_path=str(output_md_path))
+        # The ranker's scan blocks; run it on its own event loop in a worker thread so
+        # concurrent version builds keep making progress.
+        await asyncio.to_thread(
+            asyncio.run,
+            ranker.generate(output_yaml_path=str(output_path), output_md_path=str(output_md_path))
+        )
         
     except Exception as e:
         console.print(f"[red]Indexing failed: {e}[/red]")
@@ -393,11 +565,31 @@ async def process_version_update(
     console.print("[bold]Generating Semantic Embeddings...[/bold]")
     
     try:
-        await build_index(output_path)
+        embedding_stats = await build_index(output_path)
         console.print("[green]Embeddings generated successfully.[/green]")
     except Exception as e:
         console.print(f"[red]Embedding generation failed: {e}[/red]")
         sys.exit(1)
+
+    # 3.5 Change Report
+    report = {
+        "version": version,
+        "commit": commit,
+        "base_version": base_version,
+        "base_commit": base_commit,
+        "files": files,
+        "targets": None,
+        "embeddings": embedding_stats if isinstance(embedding_stats, dict) else None,
+    }
+    base_index = INDICES_DIR / safe_repo_id / str(base_version) / RANKED_TARGETS_YAML
+    try:
+        if base_version and output_path.exists():
+            report["targets"] = await asyncio.to_thread(diff_targets, base_index, output_path)
+        with open(version_dir / CHANGE_REPORT_YAML, "w") as f:
+            yaml.safe_dump(report, f, sort_keys=False)
+    except (OSError, yaml.YAMLError) as e:
+        console.print(f"[yellow]Warning: Failed to write change report: {e}[/yellow]")
+    print_change_report(repo_id, report)
     
     # 4. Update Registry
     relative_index_path = f"indices/{safe_repo_id}/{version}/{RANKED_TARGETS_YAML}"
@@ -409,6 +601,33 @@ async def process_version_update(
     # Cleanup
     shutil.rmtree(tmp_dir)
 
+def print_change_report(repo_id: str, report: Dict[str, Any]) -> None:
+    """
+    Print a summary of a version's change report.
+
+    Args:
+        repo_id: The repository identifier.
+        report: The report written to the version's changes.yaml.
+    """
+    if not report["base_version"]:
+        console.print(f"[dim]{repo_id}@{report['version']}: no indexed version to compare against.[/dim]")
+    else:
+        table = Table(title=f"{repo_id}@{report['version']} vs {report['base_version']}")
+        table.add_column("Item", style="cyan")
+        table.add_column("Added", justify="right", style="green")
+        table.add_column("Changed", justify="right", style="yellow")
+        table.add_column("Removed", justify="right", style="red")
+        files = report.get("files")
+        if files:
+            table.add_row("Files", str(len(files["added"])), str(len(files["modified"])), str(len(files["deleted"])))
+        targets = report.get("targets")
+        if targets:
+            table.add_row("Targets", str(len(targets["added"])), str(len(targets["changed"])), str(len(targets["removed"])))
+        console.print(table)
+    embeddings = report.get("embeddings")
+    if embeddings:
+        console.print(f"[dim]Embeddings: {embeddings['embedded']} computed, {embeddings['reused']} reused.[/dim]")
+
 @cli.command()
 @click.argument("repo_id")
 @click.argument("version")
@@ -24,7 +24,7 @@ from benchmarks.answer_generators.gemini_cli_docker.gemini_cli_podman_answer_gen
 from benchmarks.answer_generators.gemini_cli_docker.image_definitions import (
     IMAGE_DEFINITIONS,
 )
-from benchmarks.answer_generators.gemini_cli_docker.podman_utils import PodmanContainer
+from benchmarks.answer_generators.gemini_cli_docker.image_builder import ImageBuilder
 
 from core.api_key_manager import API_KEY_MANAGER
 
@@ -35,12 +35,6 @@ async def main():
     # Filter targets from args if provided
     target_images = sys.argv[1:]
 
-    # Create a dummy container instance to access build logic
-    container = PodmanContainer(
-        image_name="dummy",
-        image_definitions=IMAGE_DEFINITIONS
-    )
-
     if target_images:
         leaves = target_images
     else:
@@ -52,11 +46,18 @@ async def main():
 
     print(f"Target images: {leaves}")
 
-    for image_name in leaves:
-        print(f"\n--- Building chain for {image_name} ---")
-        # Accessing private method as this is a maintenance script
-        await container._build_image_chain(image_name, force=True)
+    # One plan for all targets: shared dependencies are built once, and
+    # independent images are built in parallel.
+    builder = ImageBuilder(IMAGE_DEFINITIONS)
+    plan = builder.plan(leaves)
+    print("\nBuild order:")
+    for step in plan.steps.values():
+        deps = ", ".join(step.dependencies) or "-"
+        print(f"  {step.image} (after: {deps})")
+
+    plan = await builder.ensure(leaves, force=True)
 
+    print("\n" + plan.report())
     print("\nAll builds complete.")
 
 
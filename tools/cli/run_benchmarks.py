@@ -41,9 +41,11 @@ from benchmarks.answer_generators.gemini_cli_docker import (
 from benchmarks.answer_generators.base import AnswerGenerator
 from core.config import PODMAN_CONFIG
 from benchmarks.data_models import BenchmarkRunResult
+from benchmarks.results_store import write_columnar_results
 from benchmarks.logger import (YamlTraceLogger, ConsoleBenchmarkLogger, CompositeLogger)
 import benchmarks.analysis as analysis
 from tools.cli.generate_benchmark_report import analyze_run_logs
+from tools.analysis.trends_store import TrendsStore
 from core.config import BENCHMARK_RUNS_DIR
 
 # Set pandas display options (needed for analysis functions)
@@ -341,6 +343,20 @@ async def main():
         json.dump(results_data, f, indent=2)
     logger.log_message(f"Raw benchmark results saved to: {results_json_path}")
 
+    # Save columnar results (scalar columns + lazily loaded payloads) for fast dashboards
+    try:
+        columns_path = write_columnar_results(results_data, run_output_dir)
+        logger.log_message(f"Columnar benchmark results saved to: {columns_path}")
+    except Exception as e:
+        logger.log_message(f"Failed to save columnar results: {e}")
+
+    # Fold this run into the historical trends aggregate store
+    try:
+        with TrendsStore() as trends_store:
+            trends_store.ingest_run(run_output_dir)
+    except Exception as e:
+        logger.log_message(f"Failed to update historical trends store: {e}")
+
 
     logger.finalize_run()
 
@@ -115,3 +115,88 @@ async def test_manage_registry_dynamic_cooccurrence_e2e(monkeypatch):
         
         ranked_yaml = version_dir / RANKED_TARGETS_YAML
         assert ranked_yaml.exists()
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo, check=True, capture_output=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_manage_registry_incremental_patch_release(tmp_path, monkeypatch):
+    """
+    Builds v1.0.0 and then v1.0.1 of a local repository (with the deterministic fake
+    embedder) and checks that the patch release is diffed against v1.0.0: the change
+    report lists the changed file and targets, and only changed targets are embedded.
+    """
+    from tools.cli import manage_registry
+    from tools.knowledge import build_vector_index
+    from tools.knowledge.run_api_indexing import RepoMirrors
+
+    repo_path = tmp_path / "lib_repo"
+    package = repo_path / "src" / "google" / "adk"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "agents.py").write_text(
+        "class Agent:\n    '''An agent.'''\n    def run(self): pass\n"
+    )
+    (package / "tools.py").write_text(
+        "class Tool:\n    '''A tool.'''\n\nclass Toolset:\n    '''Some tools.'''\n"
+    )
+    _git(repo_path, "init", "-q", "-b", "main")
+    _git(repo_path, "add", ".")
+    _git(repo_path, "commit", "-q", "-m", "v1.0.0")
+    _git(repo_path, "tag", "v1.0.0")
+    (package / "agents.py").write_text(
+        "class Agent:\n    '''An agent that runs tools.'''\n    def run(self): pass\n"
+        "\nclass Planner:\n    '''Plans.'''\n"
+    )
+    _git(repo_path, "commit", "-q", "-am", "v1.0.1")
+    _git(repo_path, "tag", "v1.0.1")
+
+    for name, value in {
+        "ADK_FAKE_EMBEDDINGS": "1",
+        "ADK_EMBEDDING_CACHE": str(tmp_path / "embeddings.db"),
+        "ADK_SCAN_CACHE": str(tmp_path / "scan.db"),
+        "ADK_COOCC_CACHE": str(tmp_path / "coocc.db"),
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(manage_registry, "build_index", build_vector_index.build_index)
+    monkeypatch.setattr(manage_registry, "INDICES_DIR", tmp_path / "indices")
+    monkeypatch.setattr(manage_registry, "BUILD_DIR", tmp_path / "build")
+    monkeypatch.setattr(manage_registry, "_mirrors", RepoMirrors(tmp_path / "mirrors"))
+    monkeypatch.setattr(manage_registry, "save_registry", lambda r: None)
+
+    registry = Registry(repositories={
+        "test/lib": Repository(repo_url=f"file://{repo_path.resolve()}")
+    })
+    errors = await manage_registry.process_version_updates(
+        [("test/lib", "v1.0.0", False)], registry
+    )
+    assert errors == [None]
+    errors = await manage_registry.process_version_updates(
+        [("test/lib", "v1.0.1", False)], registry
+    )
+    assert errors == [None]
+    assert set(registry.repositories["test/lib"].versions) == {"v1.0.0", "v1.0.1"}
+
+    version_dir = tmp_path / "indices" / "test-lib"
+    first = yaml.safe_load((version_dir / "v1.0.0" / "changes.yaml").read_text())
+    assert first["base_version"] is None
+    assert first["embeddings"]["reused"] == 0
+
+    report = yaml.safe_load((version_dir / "v1.0.1" / "changes.yaml").read_text())
+    assert report["base_version"] == "v1.0.0"
+    assert report["base_commit"] == first["commit"] != report["commit"]
+    assert report["files"] == {"added": [], "modified": ["src/google/adk/agents.py"], "deleted": []}
+    targets = report["targets"]
+    assert targets["added"] == ["google.adk.agents.Planner"]
+    assert "google.adk.agents.Agent" in targets["changed"]
+    assert not targets["removed"]
+    assert not any(t.startswith("google.adk.tools") for t in targets["changed"])
+    # Only the added and changed targets are embedded again.
+    embeddings = report["embeddings"]
+    assert embeddings["embedded"] == len(targets["added"]) + len(targets["changed"])
+    assert embeddings["reused"] == targets["total"] - embeddings["embedded"] > 0
@@ -3,6 +3,7 @@ import sys
 from unittest.mock import MagicMock
 
 # Mock numpy and build_vector_index before ANY other locally imported modules
+_build_vector_index = sys.modules.get("tools.knowledge.build_vector_index")
 sys.modules["tools.knowledge.build_vector_index"] = MagicMock()
 
 import pytest
@@ -10,6 +11,12 @@ from unittest.mock import patch, AsyncMock
 from click.testing import CliRunner
 from tools.cli import manage_registry
 
+# Only manage_registry needs the mock; test modules collected later get the real one.
+if _build_vector_index is None:
+    del sys.modules["tools.knowledge.build_vector_index"]
+else:
+    sys.modules["tools.knowledge.build_vector_index"] = _build_vector_index
+
 @pytest.fixture
 def runner():
     return CliRunner()
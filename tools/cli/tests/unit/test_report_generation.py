@@ -117,3 +117,75 @@ class TestReportGeneration:
         assert "Real content here." in report
         assert "# Copyright 2025 Google LLC" not in report
         assert "# Licensed under Apache" not in report
+
+    async def test_columnar_runs_are_analyzed_without_loading_results_json(
+        self, tmp_path, monkeypatch
+    ):
+        """Tests that a run with the columnar artifact never parses results.json.gz."""
+        import pandas as pd
+        from tools.cli import generate_benchmark_report as report
+
+        (tmp_path / "results.json.gz").write_bytes(b"not gzip")
+        log_path = tmp_path / "trace.jsonl"
+        log_path.write_text("")
+
+        class FakeReader:
+            loaded = []
+
+            def __init__(self, run_dir):
+                self.frame = pd.DataFrame({"answer_generator": ["A", "B", "A"]})
+
+            def load(self, index):
+                FakeReader.loaded.append(index)
+                return f"result-{index}"
+
+        engine = MagicMock()
+        engine.results_frame = pd.DataFrame({"answer_generator": ["A", "B", "A"]})
+        engine.tool_success_stats.return_value = pd.DataFrame()
+        monkeypatch.setattr(report, "has_columnar_results", lambda run_dir: True)
+        monkeypatch.setattr(report, "ResultPayloadReader", FakeReader)
+        monkeypatch.setattr(report, "AnalysisEngine", MagicMock())
+        report.AnalysisEngine.from_run_dir.return_value = engine
+
+        analyzer = LogAnalyzer(model_name="test-model")
+        logged = {}
+
+        async def static_context(run_dir):
+            return ""
+
+        async def format_logs(generator_name, results_list):
+            logged[generator_name] = (list(FakeReader.loaded), results_list)
+            FakeReader.loaded.clear()
+            return ""
+
+        async def analyze(generator_name, log_text, tool_stats_text=""):
+            return GeneratorAnalysisSection(
+                generator_name=generator_name,
+                performance_summary="",
+                docs_context_analysis="",
+                tool_usage_analysis="",
+                general_error_analysis="",
+            )
+
+        class Done(Exception):
+            pass
+
+        async def insights(**kwargs):
+            raise Done()
+
+        monkeypatch.setattr(analyzer, "_load_static_context", static_context)
+        monkeypatch.setattr(analyzer, "_calculate_quantitative_stats", MagicMock())
+        monkeypatch.setattr(analyzer, "_get_suite_context", MagicMock())
+        monkeypatch.setattr(analyzer, "_format_generator_logs", format_logs)
+        monkeypatch.setattr(analyzer, "_analyze_generator", analyze)
+        monkeypatch.setattr(analyzer, "_generate_high_level_insights", insights)
+
+        with pytest.raises(Done):
+            await analyzer.analyze_log_file(log_path)
+
+        report.AnalysisEngine.from_run_dir.assert_called_once_with(tmp_path)
+        # Each generator's full results are decoded only for its own logs.
+        assert logged == {
+            "A": ([0, 2], ["result-0", "result-2"]),
+            "B": ([1], ["result-1"]),
+        }
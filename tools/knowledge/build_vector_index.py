@@ -1,11 +1,28 @@
+"""
+Vector index builder.
+
+Embeds every ranked target into `vectors.npy` (rows in target order) and
+`vector_keys.yaml` next to the input YAML. Batches run concurrently under a
+semaphore and a requests-per-minute limit, with retries and exponential backoff.
+
+Each completed batch is checkpointed to an embedding cache keyed by a hash of the
+model name and the embedded text. An interrupted build resumes where it stopped,
+and a rebuild for a new version only embeds targets whose text changed. The output
+files are replaced atomically. Set `ADK_FAKE_EMBEDDINGS=1` (or pass
+`--fake-embedder`) to use a deterministic offline embedder.
+"""
+
 import os
 import yaml
 import numpy as np
 import json
+import hashlib
+import tempfile
+import time
 from pathlib import Path
 from google import genai
 from google.genai import types
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import asyncio
 import argparse
 import sys
@@ -16,31 +33,160 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from core.config import RANKED_TARGETS_FILE
+from core.json_store import JsonStore, default_store_path, store_or_default
 from core.models import ModelName
 
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
-# ... imports ...
+BATCH_SIZE = 100
+EMBED_CONCURRENCY = int(os.environ.get("ADK_EMBED_CONCURRENCY", 4))
+EMBED_REQUESTS_PER_MINUTE = float(os.environ.get("ADK_EMBED_RPM", 100))
+EMBED_MAX_ATTEMPTS = int(os.environ.get("ADK_EMBED_MAX_ATTEMPTS", 10))
+
+
+class GeminiEmbedder:
+    """Embeds documents with the Gemini embedding API."""
+
+    def __init__(self, api_key: str, model: str = ModelName.GEMINI_EMBEDDING_001):
+        self.model = str(model)
+        self._client = genai.Client(api_key=api_key)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        response = await self._client.aio.models.embed_content(
+            model=self.model,
+            contents=texts,
+            config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT"),
+        )
+        return [e.values for e in response.embeddings]
+
+
+class FakeEmbedder:
+    """Deterministic offline embedder: unit vectors seeded by a hash of the text."""
+
+    def __init__(self, dimension: int = 64):
+        self.model = f"fake-embedding-{dimension}"
+        self.dimension = dimension
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        vectors = []
+        for text in texts:
+            seed = hashlib.sha256(text.encode("utf-8")).digest()[:8]
+            rng = np.random.default_rng(int.from_bytes(seed, "little"))
+            v = rng.standard_normal(self.dimension)
+            vectors.append((v / np.linalg.norm(v)).tolist())
+        return vectors
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(JsonStore):
+    """Persistent map of embedding_key(model, text) to a float64 vector."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path or default_store_path("ADK_EMBEDDING_CACHE", "embedding_cache.db"),
+            "embeddings",
+        )
+
+    def _encode(self, vector: np.ndarray) -> bytes:
+        # Raw float64 bytes: a third the size of JSON text, and decoded without parsing.
+        return np.asarray(vector, dtype=np.float64).tobytes()
+
+    def _decode(self, blob: bytes) -> np.ndarray:
+        return np.frombuffer(blob, dtype=np.float64)
+
+
+class _RateLimiter:
+    """Spaces request starts at least 60 / requests_per_minute seconds apart."""
+
+    def __init__(self, requests_per_minute: float):
+        self._interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
 
-@retry(
-    stop=stop_after_attempt(10),
-    wait=wait_exponential(multiplier=2, min=4, max=60),
-    reraise=True
-)
-def embed_batch_with_retry(client, batch_texts):
-    return client.models.embed_content(
-        model=ModelName.GEMINI_EMBEDDING_001,
-        contents=batch_texts,
-        config=types.EmbedContentConfig(task_type="RETRIEVAL_DOCUMENT")
-    )
 
-async def build_index(input_file: Path):
+async def embed_batch_with_retry(
+    embedder, batch_texts: List[str], limiter: _RateLimiter
+) -> List[List[float]]:
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(EMBED_MAX_ATTEMPTS),
+        wait=wait_exponential(multiplier=2, min=4, max=60),
+        reraise=True,
+    ):
+        with attempt:
+            await limiter.wait()
+            vectors = await embedder.embed(batch_texts)
+            if len(vectors) != len(batch_texts):
+                raise ValueError(
+                    f"Expected {len(batch_texts)} embeddings, got {len(vectors)}"
+                )
+    return vectors
+
+
+def _target_text(t: Dict[str, Any]) -> str:
+    # Construct rich text representation
+    name = t.get("name", "")
+    fqn = t.get("id", "")
+    type_ = t.get("type", "")
+    docstring = t.get("docstring", "") or ""
+
+    methods = t.get("methods", [])
+    method_sigs = "\n".join([m.get("signature", "") for m in methods])
+
+    return f"Name: {name}\nFQN: {fqn}\nType: {type_}\nDocstring: {docstring}\nMethods:\n{method_sigs}"
+
+
+def _write_atomic(path: Path, write, mode: str = "w"):
+    """Writes via a temporary file in the same directory, then renames it over `path`."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _default_embedder():
+    if os.environ.get("ADK_FAKE_EMBEDDINGS"):
+        return FakeEmbedder()
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         print("Error: GEMINI_API_KEY not found in environment.")
         sys.exit(1)
+    return GeminiEmbedder(api_key)
 
-    client = genai.Client(api_key=api_key)
+
+async def build_index(
+    input_file: Path,
+    embedder=None,
+    cache: Optional[EmbeddingCache] = None,
+    concurrency: Optional[int] = None,
+    requests_per_minute: Optional[float] = None,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Builds the vector index artifacts for a ranked targets YAML.
+
+    Returns counts of targets, embeddings reused from the cache, texts embedded, and
+    batches sent.
+    """
+    if embedder is None:
+        embedder = _default_embedder()
 
     if not input_file.exists():
         print(f"Error: {input_file} not found.")
@@ -51,8 +197,13 @@ async def build_index(input_file: Path):
     vectors_path = output_dir / "vectors.npy"
     keys_path = output_dir / "vector_keys.yaml"
 
+    # Use LibYAML for speed if available
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
     with open(input_file, "r") as f:
-        targets = yaml.safe_load(f)
+        targets = yaml.load(f, Loader=Loader)
 
     if not targets:
         print("Error: No targets found in YAML.")
@@ -60,55 +211,106 @@ async def build_index(input_file: Path):
 
     print(f"Indexing {len(targets)} targets into {output_dir}...")
 
-    texts = []
-    vector_keys = []
-
-    for t in targets:
-        # Construct rich text representation
-        name = t.get("name", "")
-        fqn = t.get("id", "")
-        type_ = t.get("type", "")
-        docstring = t.get("docstring", "") or ""
-        
-        methods = t.get("methods", [])
-        method_sigs = "\n".join([m.get("signature", "") for m in methods])
-        
-        rich_text = f"Name: {name}\nFQN: {fqn}\nType: {type_}\nDocstring: {docstring}\nMethods:\n{method_sigs}"
-        texts.append(rich_text)
-        vector_keys.append({
-            "id": fqn,
-            "type": type_,
-            "rank": t.get("rank", 9999)
-        })
-
-    all_embeddings = []
-    batch_size = 100
-    for i in range(0, len(texts), batch_size):
-        batch_texts = texts[i:i+batch_size]
-        print(f"Embedding batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1}...")
-        
-        try:
-            response = embed_batch_with_retry(client, batch_texts)
-            batch_vecs = [e.values for e in response.embeddings]
-            all_embeddings.extend(batch_vecs)
-        except Exception as e:
-            print(f"Error during embedding: {e}")
-            sys.exit(1)
+    texts = [_target_text(t) for t in targets]
+    vector_keys = [
+        {"id": t.get("id", ""), "type": t.get("type", ""), "rank": t.get("rank", 9999)}
+        for t in targets
+    ]
+    keys = [embedding_key(embedder.model, text) for text in texts]
+
+    with store_or_default(cache, EmbeddingCache) as cache:
+        if cache is None:
+            print("Warning: embedding cache unavailable; builds cannot resume.")
+        vectors = cache.lookup(keys) if cache else {}
+        pending = {k: text for k, text in zip(keys, texts) if k not in vectors}
+        items = list(pending.items())
+        batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+        reused = sum(k not in pending for k in keys)
+        print(
+            f"{reused} embeddings reused, "
+            f"{len(items)} texts to embed in {len(batches)} batches."
+        )
+
+        semaphore = asyncio.Semaphore(concurrency or EMBED_CONCURRENCY)
+        limiter = _RateLimiter(
+            EMBED_REQUESTS_PER_MINUTE
+            if requests_per_minute is None
+            else requests_per_minute
+        )
+        completed = 0
+
+        async def run_batch(batch):
+            nonlocal completed
+            async with semaphore:
+                batch_vecs = await embed_batch_with_retry(
+                    embedder, [text for _, text in batch], limiter
+                )
+            rows = {
+                key: np.asarray(v, dtype=np.float64)
+                for (key, _), v in zip(batch, batch_vecs)
+            }
+            # Checkpoint: a rerun skips every batch that got this far.
+            if cache:
+                cache.store(rows.items())
+            vectors.update(rows)
+            completed += 1
+            print(f"Embedded batch {completed}/{len(batches)}...")
+
+        results = await asyncio.gather(
+            *(run_batch(batch) for batch in batches), return_exceptions=True
+        )
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        print(
+            f"Error during embedding: {failures[0]} ({len(failures)} of {len(batches)}"
+            " batches failed; completed batches are checkpointed, rerun to resume)"
+        )
+        sys.exit(1)
 
     # Save artifacts alongside the YAML
-    np.save(vectors_path, np.array(all_embeddings))
-    with open(keys_path, "w") as f:
-        yaml.dump(vector_keys, f, sort_keys=False)
+    all_embeddings = np.array([vectors[k] for k in keys])
+    _write_atomic(vectors_path, lambda f: np.save(f, all_embeddings), mode="wb")
+    _write_atomic(keys_path, lambda f: yaml.dump(vector_keys, f, sort_keys=False))
 
     print(f"Successfully built index artifacts at {output_dir}")
+    return {
+        "targets": len(targets),
+        "reused": reused,
+        "embedded": len(items),
+        "batches": len(batches),
+    }
+
 
 async def main():
     parser = argparse.ArgumentParser(description="Generate vector embeddings for ranked targets.")
     parser.add_argument("--input-yaml", type=str, help="Path to ranked_targets.yaml")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"Concurrent embedding requests (default: {EMBED_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help=f"Maximum requests per minute (default: {EMBED_REQUESTS_PER_MINUTE:g}).",
+    )
+    parser.add_argument(
+        "--fake-embedder",
+        action="store_true",
+        help="Use the deterministic offline embedder (for local testing).",
+    )
     args = parser.parse_args()
 
     input_file = Path(args.input_yaml) if args.input_yaml else RANKED_TARGETS_FILE
-    await build_index(input_file)
+    await build_index(
+        input_file,
+        embedder=FakeEmbedder() if args.fake_embedder else None,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+    )
 
 if __name__ == "__main__":
     asyncio.run(main())
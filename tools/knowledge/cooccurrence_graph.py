@@ -0,0 +1,245 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Co-occurrence adjacency index.
+
+Compiles the association list written by `run_cooccurrence_indexing.py`
+(`{"associations": [{"context", "target", "probability", "support"}, ...]}`) into
+CSR arrays: the outgoing edges of a context are one contiguous slice, kept in the
+file's order (which the indexer sorts by probability, then support). Lookups are
+O(degree), each node's top-k edges are precomputed for multi-hop expansion, and
+`load_cooccurrence_graph` shares one loaded instance per file.
+"""
+
+import heapq
+import json
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+DEFAULT_TOP_K = 10
+
+_GRAPHS: Dict[Path, Tuple[Tuple[int, int], "CooccurrenceGraph"]] = {}
+_GRAPHS_LOCK = threading.Lock()
+
+
+class Association(NamedTuple):
+    context: str
+    target: str
+    probability: float
+    support: int
+
+
+class Expansion(NamedTuple):
+    target: str
+    probability: float  # Product of edge probabilities along the best path.
+    hops: int
+    via: Optional[str]  # The node reached just before `target`; None for direct edges.
+
+
+class CooccurrenceGraph:
+    """Directed co-occurrence graph (context -> target) in CSR form."""
+
+    def __init__(self, associations: Iterable[Dict], top_k: int = DEFAULT_TOP_K):
+        self.nodes: List[str] = []
+        self.node_ids: Dict[str, int] = {}
+        edges: List[Tuple[int, int, int, float, int]] = []
+        for order, a in enumerate(associations):
+            edges.append(
+                (
+                    self._node_id(a["context"]),
+                    order,
+                    self._node_id(a["target"]),
+                    a["probability"],
+                    a["support"],
+                )
+            )
+        edges.sort(key=lambda e: (e[0], e[1]))
+
+        self.offsets = array("I", [0] * (len(self.nodes) + 1))
+        for source, *_ in edges:
+            self.offsets[source + 1] += 1
+        for i in range(len(self.nodes)):
+            self.offsets[i + 1] += self.offsets[i]
+        # Position in the original list, to merge several nodes' edges in file order.
+        self.order = array("I", (e[1] for e in edges))
+        self.sources = array("I", (e[0] for e in edges))
+        self.targets = array("I", (e[2] for e in edges))
+        self.probability = array("d", (e[3] for e in edges))
+        self.support = array("I", (e[4] for e in edges))
+
+        self.top_k = top_k
+        self._top: List[List[int]] = []
+        for node in range(len(self.nodes)):
+            edge_range = range(self.offsets[node], self.offsets[node + 1])
+            self._top.append(
+                heapq.nlargest(
+                    top_k,
+                    edge_range,
+                    key=lambda e: (self.probability[e], self.support[e], -e),
+                )
+            )
+
+    def _node_id(self, name: str) -> int:
+        node = self.node_ids.get(name)
+        if node is None:
+            node = self.node_ids[name] = len(self.nodes)
+            self.nodes.append(name)
+        return node
+
+    @classmethod
+    def from_file(cls, path: Path, top_k: int = DEFAULT_TOP_K) -> "CooccurrenceGraph":
+        """Loads a co-occurrence YAML, JSON or binary (.npz) file."""
+        if Path(path).suffix == ".npz":
+            from tools.knowledge.run_cooccurrence_indexing import (
+                association_dicts,
+                load_binary,
+            )
+
+            associations, _ = load_binary(path)
+            return cls(association_dicts(associations), top_k=top_k)
+        with open(path, "r", encoding="utf-8") as f:
+            if Path(path).suffix == ".json":
+                data = json.load(f)
+            else:
+                # Use LibYAML for speed if available
+                try:
+                    from yaml import CSafeLoader as Loader
+                except ImportError:
+                    from yaml import SafeLoader as Loader
+                data = yaml.load(f, Loader=Loader)
+        return cls((data or {}).get("associations") or [], top_k=top_k)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.node_ids
+
+    def degree(self, name: str) -> int:
+        node = self.node_ids.get(name)
+        return 0 if node is None else self.offsets[node + 1] - self.offsets[node]
+
+    def _edge(self, e: int) -> Association:
+        return Association(
+            self.nodes[self.sources[e]],
+            self.nodes[self.targets[e]],
+            self.probability[e],
+            self.support[e],
+        )
+
+    def _edges(self, node: int, threshold: float) -> Iterable[int]:
+        for e in range(self.offsets[node], self.offsets[node + 1]):
+            if self.probability[e] >= threshold:
+                yield e
+
+    def neighbors(
+        self, name: str, threshold: float = 0.0, limit: Optional[int] = None
+    ) -> List[Association]:
+        """Associations with `name` as context, in file order."""
+        node = self.node_ids.get(name)
+        if node is None:
+            return []
+        edges = self._edges(node, threshold)
+        if limit is not None:
+            edges = (e for e, _ in zip(edges, range(limit)))
+        return [self._edge(e) for e in edges]
+
+    def prefix_neighbors(
+        self, name: str, threshold: float = 0.0, limit: Optional[int] = None
+    ) -> List[Association]:
+        """Associations of every context that `name` starts with, in file order."""
+        contexts = [
+            self.node_ids[name[:i]]
+            for i in range(len(name) + 1)
+            if name[:i] in self.node_ids
+        ]
+        merged = heapq.merge(
+            *(self._edges(node, threshold) for node in contexts),
+            key=lambda e: self.order[e],
+        )
+        result = []
+        for e in merged:
+            if limit is not None and len(result) == limit:
+                break
+            result.append(self._edge(e))
+        return result
+
+    def top(self, name: str, k: Optional[int] = None) -> List[Association]:
+        """The `k` (at most `top_k`) most probable associations of `name`."""
+        node = self.node_ids.get(name)
+        if node is None:
+            return []
+        edges = self._top[node][: self.top_k if k is None else k]
+        return [self._edge(e) for e in edges]
+
+    def expand(
+        self, name: str, hops: int = 2, threshold: float = 0.0
+    ) -> List[Expansion]:
+        """
+        Nodes reachable from `name` within `hops` steps along top-k edges.
+
+        Each node is reported once, with the highest path probability found, ordered
+        by that probability.
+        """
+        start = self.node_ids.get(name)
+        if start is None:
+            return []
+        best: Dict[int, Expansion] = {}
+        frontier = [(start, 1.0)]
+        for hop in range(1, hops + 1):
+            next_frontier = []
+            for node, path_probability in frontier:
+                for e in self._top[node]:
+                    probability = path_probability * self.probability[e]
+                    target = self.targets[e]
+                    if probability < threshold or target == start:
+                        continue
+                    current = best.get(target)
+                    if current is None or probability > current.probability:
+                        via = None if hop == 1 else self.nodes[node]
+                        best[target] = Expansion(
+                            self.nodes[target], probability, hop, via
+                        )
+                        next_frontier.append((target, probability))
+            frontier = next_frontier
+        return sorted(best.values(), key=lambda x: (-x.probability, x.hops, x.target))
+
+
+def load_cooccurrence_graph(path: Path) -> Optional[CooccurrenceGraph]:
+    """
+    Returns the shared graph for a co-occurrence file, or None if it is missing or
+    unreadable. The file is reloaded when its size or mtime changes.
+    """
+    path = Path(path).resolve()
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    version = (st.st_size, st.st_mtime_ns)
+    with _GRAPHS_LOCK:
+        cached = _GRAPHS.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            graph = CooccurrenceGraph.from_file(path)
+        except Exception:
+            return None
+        _GRAPHS[path] = (version, graph)
+        return graph
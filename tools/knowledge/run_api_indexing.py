@@ -3,19 +3,31 @@
 AST-based API Usage Indexer.
 Scans Python repositories to count function/class usage frequencies.
 Outputs a YAML index for the Statistical Discovery Tool.
+
+Sources are indexed concurrently. Remote repositories are fetched shallowly into
+local bare mirrors (`<cache>/mirrors`), and their files are read straight from
+`git archive`. Files are parsed in a process pool. Each source's usage stats are
+stored as a partial result keyed by its commit SHA, include paths and the indexer
+source (`<cache>/partials`), so re-indexing only scans sources that changed or are
+new; everything else is merged from the partials.
 """
 
 import ast
+import hashlib
+import io
+import json
 import os
 import sys
-import shutil
 import subprocess
+import tarfile
 import tempfile
+import threading
 import argparse
 import logging
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Any, Optional, Tuple
 
 # Try to import yaml, fallback to json if not available (though spec says yaml)
 try:
@@ -24,11 +36,33 @@ except ImportError:
     print("PyYAML not found. Please install it: pip install PyYAML")
     sys.exit(1)
 
+from core.parallel import map_in_batches
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Mirrors and per-source partial results.
+API_INDEX_CACHE = Path(os.environ.get("ADK_API_INDEX_CACHE", "tmp/cache/api_indexing"))
+CLONE_WORKERS = int(os.environ.get("ADK_CLONE_WORKERS", 4))
+PARSE_WORKERS = int(os.environ.get("ADK_PARSE_WORKERS", min(8, os.cpu_count() or 4)))
+# Files to parse per worker process (see `core.parallel.map_in_batches`).
+PARALLEL_PARSE_MIN_FILES = 64
+
+# Partials are only reused when they were produced by this exact indexer source.
+_INDEXER_FINGERPRINT = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+IGNORE_DIRS = {
+    ".git",
+    ".venv",
+    "venv",
+    "env",
+    "__pycache__",
+    "site-packages",
+    "node_modules",
+}
+
 
 class UsageVisitor(ast.NodeVisitor):
 
@@ -92,33 +126,85 @@ class UsageVisitor(ast.NodeVisitor):
         return name
 
 
-def analyze_directory(path: Path) -> Dict[str, Any]:
-    visitor = UsageVisitor()
-    ignore_dirs = {
-        ".git",
-        ".venv",
-        "venv",
-        "env",
-        "__pycache__",
-        "site-packages",
-        "node_modules",
-    }
+def _usage_batch(
+    files: List[Tuple[str, bytes]],
+) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Parses each file with its own visitor (imports are per file) and sums the stats.
+    Returns one (stats, failures) pair for the whole batch.
+    """
+    stats = {}
+    failures = []
+    for name, source in files:
+        try:
+            tree = ast.parse(source.decode("utf-8"), filename=name)
+            visitor = UsageVisitor()
+            visitor.visit(tree)
+        except Exception as e:
+            failures.append(f"Failed to parse {name}: {e}")
+            continue
+        merge_stats(stats, visitor.stats)
+    return [(stats, failures)]
+
+
+class _ParsePool:
+    """Parses files in worker processes (or inline with one worker)."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        # Inline parsing holds the GIL; sources take turns so clone threads only
+        # overlap on network and git work.
+        self._inline_lock = threading.Lock()
+
+    def scan(self, files: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        if self._executor:
+            results = map_in_batches(
+                _usage_batch,
+                files,
+                self.workers,
+                PARALLEL_PARSE_MIN_FILES,
+                executor=self._executor,
+            )
+        else:
+            with self._inline_lock:
+                results = _usage_batch(files)
+
+        stats = {}
+        for batch_stats, failures in results:
+            for failure in failures:
+                logger.warning(failure)
+            merge_stats(stats, batch_stats)
+        return stats
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown()
+
+
+def _is_ignored(rel_path: str) -> bool:
+    return any(part in IGNORE_DIRS for part in Path(rel_path).parts[:-1])
 
-    for root, dirs, files in os.walk(path):
-        # Modify dirs in-place to skip ignored directories
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
 
-        for file in files:
+def _read_directory(path: Path) -> List[Tuple[str, bytes]]:
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        # Modify dirs in-place to skip ignored directories
+        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
+        for file in filenames:
             if file.endswith(".py"):
                 file_path = Path(root) / file
                 try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        tree = ast.parse(f.read(), filename=str(file_path))
-                    visitor.visit(tree)
-                except Exception as e:
+                    files.append((str(file_path), file_path.read_bytes()))
+                except OSError as e:
                     logger.warning(f"Failed to parse {file_path}: {e}")
+    return files
+
 
-    return visitor.stats
+def analyze_directory(
+    path: Path, parser: Optional[_ParsePool] = None
+) -> Dict[str, Any]:
+    return (parser or _ParsePool(1)).scan(_read_directory(path))
 
 
 def merge_stats(global_stats, new_stats):
@@ -129,95 +215,254 @@ def merge_stats(global_stats, new_stats):
         global_stats[func]["arg_usage"].update(data["arg_usage"])
 
 
-def clone_repo(url: str, branch: str = "main") -> Path:
-    temp_dir = Path(tempfile.mkdtemp(prefix="adk_indexer_"))
-    logger.info(f"Cloning {url} to {temp_dir}...")
-    try:
-        subprocess.run(
-            ["git", "clone", "--depth", "1", "--branch", branch, url, str(temp_dir)],
-            check=True,
-            capture_output=True,
-        )
-        return temp_dir
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Failed to clone {url}: {e.stderr.decode()}")
+def _git(*args: str, cwd: Optional[Path] = None) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+def _slug(text: str) -> str:
+    name = "".join(c if c.isalnum() else "-" for c in text.rstrip("/").split("/")[-1])
+    return f"{name}-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}"
+
+
+class RepoMirrors:
+    """Bare, shallow local mirrors of remote repositories, one per URL."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks[url]
+
+    def path(self, url: str) -> Path:
+        return self.root / f"{_slug(url)}.git"
+
+    def remote_sha(self, url: str, branch: str) -> Optional[str]:
+        """The commit `branch` (a branch or tag) points to on the remote."""
+        try:
+            # Annotated tags only list their peeled commit when asked for it.
+            output = _git("ls-remote", url, branch, f"{branch}^{{}}")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Failed to query {url}: {e.stderr.strip()}")
+            return None
+        refs = dict(reversed(line.split("\t", 1)) for line in output.splitlines())
+        for ref in (
+            f"refs/heads/{branch}",
+            f"refs/tags/{branch}^{{}}",
+            f"refs/tags/{branch}",
+        ):
+            if ref in refs:
+                return refs[ref]
         return None
 
+    def fetch(self, url: str, branch: str) -> Optional[str]:
+        """Fetches the tip of `branch` (depth 1) into the mirror; returns its SHA."""
+        mirror = self.path(url)
+        local_ref = f"refs/indexed/{branch}"
+        with self._lock(url):
+            try:
+                if not mirror.exists():
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    _git("init", "--bare", "--quiet", str(mirror))
+                logger.info(f"Fetching {url} ({branch}) into {mirror}...")
+                _git("fetch", "--depth", "1", "--quiet", url, branch, cwd=mirror)
+                sha = _git("rev-parse", "FETCH_HEAD^{commit}", cwd=mirror)
+                _git("update-ref", local_ref, sha, cwd=mirror)
+                return sha
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Failed to fetch {url}: {e.stderr.strip()}")
+            # Offline: fall back to what was fetched last time.
+            try:
+                sha = _git("rev-parse", "--verify", local_ref, cwd=mirror)
+                logger.warning(f"Using previously fetched {url} ({branch}) at {sha}")
+                return sha
+            except (subprocess.CalledProcessError, OSError):
+                return None
+
+    def has_commit(self, url: str, sha: str) -> bool:
+        try:
+            _git("cat-file", "-e", f"{sha}^{{commit}}", cwd=self.path(url))
+            return True
+        except (subprocess.CalledProcessError, OSError):
+            return False
+
+
+def _archive_files(
+    git_dir: Path, sha: str, include_paths: Optional[List[str]]
+) -> List[Tuple[str, bytes]]:
+    """Reads the Python files of a commit (optionally under include_paths) from git."""
+    files = []
+    for include in include_paths or [None]:
+        command = ["git", "archive", "--format=tar", sha]
+        if include:
+            command += ["--", include]
+        proc = subprocess.run(command, cwd=git_dir, capture_output=True)
+        if proc.returncode != 0:
+            logger.warning(f"Path {include} not found in repo.")
+            continue
+        with tarfile.open(fileobj=io.BytesIO(proc.stdout)) as tar:
+            for member in tar:
+                if (
+                    member.isfile()
+                    and member.name.endswith(".py")
+                    and not _is_ignored(member.name)
+                ):
+                    files.append((member.name, tar.extractfile(member).read()))
+    return files
+
+
+def _local_revision(path: Path) -> Optional[Tuple[Path, str]]:
+    """(git dir, HEAD) if `path` is inside a git checkout without local changes."""
+    try:
+        top = Path(_git("rev-parse", "--show-toplevel", cwd=path))
+        if _git("status", "--porcelain", cwd=path):
+            return None
+        return top / ".git", _git("rev-parse", "HEAD", cwd=path)
+    except (subprocess.CalledProcessError, OSError):
+        return None
 
-def main():
-    parser = argparse.ArgumentParser(description="Generate Statistical API Index")
-    parser.add_argument("--config", type=str, help="Path to YAML config file (sources)")
-    parser.add_argument(
-        "--output",
-        type=str,
-        default="tmp/outputs/api_metadata.yaml",
-        help="Output YAML path",
-    )
-    # Quick mode: direct repo url
-    parser.add_argument("--repo", type=str, help="Direct repo URL to analyze")
-    parser.add_argument(
-        "--path", type=str, help="Subpath within repo (e.g. python/examples)"
-    )
 
-    args = parser.parse_args()
+class PartialCache:
+    """Per-source usage stats, keyed by source, commit SHA, include paths and indexer."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, source_id: str, sha: str, include_paths) -> Path:
+        key = json.dumps([_INDEXER_FINGERPRINT, source_id, sha, include_paths or []])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / _slug(source_id) / f"{sha}-{digest[:16]}.json"
+
+    def get(self, source_id: str, sha: str, include_paths) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(source_id, sha, include_paths), "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return {
+            func: {"call_count": d["call_count"], "arg_usage": Counter(d["arg_usage"])}
+            for func, d in data["stats"].items()
+        }
+
+    def store(self, source_id: str, sha: str, include_paths, stats: Dict[str, Any]):
+        path = self._path(source_id, sha, include_paths)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "source": source_id,
+            "sha": sha,
+            "include_paths": include_paths or [],
+            "stats": {
+                func: {"call_count": d["call_count"], "arg_usage": dict(d["arg_usage"])}
+                for func, d in stats.items()
+            },
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+def _index_source(
+    source: Dict[str, Any],
+    mirrors: RepoMirrors,
+    partials: PartialCache,
+    parser: _ParsePool,
+) -> Optional[Dict[str, Any]]:
+    include_paths = source.get("include_paths")
+
+    if "local_path" in source:
+        repo_dir = Path(source["local_path"]).resolve()
+        if not repo_dir.exists():
+            logger.warning(f"Local path {repo_dir} does not exist.")
+            return None
+        logger.info(f"Using local path: {repo_dir}")
+        revision = _local_revision(repo_dir)
+        if revision is None:
+            # Not a clean checkout: nothing to key a partial on, so always scan.
+            return _analyze_local(repo_dir, include_paths, parser)
+        git_dir, sha = revision
+        source_id = str(repo_dir)
+        cached = partials.get(source_id, sha, include_paths)
+        if cached is not None:
+            logger.info(f"Reusing usage stats for {repo_dir} at {sha[:12]}")
+            return cached
+        stats = _analyze_local(repo_dir, include_paths, parser)
+        partials.store(source_id, sha, include_paths, stats)
+        return stats
+
+    url = source.get("url")
+    branch = source.get("branch", "main")
+    sha = mirrors.remote_sha(url, branch)
+    if sha:
+        cached = partials.get(url, sha, include_paths)
+        if cached is not None:
+            logger.info(f"Reusing usage stats for {url} at {sha[:12]}")
+            return cached
+    if not (sha and mirrors.has_commit(url, sha)):
+        sha = mirrors.fetch(url, branch)
+        if not sha:
+            return None
+        cached = partials.get(url, sha, include_paths)
+        if cached is not None:
+            return cached
+
+    logger.info(f"Analyzing {url} at {sha[:12]}...")
+    stats = parser.scan(_archive_files(mirrors.path(url), sha, include_paths))
+    partials.store(url, sha, include_paths, stats)
+    return stats
+
+
+def _analyze_local(
+    repo_dir: Path, include_paths: Optional[List[str]], parser: _ParsePool
+) -> Dict[str, Any]:
+    stats = {}
+    for target in (
+        [repo_dir / p for p in include_paths] if include_paths else [repo_dir]
+    ):
+        if target.exists():
+            logger.info(f"Analyzing {target}...")
+            merge_stats(stats, analyze_directory(target, parser))
+        else:
+            logger.warning(f"Path {target} not found in repo.")
+    return stats
+
+
+def index_sources(
+    sources: List[Dict[str, Any]],
+    cache_dir: Optional[Path] = None,
+    clone_workers: Optional[int] = None,
+    parse_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Indexes every source concurrently and merges their usage stats."""
+    cache_dir = Path(cache_dir or API_INDEX_CACHE)
+    mirrors = RepoMirrors(cache_dir / "mirrors")
+    partials = PartialCache(cache_dir / "partials")
+    parser = _ParsePool(PARSE_WORKERS if parse_workers is None else parse_workers)
+    try:
+        with ThreadPoolExecutor(clone_workers or CLONE_WORKERS) as threads:
+            results = list(
+                threads.map(
+                    lambda source: _index_source(source, mirrors, partials, parser),
+                    sources,
+                )
+            )
+    finally:
+        parser.close()
 
     global_stats = {}
+    for stats in results:
+        if stats:
+            merge_stats(global_stats, stats)
+    return global_stats
 
-    sources = []
-    if args.config:
-        with open(args.config, "r") as f:
-            config = yaml.safe_load(f)
-            sources = config.get("sources", [])
-    elif args.repo:
-        sources = [
-            {"url": args.repo, "include_paths": [args.path] if args.path else None}
-        ]
-
-    if not sources:
-        print("No sources provided. Use --config or --repo")
-        sys.exit(1)
-
-    temp_dirs = []
-
-    try:
-        for source in sources:
-            repo_dir = None
-            is_temp = False
-
-            if "local_path" in source:
-                repo_dir = Path(source["local_path"]).resolve()
-                if not repo_dir.exists():
-                    logger.warning(f"Local path {repo_dir} does not exist.")
-                    continue
-                logger.info(f"Using local path: {repo_dir}")
-            else:
-                url = source.get("url")
-                branch = source.get("branch", "main")
-                repo_dir = clone_repo(url, branch)
-                is_temp = True
-
-            if repo_dir:
-                if is_temp:
-                    temp_dirs.append(repo_dir)
-
-                include_paths = source.get("include_paths")
-                if include_paths:
-                    for p in include_paths:
-                        target = repo_dir / p
-                        if target.exists():
-                            logger.info(f"Analyzing {target}...")
-                            stats = analyze_directory(target)
-                            merge_stats(global_stats, stats)
-                        else:
-                            logger.warning(f"Path {target} not found in repo.")
-                else:
-                    logger.info(f"Analyzing {repo_dir}...")
-                    stats = analyze_directory(repo_dir)
-                    merge_stats(global_stats, stats)
-    finally:
-        for d in temp_dirs:
-            shutil.rmtree(d, ignore_errors=True)
 
+def build_usage_index(global_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Filters the merged stats to public ADK APIs and computes argument frequencies."""
     # Post-process: Convert Counters to dicts and calculate frequencies
     final_index = {}
 
@@ -253,7 +498,68 @@ def main():
 
         final_index[func] = {"total_calls": total, "args": args_data}
 
+    return final_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Statistical API Index")
+    parser.add_argument("--config", type=str, help="Path to YAML config file (sources)")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="tmp/outputs/api_metadata.yaml",
+        help="Output YAML path",
+    )
+    # Quick mode: direct repo url
+    parser.add_argument("--repo", type=str, help="Direct repo URL to analyze")
+    parser.add_argument(
+        "--path", type=str, help="Subpath within repo (e.g. python/examples)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=f"Mirror and partial-result cache (default: {API_INDEX_CACHE})",
+    )
+    parser.add_argument(
+        "--clone-workers",
+        type=int,
+        default=None,
+        help=f"Sources fetched concurrently (default: {CLONE_WORKERS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Parser processes (default: {PARSE_WORKERS})",
+    )
+
+    args = parser.parse_args()
+
+    sources = []
+    if args.config:
+        with open(args.config, "r") as f:
+            config = yaml.safe_load(f)
+            sources = config.get("sources", [])
+    elif args.repo:
+        sources = [
+            {"url": args.repo, "include_paths": [args.path] if args.path else None}
+        ]
+
+    if not sources:
+        print("No sources provided. Use --config or --repo")
+        sys.exit(1)
+
+    global_stats = index_sources(
+        sources,
+        cache_dir=args.cache_dir,
+        clone_workers=args.clone_workers,
+        parse_workers=args.workers,
+    )
+    final_index = build_usage_index(global_stats)
+
     logger.info(f"Writing index with {len(final_index)} entries to {args.output}")
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
     with open(args.output, "w") as f:
         yaml.dump(final_index, f, sort_keys=True)
 
@@ -1,29 +1,25 @@
-
-from typing import List, Dict, Set, Tuple
-import yaml
-from pydantic import BaseModel, Field
-
-class CooccurrenceMeta(BaseModel):
-    repo_paths: List[str] = Field(..., description="Paths scanned")
-    is_dynamic: bool = Field(True, description="Whether dynamic standard-library filtering was used")
-
-class CooccurrenceResults(BaseModel):
-    meta: CooccurrenceMeta
-    associations: List[Dict]
-
 #!/usr/bin/env python3
 """
 ADK Co-occurrence Indexer.
 
-This utility scans a Python repository (e.g., adk-samples) to calculate the 
-conditional probabilities of ADK module and class usage. It determines the 
+This utility scans Python repositories (e.g., adk-samples) to calculate the
+conditional probabilities of ADK module and class usage. It determines the
 likelihood that one component is used given the presence of another in the same file.
 
 P(B | A) = Count(A and B) / Count(A)
 
-The output is a JSON file containing these associations, which is used by the 
-Agentic Auditor and the Chain Prob Analyzer to build realistic, integrated 
-benchmarking scenarios.
+Files are parsed in a process pool, and the entities each file uses are cached by
+content digest (`FileEntityCache`), so only files that changed since the last run
+are parsed again. Each file becomes a row of a sparse file x entity
+indicator matrix X (entities mapped to integer ids), and all pairwise counts come from
+X^T X at once: the diagonal holds Count(A), the off-diagonal Count(A and B). Entities
+and pairs below the support threshold are pruned before and after the product, and
+confidence (probability) and lift are computed over whole arrays.
+
+The output is a compact binary `.npz` file (see `save_binary`), or YAML / JSON when
+the output path has that suffix; a YAML export can be written alongside the binary.
+It is used by the Agentic Auditor and the Chain Prob Analyzer to build realistic,
+integrated benchmarking scenarios.
 
 Key tracking:
 - Module imports (from x import y)
@@ -31,24 +27,98 @@ Key tracking:
 - Attribute access (Class.property)
 """
 
-import ast
-import os
-import sys
 import argparse
+import ast
+import hashlib
 import json
 import logging
+import os
 import shutil
 import subprocess
+import sys
 import tempfile
-from collections import defaultdict, Counter
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, Set, List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+from pydantic import BaseModel, Field
+
+from core.json_store import JsonStore, default_store_path, store_or_default
+from core.parallel import map_in_batches
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Entities must be used in, and pairs must co-occur in, at least this many files.
+MIN_SUPPORT = 2
+MINING_WORKERS = int(os.environ.get("ADK_COOCC_WORKERS", min(8, os.cpu_count() or 4)))
+# Files to parse per worker process (see `core.parallel.map_in_batches`).
+PARALLEL_MINING_MIN_FILES = 64
+# Upper bound on the entity pairs expanded at once while computing X^T X.
+PAIR_CHUNK_SIZE = 1 << 22
+# Associations converted to dicts at once when exporting YAML.
+YAML_EXPORT_CHUNK_SIZE = 50_000
+BINARY_FORMAT_VERSION = 1
+# Cached entity lists are only reused by the same miner code on the same Python minor
+# version (the stdlib module names used for filtering differ between versions).
+_MINER_FINGERPRINT = "{}:py{}.{}".format(
+    hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16],
+    *sys.version_info[:2],
+)
+
+IGNORED_DIRS = {
+    ".git",
+    ".vscode",
+    ".gemini",
+    "__pycache__",
+    "env",
+    "venv",
+    "node_modules",
+    "dist",
+    "build",
+}
+
+
+class CooccurrenceMeta(BaseModel):
+    repo_paths: List[str] = Field(..., description="Paths scanned")
+    is_dynamic: bool = Field(
+        True, description="Whether dynamic standard-library filtering was used"
+    )
+    file_count: int = Field(0, description="Files using at least one tracked entity")
+    min_support: int = Field(MIN_SUPPORT, description="Support threshold applied")
+
+
+class CooccurrenceResults(BaseModel):
+    meta: CooccurrenceMeta
+    associations: List[Dict]
+
+
+class CooccurrenceCounts(NamedTuple):
+    """X^T X for the file x entity indicator matrix X, after support pruning."""
+
+    entities: List[str]  # Entity names by id.
+    file_counts: np.ndarray  # Diagonal: files using each entity.
+    file_total: int  # Rows of X: files using at least one entity.
+    # Off-diagonal entries above the diagonal (pair_a < pair_b).
+    pair_a: np.ndarray
+    pair_b: np.ndarray
+    pair_counts: np.ndarray
+
+
+class Associations(NamedTuple):
+    """Rules context -> target as parallel arrays, sorted by probability then support."""
+
+    entities: List[str]
+    context: np.ndarray
+    target: np.ndarray
+    probability: np.ndarray  # P(target | context), rounded to 3 places.
+    support: np.ndarray  # Files using both.
+    lift: np.ndarray  # P(target | context) / P(target), rounded to 3 places.
+
 
 class GranularUsageVisitor(ast.NodeVisitor):
     """AST Visitor that tracks granular usage of ADK entities within a file."""
@@ -113,62 +183,400 @@ class GranularUsageVisitor(ast.NodeVisitor):
         return name
 
 
-def analyze_repo(repo_path: Path) -> Tuple[Counter, Dict[str, Counter]]:
-    """Scans the repo and builds the co-occurrence counts."""
-    file_counts = Counter()
-    co_occurrences = defaultdict(Counter)
+def _is_tracked(entity: str) -> bool:
+    """Dynamic discovery: everything outside the standard library and private roots."""
+    root = entity.split(".")[0]
+    return (
+        bool(root) and root not in sys.stdlib_module_names and not root.startswith("_")
+    )
+
+
+def _source_entities(source: bytes) -> List[str]:
+    """The tracked entities a source file uses, sorted; empty if it cannot be parsed."""
+    try:
+        tree = ast.parse(source.decode("utf-8"))
+        visitor = GranularUsageVisitor()
+        visitor.visit(tree)
+    except Exception:
+        return []
+    return sorted(e for e in visitor.used_entities if _is_tracked(e))
+
+
+def _file_entities(file_path: Path) -> List[str]:
+    try:
+        return _source_entities(Path(file_path).read_bytes())
+    except OSError:
+        return []
 
-    python_files = []
-    ignored_dirs = {
-        ".git",
-        ".vscode",
-        ".gemini",
-        "__pycache__",
-        "env",
-        "venv",
-        "node_modules",
-        "dist",
-        "build",
-    }
 
+def _source_entities_batch(sources: List[bytes]) -> List[List[str]]:
+    return [_source_entities(source) for source in sources]
+
+
+def _find_python_files(repo_path: Path) -> List[Path]:
+    python_files = []
     for root, dirs, files in os.walk(repo_path):
-        dirs[:] = [d for d in dirs if d not in ignored_dirs]
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
         for file in files:
             if file.endswith(".py") and not file.startswith("test_"):
                 python_files.append(Path(root) / file)
+    return python_files
 
-    logger.info(
-        f"Scanning {len(python_files)} files in {repo_path} for granular usage..."
-    )
 
-    for file_path in python_files:
+class FileEntityCache(JsonStore):
+    """Persistent map of a file's content digest to the tracked entities it uses."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path or default_store_path("ADK_COOCC_CACHE", "cooccurrence_cache.db"),
+            "file_entities",
+            version=_MINER_FINGERPRINT,
+        )
+
+
+def _extract_entities(
+    paths: List[Path], workers: int, cache: Optional[FileEntityCache] = None
+) -> List[List[str]]:
+    """
+    The entities each file uses, in order. Cached files are not parsed again; the
+    rest are parsed in a process pool when there are enough of them, then cached.
+    """
+    sources = []
+    for path in paths:
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                tree = ast.parse(f.read())
-
-            visitor = GranularUsageVisitor()
-            visitor.visit(tree)
-
-            # Filter for google.adk entities
-            relevant = set()
-            for ent in visitor.used_entities:
-                root = ent.split(".")[0]
-                if root and root not in sys.stdlib_module_names and not root.startswith("_"):
-                    relevant.add(ent)
-            if not relevant:
-                continue
+            sources.append(path.read_bytes())
+        except OSError:
+            sources.append(b"")
+    digests = [hashlib.sha256(source).hexdigest() for source in sources]
+
+    with store_or_default(cache, FileEntityCache) as cache:
+        known = cache.lookup(digests) if cache else {}
+        misses = list(
+            {d: s for d, s in zip(digests, sources) if d not in known}.items()
+        )
+        logger.info(f"Parsing {len(misses)} files ({len(known)} unchanged, cached)...")
+
+        fresh = map_in_batches(
+            _source_entities_batch,
+            [source for _, source in misses],
+            workers,
+            PARALLEL_MINING_MIN_FILES,
+        )
+        parsed = {digest: used for (digest, _), used in zip(misses, fresh)}
+        if cache and parsed:
+            cache.store(parsed.items())
+    known.update(parsed)
+    return [known[digest] for digest in digests]
+
+
+def _sum_by_key(keys: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorts `keys` and sums the counts of equal keys."""
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    if len(keys) == 0:
+        return keys, counts
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+def _cooccurrence_pairs(
+    indices: np.ndarray, lengths: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The entries above the diagonal of X^T X, for X in CSR form (the entity ids of row
+    i are the next `lengths[i]` values of `indices`), as (a, b, count) arrays.
+
+    Each row's ordered id pairs are expanded with array arithmetic, in chunks of about
+    PAIR_CHUNK_SIZE, encoded as `a * n + b`, and summed by sorting.
+    """
+    starts = np.cumsum(lengths) - lengths
+    squares = lengths * lengths
+    cumulative = np.cumsum(squares)
+    keys, counts = np.empty(0, np.int64), np.empty(0, np.int64)
+    pending_keys, pending_counts = [], []
+    first = 0
+    while first < len(lengths):
+        done = cumulative[first] - squares[first]
+        last = int(np.searchsorted(cumulative, done + PAIR_CHUNK_SIZE, side="right"))
+        last = max(last, first + 1)
+        lens, sq = lengths[first:last], squares[first:last]
+        total = int(sq.sum())
+        if total:
+            row = np.repeat(np.arange(last - first), sq)
+            offset = np.arange(total) - np.repeat(np.cumsum(sq) - sq, sq)
+            base, width = starts[first:last][row], lens[row]
+            a = indices[base + offset // width]
+            b = indices[base + offset % width]
+            upper = a < b
+            chunk_keys, chunk_counts = np.unique(
+                a[upper] * n + b[upper], return_counts=True
+            )
+            pending_keys.append(chunk_keys)
+            pending_counts.append(chunk_counts)
+            if sum(len(k) for k in pending_keys) > PAIR_CHUNK_SIZE:
+                keys, counts = _sum_by_key(
+                    np.concatenate([keys, *pending_keys]),
+                    np.concatenate([counts, *pending_counts]),
+                )
+                pending_keys, pending_counts = [], []
+        first = last
+    keys, counts = _sum_by_key(
+        np.concatenate([keys, *pending_keys]), np.concatenate([counts, *pending_counts])
+    )
+    return keys // n, keys % n, counts
+
+
+def count_cooccurrences(
+    scan_targets: Sequence[Path],
+    min_support: int = MIN_SUPPORT,
+    workers: Optional[int] = None,
+    cache: Optional[FileEntityCache] = None,
+) -> CooccurrenceCounts:
+    """
+    Parses every Python file under the targets and computes pruned X^T X.
+
+    Reuses the entities of unchanged files from `cache` (default: the persistent
+    cache at $ADK_COOCC_CACHE or OUTPUT_ROOT/cooccurrence_cache.db).
+    """
+    paths = []
+    for target in scan_targets:
+        files = _find_python_files(Path(target))
+        logger.info(f"Scanning {len(files)} files in {target} for granular usage...")
+        paths.extend(files)
+    per_file = _extract_entities(
+        paths, MINING_WORKERS if workers is None else workers, cache
+    )
+
+    # X in CSR form: one row of entity ids per file using any tracked entity.
+    entity_ids: Dict[str, int] = {}
+    ids: List[int] = []
+    row_lengths: List[int] = []
+    for used in per_file:
+        if used:
+            row_lengths.append(len(used))
+            ids.extend([entity_ids.setdefault(e, len(entity_ids)) for e in used])
+    entities = list(entity_ids)
+    indices = np.array(ids, dtype=np.int64)
+    lengths = np.array(row_lengths, dtype=np.int64)
+    file_counts = np.bincount(indices, minlength=len(entities))
+
+    # A pair co-occurs at most as often as its rarer entity, so entities below the
+    # threshold can be dropped from X before the quadratic step.
+    keep = file_counts[indices] >= min_support
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    kept_lengths = np.bincount(rows[keep], minlength=len(lengths))
+    pair_a, pair_b, pair_counts = _cooccurrence_pairs(
+        indices[keep], kept_lengths, max(len(entities), 1)
+    )
+    frequent = pair_counts >= min_support
+    return CooccurrenceCounts(
+        entities,
+        file_counts,
+        len(lengths),
+        pair_a[frequent],
+        pair_b[frequent],
+        pair_counts[frequent],
+    )
+
+
+def _round3(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """`numerator / denominator` rounded exactly as `round(x, 3)` would, elementwise."""
+    quotient, remainder = np.divmod(numerator * 1000, denominator)
+    rounded = (quotient + (2 * remainder > denominator)) / 1000
+    # On exact halves round() follows the float quotient, which may sit on either side.
+    ties = np.flatnonzero(2 * remainder == denominator)
+    rounded[ties] = [
+        round(x, 3) for x in (numerator[ties] / denominator[ties]).tolist()
+    ]
+    return rounded
+
+
+def compute_associations(counts: CooccurrenceCounts) -> Associations:
+    """Confidence and lift for both directions of every counted pair."""
+    context = np.concatenate((counts.pair_a, counts.pair_b))
+    target = np.concatenate((counts.pair_b, counts.pair_a))
+    support = np.concatenate((counts.pair_counts, counts.pair_counts))
+    context_counts = counts.file_counts[context]
+    probability = _round3(support, context_counts)
+    lift = np.round(
+        support * counts.file_total / (context_counts * counts.file_counts[target]), 3
+    )
+
+    # Descending probability, then support; ties by name so the output is stable.
+    rank = np.empty(len(counts.entities), dtype=np.int64)
+    rank[sorted(range(len(counts.entities)), key=counts.entities.__getitem__)] = (
+        np.arange(len(counts.entities))
+    )
+    order = np.lexsort((rank[target], rank[context], -support, -probability))
+    return Associations(
+        counts.entities,
+        context[order],
+        target[order],
+        probability[order],
+        support[order],
+        lift[order],
+    )
+
 
-            for ent in relevant:
-                file_counts[ent] += 1
-                for other in relevant:
-                    if ent != other:
-                        co_occurrences[ent][other] += 1
-        except Exception:
-            pass
+def association_dicts(associations: Associations) -> List[Dict]:
+    names = associations.entities
+    return [
+        {
+            "context": names[c],
+            "target": names[t],
+            "probability": p,
+            "support": s,
+            "lift": l,
+        }
+        for c, t, p, s, l in zip(
+            associations.context.tolist(),
+            associations.target.tolist(),
+            associations.probability.tolist(),
+            associations.support.tolist(),
+            associations.lift.tolist(),
+        )
+    ]
+
+
+def _encode(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+
+def _decode(data: np.ndarray) -> str:
+    return data.tobytes().decode("utf-8")
+
+
+def save_binary(path: Path, associations: Associations, meta: CooccurrenceMeta) -> None:
+    """
+    Writes associations as a compressed `.npz` archive: entity names (newline-joined
+    UTF-8), the meta as JSON, and one array per association field. Loads without
+    pickle via `load_binary`.
+    """
+    with open(path, "wb") as f:
+        np.savez_compressed(
+            f,
+            version=np.array([BINARY_FORMAT_VERSION]),
+            meta=_encode(meta.model_dump_json()),
+            entities=_encode("\n".join(associations.entities)),
+            context=associations.context.astype(np.int32),
+            target=associations.target.astype(np.int32),
+            probability=associations.probability,
+            support=associations.support.astype(np.int32),
+            lift=associations.lift,
+        )
 
+
+def load_binary(path: Path) -> Tuple[Associations, CooccurrenceMeta]:
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data["version"][0])
+        if version != BINARY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported co-occurrence format version {version}")
+        names = _decode(data["entities"])
+        associations = Associations(
+            names.split("\n") if names else [],
+            data["context"],
+            data["target"],
+            data["probability"],
+            data["support"],
+            data["lift"],
+        )
+        meta = CooccurrenceMeta.model_validate_json(_decode(data["meta"]))
+    return associations, meta
+
+
+def save_text(path: Path, associations: Associations, meta: CooccurrenceMeta) -> None:
+    """Writes the `{meta, associations}` document as JSON (.json) or YAML."""
+    if Path(path).suffix == ".json":
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "meta": meta.model_dump(mode="json"),
+                    "associations": association_dicts(associations),
+                },
+                f,
+                indent=2,
+            )
+        return
+
+    # Use LibYAML for speed if available
+    try:
+        from yaml import CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeDumper as Dumper
+
+    def dump(data) -> str:
+        return yaml.dump(data, Dumper=Dumper, sort_keys=False)
+
+    total = len(associations.context)
+    with open(path, "w") as f:
+        f.write(dump({"meta": meta.model_dump(mode="json")}))
+        if not total:
+            f.write(dump({"associations": []}))
+            return
+        # The list is emitted in slices: a block sequence under a top-level key is
+        # not indented, so consecutive slices form one sequence.
+        f.write("associations:\n")
+        for start in range(0, total, YAML_EXPORT_CHUNK_SIZE):
+            rows = slice(start, start + YAML_EXPORT_CHUNK_SIZE)
+            chunk = Associations(
+                associations.entities, *(field[rows] for field in associations[1:])
+            )
+            f.write(dump(association_dicts(chunk)))
+
+
+def analyze_repo(repo_path: Path) -> Tuple[Counter, Dict[str, Counter]]:
+    """Scans the repo and builds the (unpruned) co-occurrence counts."""
+    counts = count_cooccurrences([repo_path], min_support=1)
+    names = counts.entities
+    file_counts = Counter(dict(zip(names, counts.file_counts.tolist())))
+    co_occurrences = defaultdict(Counter)
+    for a, b, count in zip(
+        counts.pair_a.tolist(), counts.pair_b.tolist(), counts.pair_counts.tolist()
+    ):
+        co_occurrences[names[a]][names[b]] = count
+        co_occurrences[names[b]][names[a]] = count
     return file_counts, co_occurrences
 
 
+def generate_cooccurrence(
+    scan_targets: List[Path],
+    output_path: str,
+    yaml_path: Optional[str] = None,
+    min_support: int = MIN_SUPPORT,
+    workers: Optional[int] = None,
+    cache: Optional[FileEntityCache] = None,
+) -> Associations:
+    """
+    Generates co-occurrence metrics dynamically for all targets.
+
+    The format follows the suffix of `output_path`: `.yaml`/`.yml` or `.json` for text,
+    anything else for the binary format. `yaml_path` additionally exports YAML.
+    """
+    counts = count_cooccurrences(scan_targets, min_support, workers, cache)
+    associations = compute_associations(counts)
+    meta = CooccurrenceMeta(
+        repo_paths=[str(p) for p in scan_targets],
+        is_dynamic=True,
+        file_count=counts.file_total,
+        min_support=min_support,
+    )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.suffix in (".yaml", ".yml", ".json"):
+        save_text(output_path, associations, meta)
+    else:
+        save_binary(output_path, associations, meta)
+    if yaml_path:
+        save_text(Path(yaml_path), associations, meta)
+
+    logger.info(
+        f"Saved {len(associations.context)} associations between "
+        f"{len(counts.entities)} entities to {output_path}"
+    )
+    return associations
+
+
 def clone_repo(url: str, branch: str = "main") -> Path:
     """Clones a repo to a temporary directory."""
     temp_dir = Path(tempfile.mkdtemp(prefix="adk_coocc_"))
@@ -186,19 +594,18 @@ def clone_repo(url: str, branch: str = "main") -> Path:
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Calculate ADK Co-occurrence Probabilities."
-    )
+    parser = argparse.ArgumentParser(description="Co-occurrence Probabilities.")
     parser.add_argument(
-        "--repo",
+        "--repos",
+        "--repo-paths",
         type=str,
-        help="Repo URL to analyze (optional if --repo-paths is used)",
+        nargs="+",
+        help="List of local repository paths to scan.",
     )
     parser.add_argument(
-        "--repo-paths",
+        "--repo",
         type=str,
-        nargs="+",
-        help="List of local repository paths to scan",
+        help="Repo URL to analyze (optional if --repos is used)",
     )
     parser.add_argument(
         "--path",
@@ -209,77 +616,55 @@ def main():
     parser.add_argument(
         "--output",
         type=str,
-        default="benchmarks/adk_cooccurrence.json",
-        help="Output path for JSON stats",
+        default="cooccurrence.npz",
+        help="Output file: binary .npz, or .yaml/.json for text.",
+    )
+    parser.add_argument(
+        "--yaml",
+        type=str,
+        default=None,
+        help="Also export the associations as YAML to this path.",
+    )
+    parser.add_argument(
+        "--min-support",
+        type=int,
+        default=MIN_SUPPORT,
+        help="Minimum number of files for entities and pairs.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Parser processes (default: $ADK_COOCC_WORKERS or {MINING_WORKERS}).",
     )
-
     args = parser.parse_args()
 
     temp_dirs = []
     scan_targets = []
-
     try:
-        if args.repo_paths:
-            for p in args.repo_paths:
+        if args.repos:
+            for p in args.repos:
                 resolved = Path(p).resolve()
                 if resolved.exists():
                     scan_targets.append(resolved)
                 else:
                     logger.warning(f"Path not found: {p}")
-
         elif args.repo:
             repo_dir = clone_repo(args.repo)
-            if repo_dir:
-                temp_dirs.append(repo_dir)
-                scan_targets.append(repo_dir / args.path)
-            else:
+            if not repo_dir:
                 sys.exit(1)
+            temp_dirs.append(repo_dir)
+            scan_targets.append(repo_dir / args.path)
         else:
-            parser.error("Must provide either --repo-paths or --repo")
-
-        total_counts = Counter()
-        total_co_occurrences = defaultdict(Counter)
-
-        for target in scan_targets:
-            c, co = analyze_repo(target)
-            total_counts.update(c)
-            for key, val in co.items():
-                total_co_occurrences[key].update(val)
-
-        results = []
-        for context, count in total_counts.items():
-            if count < 2:
-                continue  # Noise filter
-
-            associations = total_co_occurrences[context]
-            for target, co_count in associations.items():
-                prob = co_count / count
-                results.append(
-                    {
-                        "context": context,
-                        "target": target,
-                        "probability": round(prob, 3),
-                        "support": co_count,
-                    }
-                )
-
-        results.sort(key=lambda x: (x["probability"], x["support"]), reverse=True)
-
-        # Ensure output directory exists
-        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-
-        with open(args.output, "w") as f:
-            json.dump(
-                {
-                    "meta": {"repo_paths": [str(p) for p in scan_targets]},
-                    "associations": results,
-                },
-                f,
-                indent=2,
-            )
-
-        logger.info(f"Saved {len(results)} granular associations to {args.output}")
-
+            parser.error("Must provide either --repos or --repo")
+
+        generate_cooccurrence(
+            scan_targets,
+            args.output,
+            yaml_path=args.yaml,
+            min_support=args.min_support,
+            workers=args.workers,
+        )
     finally:
         for t in temp_dirs:
             shutil.rmtree(t, ignore_errors=True)
@@ -287,71 +672,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-def generate_cooccurrence(scan_targets: List[Path], output_path: str) -> None:
-    """Generates co-occurrence metrics dynamically for all targets."""
-    total_counts = Counter()
-    total_co_occurrences = defaultdict(Counter)
-
-    for target in scan_targets:
-        c, co = analyze_repo(target)
-        total_counts.update(c)
-        for key, val in co.items():
-            total_co_occurrences[key].update(val)
-
-    results = []
-    
-    # We only care about rules with sufficient support
-    MIN_SUPPORT = 2
-
-    for context, targets in total_co_occurrences.items():
-        ctx_total = total_counts[context]
-
-        if ctx_total < MIN_SUPPORT:
-            continue
-
-        for target, count in targets.items():
-            prob = count / ctx_total
-            if count >= MIN_SUPPORT:
-                results.append(
-                    {
-                        "context": context,
-                        "target": target,
-                        "probability": round(prob, 3),
-                        "support": count,
-                    }
-                )
-
-    # Sort descending by probability, then support
-    results.sort(key=lambda x: (x["probability"], x["support"]), reverse=True)
-
-    output_data = CooccurrenceResults(
-        meta=CooccurrenceMeta(
-            repo_paths=[str(p) for p in scan_targets],
-            is_dynamic=True
-        ),
-        associations=results
-    )
-
-    with open(output_path, "w") as f:
-        yaml.safe_dump(output_data.model_dump(mode='json'), f, sort_keys=False)
-
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Co-occurrence Probabilities.")
-    parser.add_argument(
-        "--repos",
-        type=str,
-        nargs="+",
-        required=True,
-        help="List of local repository paths to scan.",
-    )
-    parser.add_argument(
-        "--output",
-        type=str,
-        default="cooccurrence.yaml",
-        help="Output YAML file.",
-    )
-    args = parser.parse_args()
-
-    targets = [Path(p) for p in args.repos]
-    generate_cooccurrence(targets, args.output)
@@ -0,0 +1,138 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runtime identity resolver worker.
+
+Started by `runtime_resolver.RuntimeResolver` as `python -I _resolver_worker.py
+'<json list of leading paths>' <timeout seconds> '<json list of trailing paths>'`;
+the paths go before and after the default sys.path. Reads one JSON list of FQNs per
+line and answers one JSON list of `[file_path, canonical_fqn, kind]` (or null) per
+line. A request that runs past the timeout is answered with `{"hung": [modules]}`,
+the modules whose import was still executing, and the worker exits. Only uses the
+standard library, so it runs in any interpreter.
+"""
+
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+
+class _Resolver:
+    def __init__(self):
+        self.failed_imports = set()
+
+    def _import(self, name):
+        if name in self.failed_imports:
+            return None
+        try:
+            return __import__(name, fromlist=["*"])
+        except BaseException:  # Import side effects may even call sys.exit().
+            self.failed_imports.add(name)
+            return None
+
+    def resolve(self, fqn):
+        """Imports the longest importable prefix of `fqn` and walks the rest as attributes."""
+        parts = fqn.split(".")
+        for i in range(len(parts), 0, -1):
+            obj = self._import(".".join(parts[:i]))
+            if obj is None:
+                continue
+            try:
+                for attr in parts[i:]:
+                    if not hasattr(obj, attr):
+                        break
+                    obj = getattr(obj, attr)
+                else:
+                    return _describe(fqn, obj)
+            except BaseException:
+                continue
+        return None
+
+
+def _describe(fqn, obj):
+    if inspect.ismodule(obj):
+        kind, canonical = "module", obj.__name__
+    else:
+        if inspect.isclass(obj):
+            kind = "class"
+        elif inspect.isroutine(obj):
+            kind = "function"
+        else:
+            kind = "object"
+        module = getattr(obj, "__module__", None)
+        qualname = getattr(obj, "__qualname__", None)
+        if kind != "object" and isinstance(module, str) and isinstance(qualname, str):
+            canonical = f"{module}.{qualname}"
+        else:
+            canonical = fqn
+    try:
+        file_path = inspect.getfile(obj)
+    except BaseException:
+        file_path = None
+    return [file_path, canonical, kind]
+
+
+def _initializing_modules():
+    """Modules whose import is still running; importing them again hangs too."""
+    return [
+        name
+        for name, module in list(sys.modules.items())
+        if getattr(getattr(module, "__spec__", None), "_initializing", False)
+    ]
+
+
+def _watch(state, lock, timeout, responses):
+    while True:
+        time.sleep(min(1.0, timeout / 4))
+        with lock:
+            started = state["started"]
+            if started is not None and time.monotonic() - started > timeout:
+                responses.write(json.dumps({"hung": _initializing_modules()}) + "\n")
+                responses.flush()
+                os._exit(1)
+
+
+def main():
+    sys.path[0:0] = json.loads(sys.argv[1])
+    timeout = float(sys.argv[2])
+    sys.path.extend(json.loads(sys.argv[3]))
+    # Keep the protocol on private descriptors: imported modules may read stdin or
+    # print to stdout, which now go to /dev/null and stderr.
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+
+    resolver = _Resolver()
+    state, lock = {"started": None}, threading.Lock()
+    threading.Thread(
+        target=_watch, args=(state, lock, timeout, responses), daemon=True
+    ).start()
+    for line in requests:
+        with lock:
+            state["started"] = time.monotonic()
+        results = [resolver.resolve(fqn) for fqn in json.loads(line)]
+        with lock:
+            state["started"] = None
+            responses.write(json.dumps(results) + "\n")
+            responses.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -43,9 +43,12 @@ import textwrap
 import logging
 import subprocess
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Optional, Dict, List, Any, Set
 
+from adk_knowledge_ext.navigation import write_ranked_targets
+from tools.knowledge.cooccurrence_graph import load_cooccurrence_graph
+from tools.knowledge.target_ranker.runtime_resolver import RuntimeResolver
 from tools.knowledge.target_ranker.scanner import scan_repository
 from tools.knowledge.target_ranker.models import RankedTarget, MemberInfo
 
@@ -66,6 +69,20 @@ CONSTRUCTOR_EXCLUDED_FIELDS = {
 }
 
 
+def _build_suffix_index(class_fqns: List[str]) -> Dict[str, List[str]]:
+    """
+    Maps every dotted suffix of each class FQN (for `a.b.C`: `C` and `b.C`) to the
+    classes ending with `.<suffix>`, in `class_fqns` order.
+    """
+    index = defaultdict(list)
+    for fqn in class_fqns:
+        pos = fqn.find(".")
+        while pos != -1:
+            index[fqn[pos + 1 :]].append(fqn)
+            pos = fqn.find(".", pos + 1)
+    return index
+
+
 class TargetRanker:
 
     def __init__(
@@ -153,12 +170,33 @@ class TargetRanker:
                 properties.append(MemberInfo(**prop_entry))
         return properties
 
+    @staticmethod
+    def _class_hierarchy(cls_fqn, structure_map, adk_inheritance):
+        """
+        The class followed by its ADK ancestors in BFS order. Classes missing from the
+        structure map are listed but not expanded.
+        """
+        queue = deque([cls_fqn])
+        visited = {cls_fqn}
+        hierarchy = []
+        while queue:
+            curr = queue.popleft()
+            hierarchy.append(curr)
+            if curr not in structure_map:
+                continue
+            for p in adk_inheritance.get(curr, []):
+                if p not in visited:
+                    visited.add(p)
+                    queue.append(p)
+        return hierarchy
+
     def reconstruct_constructor_signature(
-        self, cls_fqn, structure_map, entity_map, adk_inheritance
+        self, cls_fqn, structure_map, entity_map, adk_inheritance, hierarchy=None
     ):
         """
         Deterministic reconstruction of constructor signature for classes without explicit __init__.
         Handles Pydantic models by aggregating fields from the MRO.
+        `hierarchy` is the class's `_class_hierarchy`, computed when omitted.
         """
         struct = structure_map.get(cls_fqn)
         if not struct:
@@ -181,17 +219,13 @@ class TargetRanker:
         # 2. Analyze MRO to detect Pydantic models, Dataclasses, or inherit parent __init__
         # This uses BFS to gather the hierarchy.
         # Note: A proper MRO linearization would be better but BFS is a decent proxy for gathering members.
-        queue = [cls_fqn]
-        visited = {cls_fqn}
-        hierarchy = []
+        if hierarchy is None:
+            hierarchy = self._class_hierarchy(cls_fqn, structure_map, adk_inheritance)
 
         is_generated_init = False
         first_init_sig = None
 
-        while queue:
-            curr = queue.pop(0)
-            hierarchy.append(curr)
-
+        for curr in hierarchy:
             curr_struct = structure_map.get(curr)
             if not curr_struct:
                 continue
@@ -218,13 +252,6 @@ class TargetRanker:
                         if m_entity:
                             first_init_sig = m_entity.get("signature_full")
 
-            # Add parents to queue
-            parents = adk_inheritance.get(curr, [])
-            for p in parents:
-                if p not in visited:
-                    visited.add(p)
-                    queue.append(p)
-
         if is_generated_init:
             # For Pydantic/Dataclasses, collect all properties (fields) from the hierarchy
             fields = []
@@ -278,6 +305,8 @@ class TargetRanker:
 
         repo_root = Path(self.repo_path)
         errors = []
+        # Many entries share a file: read and parse each one once.
+        parsed_files = {}
 
         for entry in data:
             fqn = entry.get("id") or entry.get("fqn")
@@ -303,17 +332,26 @@ class TargetRanker:
                 continue
 
             try:
-                content = full_path.read_text(encoding="utf-8")
-                tree = ast.parse(content)
+                if full_path not in parsed_files:
+                    try:
+                        content = full_path.read_text(encoding="utf-8")
+                        tree = ast.parse(content)
+                        # Use ast.walk to find nested functions/classes
+                        defined = {
+                            node.name
+                            for node in ast.walk(tree)
+                            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+                        }
+                        parsed_files[full_path] = (content, defined)
+                    except Exception as e:
+                        parsed_files[full_path] = e
+                parsed = parsed_files[full_path]
+                if isinstance(parsed, Exception):
+                    raise parsed
+                content, defined = parsed
                 target_name = fqn.split(".")[-1]
 
-                found = False
-                # Use ast.walk to find nested functions/classes
-                for node in ast.walk(tree):
-                    if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
-                        if node.name == target_name:
-                            found = True
-                            break
+                found = target_name in defined
 
                 if not found:
                     # Fallback check for constants or imports
@@ -356,9 +394,12 @@ class TargetRanker:
         dependency_root_path = None
         if self.dependency_root:
             dependency_root_path = Path(self.dependency_root).resolve()
-            if str(dependency_root_path) not in sys.path:
-                logger.info(f"Adding dependency root to sys.path: {dependency_root_path}")
-                sys.path.insert(0, str(dependency_root_path))
+
+        # Names are resolved by importing them in an isolated subprocess, never here.
+        resolver_paths = [str(Path(self.repo_path).resolve())]
+        if dependency_root_path:
+            resolver_paths.append(str(dependency_root_path))
+        resolver = RuntimeResolver(resolver_paths)
         
         # 1. Scan ADK Repo (Seed)
         logger.info(f"Scanning ADK repo: {self.repo_path}...")
@@ -375,7 +416,8 @@ class TargetRanker:
         scan_result = scan_repository(
             repo_path=self.repo_path,
             namespace=self.namespace,
-            usage_stats=usage_stats
+            usage_stats=usage_stats,
+            resolver=resolver,
         )
         
         if "scanned_targets" in scan_result:
@@ -392,7 +434,7 @@ class TargetRanker:
         if dependency_root_path and dependency_root_path.exists():
             logger.info("Starting BFS Discovery for External Dependencies (Public API Only)...")
             logger.info(f"Dependency Root: {dependency_root_path}")
-            logger.info(f"Sys Path includes dependency root: {str(dependency_root_path) in sys.path}")
+            logger.info(f"Resolver path: {resolver_paths}")
             
             # Helper to extract potential external dependencies from structure
             def get_dependencies_from_structure(struct_entry):
@@ -411,17 +453,25 @@ class TargetRanker:
                     deps.add(pt)
                 return deps
 
+            builtin_names = ("int", "str", "bool", "float", "list", "dict", "set", "Any", "Optional", "List")
+
             unique_processed_structs = set()
-            queue = list(all_structure.keys())
+            queue = deque(all_structure.keys())
             visited_files = set()
             processed_fqns = set()
             
-            import importlib
-            
             logger.info(f"Initial Queue Size: {len(queue)}")
 
+            # Resolve the seed's dependencies in large batches up front.
+            resolver.resolve_many(
+                cand
+                for struct in all_structure.values()
+                for cand in get_dependencies_from_structure(struct)
+                if cand not in all_structure and cand not in builtin_names
+            )
+
             while queue:
-                curr_fqn = queue.pop(0)
+                curr_fqn = queue.popleft()
                 if curr_fqn in unique_processed_structs:
                     continue
                 unique_processed_structs.add(curr_fqn)
@@ -431,71 +481,59 @@ class TargetRanker:
                 struct = all_structure[curr_fqn]
                 
                 candidates = get_dependencies_from_structure(struct)
+                # One batch for the candidates that are still unknown at this point.
+                resolver.resolve_many(
+                    cand
+                    for cand in candidates
+                    if cand not in processed_fqns
+                    and cand not in all_structure
+                    and cand not in builtin_names
+                )
                 for cand in candidates:
                     if cand in processed_fqns: continue
                     processed_fqns.add(cand)
                     
                     if cand in all_structure: continue # Already have definition
-                    if cand in ("int", "str", "bool", "float", "list", "dict", "set", "Any", "Optional", "List"): continue
+                    if cand in builtin_names: continue
                     
-                    # Resolve
+                    resolution = resolver.resolve(cand)
+                    if not resolution or not resolution.file_path:
+                        logger.debug(f"Could not resolve candidate: {cand}")
+                        continue
+
                     try:
-                        # Heuristic resolution loop
-                        parts = cand.split(".")
-                        obj = None
-                        found = False
+                        f_path_obj = Path(resolution.file_path).resolve()
                         
-                        logger.debug(f"Attempting to resolve candidate: {cand}")
-
-                        for i in range(len(parts), 0, -1):
-                            mod_str = ".".join(parts[:i])
-                            try:
-                                mod = __import__(mod_str, fromlist=["*"])
-                                curr = mod
-                                ok = True
-                                for attr in parts[i:]:
-                                    if hasattr(curr, attr):
-                                        curr = getattr(curr, attr)
-                                    else:
-                                        ok = False; break
-                                if ok: obj = curr; found = True; break
-                            except Exception as e:
-                                # logger.debug(f"Failed import {mod_str}: {e}")
-                                continue
+                        logger.debug(f"Resolved {cand} to {f_path_obj} ({resolution.kind})")
                         
-                        if found and obj:
-                            try:
-                               f_path = inspect.getfile(obj)
-                               f_path_obj = Path(f_path).resolve()
-                               
-                               logger.debug(f"Resolved {cand} to {f_path_obj}")
-                               
-                               if str(dependency_root_path) in str(f_path_obj):
-                                   if f_path_obj not in visited_files:
-                                       visited_files.add(f_path_obj)
-                                       logger.info(f"Found External Dependency: {f_path_obj} (from {cand})")
-                                       # SCAN
-                                       new_entities = []
-                                       _scan_file_single(
-                                           full_path=f_path_obj,
-                                           root_dir=dependency_root_path,
-                                           root_namespace_prefix=None,
-                                           namespace=None,
-                                           usage_stats={}, 
-                                           structure_map=all_structure,
-                                           entities=new_entities,  # Pass temp list
-                                           alias_map=all_aliases
-                                       )
-                                       # Convert to dicts and add to all_targets
-                                       for new_e in new_entities:
-                                           new_d = new_e.model_dump()
-                                           all_targets.append(new_d)
-                                           queue.append(new_d["id"])
-                               else:
-                                   logger.debug(f"Ignored {cand}: Not in dependency root ({dependency_root_path})")
-                            except: pass
+                        if str(dependency_root_path) in str(f_path_obj):
+                            if f_path_obj not in visited_files:
+                                visited_files.add(f_path_obj)
+                                logger.info(f"Found External Dependency: {f_path_obj} (from {cand})")
+                                # SCAN
+                                new_entities = []
+                                _scan_file_single(
+                                    full_path=f_path_obj,
+                                    root_dir=dependency_root_path,
+                                    root_namespace_prefix=None,
+                                    namespace=None,
+                                    usage_stats={}, 
+                                    structure_map=all_structure,
+                                    entities=new_entities,  # Pass temp list
+                                    alias_map=all_aliases
+                                )
+                                # Convert to dicts and add to all_targets
+                                for new_e in new_entities:
+                                    new_d = new_e.model_dump()
+                                    all_targets.append(new_d)
+                                    queue.append(new_d["id"])
+                        else:
+                            logger.debug(f"Ignored {cand}: Not in dependency root ({dependency_root_path})")
                     except: pass
 
+            logger.info(f"Runtime resolver: {resolver.stats}")
+        resolver.close()
+
         # Restore aggregated data to session state (REMOVED)
         # session.state["scanned_targets"] = all_targets
         # session.state["structure_map"] = all_structure
@@ -516,6 +554,9 @@ class TargetRanker:
         external_bases = defaultdict(list)
 
         class_fqns = [k for k, v in structure_map.items() if v["type"] == "Class"]
+        # Classes by every dotted suffix of their FQN, to match a base like `Agent` or
+        # `agents.Agent` without scanning every class.
+        classes_by_suffix = _build_suffix_index(class_fqns)
 
         for cls_fqn in class_fqns:
             bases = structure_map[cls_fqn].get("bases", [])
@@ -525,15 +566,15 @@ class TargetRanker:
                     match = base
 
                 if not match:
-                    candidates = [k for k in class_fqns if k.endswith(f".{base}")]
+                    candidates = classes_by_suffix.get(base, [])
                     if len(candidates) == 1:
                         match = candidates[0]
                     elif len(candidates) > 1:
-                        candidates.sort(
+                        # The first candidate sharing the longest prefix with cls_fqn.
+                        match = max(
+                            candidates,
                             key=lambda x: len(os.path.commonprefix([x, cls_fqn])),
-                            reverse=True,
                         )
-                        match = candidates[0]
 
                 if match:
                     adk_inheritance[cls_fqn].append(match)
@@ -545,16 +586,7 @@ class TargetRanker:
         entity_map = {t["id"]: t for t in targets_data}
 
         # Load co-occurrence if exists
-        associations = []
-        if cooccurrence_path.exists():
-            with open(cooccurrence_path, "r") as f:
-                cooccurrence_data = yaml.safe_load(f)
-                associations = cooccurrence_data.get("associations", [])
-
-        graph = defaultdict(list)
-        for a in associations:
-            if a["context"] in entity_map and a["target"] in entity_map:
-                graph[a["context"]].append(a["target"])
+        coocc_graph = load_cooccurrence_graph(cooccurrence_path)
 
         seeds = [t for t in targets_data if t.get("usage_score", 0) > 0]
         seeds.sort(key=lambda t: t.get("usage_score", 0), reverse=True)
@@ -573,8 +605,9 @@ class TargetRanker:
         while idx < len(ordered_ids):
             curr_id = ordered_ids[idx]
             idx += 1
-            for dep_id in graph.get(curr_id, []):
-                if dep_id not in visited:
+            neighbors = coocc_graph.neighbors(curr_id) if coocc_graph else []
+            for dep_id in (a.target for a in neighbors):
+                if dep_id in entity_map and dep_id not in visited:
                     visited.add(dep_id)
                     ordered_ids.append(dep_id)
                     target_groups[dep_id] = "Dependency"
@@ -588,6 +621,33 @@ class TargetRanker:
 
         logger.info(f"Writing detailed YAML to {output_yaml_path}...")
 
+        # Each class's hierarchy and member lists are computed once, however many
+        # subclasses inherit them.
+        hierarchies = {}
+        methods_by_class = {}
+        props_by_class = {}
+
+        def hierarchy_of(cls_fqn):
+            if cls_fqn not in hierarchies:
+                hierarchies[cls_fqn] = self._class_hierarchy(
+                    cls_fqn, structure_map, adk_inheritance
+                )
+            return hierarchies[cls_fqn]
+
+        def methods_of(cls_fqn):
+            if cls_fqn not in methods_by_class:
+                methods_by_class[cls_fqn] = self._get_methods_for_class(
+                    cls_fqn, structure_map, entity_map
+                )
+            return methods_by_class[cls_fqn]
+
+        def props_of(cls_fqn):
+            if cls_fqn not in props_by_class:
+                props_by_class[cls_fqn] = self._get_properties_for_class(
+                    cls_fqn, structure_map
+                )
+            return props_by_class[cls_fqn]
+
         yaml_data = []
         for rank, tid in enumerate(ordered_ids, 1):
             t = entity_map[tid]
@@ -620,35 +680,22 @@ class TargetRanker:
             if tid in structure_map:
                 # Constructor Reconstruction
                 reconstructed_init = self.reconstruct_constructor_signature(
-                    tid, structure_map, entity_map, adk_inheritance
+                    tid, structure_map, entity_map, adk_inheritance, hierarchy_of(tid)
                 )
                 if reconstructed_init:
                     target_model.constructor_signature = reconstructed_init
 
                 # Own Members
-                own_methods = self._get_methods_for_class(
-                    tid, structure_map, entity_map
-                )
+                own_methods = methods_of(tid)
                 if own_methods:
                     target_model.methods = own_methods
 
-                own_props = self._get_properties_for_class(tid, structure_map)
+                own_props = props_of(tid)
                 if own_props:
                     target_model.properties = own_props
 
                 # Inherited Members (ADK)
-                ancestors = []
-                queue_anc = [tid]
-                seen_ancestors = {tid}
-
-                while queue_anc:
-                    curr = queue_anc.pop(0)
-                    parents = adk_inheritance.get(curr, [])
-                    for p in parents:
-                        if p not in seen_ancestors:
-                            seen_ancestors.add(p)
-                            ancestors.append(p)
-                            queue_anc.append(p)
+                ancestors = hierarchy_of(tid)[1:]
 
                 if ancestors:
                     inherited_methods_dict = {}
@@ -657,15 +704,11 @@ class TargetRanker:
                     for anc_fqn in ancestors:
                         anc_name = structure_map[anc_fqn]["name"]
 
-                        anc_methods = self._get_methods_for_class(
-                            anc_fqn, structure_map, entity_map
-                        )
+                        anc_methods = methods_of(anc_fqn)
                         if anc_methods:
                             inherited_methods_dict[anc_name] = anc_methods
 
-                        anc_props = self._get_properties_for_class(
-                            anc_fqn, structure_map
-                        )
+                        anc_props = props_of(anc_fqn)
                         if anc_props:
                             inherited_props_dict[anc_name] = anc_props
 
@@ -692,8 +735,9 @@ class TargetRanker:
 
             yaml_data.append(target_model.model_dump(exclude_none=True))
 
-        with open(output_yaml_path, "w") as f:
-            yaml.dump(yaml_data, f, sort_keys=False, width=1000)
+        # Also writes ranked_targets.nav.json: the reverse indices that the
+        # list/inspect tools navigate without parsing the whole YAML.
+        write_ranked_targets(yaml_data, output_yaml_path)
 
         logger.info(f"Writing ranked list to {output_md_path}...")
         with open(output_md_path, "w") as f:
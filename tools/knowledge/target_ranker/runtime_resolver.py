@@ -0,0 +1,330 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Runtime identity resolution in an isolated interpreter.
+
+The scanner and ranker need to know what a dotted name really is at runtime: which
+file defines it, what its canonical name is (`module.qualname`, so re-exports of one
+class resolve to the same name), and whether it is a module, class, function or other
+object. Importing arbitrary packages in the indexing process pollutes `sys.modules`
+and runs their import side effects there, so `RuntimeResolver` imports them in a
+worker subprocess (`_resolver_worker.py`, run with `python -I` and only the given path
+entries added). Lookups are batched, memoized in memory, and persisted (found or not)
+per environment hash, which covers the interpreter, its `sys.path`, the installed
+distributions and the sources on the added path entries.
+
+A request that times out reports the modules whose import hung. Names under them are
+then resolved as not found without starting another worker, and persisted as such.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import select
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from core.json_store import JsonStore, default_store_path, open_default
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_PYTHON = os.environ.get("ADK_RESOLVER_PYTHON", sys.executable)
+# FQNs per worker request, and how long one request may take (imports can be slow).
+RESOLVE_BATCH_SIZE = 256
+RESOLVE_TIMEOUT_SECONDS = float(os.environ.get("ADK_RESOLVER_TIMEOUT", 120))
+# Extra wait for the worker to report its own timeout before it is killed.
+_TIMEOUT_GRACE_SECONDS = 10
+
+_WORKER_SCRIPT = Path(__file__).with_name("_resolver_worker.py")
+_SOURCE_IGNORED_DIRS = {".git", "__pycache__", "node_modules", "venv", "env"}
+
+
+class Resolution(NamedTuple):
+    file_path: Optional[str]  # None for objects without a source file (builtins).
+    canonical_fqn: str
+    kind: str  # "module", "class", "function" or "object"
+
+
+class _WorkerFailed(Exception):
+    def __init__(self, message: str, hung_modules: Sequence[str] = ()):
+        super().__init__(message)
+        self.hung_modules = list(hung_modules)
+
+
+def _path_stamp(entry: str, walk_sources: bool) -> List:
+    """A cheap fingerprint of one sys.path entry."""
+    path = Path(entry)
+    if not path.is_dir():
+        try:
+            st = path.stat()
+            return [entry, st.st_size, st.st_mtime_ns]
+        except OSError:
+            return [entry, None]
+    try:
+        names = sorted(os.listdir(path))
+    except OSError:
+        return [entry, None]
+    # Installed packages: distribution metadata names carry their versions.
+    dists = [n for n in names if n.endswith((".dist-info", ".egg-info", ".pth"))]
+    if dists or not walk_sources:
+        return [entry, dists]
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _SOURCE_IGNORED_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                rel = os.path.relpath(os.path.join(root, name), path)
+                files.append([rel, st.st_size, st.st_mtime_ns])
+    return [entry, files]
+
+
+def environment_hash(
+    python: str, paths: Sequence[str], fallback_paths: Sequence[str] = ()
+) -> str:
+    """Fingerprints the interpreter, its default sys.path and the added path entries."""
+    probe = subprocess.run(
+        [
+            python,
+            "-I",
+            "-c",
+            "import json, sys; print(json.dumps([sys.version, sys.executable, sys.path]))",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+    version, executable, default_path = json.loads(probe.stdout)
+    stamps = [_path_stamp(p, walk_sources=True) for p in [*paths, *fallback_paths]]
+    stamps += [_path_stamp(p, walk_sources=False) for p in default_path]
+    payload = json.dumps(
+        [version, executable, list(paths), list(fallback_paths), stamps]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResolutionCache(JsonStore):
+    """Persistent map of (environment hash, FQN) to a resolution, or to not-found."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path
+            or default_store_path("ADK_RESOLVER_CACHE", "runtime_resolver_cache.db"),
+            "resolutions",
+        )
+
+    def lookup_resolutions(
+        self, env: str, fqns: Sequence[str]
+    ) -> Dict[str, Optional[Resolution]]:
+        keys = {fqn: json.dumps([env, fqn]) for fqn in fqns}
+        found = self.lookup(keys.values())
+        return {
+            fqn: Resolution(*found[key]) if found[key] else None
+            for fqn, key in keys.items()
+            if key in found
+        }
+
+    def store_resolutions(self, env: str, results: Dict[str, Optional[Resolution]]):
+        self.store((json.dumps([env, fqn]), r) for fqn, r in results.items())
+
+
+class RuntimeResolver:
+    """
+    Resolves FQNs by importing them in a worker subprocess.
+
+    Args:
+        paths: Entries put in front of the worker's sys.path (e.g. the scanned repo
+            and the dependency root).
+        fallback_paths: Entries appended to the worker's sys.path, so installed
+            packages take precedence over them.
+        python: Interpreter for the worker; defaults to $ADK_RESOLVER_PYTHON or the
+            current one.
+        cache: Persistent cache; the default one is opened when omitted.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str] = (),
+        python: Optional[str] = None,
+        cache: Optional[ResolutionCache] = None,
+        fallback_paths: Sequence[str] = (),
+    ):
+        self.paths = [str(p) for p in paths]
+        self.fallback_paths = [str(p) for p in fallback_paths]
+        self.python = python or RESOLVER_PYTHON
+        self._cache = cache
+        self._owns_cache = cache is None
+        self._env: Optional[str] = None
+        self._memo: Dict[str, Optional[Resolution]] = {}
+        self._proc: Optional[subprocess.Popen] = None
+        self._unavailable = False
+        self._hung_modules: Set[str] = set()
+        self.stats = {
+            "memo_hits": 0,
+            "cache_hits": 0,
+            "resolved": 0,
+            "worker_starts": 0,
+            "hung_skipped": 0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def resolve(self, fqn: str) -> Optional[Resolution]:
+        return self.resolve_many([fqn])[fqn]
+
+    def resolve_many(self, fqns: Iterable[str]) -> Dict[str, Optional[Resolution]]:
+        """Resolves each FQN; None means it could not be imported."""
+        fqns = list(dict.fromkeys(fqns))
+        pending = [f for f in fqns if f not in self._memo]
+        self.stats["memo_hits"] += len(fqns) - len(pending)
+        if pending and not self._unavailable:
+            self._resolve_pending(pending)
+        return {f: self._memo.get(f) for f in fqns}
+
+    def _resolve_pending(self, pending: List[str]):
+        if self._env is None:
+            try:
+                self._env = environment_hash(
+                    self.python, self.paths, self.fallback_paths
+                )
+            except (OSError, ValueError, subprocess.SubprocessError) as e:
+                logger.warning(f"Runtime resolver unavailable ({self.python}): {e}")
+                self._unavailable = True
+                return
+            if self._owns_cache:
+                # Without a writable default cache, results are only memoized.
+                self._cache = open_default(ResolutionCache)
+
+        if self._cache:
+            cached = self._cache.lookup_resolutions(self._env, pending)
+            self._memo.update(cached)
+            self.stats["cache_hits"] += len(cached)
+            pending = [f for f in pending if f not in cached]
+
+        for start in range(0, len(pending), RESOLVE_BATCH_SIZE):
+            batch = pending[start : start + RESOLVE_BATCH_SIZE]
+            results = {f: None for f in batch if self._under_hung_import(f)}
+            batch = [f for f in batch if f not in results]
+            try:
+                if batch:
+                    results.update(self._request(batch))
+            except _WorkerFailed as e:
+                self._hung_modules.update(e.hung_modules)
+                # One of them crashed or hung the worker: retry them one by one. Names
+                # under an import that hung fail without a worker; crashes are only
+                # memoized (not persisted).
+                for fqn in batch:
+                    if self._under_hung_import(fqn):
+                        results[fqn] = None
+                        continue
+                    try:
+                        results.update(self._request([fqn]))
+                    except _WorkerFailed as e:
+                        logger.debug(f"Runtime resolver failed on {fqn}: {e}")
+                        self._hung_modules.update(e.hung_modules)
+                        if e.hung_modules:
+                            results[fqn] = None
+                        else:
+                            self._memo[fqn] = None
+            self._memo.update(results)
+            self.stats["resolved"] += len(results)
+            if self._cache and results:
+                self._cache.store_resolutions(self._env, results)
+
+    def _under_hung_import(self, fqn: str) -> bool:
+        """Whether resolving `fqn` imports a module that hung an earlier worker."""
+        parts = fqn.split(".")
+        for i in range(1, len(parts) + 1):
+            if ".".join(parts[:i]) in self._hung_modules:
+                self.stats["hung_skipped"] += 1
+                return True
+        return False
+
+    def _start_worker(self):
+        self._proc = subprocess.Popen(
+            [
+                self.python,
+                "-I",
+                str(_WORKER_SCRIPT),
+                json.dumps(self.paths),
+                str(RESOLVE_TIMEOUT_SECONDS),
+                json.dumps(self.fallback_paths),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+        self.stats["worker_starts"] += 1
+
+    def _stop_worker(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def _request(self, fqns: List[str]) -> Dict[str, Optional[Resolution]]:
+        if self._proc is None or self._proc.poll() is not None:
+            self._start_worker()
+        proc = self._proc
+        try:
+            proc.stdin.write(json.dumps(fqns) + "\n")
+            proc.stdin.flush()
+            # The worker reports its own timeout; this covers imports holding the GIL.
+            deadline = (
+                time.monotonic() + RESOLVE_TIMEOUT_SECONDS + _TIMEOUT_GRACE_SECONDS
+            )
+            # The worker writes whole lines, so once readable, readline() returns.
+            while not select.select([proc.stdout], [], [], 1.0)[0]:
+                if time.monotonic() > deadline:
+                    raise _WorkerFailed("timed out")
+            line = proc.stdout.readline()
+            if not line:
+                raise _WorkerFailed(f"exited with {proc.wait()}")
+            answers = json.loads(line)
+            if isinstance(answers, dict):
+                raise _WorkerFailed("timed out", answers.get("hung", []))
+        except (OSError, ValueError, _WorkerFailed) as e:
+            self._stop_worker()
+            raise _WorkerFailed(str(e), getattr(e, "hung_modules", ())) from e
+        return {
+            fqn: Resolution(*answer) if answer else None
+            for fqn, answer in zip(fqns, answers)
+        }
+
+    def close(self):
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._stop_worker()
+        if self._owns_cache and self._cache:
+            self._cache.close()
+            self._cache = None
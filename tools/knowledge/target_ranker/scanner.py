@@ -4,6 +4,11 @@ AST-based repository scanner.
 This module provides the `scan_repository` function, which walks a Python codebase,
 parses files into ASTs, and extracts structural information (classes, methods,
 docstrings, complexity) into `TargetEntity` objects.
+
+Each file is scanned on its own into a `FileScan` (in a process pool for large
+trees), and the results are merged in walk order, so the output is the same as a
+serial scan. File scans are cached by content digest and scanner version, so files
+that did not change between two ADK versions are not parsed again.
 """
 
 # Copyright 2025 Google LLC
@@ -23,16 +28,76 @@ docstrings, complexity) into `TargetEntity` objects.
 """Tools for the Agentic Benchmark Generator agents."""
 
 import ast
+import hashlib
 import os
 import sys
 import yaml
 import json
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Set, Tuple
 from collections import defaultdict
 
 from benchmarks.generator.benchmark_generator.models import TargetEntity, TargetType
+from core.json_store import JsonStore, default_store_path, store_or_default
+from core.parallel import map_in_batches
+from tools.knowledge.target_ranker.runtime_resolver import RuntimeResolver
+
+# Bump when the scan output changes in a way the source digest below cannot see.
+SCANNER_VERSION = 1
+# Cached scans are only reused by the same scanner code on the same Python minor
+# version (`ast.unparse` output differs between versions).
+_SCANNER_FINGERPRINT = "{}:{}:py{}.{}".format(
+    SCANNER_VERSION,
+    hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16],
+    *sys.version_info[:2],
+)
+
+SCAN_WORKERS = int(os.environ.get("ADK_SCAN_WORKERS", min(8, os.cpu_count() or 4)))
+# Files to parse per worker process (see `core.parallel.map_in_batches`).
+PARALLEL_SCAN_MIN_FILES = 64
+
+
+class FileScan(NamedTuple):
+    """What one file contributes to a scan, independent of every other file."""
+
+    # Final structure_map entries, in order of first assignment.
+    structure: Dict[str, Dict[str, Any]]
+    # Every structure_map assignment as (fqn, type), in order.
+    assignments: List[Tuple[str, str]]
+    # `__init__` re-exports as (assignments made before it, alias_fqn, canonical_fqn);
+    # whether they become aliases depends on what earlier files defined.
+    alias_candidates: List[Tuple[int, str, str]]
+    # TargetEntity fields, without usage_score (applied when merging).
+    entities: List[Dict[str, Any]]
+
+
+class FileScanCache(JsonStore):
+    """Persistent map of (content digest, file path, module FQN) to a `FileScan`."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__(
+            db_path or default_store_path("ADK_SCAN_CACHE", "scan_cache.db"),
+            "file_scans",
+            version=_SCANNER_FINGERPRINT,
+        )
+
+    @staticmethod
+    def key(digest: str, file_path: str, module_fqn: str) -> str:
+        return json.dumps([digest, file_path, module_fqn])
+
+    def lookup_scans(self, keys: Sequence[str]) -> Dict[str, FileScan]:
+        scans = {}
+        for key, value in self.lookup(keys).items():
+            structure, assignments, alias_candidates, entities = value
+            scans[key] = FileScan(
+                structure,
+                [tuple(a) for a in assignments],
+                [tuple(c) for c in alias_candidates],
+                entities,
+            )
+        return scans
+
 
 # --- Scanner (Cartographer) Logic ---
 
@@ -44,6 +109,8 @@ def scan_repository(
     root_namespace_prefix: Optional[str] = None,
     usage_stats: Optional[Dict] = None,
     cooccurrence: Optional[Dict] = None,
+    cache: Optional[FileScanCache] = None,
+    resolver: Optional[RuntimeResolver] = None,
 ) -> Dict[str, Any]:
     """
     Scans the repository to build a hierarchical map of entities.
@@ -53,6 +120,11 @@ def scan_repository(
     Features:
     - Resolves type hints to Fully Qualified Names (FQNs) via import analysis.
     - Handles string forward references and local class definitions.
+    - Reuses cached scans of unchanged files (`cache`, default: the persistent
+      cache at $ADK_SCAN_CACHE or OUTPUT_ROOT/scan_cache.db) and parses the rest
+      in parallel.
+    - Corrects usage scores of re-exported entities by resolving names at runtime
+      (`resolver`, default: one with the repository on its path), in a subprocess.
 
     Returns:
         Dict containing:
@@ -134,70 +206,51 @@ def scan_repository(
                 all_python_files.append(Path(root) / file)
 
     # Hierarchical Definition Pass
+    sources = []
     for full_path in all_python_files:
-        _scan_file_single(
-            full_path,
-            root_dir,
-            root_namespace_prefix,
-            namespace,
-            usage_stats,
-            structure_map,
-            entities,
-            alias_map,
-        )
+        identity = _module_identity(full_path, root_dir, root_namespace_prefix, namespace)
+        if identity is None:
+            continue
+        try:
+            sources.append((identity, full_path.read_bytes()))
+        except Exception:
+            pass
+    for scan in _scan_sources(sources, cache):
+        _merge_file_scan(scan, usage_stats, structure_map, entities, alias_map)
 
     # --- Post-Scan Usage Correction (Runtime Identity) ---
-    # Resolve aliases by checking if objects are identical in memory.
+    # Resolve aliases by checking if names resolve to the same object at runtime.
 
     print("[DEBUG] Building Runtime Usage Map...")
-    runtime_usage_map = {}  # {id(obj): count}
-
-    # Pre-load usage stats into memory map
-    sys.path.insert(0, str(root_dir))  # Ensure we can import
-    for fqn, stats in usage_stats.items():
-        try:
-            # Import module and get object
-            parts = fqn.split(".")
-            module_name = ".".join(parts[:-1])
-            obj_name = parts[-1]
-            module = __import__(module_name, fromlist=[obj_name])
-            obj = getattr(module, obj_name)
-            obj_id = id(obj)
-            current_count = runtime_usage_map.get(obj_id, 0)
-            runtime_usage_map[obj_id] = current_count + stats.get("total_calls", 0)
-        except Exception:
-            pass  # Ignore import errors for stats keys
-
-    # Fix Entities
-    print(f"[DEBUG] Correcting {len(entities)} entities using runtime identity...")
-    for entity in entities:
-        if entity.usage_score == 0:
-            try:
-                # Import entity
-                parts = entity.id.split(".")
-                # Handle module vs class/func
-                if entity.type == TargetType.MODULE:
-                    obj = __import__(entity.id, fromlist=["*"])
-                else:
-                    module_name = ".".join(parts[:-1])
-                    obj_name = parts[-1]
-                    module = __import__(module_name, fromlist=[obj_name])
-                    obj = getattr(module, obj_name)
-
-                # Check identity
-                if id(obj) in runtime_usage_map:
-                    calls = runtime_usage_map[id(obj)]
-                    if calls > 0:
-                        print(
-                            f"[DEBUG] Correcting usage for {entity.id}: 0 -> {calls} (Runtime Identity Match)"
-                        )
-                        entity.usage_score = calls
-            except Exception:
-                pass  # Fail silently if we can't import/find (e.g. syntax errors in file)
+    runtime_usage_map = defaultdict(int)  # {canonical_fqn: count}
 
-    # Remove from sys.path to be clean
-    if str(root_dir) in sys.path:
-        sys.path.remove(str(root_dir))
+    owns_resolver = resolver is None
+    if owns_resolver:
+        resolver = RuntimeResolver([str(root_dir)])
+    try:
+        resolved_stats = resolver.resolve_many(usage_stats)
+        for fqn, stats in usage_stats.items():
+            resolution = resolved_stats[fqn]
+            if resolution:
+                runtime_usage_map[resolution.canonical_fqn] += stats.get("total_calls", 0)
+
+        # Fix Entities
+        print(f"[DEBUG] Correcting {len(entities)} entities using runtime identity...")
+        unscored = [entity for entity in entities if entity.usage_score == 0]
+        if not any(calls > 0 for calls in runtime_usage_map.values()):
+            unscored = []  # Nothing to match against.
+        resolved_entities = resolver.resolve_many(e.id for e in unscored)
+        for entity in unscored:
+            resolution = resolved_entities[entity.id]
+            calls = runtime_usage_map.get(resolution.canonical_fqn, 0) if resolution else 0
+            if calls > 0:
+                print(
+                    f"[DEBUG] Correcting usage for {entity.id}: 0 -> {calls} (Runtime Identity Match)"
+                )
+                entity.usage_score = calls
+    finally:
+        if owns_resolver:
+            resolver.close()
 
     # tool_context assignments removed
     
@@ -220,6 +273,28 @@ def _scan_file_single(
     entities: List[TargetEntity],
     alias_map: Dict[str, str],
 ):
+    """Scans one file and merges it into the given maps."""
+    identity = _module_identity(full_path, root_dir, root_namespace_prefix, namespace)
+    if identity is None:
+        return
+    try:
+        source = full_path.read_bytes()
+    except Exception:
+        return
+    scan = _scan_source(source, *identity)
+    _merge_file_scan(scan, usage_stats, structure_map, entities, alias_map)
+
+
+def _module_identity(
+    full_path: Path,
+    root_dir: Path,
+    root_namespace_prefix: Optional[str],
+    namespace: Optional[str],
+) -> Optional[Tuple[str, str, str]]:
+    """
+    Returns (relative file path, module name, module FQN) for a file, or None if the
+    module is outside `namespace` or private.
+    """
     try:
         if full_path.is_absolute():
             # Try to make it relative to root_dir if possible, else just use name
@@ -258,48 +333,150 @@ def _scan_file_single(
                 module_fqn = root_namespace_prefix
 
         if namespace and not module_fqn.startswith(namespace):
-            return
+            return None
 
         # Public API Filter: Skip modules with private components
         if any(part.startswith("_") for part in module_fqn.split(".")):
-            return
+            return None
+
+        module_name = module_parts[-1] if module_parts else "root"
+        return str(relative_path), module_name, module_fqn
+    except Exception:
+        return None
 
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
+
+class _RecordingStructureMap(dict):
+    """A structure map that logs every assignment, for replaying alias checks."""
+
+    def __init__(self):
+        super().__init__()
+        self.assignments: List[Tuple[str, str]] = []
+
+    def __setitem__(self, key, value):
+        self.assignments.append((key, value["type"]))
+        super().__setitem__(key, value)
+
+
+def _scan_source(
+    source: bytes, file_path: str, module_name: str, module_fqn: str
+) -> FileScan:
+    """
+    Scans one file's source. Depends on nothing but its arguments, so it can run in a
+    worker process and its result can be cached.
+    """
+    structure_map = _RecordingStructureMap()
+    alias_candidates: List[Tuple[int, str, str]] = []
+    entities: List[Dict[str, Any]] = []
+    try:
+        # Same text as open(..., encoding="utf-8").read(), with universal newlines.
+        content = source.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
         tree = ast.parse(content)
 
         # Record Module in Structure Map
         structure_map[module_fqn] = {
             "type": "Module",
-            "name": module_parts[-1] if module_parts else "root",
+            "name": module_name,
             "children": [],
             "params": {},
             "props": [],
         }
 
         # Module Entity
-        mod_stats = usage_stats.get(module_fqn, {})
         entities.append(
-            TargetEntity(
+            dict(
                 id=module_fqn,
                 type=TargetType.MODULE,
-                name=module_parts[-1] if module_parts else "root",
-                file_path=str(relative_path),
-                usage_score=mod_stats.get("total_calls", 0),
+                name=module_name,
+                file_path=file_path,
                 docstring=ast.get_docstring(tree),
             )
         )
 
-        visitor = EntityVisitor(module_fqn, str(relative_path), structure_map, entities, usage_stats, alias_map)
+        visitor = EntityVisitor(module_fqn, file_path, structure_map, entities, alias_candidates)
         visitor.collect_metadata(tree)
         visitor.visit(tree)
     except Exception as e:
-        # logging.warning(f"Failed to scan {full_path}: {e}")
+        # logging.warning(f"Failed to scan {file_path}: {e}")
         pass
+    return FileScan(
+        dict(structure_map), structure_map.assignments, alias_candidates, entities
+    )
+
+
+def _scan_source_batch(jobs: List[Tuple[bytes, str, str, str]]) -> List[FileScan]:
+    return [_scan_source(*job) for job in jobs]
+
+
+def _scan_sources(
+    sources: List[Tuple[Tuple[str, str, str], bytes]],
+    cache: Optional[FileScanCache] = None,
+) -> List[FileScan]:
+    """
+    Scans (identity, source) pairs, in order. Cached scans are reused; the rest are
+    parsed in a process pool when there are enough of them, then cached.
+    """
+    with store_or_default(cache, FileScanCache) as cache:
+        keys = [
+            FileScanCache.key(hashlib.sha256(source).hexdigest(), file_path, module_fqn)
+            for (file_path, _, module_fqn), source in sources
+        ]
+        known = cache.lookup_scans(keys) if cache else {}
+        scans: List[Optional[FileScan]] = [known.get(key) for key in keys]
+        misses = [i for i, scan in enumerate(scans) if scan is None]
+
+        jobs = [(sources[i][1], *sources[i][0]) for i in misses]
+        fresh = map_in_batches(
+            _scan_source_batch, jobs, SCAN_WORKERS, PARALLEL_SCAN_MIN_FILES
+        )
+        for i, scan in zip(misses, fresh):
+            scans[i] = scan
+        if cache and misses:
+            cache.store((keys[i], scans[i]) for i in misses)
+    return scans
+
+
+def _merge_file_scan(
+    scan: FileScan,
+    usage_stats: Dict[str, Any],
+    structure_map: Dict[str, Any],
+    entities: List[TargetEntity],
+    alias_map: Dict[str, str],
+):
+    """Merges a file scan into the maps as if the file had been scanned into them."""
+    if scan.alias_candidates:
+        # Types assigned by this file so far; everything else comes from earlier files.
+        written: Dict[str, str] = {}
+        replayed = 0
+
+        def type_of(fqn):
+            if fqn in written:
+                return written[fqn]
+            if fqn in structure_map:
+                return structure_map[fqn]["type"]
+            return None
+
+        for position, alias_fqn, canonical_fqn in scan.alias_candidates:
+            for fqn, kind in scan.assignments[replayed:position]:
+                written[fqn] = kind
+            replayed = position
+            canonical_type = type_of(canonical_fqn)
+            if (
+                canonical_type is not None
+                and canonical_type != "Module"
+                and type_of(alias_fqn) != "Module"
+            ):
+                alias_map[alias_fqn] = canonical_fqn
+
+    structure_map.update(scan.structure)
+    for fields in scan.entities:
+        stats = usage_stats.get(fields["id"], {})
+        entities.append(
+            TargetEntity(**fields, usage_score=stats.get("total_calls", 0))
+        )
 
 class EntityVisitor(ast.NodeVisitor):
 
-    def __init__(self, mod_fqn, f_path, structure_map, entities, usage_stats, alias_map):
+    def __init__(self, mod_fqn, f_path, structure_map, entities, alias_candidates):
         self.current_class_fqn = None
         self.in_function = False
         self.mod_fqn = mod_fqn
@@ -310,8 +487,7 @@ class EntityVisitor(ast.NodeVisitor):
         
         self.structure_map = structure_map
         self.entities = entities
-        self.usage_stats = usage_stats
-        self.alias_map = alias_map
+        self.alias_candidates = alias_candidates
 
     def collect_metadata(self, node):
         """Pre-scans top-level nodes for __all__ and locally defined names."""
@@ -400,12 +576,11 @@ class EntityVisitor(ast.NodeVisitor):
                 alias_fqn = f"{self.mod_fqn}.{alias_name}"
                 canonical_fqn = f"{canonical_mod}.{alias.name}"
                 
-                if (
-                    canonical_fqn in self.structure_map
-                    and self.structure_map[canonical_fqn]["type"] != "Module"
-                    and (alias_fqn not in self.structure_map or self.structure_map[alias_fqn]["type"] != "Module")
-                ):
-                    self.alias_map[alias_fqn] = canonical_fqn
+                # Recorded as an alias when merging, if canonical_fqn is then a
+                # non-Module entry and alias_fqn is not a Module.
+                self.alias_candidates.append(
+                    (len(self.structure_map.assignments), alias_fqn, canonical_fqn)
+                )
 
         self.generic_visit(node)
 
@@ -504,14 +679,12 @@ class EntityVisitor(ast.NodeVisitor):
         self.structure_map[self.mod_fqn]["children"].append(class_fqn)
 
         # Entity
-        cls_stats = self.usage_stats.get(class_fqn, {})
         self.entities.append(
-            TargetEntity(
+            dict(
                 id=class_fqn,
                 type=TargetType.CLASS,
                 name=node.name,
                 file_path=self.f_path,
-                usage_score=cls_stats.get("total_calls", 0),
                 docstring=ast.get_docstring(node),
                 parent_id=self.mod_fqn,
             )
@@ -643,14 +816,12 @@ class EntityVisitor(ast.NodeVisitor):
                 self.structure_map[parent_fqn]["children"].append(func_fqn)
 
             if node.end_lineno - node.lineno >= 3:
-                func_stats = self.usage_stats.get(func_fqn, {})
                 self.entities.append(
-                    TargetEntity(
+                    dict(
                         id=func_fqn,
                         type=TargetType.METHOD,
                         name=node.name,
                         file_path=self.f_path,
-                        usage_score=func_stats.get("total_calls", 0),
                         docstring=doc,
                         parent_id=parent_fqn,
                         signature=f"def {node.name}(...):",
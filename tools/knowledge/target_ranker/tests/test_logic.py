@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import MagicMock
-from tools.knowledge.target_ranker.ranker import TargetRanker
+from tools.knowledge.target_ranker.ranker import TargetRanker, _build_suffix_index
 
 
 class TestTargetRankerLogic:
@@ -153,3 +153,39 @@ class TestTargetRankerLogic:
             "pkg.Child", structure_map, entity_map, adk_inheritance
         )
         assert result is None
+
+    def test_suffix_index_matches_endswith(self):
+        """Suffix lookups should equal an endswith scan over all classes, in order."""
+        class_fqns = [
+            "pkg.agents.Agent",
+            "pkg.Agent",
+            "other.agents.Agent",
+            "pkg.agents.LlmAgent",
+            "pkg.agents.base.Agent",
+        ]
+        index = _build_suffix_index(class_fqns)
+
+        for base in ["Agent", "agents.Agent", "pkg.Agent", "LlmAgent", "gent", ""]:
+            expected = [k for k in class_fqns if k.endswith(f".{base}")]
+            assert index.get(base, []) == expected
+
+    def test_class_hierarchy_is_bfs_order(self, ranker):
+        """Ancestors come in BFS order; classes outside the structure map are not expanded."""
+        structure_map = {
+            "pkg.C": {"type": "Class"},
+            "pkg.A": {"type": "Class"},
+            "pkg.B": {"type": "Class"},
+        }
+        adk_inheritance = {
+            "pkg.C": ["pkg.A", "pkg.B"],
+            "pkg.A": ["pkg.B", "ext.Base"],
+            "pkg.B": ["pkg.C"],
+            "ext.Base": ["ext.Root"],
+        }
+
+        assert ranker._class_hierarchy("pkg.C", structure_map, adk_inheritance) == [
+            "pkg.C",
+            "pkg.A",
+            "pkg.B",
+            "ext.Base",
+        ]
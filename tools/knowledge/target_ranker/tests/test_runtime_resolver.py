@@ -0,0 +1,134 @@
+"""Test Runtime Resolver module."""
+
+import sys
+
+import pytest
+
+from tools.knowledge.target_ranker import runtime_resolver
+from tools.knowledge.target_ranker.runtime_resolver import (
+    ResolutionCache,
+    RuntimeResolver,
+)
+from tools.knowledge.target_ranker.scanner import FileScanCache, scan_repository
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "src"
+    pkg = root / "resolverpkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("from .models import Model\n")
+    (pkg / "models.py").write_text(
+        "print('noisy import')\n"
+        "class Model:\n"
+        "    def run(self):\n"
+        "        x = 1\n"
+        "        y = 2\n"
+        "        return x + y\n"
+        "LIMIT = 3\n"
+    )
+    (pkg / "broken.py").write_text("import sys\nsys.exit(1)\n")
+    return root
+
+
+def test_resolves_in_a_subprocess(root, tmp_path):
+    with RuntimeResolver([root], cache=ResolutionCache(tmp_path / "r.db")) as resolver:
+        results = resolver.resolve_many(
+            [
+                "resolverpkg.Model",
+                "resolverpkg.models.Model.run",
+                "resolverpkg.models",
+                "resolverpkg.models.LIMIT",
+                "resolverpkg.broken.thing",
+                "resolverpkg.Missing",
+            ]
+        )
+
+    model_file = str(root / "resolverpkg" / "models.py")
+    assert results["resolverpkg.Model"] == (
+        model_file,
+        "resolverpkg.models.Model",
+        "class",
+    )
+    assert results["resolverpkg.models.Model.run"] == (
+        model_file,
+        "resolverpkg.models.Model.run",
+        "function",
+    )
+    assert results["resolverpkg.models"].kind == "module"
+    assert results["resolverpkg.models.LIMIT"].kind == "object"
+    assert results["resolverpkg.broken.thing"] is None
+    assert results["resolverpkg.Missing"] is None
+    assert "resolverpkg" not in sys.modules
+
+
+def test_results_are_persisted_per_environment(root, tmp_path):
+    cache_path = tmp_path / "r.db"
+    with RuntimeResolver([root], cache=ResolutionCache(cache_path)) as resolver:
+        first = resolver.resolve_many(["resolverpkg.Model", "resolverpkg.Missing"])
+
+    with RuntimeResolver([root], cache=ResolutionCache(cache_path)) as resolver:
+        assert resolver.resolve_many(first) == first
+        assert resolver.stats["cache_hits"] == 2
+        assert resolver.stats["worker_starts"] == 0
+
+    # Changing a source on the path changes the environment hash.
+    (root / "resolverpkg" / "extra.py").write_text("Missing = 1\n")
+    (root / "resolverpkg" / "__init__.py").write_text(
+        "from .models import Model\nfrom .extra import Missing\n"
+    )
+    with RuntimeResolver([root], cache=ResolutionCache(cache_path)) as resolver:
+        assert resolver.resolve("resolverpkg.Missing").kind == "object"
+        assert resolver.stats["worker_starts"] == 1
+
+
+def test_scan_corrects_usage_of_reexported_names(root, tmp_path):
+    with RuntimeResolver([root], cache=ResolutionCache(tmp_path / "r.db")) as resolver:
+        result = scan_repository(
+            str(root),
+            usage_stats={"resolverpkg.Model": {"total_calls": 4}},
+            cache=FileScanCache(tmp_path / "scan.db"),
+            resolver=resolver,
+        )
+
+    scores = {t["id"]: t["usage_score"] for t in result["scanned_targets"]}
+    assert scores["resolverpkg.models.Model"] == 4
+    assert scores["resolverpkg.models.Model.run"] == 0
+
+
+def test_names_under_a_hung_import_fail_without_new_workers(
+    root, tmp_path, monkeypatch
+):
+    slow = root / "slowpkg"
+    slow.mkdir()
+    (slow / "__init__.py").write_text("from . import hangs\n")
+    (slow / "hangs.py").write_text("import time\ntime.sleep(60)\n")
+    monkeypatch.setattr(runtime_resolver, "RESOLVE_TIMEOUT_SECONDS", 1)
+    names = [f"slowpkg.hangs.name{i}" for i in range(5)] + ["slowpkg.Other"]
+    cache_path = tmp_path / "r.db"
+
+    with RuntimeResolver([root], cache=ResolutionCache(cache_path)) as resolver:
+        results = resolver.resolve_many(names + ["resolverpkg.Model"])
+        assert all(results[name] is None for name in names)
+        assert results["resolverpkg.Model"].kind == "class"
+        # Only the batch hangs; its retries under the hung imports need no worker.
+        assert resolver.stats["worker_starts"] == 2
+        assert resolver.stats["hung_skipped"] == len(names)
+
+    with RuntimeResolver([root], cache=ResolutionCache(cache_path)) as resolver:
+        assert resolver.resolve_many(names) == dict.fromkeys(names)
+        assert resolver.stats["worker_starts"] == 0
+
+
+def test_fallback_paths_do_not_shadow_installed_modules(tmp_path):
+    shadow = tmp_path / "shadow"
+    (shadow / "csv").mkdir(parents=True)
+    (shadow / "csv" / "__init__.py").write_text("class DictReader:\n    pass\n")
+    (shadow / "onlyhere.py").write_text("VALUE = 1\n")
+    cache = ResolutionCache(tmp_path / "r.db")
+
+    with RuntimeResolver(fallback_paths=[shadow], cache=cache) as resolver:
+        assert "shadow" not in resolver.resolve("csv.DictReader").file_path
+        assert resolver.resolve("onlyhere.VALUE").kind == "object"
+    with RuntimeResolver([shadow], cache=cache) as resolver:
+        assert "shadow" in resolver.resolve("csv.DictReader").file_path
@@ -0,0 +1,78 @@
+"""Test Scan Cache module."""
+
+import pytest
+
+from tools.knowledge.target_ranker import scanner
+from tools.knowledge.target_ranker.scanner import FileScanCache, scan_repository
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo_dir = tmp_path / "repo"
+    scanpkg = repo_dir / "scanpkg"
+    (scanpkg / "sub").mkdir(parents=True)
+    (scanpkg / "__init__.py").write_text(
+        "from .models import Model, helper\nfrom . import sub\n__all__ = ['Model', 'sub']\n"
+    )
+    (scanpkg / "models.py").write_text(
+        "class Model:\n"
+        "    name: str = 'x'\n"
+        "    def run(self, x: int) -> str:\n"
+        "        '''Runs.'''\n"
+        "        y = x\n"
+        "        return str(y)\n"
+        "def helper():\n    pass\n"
+    )
+    (scanpkg / "sub" / "__init__.py").write_text("from scanpkg.models import Model\n")
+    for i in range(5):
+        (scanpkg / f"extra_{i}.py").write_text(
+            f"class Extra{i}(object):\n    value = {i}\n"
+        )
+    return repo_dir
+
+
+def _scan(repo, cache, usage_stats=None):
+    return scan_repository(
+        str(repo), namespace="scanpkg", usage_stats=usage_stats or {}, cache=cache
+    )
+
+
+def test_parallel_scan_matches_serial_scan(repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "SCAN_WORKERS", 1)
+    serial = _scan(repo, FileScanCache(tmp_path / "serial.db"))
+
+    monkeypatch.setattr(scanner, "SCAN_WORKERS", 2)
+    monkeypatch.setattr(scanner, "PARALLEL_SCAN_MIN_FILES", 1)
+    parallel = _scan(repo, FileScanCache(tmp_path / "parallel.db"))
+
+    assert repr(parallel) == repr(serial)
+    # Re-exports resolve against modules scanned earlier, as in a serial scan.
+    assert serial["alias_map"]["scanpkg.sub.Model"] == "scanpkg.models.Model"
+
+
+def test_unchanged_files_are_not_parsed_again(repo, tmp_path, monkeypatch):
+    cache = FileScanCache(tmp_path / "scan.db")
+    first = _scan(repo, cache)
+
+    parsed = []
+    scan_source = scanner._scan_source
+
+    def counting_scan_source(source, file_path, *args):
+        parsed.append(file_path)
+        return scan_source(source, file_path, *args)
+
+    monkeypatch.setattr(scanner, "_scan_source", counting_scan_source)
+    assert repr(_scan(repo, cache)) == repr(first)
+    assert parsed == []
+
+    (repo / "scanpkg" / "extra_0.py").write_text("class Renamed:\n    pass\n")
+    changed = _scan(
+        repo, cache, usage_stats={"scanpkg.models.Model": {"total_calls": 4}}
+    )
+    assert parsed == ["scanpkg/extra_0.py"]
+    assert "scanpkg.extra_0.Renamed" in changed["structure_map"]
+    # Usage scores are applied to cached scans too.
+    model = next(
+        t for t in changed["scanned_targets"] if t["id"] == "scanpkg.models.Model"
+    )
+    assert model["usage_score"] == 4
@@ -0,0 +1,107 @@
+"""Test Build Vector Index module."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+import yaml
+
+from tools.knowledge import build_vector_index
+from tools.knowledge.build_vector_index import (
+    EmbeddingCache,
+    FakeEmbedder,
+    _target_text,
+    build_index,
+)
+
+
+class CountingEmbedder(FakeEmbedder):
+    def __init__(self, fail_on=None):
+        super().__init__(dimension=8)
+        self.embedded = []
+        self.fail_on = fail_on
+
+    async def embed(self, texts):
+        if self.fail_on and any(self.fail_on in t for t in texts):
+            raise RuntimeError("quota exceeded")
+        self.embedded.extend(texts)
+        return await super().embed(texts)
+
+
+def _write_targets(path, docstrings):
+    targets = [
+        {"id": f"pkg.T{i}", "name": f"T{i}", "type": "CLASS", "rank": i, "docstring": d}
+        for i, d in enumerate(docstrings)
+    ]
+    path.write_text(yaml.safe_dump(targets))
+
+
+async def _build(input_file, embedder, cache_path):
+    cache = EmbeddingCache(cache_path)
+    try:
+        return await build_index(
+            input_file,
+            embedder=embedder,
+            cache=cache,
+            concurrency=3,
+            requests_per_minute=0,
+            batch_size=4,
+        )
+    finally:
+        cache.close()
+
+
+async def test_rebuild_only_embeds_changed_texts(tmp_path):
+    input_file = tmp_path / "ranked_targets.yaml"
+    _write_targets(input_file, [f"doc {i}" for i in range(10)])
+    first = await _build(input_file, CountingEmbedder(), tmp_path / "cache.db")
+    assert first == {"targets": 10, "reused": 0, "embedded": 10, "batches": 3}
+    vectors = np.load(tmp_path / "vectors.npy")
+    keys = yaml.safe_load((tmp_path / "vector_keys.yaml").read_text())
+    assert vectors.shape == (10, 8)
+    assert [k["id"] for k in keys] == [f"pkg.T{i}" for i in range(10)]
+    # Vectors are cached as raw float64 bytes.
+    conn = sqlite3.connect(tmp_path / "cache.db")
+    stored = conn.execute(
+        "SELECT DISTINCT typeof(value), length(value) FROM embeddings"
+    )
+    assert stored.fetchall() == [("blob", 8 * 8)]
+    conn.close()
+
+    _write_targets(input_file, [f"doc {i}" for i in range(9)] + ["changed"])
+    embedder = CountingEmbedder()
+    second = await _build(input_file, embedder, tmp_path / "cache.db")
+    assert second["reused"] == 9 and second["embedded"] == 1
+    assert embedder.embedded == [
+        _target_text(yaml.safe_load(input_file.read_text())[9])
+    ]
+    rebuilt = np.load(tmp_path / "vectors.npy")
+    np.testing.assert_array_equal(rebuilt[:9], vectors[:9])
+    assert not np.array_equal(rebuilt[9], vectors[9])
+    # Outputs are renamed into place; no temporary files are left behind.
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+
+async def test_failed_build_resumes_from_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(build_vector_index, "EMBED_MAX_ATTEMPTS", 1)
+    input_file = tmp_path / "ranked_targets.yaml"
+    _write_targets(input_file, [f"doc {i}" for i in range(10)])
+    (tmp_path / "vectors.npy").write_bytes(b"previous")
+
+    with pytest.raises(SystemExit):
+        await _build(input_file, CountingEmbedder(fail_on="doc 5"), tmp_path / "c.db")
+    # The previous artifacts are left untouched.
+    assert (tmp_path / "vectors.npy").read_bytes() == b"previous"
+
+    embedder = CountingEmbedder()
+    stats = await _build(input_file, embedder, tmp_path / "c.db")
+    # Only the failed batch (targets 4-7) is embedded again.
+    assert stats["reused"] == 6 and len(embedder.embedded) == 4
+    assert np.load(tmp_path / "vectors.npy").shape == (10, 8)
+
+
+async def test_fake_embedder_is_deterministic():
+    first = await FakeEmbedder().embed(["a", "b"])
+    assert first == await FakeEmbedder().embed(["a", "b"])
+    assert first[0] != first[1]
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
@@ -0,0 +1,82 @@
+"""Test Cooccurrence Graph module."""
+
+import random
+
+import yaml
+
+from tools.knowledge.cooccurrence_graph import (
+    CooccurrenceGraph,
+    load_cooccurrence_graph,
+)
+
+
+def _associations(seed=0, nodes=40, edges=400):
+    rng = random.Random(seed)
+    names = [f"google.adk.m{i}" for i in range(nodes)] + ["google.adk", "google"]
+    result = [
+        {
+            "context": rng.choice(names),
+            "target": rng.choice(names),
+            "probability": round(rng.random(), 3),
+            "support": rng.randint(2, 50),
+        }
+        for _ in range(edges)
+    ]
+    result.sort(key=lambda x: (x["probability"], x["support"]), reverse=True)
+    return result
+
+
+def test_lookups_match_a_linear_scan():
+    associations = _associations()
+    graph = CooccurrenceGraph(associations)
+
+    for name in ["google.adk.m3", "google.adk.m17", "google.adk.m3.Agent", "x"]:
+        for threshold in (0.0, 0.5):
+            exact = [
+                (a["context"], a["target"], a["probability"], a["support"])
+                for a in associations
+                if a["context"] == name and a["probability"] >= threshold
+            ]
+            prefix = [
+                (a["context"], a["target"], a["probability"], a["support"])
+                for a in associations
+                if name.startswith(a["context"]) and a["probability"] >= threshold
+            ]
+            assert graph.neighbors(name, threshold) == exact
+            assert graph.prefix_neighbors(name, threshold, limit=10) == prefix[:10]
+
+
+def test_top_k_and_multi_hop_expansion():
+    graph = CooccurrenceGraph(
+        [
+            {"context": "a", "target": "b", "probability": 0.5, "support": 5},
+            {"context": "a", "target": "c", "probability": 0.9, "support": 2},
+            {"context": "b", "target": "d", "probability": 0.8, "support": 3},
+            {"context": "c", "target": "d", "probability": 0.4, "support": 3},
+            {"context": "d", "target": "a", "probability": 1.0, "support": 3},
+        ],
+        top_k=1,
+    )
+
+    assert [a.target for a in graph.top("a")] == ["c"]
+    # Only the top-1 edge of each node is followed: a -> c -> d.
+    expansion = graph.expand("a", hops=3)
+    assert [(x.target, x.hops, x.via) for x in expansion] == [
+        ("c", 1, None),
+        ("d", 2, "c"),
+    ]
+    assert round(expansion[1].probability, 2) == 0.36
+
+
+def test_loaded_graph_is_shared_until_the_file_changes(tmp_path):
+    path = tmp_path / "adk_cooccurrence.yaml"
+    path.write_text(yaml.safe_dump({"associations": _associations(edges=10)}))
+
+    first = load_cooccurrence_graph(path)
+    assert load_cooccurrence_graph(path) is first
+
+    path.write_text(yaml.safe_dump({"associations": _associations(edges=20)}))
+    second = load_cooccurrence_graph(path)
+    assert second is not first
+    assert second.edge_count == 20
+    assert load_cooccurrence_graph(tmp_path / "missing.yaml") is None
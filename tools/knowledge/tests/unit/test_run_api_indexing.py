@@ -0,0 +1,133 @@
+"""Test Run Api Indexing module."""
+
+import subprocess
+
+from tools.knowledge import run_api_indexing
+from tools.knowledge.run_api_indexing import build_usage_index, index_sources
+
+AGENT_FILE = (
+    "from google.adk.agents import Agent\n"
+    "Agent(name='a', tools=[])\n"
+    "Agent(name='b')\n"
+)
+RUNNER_FILE = (
+    "from google.adk import runners\n"
+    "runners.Runner(agent=None)\n"
+    "runners.Runner(agent=None, app_name='x')\n"
+)
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _make_repo(path, files):
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _commit(path, files)
+    return path
+
+
+def _commit(repo, files):
+    for name, content in files.items():
+        (repo / name).parent.mkdir(parents=True, exist_ok=True)
+        (repo / name).write_text(content)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "update")
+
+
+def _count_scans(monkeypatch):
+    scanned = []
+    usage_batch = run_api_indexing._usage_batch
+
+    def counting_usage_batch(files):
+        scanned.extend(name for name, _ in files)
+        return usage_batch(files)
+
+    monkeypatch.setattr(run_api_indexing, "_usage_batch", counting_usage_batch)
+    return scanned
+
+
+def test_partials_are_reused_per_commit(tmp_path, monkeypatch):
+    agents = _make_repo(tmp_path / "agents", {"app/agent.py": AGENT_FILE})
+    samples = _make_repo(
+        tmp_path / "samples",
+        {"python/run.py": RUNNER_FILE, "docs/conf.py": AGENT_FILE},
+    )
+    sources = [
+        {"url": str(agents)},
+        {"url": str(samples), "include_paths": ["python"]},
+    ]
+    cache = tmp_path / "cache"
+    scanned = _count_scans(monkeypatch)
+
+    index = build_usage_index(index_sources(sources, cache, parse_workers=1))
+    assert index["google.adk.agents.Agent"] == {
+        "total_calls": 2,
+        "args": {"name": {"freq": 1.0, "count": 2}, "tools": {"freq": 0.5, "count": 1}},
+    }
+    assert index["google.adk.runners.Runner"]["total_calls"] == 2
+    assert sorted(scanned) == ["app/agent.py", "python/run.py"]
+
+    # Adding a source only scans that source.
+    scanned.clear()
+    extra = _make_repo(tmp_path / "extra", {"main.py": AGENT_FILE})
+    sources.append({"url": str(extra)})
+    index = build_usage_index(index_sources(sources, cache, parse_workers=1))
+    assert scanned == ["main.py"]
+    assert index["google.adk.agents.Agent"]["total_calls"] == 4
+
+    # A new commit is scanned again; so is a local path with uncommitted changes.
+    scanned.clear()
+    _commit(agents, {"app/agent.py": AGENT_FILE + "Agent(name='c')\n"})
+    local = _make_repo(tmp_path / "local", {"tool.py": RUNNER_FILE})
+    sources.append({"local_path": str(local)})
+    index = build_usage_index(index_sources(sources, cache, parse_workers=1))
+    assert sorted(scanned) == [str(local / "tool.py"), "app/agent.py"]
+    assert index["google.adk.agents.Agent"]["total_calls"] == 5
+
+    scanned.clear()
+    index_sources(sources, cache, parse_workers=1)
+    assert scanned == []
+    (local / "tool.py").write_text(RUNNER_FILE + "runners.Runner()\n")
+    index = build_usage_index(index_sources(sources, cache, parse_workers=1))
+    assert scanned == [str(local / "tool.py")]
+    assert index["google.adk.runners.Runner"]["total_calls"] == 5
+
+
+def test_process_pool_matches_inline_parsing(tmp_path, monkeypatch):
+    files = {f"m{i}.py": (AGENT_FILE, RUNNER_FILE)[i % 2] for i in range(12)}
+    files["broken.py"] = "def (:\n"
+    repo = _make_repo(tmp_path / "repo", files)
+    sources = [{"url": str(repo)}]
+
+    inline = index_sources(sources, tmp_path / "a", parse_workers=1)
+    monkeypatch.setattr(run_api_indexing, "PARALLEL_PARSE_MIN_FILES", 1)
+    pooled = index_sources(sources, tmp_path / "b", parse_workers=2)
+    assert build_usage_index(pooled) == build_usage_index(inline)
+    assert inline["google.adk.agents.Agent"]["call_count"] == 12
+
+
+def test_annotated_tags_are_keyed_by_commit(tmp_path, monkeypatch):
+    repo = _make_repo(tmp_path / "repo", {"app/agent.py": AGENT_FILE})
+    _git(repo, "tag", "-a", "v1", "-m", "release")
+    commit = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True
+    ).stdout.strip()
+    mirrors = run_api_indexing.RepoMirrors(tmp_path / "mirrors")
+    assert mirrors.remote_sha(str(repo), "v1") == commit
+    assert mirrors.fetch(str(repo), "v1") == commit
+
+    # The partial stored under the tag's commit is found again on the next run.
+    sources = [{"url": str(repo), "branch": "v1"}]
+    scanned = _count_scans(monkeypatch)
+    index_sources(sources, tmp_path / "cache", parse_workers=1)
+    assert scanned == ["app/agent.py"]
+    scanned.clear()
+    index_sources(sources, tmp_path / "cache", parse_workers=1)
+    assert scanned == []
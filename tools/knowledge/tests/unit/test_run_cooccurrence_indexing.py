@@ -182,3 +182,148 @@ import os
         # Should CAPTURE dynamic non-stdlib usages
         assert "pydantic.BaseModel" in targets or "pydantic" in targets
         assert "google.genai" in targets
+
+
+import random
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from tools.knowledge import run_cooccurrence_indexing
+from tools.knowledge.cooccurrence_graph import CooccurrenceGraph
+from tools.knowledge.run_cooccurrence_indexing import (
+    FileEntityCache,
+    _round3,
+    compute_associations,
+    count_cooccurrences,
+    load_binary,
+)
+
+
+def _random_corpus(root, files=120, seed=0):
+    rng = random.Random(seed)
+    modules = [f"lib{i}.mod{j}" for i in range(6) for j in range(5)]
+    for i in range(files):
+        imports = rng.sample(modules, rng.randint(0, 8))
+        (root / f"f{i}.py").write_text("".join(f"import {m}\n" for m in imports))
+    (root / "broken.py").write_text("import lib0.mod0\ndef (:\n")
+
+
+def _pairwise_reference(root, min_support=2):
+    """The per-file O(k^2) counting the matrix product replaces."""
+    file_counts, co = Counter(), defaultdict(Counter)
+    for path in sorted(root.glob("*.py")):
+        used = run_cooccurrence_indexing._file_entities(path)
+        for ent in used:
+            file_counts[ent] += 1
+            for other in used:
+                if ent != other:
+                    co[ent][other] += 1
+    return {
+        (ctx, tgt, round(count / file_counts[ctx], 3), count)
+        for ctx, targets in co.items()
+        if file_counts[ctx] >= min_support
+        for tgt, count in targets.items()
+        if count >= min_support
+    }
+
+
+def test_matrix_counts_match_pairwise_counting(tmp_path, monkeypatch):
+    _random_corpus(tmp_path)
+    # Several chunks, and several partial sums, even on this small corpus.
+    monkeypatch.setattr(run_cooccurrence_indexing, "PAIR_CHUNK_SIZE", 50)
+
+    for min_support in (1, 2, 5):
+        counts = count_cooccurrences([tmp_path], min_support=min_support, workers=1)
+        assoc = compute_associations(counts)
+        names = assoc.entities
+        rows = list(
+            zip(
+                [names[c] for c in assoc.context],
+                [names[t] for t in assoc.target],
+                assoc.probability.tolist(),
+                assoc.support.tolist(),
+            )
+        )
+        assert set(rows) == _pairwise_reference(tmp_path, min_support)
+        assert rows == sorted(
+            rows, key=lambda r: (-r[2], -r[3], r[0], r[1])
+        ), "sorted by probability, support, then names"
+        p_target = counts.file_counts[assoc.target] / counts.file_total
+        assert np.allclose(
+            assoc.lift,
+            assoc.support / counts.file_counts[assoc.context] / p_target,
+            atol=5e-4,
+        )
+
+
+def test_parallel_extraction_matches_serial(tmp_path, monkeypatch):
+    _random_corpus(tmp_path, files=40)
+    serial = count_cooccurrences(
+        [tmp_path], workers=1, cache=FileEntityCache(tmp_path / "serial.db")
+    )
+    monkeypatch.setattr(run_cooccurrence_indexing, "PARALLEL_MINING_MIN_FILES", 1)
+    parallel = count_cooccurrences(
+        [tmp_path], workers=2, cache=FileEntityCache(tmp_path / "parallel.db")
+    )
+    assert repr(parallel) == repr(serial)
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _random_corpus(repo, files=30)
+    cache = FileEntityCache(tmp_path / "entities.db")
+    first = count_cooccurrences([repo], workers=1, cache=cache)
+
+    parsed = []
+    source_entities = run_cooccurrence_indexing._source_entities
+
+    def counting_source_entities(source):
+        parsed.append(source)
+        return source_entities(source)
+
+    monkeypatch.setattr(
+        run_cooccurrence_indexing, "_source_entities", counting_source_entities
+    )
+    assert repr(count_cooccurrences([repo], workers=1, cache=cache)) == repr(first)
+    assert parsed == []
+
+    (repo / "f0.py").write_text("import lib5.mod4\nimport lib0.mod0\n")
+    changed = count_cooccurrences([repo], workers=1, cache=cache)
+    assert parsed == [b"import lib5.mod4\nimport lib0.mod0\n"]
+    fresh = count_cooccurrences(
+        [repo], workers=1, cache=FileEntityCache(tmp_path / "fresh.db")
+    )
+    assert repr(changed) == repr(fresh)
+
+
+def test_binary_output_with_yaml_export(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _random_corpus(repo, files=60)
+    assoc = generate_cooccurrence(
+        [repo], str(tmp_path / "out.npz"), yaml_path=str(tmp_path / "out.yaml")
+    )
+
+    loaded, meta = load_binary(tmp_path / "out.npz")
+    assert loaded.entities == assoc.entities
+    assert loaded.support.tolist() == assoc.support.tolist()
+    assert meta.repo_paths == [str(repo)]
+    # Only files using some entity are rows of X (not empty or unparsable ones).
+    used = [run_cooccurrence_indexing._file_entities(p) for p in repo.glob("*.py")]
+    assert meta.file_count == sum(1 for u in used if u) < 61
+
+    binary = CooccurrenceGraph.from_file(tmp_path / "out.npz")
+    text = CooccurrenceGraph.from_file(tmp_path / "out.yaml")
+    assert binary.edge_count == text.edge_count == len(assoc.context) > 0
+    for node in text.nodes:
+        assert binary.neighbors(node) == text.neighbors(node)
+
+
+def test_round3_matches_builtin_round():
+    support, count = np.meshgrid(np.arange(1, 400), np.arange(1, 400))
+    valid = support <= count
+    support, count = support[valid], count[valid]
+    expected = [round(s / c, 3) for s, c in zip(support.tolist(), count.tolist())]
+    assert _round3(support, count).tolist() == expected
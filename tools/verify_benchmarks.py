@@ -27,6 +27,12 @@ from benchmarks.answer_generators.verifier_pipeline import create_verifier_adk_g
 from core.api_key_manager import ApiKeyManager, KeyType
 from benchmarks.answer_generators.adk_context import adk_execution_context
 from core.config import DATA_DIR, PROJECT_ROOT, MOST_POWERFUL_MODEL, OUTPUT_ROOT, VERIFICATION_RUNS_DIR
+from tools.benchmark_verification.verification_store import (
+    VERIFY_JOBS,
+    VerificationStore,
+    context_digest,
+    fingerprint_cases,
+)
 from dotenv import load_dotenv
 load_dotenv()
 try:
@@ -100,8 +106,80 @@ def print_verification_details(logs: List[Any]):
 
 import shutil
 import datetime as _dt
+import hashlib
+import sqlite3
+import benchmarks.answer_generators.verifier_pipeline as _verifier_pipeline
 
-# ... imports ...
+DEFAULT_REPO_URL = "https://github.com/google/adk-python.git"
+DEFAULT_REPO_VERSION = "v1.20.0"
+
+
+def verifier_fingerprint() -> str:
+    """Digest of the verifier pipeline sources; changing its agents re-verifies every case."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(_verifier_pipeline.__file__).parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def suite_context(
+    data: Dict[str, Any],
+    model_name: str,
+    repo_url: str = DEFAULT_REPO_URL,
+    repo_version: str = DEFAULT_REPO_VERSION,
+    setup_cmd: Optional[List[str]] = None,
+    verifier: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Everything outside a benchmark file's cases that their verdicts depend on."""
+    return {
+        # Sandbox config at the root level of benchmark.yaml wins over the CLI.
+        "target_repo_url": data.get("target_repo_url", repo_url),
+        "target_repo_version": data.get("target_repo_version", repo_version),
+        "extra_dependencies": data.get("extra_dependencies", setup_cmd),
+        # We map benchmark_type globally to the file since the factory needs it
+        "benchmark_type": (data.get("benchmarks") or [{}])[0].get("benchmark_type", "multiple_choice"),
+        "model": model_name,
+        "verifier": verifier or verifier_fingerprint(),
+    }
+
+
+def fingerprint_files(
+    files: List[Path],
+    model_name: str,
+    repo_url: str = DEFAULT_REPO_URL,
+    repo_version: str = DEFAULT_REPO_VERSION,
+    setup_cmd: Optional[List[str]] = None,
+    verifier: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[Path, List[tuple]]:
+    """
+    Fingerprints the cases of every benchmark file in one sharded pass.
+
+    Returns each file's (fingerprint, problems) pairs in case order; case IDs are not
+    unique across files, so they cannot key a shared map.
+    """
+    verifier = verifier or verifier_fingerprint()
+    jobs, job_files = [], []
+    for f in files:
+        with open(f, "r") as yf:
+            data = yaml.safe_load(yf)
+        if data:
+            context = suite_context(data, model_name, repo_url, repo_version, setup_cmd, verifier)
+            digest = context_digest(context)
+            cases = data.get('benchmarks', [])
+            jobs.extend((case, digest) for case in cases)
+            job_files.extend(f for _ in cases)
+    fingerprints: Dict[Path, List[tuple]] = {}
+    for f, result in zip(job_files, fingerprint_cases(jobs, PROJECT_ROOT, workers)):
+        fingerprints.setdefault(f, []).append(result)
+    return fingerprints
+
+
+def _stream_result(run_dir: Path, result: Dict[str, Any]):
+    """Appends a finished case to the run's results.jsonl as soon as it is known."""
+    with open(run_dir / "results.jsonl", "a") as f:
+        f.write(json.dumps(result) + "\n")
 
 
 async def verify_benchmark(
@@ -110,15 +188,27 @@ async def verify_benchmark(
     model_name: str,
     api_key_manager: ApiKeyManager,
     skip_ids: Optional[set] = None,
-    repo_url: str = "https://github.com/google/adk-python.git",
-    repo_version: str = "v1.20.0",
+    repo_url: str = DEFAULT_REPO_URL,
+    repo_version: str = DEFAULT_REPO_VERSION,
     setup_cmd: Optional[List[str]] = None,
     semaphore: Optional[asyncio.Semaphore] = None,
     max_retries: int = 3,
     min_wait: float = 2.0,
-    max_wait: float = 60.0
+    max_wait: float = 60.0,
+    store: Optional[VerificationStore] = None,
+    fingerprints: Optional[List[tuple]] = None,
+    force: bool = False,
 ):
-    """Verifies a single benchmark file using concurrency across cases."""
+    """Verifies a single benchmark file using concurrency across cases.
+
+    Each case is fingerprinted (see suite_context and verification_store). Cases whose
+    fingerprint already has a verdict in `store` are not verified again unless `force`
+    is set, and cases whose referenced files are missing or do not parse fail without
+    running the agent. `fingerprints` holds the precomputed (fingerprint, problems)
+    pair of each case of this file, in order (case IDs are not unique across files);
+    they are computed here when omitted. Every finished case
+    is streamed to run_dir/results.jsonl and `store` as soon as it completes.
+    """
     if skip_ids is None:
         skip_ids = set()
     if semaphore is None:
@@ -144,21 +234,54 @@ async def verify_benchmark(
         return
 
     # Extract sandbox config if it exists at root level of benchmark.yaml
-    yaml_target_repo = data.get("target_repo_url", repo_url)
-    yaml_target_version = data.get("target_repo_version", repo_version)
-    yaml_extra_deps = data.get("extra_dependencies", setup_cmd)
-    
-    # We map benchmark_type globally to the file since the factory needs it
-    benchmark_type = data.get("benchmarks", [{}])[0].get("benchmark_type", "multiple_choice")
-
-    async def _process_case(case):
+    context = suite_context(data, model_name, repo_url, repo_version, setup_cmd)
+    yaml_target_repo = context["target_repo_url"]
+    yaml_target_version = context["target_repo_version"]
+    yaml_extra_deps = context["extra_dependencies"]
+    benchmark_type = context["benchmark_type"]
+
+    if fingerprints is None or len(fingerprints) != len(benchmarks):
+        digest = context_digest(context)
+        fingerprints = fingerprint_cases([(case, digest) for case in benchmarks], PROJECT_ROOT)
+    known = {} if (force or store is None) else store.lookup(
+        [fingerprint for fingerprint, _ in fingerprints]
+    )
+
+    def _finish(case_result, fingerprint):
+        case_result["fingerprint"] = fingerprint
+        _stream_result(run_dir, case_result)
+        if store is not None:
+            store.store([(fingerprint, case_result)])
+        return case_result
+
+    async def _process_case(case, fingerprint, problems):
         case_id = case.get('id')
         if case_id in skip_ids:
             return None
+        if fingerprint in known:
+            print(f"  {Fore.LIGHTBLACK_EX}✓ Unchanged since verified: {case_id} ({known[fingerprint]['verdict']}){Style.RESET_ALL}")
+            return dict(known[fingerprint], cached=True)
 
         slug = re.sub(r'[^a-zA-Z0-9_]', '_', case_id)
         case_output_dir = run_dir / slug
-        
+
+        if problems:
+            # Static checks failed; the agent could not verify this case either.
+            print(f"  {Fore.RED}❌ {case_id}: {'; '.join(problems)}{Style.RESET_ALL}")
+            case_output_dir.mkdir(parents=True, exist_ok=True)
+            res = {
+                "id": case_id,
+                "verdict": "Error",
+                "error": "; ".join(problems),
+                "question": case.get("question"),
+                "options": case.get("options", {}),
+                "expected_answer": case.get("correct_answer"),
+                "attempts": 0
+            }
+            with open(case_output_dir / "report.json", "w") as f2:
+                json.dump(res, f2, indent=2)
+            return _finish(res, fingerprint)
+
         async with semaphore:
             case_output_dir.mkdir(parents=True, exist_ok=True)
             print(f"\n  {Style.BRIGHT}{Fore.BLUE}▶ Verifying Case: {case_id}{Style.RESET_ALL}")
@@ -328,7 +451,7 @@ async def verify_benchmark(
                     
                     with open(case_output_dir / "report.json", "w") as f2:
                         json.dump(case_result, f2, indent=2)
-                    return case_result
+                    return _finish(case_result, fingerprint)
 
                 except Exception as e:
                     should_retry = attempt_idx < max_retries
@@ -372,10 +495,13 @@ async def verify_benchmark(
                         }
                         with open(case_output_dir / "report.json", "w") as f2:
                             json.dump(res, f2, indent=2)
-                        return res
+                        return _finish(res, fingerprint)
 
     # execute all cases in THIS file asynchronously
-    tasks = [_process_case(case) for case in benchmarks]
+    tasks = [
+        _process_case(case, fingerprint, problems)
+        for case, (fingerprint, problems) in zip(benchmarks, fingerprints)
+    ]
     raw_results = await asyncio.gather(*tasks)
     return [r for r in raw_results if r]
 
@@ -388,12 +514,14 @@ async def main():
     parser.add_argument("--resume-latest", action="store_true", help="Resume from the most recent run directory.")
     
     # Generic Repository Sandboxing Settings
-    parser.add_argument("--repo-url", help="Target repository URL for the code context", default="https://github.com/google/adk-python.git")
-    parser.add_argument("--repo-version", help="Version/Branch of the target repository", default="v1.20.0")
+    parser.add_argument("--repo-url", help="Target repository URL for the code context", default=DEFAULT_REPO_URL)
+    parser.add_argument("--repo-version", help="Version/Branch of the target repository", default=DEFAULT_REPO_VERSION)
     parser.add_argument("--concurrency", type=int, default=3, help="Max concurrent verify cases.")
     parser.add_argument("--max-retries", type=int, default=3, help="Maximum number of retries per case.")
     parser.add_argument("--min-wait", type=float, default=2.0, help="Minimum wait time between retries in seconds.")
     parser.add_argument("--max-wait", type=float, default=60.0, help="Maximum wait time between retries in seconds.")
+    parser.add_argument("--force", action="store_true", help="Verify every case again, even if it was verified at its current fingerprint.")
+    parser.add_argument("--jobs", type=int, default=VERIFY_JOBS, help="Processes used to fingerprint and statically check cases.")
     parser.add_argument("--extra-dep", action="append", help="Extra dependency constraints to inject into the sandbox pyproject.toml before uv sync (e.g. 'django>=4.0'). Passed multiple times for multiple packages.")
     
     args = parser.parse_args()
@@ -481,19 +609,20 @@ async def main():
 
     print(f"{Fore.CYAN}Found {len(files)} benchmark files to verify.{Style.RESET_ALL}")
     
-    # Pre-count total test cases across all files
-    total_cases = 0
-    
-    for f in files:
-        
-        import yaml
-        with open(f, "r") as _yf:
-            b = yaml.safe_load(_yf)
-
-        if b:
-            total_cases += len(b.get('benchmarks', []))
+    # Pre-count total test cases across all files, and fingerprint them all at once
+    fingerprints = fingerprint_files(
+        files, model_to_use, args.repo_url, args.repo_version, args.extra_dep,
+        workers=args.jobs,
+    )
+    total_cases = sum(len(cases) for cases in fingerprints.values())
     
     print(f"{Fore.CYAN}Total benchmark cases to verify: {total_cases}{Style.RESET_ALL}\n")
+
+    try:
+        store = VerificationStore()
+    except (OSError, sqlite3.Error) as e:
+        print(f"{Fore.YELLOW}Warning: verification store unavailable ({e}); verifying every case.{Style.RESET_ALL}")
+        store = None
     
     completed_cases = 0
     import time
@@ -511,21 +640,29 @@ async def main():
             semaphore=semaphore,
             max_retries=args.max_retries,
             min_wait=args.min_wait,
-            max_wait=args.max_wait
+            max_wait=args.max_wait,
+            store=store,
+            fingerprints=fingerprints.get(f),
+            force=args.force,
         ))
         
-    all_file_results = await asyncio.gather(*tasks)
+    try:
+        all_file_results = await asyncio.gather(*tasks)
+    finally:
+        if store is not None:
+            store.close()
     
     for file_results in all_file_results:
         if file_results:
             current_results.extend(file_results)
             
     completed_cases = total_cases
+    reused_cases = sum(1 for r in current_results if r.get("cached"))
     current_time = time.time()
     elapsed_minutes = (current_time - start_run_time) / 60
     import datetime as _dt
     timestamp = _dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"{Fore.GREEN}[{timestamp}] - Verification Progress: {completed_cases}/{total_cases} tasks completed in {elapsed_minutes:.1f} minutes.{Style.RESET_ALL}\n")
+    print(f"{Fore.GREEN}[{timestamp}] - Verification Progress: {completed_cases}/{total_cases} tasks completed in {elapsed_minutes:.1f} minutes ({reused_cases} unchanged since verified).{Style.RESET_ALL}\n")
 
 
     # --- Report Aggregation ---
@@ -597,6 +734,9 @@ async def main():
             
             slug = re.sub(r'[^a-zA-Z0-9_]', '_', r['id'])
             rel_path = f"./{slug}"
+            if r.get('cached') and r.get('artifact_path'):
+                # Verified by an earlier run; its artifacts live in that run's directory.
+                rel_path = r['artifact_path']
             
             summary_md += f"### `{r['id']}`\n"
             
@@ -31,6 +31,12 @@ from pydantic import TypeAdapter
 from benchmarks.data_models import BenchmarkRunResult, BenchmarkResultType, ForensicData, CaseSummary, ForensicInsight, TraceLogEvent
 from benchmarks.benchmark_candidates import CANDIDATE_GENERATORS
 from tools.analysis.run_metrics import analyze_benchmark_run
+from benchmarks.results_store import (
+    RESULTS_COLUMNS_FILE,
+    RESULTS_PAYLOADS_FILE,
+    ResultPayloadReader,
+    load_results_frame as _read_results_frame,
+)
 from core.config import BENCHMARK_RUNS_DIR
 
 # --- GCS Support ---
@@ -140,9 +146,10 @@ artifact_manager = ArtifactManager(bucket_name=BENCHMARK_GCS_BUCKET)
 
 def get_run_status(run_id: str) -> str:
     """Determines the status of a run based on file existence."""
-    # Check for results.json.gz, results.json, or results.yaml (Completed)
+    # Check for results.parquet, results.json.gz, results.json, or results.yaml (Completed)
     if (
-        artifact_manager.get_file(run_id, "results.json.gz")
+        artifact_manager.get_file(run_id, RESULTS_COLUMNS_FILE)
+        or artifact_manager.get_file(run_id, "results.json.gz")
         or artifact_manager.get_file(run_id, "results.json")
         or artifact_manager.get_file(run_id, "results.yaml")
     ):
@@ -208,6 +215,36 @@ def load_results(run_id) -> List[BenchmarkRunResult]:
     return results
 
 
+@st.cache_data
+def load_results_frame(run_id) -> pd.DataFrame | None:
+    """Loads the columnar scalar table (results.parquet) for a run, if present.
+
+    Only the scalar columns are read; heavy fields (traces, attempts, answers) are
+    loaded per case via `load_result_detail`.
+    """
+    path = artifact_manager.get_file(run_id, RESULTS_COLUMNS_FILE)
+    if not path or not artifact_manager.get_file(run_id, RESULTS_PAYLOADS_FILE):
+        return None
+    try:
+        df = _read_results_frame(path.parent)
+    except Exception as e:
+        print(f"Error loading {RESULTS_COLUMNS_FILE}: {e}")
+        return None
+
+    # Expose the attempt summaries under the same column the JSON path produces
+    df["generation_attempts"] = df["attempts_summary"].apply(json.loads)
+    return df
+
+
+@st.cache_data
+def load_result_detail(run_id, index: int) -> BenchmarkRunResult:
+    """Loads the full result for a single row of the columnar table."""
+    path = artifact_manager.get_file(run_id, RESULTS_PAYLOADS_FILE)
+    return ResultPayloadReader(path.parent, frame=load_results_frame(run_id)).load(
+        index
+    )
+
+
 @st.cache_data
 def load_traces(run_id):
     """Loads trace.yaml and indexes it by benchmark_name.
@@ -780,16 +817,23 @@ def main():
     selected_run = selected_run_obj["id"]
 
     # 2. Load Data
+    # Prefer the columnar table; fall back to validating the full results file.
+    results_list = None
     with Profiler("load_results"):
-        results_list = load_results(selected_run)
+        df = load_results_frame(selected_run)
+        if df is None:
+            results_list = load_results(selected_run)
 
-    if not results_list:
+    if df is None and not results_list:
         st.warning(f"No results found in {selected_run}/results.yaml. The benchmark run might have failed early or produced no output.")
         return
 
     # Convert to DataFrame for UI logic
     with Profiler("create_dataframe"):
-        df = pd.DataFrame([r.model_dump(mode="json") for r in results_list])
+        if df is None:
+            df = pd.DataFrame([r.model_dump(mode="json") for r in results_list])
+        else:
+            df = df.copy()
 
         if "suite" in df.columns:
             df["suite"] = df["suite"].apply(
@@ -1317,7 +1361,10 @@ def main():
         "Generator Diagnosis",
     ]:
         # Use typed object for detail view
-        result_obj = results_list[selected_case_id]
+        if results_list is not None:
+            result_obj = results_list[selected_case_id]
+        else:
+            result_obj = load_result_detail(selected_run, selected_case_id)
         generation_attempts = result_obj.generation_attempts or []
 
         # Load forensic data